@@ -5,6 +5,7 @@ from dataclasses import dataclass
 import numpy as np
 import requests
 from biotite.structure.io.pdbx import *
+from biotite.structure.info.ccd import _write_residue_index
 
 
 class ComponentException(Exception):
@@ -459,5 +460,10 @@ def setup_ccd(target_diriectory):
     compressed_file["components"] = compressed_block
     compressed_file.write(target_diriectory / "components.bcif")
 
+    logging.info("Write residue index...")
+    _write_residue_index(
+        compressed_block, target_diriectory / "components_index.npz"
+    )
+
 from pathlib import Path
 setup_ccd(Path(__file__).parent / "src" / "biotite" / "structure" / "info" / "ccd")
\ No newline at end of file
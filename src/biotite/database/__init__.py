@@ -20,4 +20,12 @@ download the associated files.
 __name__ = "biotite.database"
 __author__ = "Patrick Kunzmann"
 
-from .error import *
\ No newline at end of file
+from .error import *
+
+# The subpackages are only imported when they are accessed for the first
+# time, as each of them requires a web client
+from ..lazy import attach_lazy_modules as _attach_lazy_modules
+__getattr__, __dir__, __all__ = _attach_lazy_modules(
+    __name__, globals(), {},
+    subpackages=["entrez", "pubchem", "rcsb", "uniprot"]
+)
@@ -15,6 +15,27 @@ from .copyable import Copyable
 import copy
 
 
+class _ReadMethod:
+    """
+    Descriptor for the :func:`read()` class method of a :class:`File`
+    subclass.
+
+    If accessed via the class, the class method is returned.
+    If accessed via an instance, the deprecated instance method is
+    returned.
+    """
+
+    def __init__(self, class_method):
+        self._class_method = class_method
+        self.__func__ = class_method.__func__
+        self.__doc__ = class_method.__func__.__doc__
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self._class_method.__get__(None, owner)
+        return instance._deprecated_read
+
+
 class File(Copyable, metaclass=abc.ABCMeta):
     """
     Base class for all file classes.
@@ -26,12 +47,20 @@ class File(Copyable, metaclass=abc.ABCMeta):
     :func:`write()` method is used.
     """
 
-    def __init__(self):
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
         # Support for deprecated instance method 'read()':
-        # When creating an instance, the 'read()' class method is
-        # replaced by the instance method, so that subsequent
-        # 'read()' calls are delegated to the instance method
-        self.read = self._deprecated_read
+        # The 'read()' class method is wrapped, so that calling it on
+        # an instance is delegated to the instance method
+        # In contrast to assigning the instance method to an attribute
+        # of each instance, this does not create a reference cycle,
+        # so file objects are released as soon as they are unused
+        read = cls.__dict__.get("read")
+        if isinstance(read, classmethod):
+            cls.read = _ReadMethod(read)
+
+    def __init__(self):
+        pass
 
     @classmethod
     @abc.abstractmethod
@@ -0,0 +1,94 @@
+# This source code is part of the Biotite package and is distributed
+# under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
+# information.
+
+"""
+Utility functions for the lazy import of modules in *Biotite*
+subpackages.
+"""
+
+__name__ = "biotite"
+__author__ = "Patrick Kunzmann"
+__all__ = []
+
+import importlib
+import inspect
+
+
+def attach_lazy_modules(package_name, package_globals,
+                        modules, subpackages=()):
+    """
+    Make the attributes of the given modules available in a package,
+    without importing the modules until one of their attributes is
+    accessed for the first time (:pep:`562`).
+
+    Parameters
+    ----------
+    package_name : str
+        The name of the package, e.g. ``'biotite.structure'``.
+    package_globals : dict
+        The ``globals()`` of the package's ``__init__.py``.
+    modules : dict (str -> list of str)
+        Maps the names of the modules in the package, that should be
+        imported lazily, to the names of the attributes they provide,
+        i.e. their ``__all__``.
+    subpackages : iterable object of str, optional
+        The names of subpackages that are imported lazily, when they
+        are accessed as attribute of the package.
+
+    Returns
+    -------
+    getattr_function, dir_function : function
+        The module-level ``__getattr__()`` and ``__dir__()`` of the
+        package.
+    all_attributes : list of str
+        The ``__all__`` of the package.
+        This comprises all public attributes, that are already present
+        in `package_globals`, and all attributes of the lazily imported
+        modules.
+
+    Notes
+    -----
+    No attribute of a lazily imported module may have the same name as
+    any module in the package:
+    When a module is imported, it is set as attribute of its package
+    and would shadow the attribute with the same name.
+    Hence, such modules must be imported eagerly instead.
+
+    The given `modules` are stored as ``_lazy_modules`` in
+    `package_globals`, so that the attribute names can be checked
+    against the ``__all__`` of the respective module in the tests.
+    """
+    package_globals["_lazy_modules"] = modules
+    attribute_to_module = {
+        attr: module_name
+        for module_name, attributes in modules.items()
+        for attr in attributes
+    }
+    lazy_submodules = set(modules) | set(subpackages)
+
+    def __getattr__(name):
+        module_name = attribute_to_module.get(name)
+        if module_name is not None:
+            module = importlib.import_module(f"{package_name}.{module_name}")
+            # Set all attributes of the imported module at once,
+            # so this function is not called again for them
+            for attr in modules[module_name]:
+                package_globals[attr] = getattr(module, attr)
+            return package_globals[name]
+        if name in lazy_submodules:
+            # Importing a submodule sets it as attribute of the package
+            return importlib.import_module(f"{package_name}.{name}")
+        raise AttributeError(
+            f"module '{package_name}' has no attribute '{name}'"
+        )
+
+    def __dir__():
+        return sorted(set(package_globals) | set(attribute_to_module))
+
+    all_attributes = [
+        name for name, value in package_globals.items()
+        if not name.startswith("_") and not inspect.ismodule(value)
+    ] + list(attribute_to_module)
+
+    return __getattr__, __dir__, all_attributes
@@ -65,9 +65,24 @@ __name__ = "biotite.sequence"
 __author__ = "Patrick Kunzmann"
 
 from .alphabet import *
-from .search import *
 from .seqtypes import *
 from .sequence import *
-from .codon import *
-from .annotation import *
-from .profile import *
+
+# The following modules are only imported when one of their attributes
+# is accessed for the first time, to keep 'import biotite.sequence' fast
+from ..lazy import attach_lazy_modules as _attach_lazy_modules
+__getattr__, __dir__, __all__ = _attach_lazy_modules(
+    __name__, globals(),
+    {
+        "annotation": [
+            "Location", "Feature", "Annotation", "AnnotatedSequence"
+        ],
+        "codon": ["CodonTable"],
+        "profile": ["SequenceProfile"],
+        "search": [
+            "find_subsequence", "find_symbol", "find_symbol_first",
+            "find_symbol_last"
+        ],
+    },
+    subpackages=["align", "graphics", "io", "phylo"]
+)
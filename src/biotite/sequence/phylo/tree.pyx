@@ -11,7 +11,6 @@ cimport numpy as np
 
 import copy
 import numpy as np
-import networkx as nx
 from ...file import InvalidFileError
 from ...copyable import Copyable
 
@@ -137,6 +136,10 @@ class Tree(Copyable):
         ((0, 1), 2)   ->  (0, 1)
         ((0, 1), 2)   ->  2
         """
+        # Importing NetworkX is expensive
+        # -> import it only when it is actually needed
+        import networkx as nx
+
         cdef tuple children
         cdef bint children_already_handled
         cdef TreeNode node, child, parent
@@ -106,26 +106,49 @@ __author__ = "Patrick Kunzmann"
 from .atoms import *
 from .bonds import *
 from .box import *
+from .categorical import *
 from .celllist import *
-from .charges import *
-from .compare import *
 from .density import *
-from .dotbracket import *
 from .error import *
 from .filter import *
 from .geometry import *
 from .hbond import *
 from .integrity import *
-from .mechanics import *
 from .molecules import *
 from .pseudoknots import *
 from .rdf import *
-from .repair import *
 from .residues import *
 from .chains import *
 from .sasa import *
-from .sse import *
 from .superimpose import *
-from .transform import *
-from .basepairs import *
-# util and resutil are used internally
+
+# The following modules are only imported when one of their attributes
+# is accessed for the first time, to keep 'import biotite.structure' fast
+from ..lazy import attach_lazy_modules as _attach_lazy_modules
+__getattr__, __dir__, __all__ = _attach_lazy_modules(
+    __name__, globals(),
+    {
+        "basepairs": [
+            "base_pairs", "map_nucleotide", "base_stacking",
+            "base_pairs_edge", "Edge", "base_pairs_glycosidic_bond",
+            "GlycosidicBond"
+        ],
+        "charges": ["partial_charges"],
+        "compare": ["rmsd", "pairwise_rmsd", "rmspd", "rmsf", "average"],
+        "dotbracket": [
+            "dot_bracket_from_structure", "dot_bracket",
+            "base_pairs_from_dot_bracket"
+        ],
+        "mechanics": ["mass_center", "gyration_radius"],
+        "repair": [
+            "renumber_atom_ids", "renumber_res_ids",
+            "create_continuous_res_ids", "infer_elements"
+        ],
+        "sse": ["annotate_sse"],
+        "transform": [
+            "translate", "rotate", "rotate_centered", "rotate_about_axis",
+            "orient_principal_components", "align_vectors"
+        ],
+    },
+    subpackages=["graphics", "info", "io"]
+)
@@ -16,6 +16,7 @@ import numbers
 import abc
 import numpy as np
 from .bonds import BondList
+from .categorical import CategoricalArray
 from ..copyable import Copyable
 
 
@@ -26,6 +27,11 @@ class _AtomArrayBase(Copyable, metaclass=abc.ABCMeta):
     It implements functionality for annotation arrays and also
     rudimentarily for coordinates.
     """
+
+    # True, if the bond list is shared with the stack this array
+    # was obtained from and hence needs to be copied before it is
+    # handed out
+    _shared_bonds = False
     
     def __init__(self, length):
         """
@@ -36,6 +42,7 @@ class _AtomArrayBase(Copyable, metaclass=abc.ABCMeta):
         self._coord = None
         self._bonds = None
         self._box = None
+        self._cache = {}
         self.add_annotation("chain_id", dtype="U4")
         self.add_annotation("res_id", dtype=int)
         self.add_annotation("ins_code", dtype="U1")
@@ -137,22 +144,32 @@ class _AtomArrayBase(Copyable, metaclass=abc.ABCMeta):
         ----------
         category : str
             The annotation category to be set.
-        array : ndarray or None
+        array : ndarray or CategoricalArray or None
             The new value of the annotation category. The size of the
             array must be the same as the array length.
+            A :class:`CategoricalArray` is stored as it is, i.e. the
+            annotation is represented by integer codes from then on.
         """
         if len(array) != self._array_length:
             raise IndexError(
                 f"Expected array length {self._array_length}, "
                 f"but got {len(array)}"
             )
+        if isinstance(array, CategoricalArray):
+            self._annot[category] = array
+            return
+        array = np.asarray(array)
         if category in self._annot:
             # Keep the dtype if the annotation already exists
-            self._annot[category] = np.asarray(
-                array, dtype=self._annot[category].dtype
-            )
-        else:
-            self._annot[category] = np.asarray(array)
+            # Only cast if necessary, as 'np.asarray()' would also copy
+            # string arrays with an equal, but not identical dtype
+            dtype = self._annot[category].dtype
+            if array.dtype != dtype:
+                array = array.astype(dtype)
+            if isinstance(self._annot[category], CategoricalArray):
+                # Keep the categorical representation
+                array = CategoricalArray(array)
+        self._annot[category] = array
         
     def get_annotation_categories(self):
         """
@@ -165,6 +182,106 @@ class _AtomArrayBase(Copyable, metaclass=abc.ABCMeta):
         """
         return list(self._annot.keys())
             
+    def freeze_annotations(self):
+        """
+        Make all annotation arrays read-only.
+
+        Values derived from the annotation arrays, such as the residue
+        and chain starts, are cached only for read-only annotation
+        arrays that are no views on writable arrays, as only these
+        cannot be modified in-place.
+        Hence, freezing the annotations of an atom array before
+        passing it to many residue-wise or chain-wise functions
+        avoids that the residue and chain starts are determined
+        repeatedly.
+
+        Notes
+        -----
+        Afterwards, the annotation arrays are copied on write:
+        Setting an annotation, either via :meth:`set_annotation()` or
+        the corresponding attribute, or setting an atom via
+        ``array[i] = atom``, replaces the frozen annotation array with
+        a new one.
+        An in-place modification, such as ``array.res_id += 1``,
+        raises an exception.
+        A copy of the atom array obtained via :meth:`copy()` has
+        writable annotation arrays again.
+
+        The arrays obtained from an :class:`AtomArrayStack` share the
+        cache with the stack, but as their annotation arrays are views
+        on the annotation arrays of the stack, the stack itself needs
+        to be frozen to enable caching.
+        The annotation arrays of the models from the streaming
+        structure readers, like :meth:`PDBFile.read_iter_structure()`,
+        are already frozen.
+
+        Examples
+        --------
+
+        >>> array = atom_array.copy()
+        >>> array.freeze_annotations()
+        >>> print(array.res_id.flags.writeable)
+        False
+        >>> array.res_id = array.res_id + 1
+        >>> print(array.res_id[:3])
+        [2 2 2]
+        """
+        for name, annotation in self._annot.items():
+            if not annotation.flags.writeable:
+                continue
+            if not annotation.flags.owndata:
+                # The array might be a view on an annotation array of
+                # another atom array, which could still be modified
+                annotation = annotation.copy()
+            annotation.flags.writeable = False
+            self._annot[name] = annotation
+
+    def _get_cached(self, key, categories, function):
+        """
+        Get a value that is derived from the given annotation
+        categories, e.g. the residue starts.
+
+        The value is cached as long as the annotation arrays of these
+        categories are the same objects and are immutable, i.e.
+        neither they nor the arrays they are views on are writable.
+        This is the case after :meth:`freeze_annotations()`, also for
+        the arrays obtained from a frozen :class:`AtomArrayStack`,
+        which share the cache with the stack.
+        Replacing an annotation array, e.g. via
+        :meth:`set_annotation()`, changes its identity and hence
+        invalidates the cached value.
+
+        Parameters
+        ----------
+        key : str
+            The name of the cached value.
+        categories : iterable object of str
+            The annotation categories the value is derived from.
+        function : callable
+            The function that computes the value from this object.
+        """
+        try:
+            annotations = {
+                category: self._annot[category] for category in categories
+            }
+        except KeyError:
+            # Let the function raise the appropriate exception
+            return function(self)
+        entry = self._cache.get(key)
+        if entry is not None:
+            cached_annotations, value = entry
+            if all(
+                annotation is cached_annotations[category]
+                for category, annotation in annotations.items()
+            ):
+                return value
+        value = function(self)
+        if all(
+            _is_immutable(annotation) for annotation in annotations.values()
+        ):
+            self._cache[key] = (annotations, value)
+        return value
+
     def _subarray(self, index):
         # Index is one dimensional (boolean mask, index array)
         new_coord = self._coord[..., index, :]
@@ -188,6 +305,10 @@ class _AtomArrayBase(Copyable, metaclass=abc.ABCMeta):
         try:
             if isinstance(index, (numbers.Integral, np.ndarray)):
                 for name in self._annot:
+                    if not self._annot[name].flags.writeable:
+                        # Copy-on-write for read-only annotation arrays,
+                        # e.g. shared with an 'AtomArrayStack'
+                        self._annot[name] = self._annot[name].copy()
                     self._annot[name][index] = atom._annot[name]
                 self._coord[..., index, :] = atom.coord
             else:
@@ -262,6 +383,11 @@ class _AtomArrayBase(Copyable, metaclass=abc.ABCMeta):
         if attr == "coord":
             return self._coord
         if attr == "bonds":
+            if self._shared_bonds:
+                # Copy-on-write: As the bond list may be modified by
+                # the caller, it is not shared anymore from here on
+                self._bonds = self._bonds.copy()
+                self._shared_bonds = False
             return self._bonds
         if attr == "box":
             return self._box
@@ -313,9 +439,11 @@ class _AtomArrayBase(Copyable, metaclass=abc.ABCMeta):
                         f"but bond list has {value.get_atom_count()} atoms"
                     )
                 super().__setattr__("_bonds", value)
+                super().__setattr__("_shared_bonds", False)
             elif value is None:
                 # Remove bond list
                 super().__setattr__("_bonds", None)
+                super().__setattr__("_shared_bonds", False)
             else:
                 raise TypeError("Value must be 'BondList'")
         
@@ -425,6 +553,13 @@ class _AtomArrayBase(Copyable, metaclass=abc.ABCMeta):
             concat._box = np.copy(self._box)
         return concat
     
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # The cache may contain views on the annotation arrays,
+        # that would be pickled as copies
+        state["_cache"] = {}
+        return state
+
     def __copy_fill__(self, clone):
         super().__copy_fill__(clone)
         self._copy_annotations(clone)
@@ -949,6 +1084,13 @@ class AtomArrayStack(_AtomArrayBase):
         index.
         
         The same as ``stack[index]``, if `index` is an integer.
+
+        The returned :class:`AtomArray` is a lightweight view on the
+        stack:
+        Its coordinates and box are views into the respective arrays of
+        the stack and its annotation arrays are read-only references to
+        the annotation arrays of the stack.
+        Hence, obtaining an array is independent of the number of atoms.
         
         Parameters
         ----------
@@ -958,18 +1100,67 @@ class AtomArrayStack(_AtomArrayBase):
         Returns
         -------
         array : AtomArray
-            AtomArray at position `index`. 
+            AtomArray at position `index`.
+
+        Notes
+        -----
+        The annotation arrays of the returned :class:`AtomArray` are
+        copied on write:
+        Setting an annotation, either via :meth:`set_annotation()` or
+        the corresponding attribute, or setting an atom via
+        ``array[i] = atom``, replaces the shared annotation array
+        with an own one.
+        An in-place modification of a shared annotation array, such as
+        ``array.res_id += 1``, raises an exception.
+        In this case the array can be copied with :meth:`copy()`
+        beforehand.
+        Likewise, the :class:`BondList` of the stack is only copied,
+        when the :attr:`bonds` attribute of the returned
+        :class:`AtomArray` is accessed.
+
+        Examples
+        --------
+
+        >>> array = atom_array_stack.get_array(0)
+        >>> print(array.res_id.flags.writeable)
+        False
+        >>> array.res_id = array.res_id + 1
+        >>> print(array.res_id[:3])
+        [2 2 2]
+        >>> print(atom_array_stack.res_id[:3])
+        [1 1 1]
+        """
+        return self._get_array_view(index, self._get_read_only_annotations())
+
+    def _get_read_only_annotations(self):
         """
-        array = AtomArray(self.array_length())
-        for name in self._annot:
-            array._annot[name] = self._annot[name]
-        array._coord = self._coord[index]
-        if self._bonds is not None:
-            array._bonds = self._bonds.copy()
-        if self._box is not None:
-            array._box = self._box[index]
+        Get read-only views of the annotation arrays, that can be
+        shared with the arrays obtained from :meth:`_get_array_view()`.
 
-        return array
+        The views are reused as long as the annotation arrays are the
+        same objects, so that values cached for one array obtained from
+        this stack are also valid for the other ones.
+        """
+        sources, views = self._cache.get("annotation_views", ({}, {}))
+        if sources.keys() == self._annot.keys() and all(
+            sources[name] is annotation
+            for name, annotation in self._annot.items()
+        ):
+            return views
+        views = _read_only_annotations(self)
+        self._cache["annotation_views"] = (dict(self._annot), views)
+        return views
+
+    def _get_array_view(self, index, annot):
+        return _array_view(
+            annot,
+            self._coord[index],
+            self._box[index] if self._box is not None else None,
+            self._bonds,
+            # The array has the same annotations, so cached values
+            # derived from them are shared
+            self._cache
+        )
     
     def stack_depth(self):
         """
@@ -1010,10 +1201,10 @@ class AtomArrayStack(_AtomArrayBase):
         ------
         array : AtomArray
         """
-        i = 0
-        while i < len(self):
-            yield self.get_array(i)
-            i += 1
+        # The annotation views are shared between all arrays
+        annot = self._get_read_only_annotations()
+        for i in range(len(self)):
+            yield self._get_array_view(i, annot)
             
     def __getitem__(self, index):
         """
@@ -1163,6 +1354,90 @@ class AtomArrayStack(_AtomArrayBase):
         return AtomArrayStack(self.stack_depth(), self.array_length())
 
 
+def _is_immutable(array):
+    """
+    Check whether the given array cannot be modified, i.e. neither the
+    array itself nor any array it is a view on is writable.
+    """
+    if isinstance(array, CategoricalArray):
+        array = array.codes
+    while isinstance(array, np.ndarray):
+        if array.flags.writeable:
+            return False
+        array = array.base
+    if array is None:
+        return True
+    # The array is based on a buffer, e.g. 'bytes' or a memory map
+    try:
+        return memoryview(array).readonly
+    except TypeError:
+        return False
+
+
+def _read_only_annotations(atoms):
+    """
+    Create read-only views of the annotation arrays of the given atoms.
+
+    Parameters
+    ----------
+    atoms : AtomArray or AtomArrayStack
+        The atoms to get the annotation arrays from.
+
+    Returns
+    -------
+    views : dict (str -> ndarray)
+        The read-only views of the annotation arrays.
+    """
+    views = {}
+    for name, annotation in atoms._annot.items():
+        view = annotation.view()
+        view.flags.writeable = False
+        views[name] = view
+    return views
+
+
+def _array_view(annot, coord, box, bonds, cache):
+    """
+    Create an :class:`AtomArray` that shares the given read-only
+    annotation arrays, bond list and cache with other atom arrays.
+
+    The annotation arrays are copied on write, when the respective
+    annotation is set, and the bond list is copied, when it is
+    accessed.
+
+    Parameters
+    ----------
+    annot : dict (str -> ndarray)
+        The read-only annotation arrays, e.g. obtained from
+        :func:`_read_only_annotations()`.
+    coord : ndarray, shape=(n,3), dtype=float32
+        The coordinates of the atom array.
+    box : ndarray, shape=(3,3), dtype=float32 or None
+        The box of the atom array.
+    bonds : BondList or None
+        The shared bond list.
+    cache : dict
+        The cache shared between all atom arrays with the same
+        annotation arrays.
+
+    Returns
+    -------
+    array : AtomArray
+        The atom array.
+    """
+    # The constructor is bypassed, as the default annotation arrays
+    # allocated by it would be replaced anyway
+    array = AtomArray.__new__(AtomArray)
+    array._annot = dict(annot)
+    array._array_length = coord.shape[-2]
+    array._coord = coord
+    array._bonds = bonds
+    array._shared_bonds = bonds is not None
+    array._box = box
+    array._cache = cache
+    return array
+
+
 def array(atoms):
     """
     Create an :class:`AtomArray` from a list of :class:`Atom`.
@@ -1271,11 +1546,14 @@ def stack(arrays):
             )
     array_stack = AtomArrayStack(array_count, ref_array.array_length())
     for name, annotation in ref_array._annot.items():
+        if not annotation.flags.writeable:
+            # The annotation is shared with another stack
+            annotation = annotation.copy()
         array_stack._annot[name] = annotation
     coord_list = [array._coord for array in arrays] 
     array_stack._coord = np.stack(coord_list, axis=0)
     # Take bond list from first array
-    array_stack._bonds = ref_array._bonds
+    array_stack._bonds = ref_array.bonds
     # When all atom arrays provide a box, copy the boxes
     if all([array.box is not None for array in arrays]):
         array_stack.box = np.array([array.box for array in arrays])
@@ -1412,6 +1690,9 @@ def from_template(template, coord, box=None):
     
     for category in template.get_annotation_categories():
         annot = template.get_annotation(category)
+        if not annot.flags.writeable:
+            # The annotation is shared with another stack
+            annot = annot.copy()
         new_stack.set_annotation(category, annot)
     if template.bonds is not None:
         new_stack.bonds = template.bonds.copy()
@@ -20,7 +20,6 @@ from libc.stdlib cimport free, realloc
 import itertools
 import numbers
 from enum import IntEnum
-import networkx as nx
 import numpy as np
 from .error import BadStructureError
 from ..copyable import Copyable
@@ -160,6 +159,11 @@ class BondList(Copyable):
     If a bond appears multiple times with different bond types, the
     first bond takes precedence.
 
+    For efficient lookup of the atoms bonded to a given atom, an
+    adjacency representation of the bonds in *compressed sparse row*
+    (CSR) format is created on demand and reused until the
+    :class:`BondList` is modified.
+
     Examples
     --------
 
@@ -258,6 +262,9 @@ class BondList(Copyable):
     BondType.SINGLE bond between C6 and H6
     """
 
+    # Lazily created adjacency in CSR format, see '_get_adjacency()'
+    _adjacency = None
+
     def __init__(self, uint32 atom_count, np.ndarray bonds=None):
         self._atom_count = atom_count
 
@@ -298,23 +305,21 @@ class BondList(Copyable):
                     "(n,2) or (n,3)"
                 )
             self._remove_redundant_bonds()
-            self._max_bonds_per_atom = self._get_max_bonds_per_atom()
 
         else:
             # Create empty bond list
             self._bonds = np.zeros((0, 3), dtype=np.uint32)
-            self._max_bonds_per_atom = 0
 
     def __copy_create__(self):
         # Create empty bond list to prevent
         # unnecessary removal of redundant atoms
-        # and calculation of maximum bonds per atom
         return BondList(self._atom_count)
 
     def __copy_fill__(self, clone):
         # The bonds are added here
         clone._bonds = self._bonds.copy()
-        clone._max_bonds_per_atom = self._max_bonds_per_atom
+        # The adjacency is never modified in-place and can be shared
+        clone._adjacency = self._adjacency
 
     def offset_indices(self, int offset):
         """
@@ -349,6 +354,7 @@ class BondList(Copyable):
             raise ValueError("Offest must be positive")
         self._bonds[:,:2] += offset
         self._atom_count += offset
+        self._adjacency = None
 
     def as_array(self):
         """
@@ -420,6 +426,10 @@ class BondList(Copyable):
         1 3 {'bond_type': <BondType.SINGLE: 1>}
         1 4 {'bond_type': <BondType.SINGLE: 1>}
         """
+        # Importing NetworkX is expensive
+        # -> import it only when it is actually needed
+        import networkx as nx
+
         cdef int i
 
         cdef uint32[:,:] all_bonds_v = self._bonds
@@ -456,12 +466,14 @@ class BondList(Copyable):
         bonds = self._bonds
         difference = BondType.AROMATIC_SINGLE - BondType.SINGLE
         bonds[bonds[:, 2] >= BondType.AROMATIC_SINGLE, 2] -= difference
+        self._adjacency = None
 
     def remove_bond_order(self):
         """
         Convert all bonds to :attr:`BondType.ANY`.
         """
         self._bonds[:,2] = BondType.ANY
+        self._adjacency = None
 
     def get_atom_count(self):
         """
@@ -520,39 +532,13 @@ class BondList(Copyable):
         >>> print(bonds)
         [0 3 4]
         """
-        cdef int i=0, j=0
-
         cdef uint32 index = _to_positive_index(atom_index, self._atom_count)
 
-        cdef uint32[:,:] all_bonds_v = self._bonds
-        # Pessimistic array allocation:
-        # assume size is equal to the atom with most bonds
-        cdef np.ndarray bonds = np.zeros(self._max_bonds_per_atom,
-                                         dtype=np.uint32)
-        cdef uint32[:] bonds_v = bonds
-        cdef np.ndarray bond_types = np.zeros(self._max_bonds_per_atom,
-                                              dtype=np.uint8)
-        cdef uint8[:] bond_types_v = bond_types
-
-        for i in range(all_bonds_v.shape[0]):
-            # If a bond is found for the desired atom index
-            # at the first or second position of the bond,
-            # then append the index of the respective other position
-            if all_bonds_v[i,0] == index:
-                bonds_v[j] = all_bonds_v[i,1]
-                bond_types_v[j] = all_bonds_v[i,2]
-                j += 1
-            elif all_bonds_v[i,1] == index:
-                bonds_v[j] = all_bonds_v[i,0]
-                bond_types_v[j] = all_bonds_v[i,2]
-                j += 1
-
-        # Trim to correct size
-        bonds = bonds[:j]
-        bond_types = bond_types[:j]
-
-        return bonds, bond_types
-
+        indptr, neighbors, bond_types = self._get_adjacency()
+        cdef int64 start = indptr[index]
+        cdef int64 stop = indptr[index + 1]
+        # Copy, as the adjacency is reused
+        return neighbors[start:stop].copy(), bond_types[start:stop].copy()
 
     def get_all_bonds(self):
         """
@@ -650,41 +636,36 @@ class BondList(Copyable):
         10: [4]
         11: [5]
         """
-        cdef int i=0
-        cdef uint32 atom_index_i, atom_index_j, bond_type
+        cdef int64 i, j
+        cdef int64 start
+
+        indptr, neighbors, bond_types = self._get_adjacency()
+        cdef int64[:] indptr_v = indptr
+        cdef uint32[:] neighbors_v = neighbors
+        cdef uint8[:] bond_types_v = bond_types
+        cdef int64 max_bonds_per_atom = 0
+        if self._atom_count > 0:
+            max_bonds_per_atom = np.max(np.diff(indptr))
 
-        cdef uint32[:,:] all_bonds_v = self._bonds
         # The size of 2nd dimension is equal to the atom with most bonds
         # Since each atom can have an individual number of bonded atoms,
         # The arrays are padded with '-1'
         cdef np.ndarray bonds = np.full(
-            (self._atom_count, self._max_bonds_per_atom), -1, dtype=np.int32
+            (self._atom_count, max_bonds_per_atom), -1, dtype=np.int32
         )
         cdef int32[:,:] bonds_v = bonds
-        cdef np.ndarray bond_types = np.full(
-            (self._atom_count, self._max_bonds_per_atom), -1, dtype=np.int8
+        cdef np.ndarray padded_bond_types = np.full(
+            (self._atom_count, max_bonds_per_atom), -1, dtype=np.int8
         )
-        cdef int8[:,:] bond_types_v = bond_types
-        # Track the number of already found bonds for each given index
-        cdef np.ndarray lengths = np.zeros(self._atom_count, dtype=np.uint32)
-        cdef uint32[:] lengths_v = lengths
+        cdef int8[:,:] padded_bond_types_v = padded_bond_types
 
-        for i in range(all_bonds_v.shape[0]):
-            atom_index_i = all_bonds_v[i,0]
-            atom_index_j = all_bonds_v[i,1]
-            bond_type = all_bonds_v[i,2]
-            # Add second bonded atom for the first bonded atom
-            # and vice versa
-            # Use 'lengths' variable to append the value
-            bonds_v[atom_index_i, lengths_v[atom_index_i]] = atom_index_j
-            bonds_v[atom_index_j, lengths_v[atom_index_j]] = atom_index_i
-            bond_types_v[atom_index_i, lengths_v[atom_index_i]] = bond_type
-            bond_types_v[atom_index_j, lengths_v[atom_index_j]] = bond_type
-            # Increment lengths
-            lengths_v[atom_index_i] += 1
-            lengths_v[atom_index_j] += 1
-
-        return bonds, bond_types
+        for i in range(self._atom_count):
+            start = indptr_v[i]
+            for j in range(start, indptr_v[i+1]):
+                bonds_v[i, j - start] = neighbors_v[j]
+                padded_bond_types_v[i, j - start] = bond_types_v[j]
+
+        return bonds, padded_bond_types
 
 
     def adjacency_matrix(self):
@@ -830,7 +811,7 @@ class BondList(Copyable):
                 ),
                 axis=0
             )
-            self._max_bonds_per_atom = self._get_max_bonds_per_atom()
+        self._adjacency = None
 
     def remove_bond(self, int32 atom_index1, int32 atom_index2):
         """
@@ -857,11 +838,7 @@ class BondList(Copyable):
             # the reverse check is omitted
             if (all_bonds_v[i,0] == index1 and all_bonds_v[i,1] == index2):
                 self._bonds = np.delete(self._bonds, i, axis=0)
-        # The maximum bonds per atom is not recalculated,
-        # as the value can only be decreased on bond removal
-        # Since this value is only used for pessimistic array allocation
-        # in 'get_bonds()', the slightly larger memory usage is a better
-        # option than the repetitive call of _get_max_bonds_per_atom()
+        self._adjacency = None
 
     def remove_bonds_to(self, int32 atom_index):
         """
@@ -889,8 +866,7 @@ class BondList(Copyable):
                 mask_v[i] = False
         # Remove the bonds
         self._bonds = self._bonds[mask.astype(bool, copy=False)]
-        # The maximum bonds per atom is not recalculated
-        # (see 'remove_bond()')
+        self._adjacency = None
 
     def remove_bonds(self, bond_list):
         """
@@ -924,8 +900,7 @@ class BondList(Copyable):
 
         # Remove the bonds
         self._bonds = self._bonds[mask.astype(bool, copy=False)]
-        # The maximum bonds per atom is not recalculated
-        # (see 'remove_bond()')
+        self._adjacency = None
 
     def merge(self, bond_list):
         """
@@ -1002,11 +977,8 @@ class BondList(Copyable):
         cdef uint32 merged_count = self._atom_count + bond_list._atom_count
         cdef merged_bond_list = BondList(merged_count)
         # Array is not used in constructor to prevent unnecessary
-        # maximum and redundant bond calculation
+        # redundant bond calculation
         merged_bond_list._bonds = merged_bonds
-        merged_bond_list._max_bonds_per_atom = max(
-            self._max_bonds_per_atom, merged_bond_list._max_bonds_per_atom
-        )
         return merged_bond_list
 
     def __getitem__(self, index):
@@ -1035,10 +1007,27 @@ class BondList(Copyable):
             ## Handle single index
             return self.get_bonds(index)
 
+        elif isinstance(index, slice) and index.step in (None, 1):
+            ## Handle contiguous range of atoms
+            # No index map is required, as all remaining atom indices
+            # are simply decreased by the start of the range
+            start, stop, _ = index.indices(self._atom_count)
+            stop = max(start, stop)
+            copy = BondList(stop - start)
+            # Since the indices are sorted per bond,
+            # only the first index needs to be checked against the
+            # start and only the second index against the stop
+            copy._bonds = self._bonds[
+                (self._bonds[:,0] >= start) & (self._bonds[:,1] < stop)
+            ]
+            copy._bonds[:,:2] -= start
+            return copy
+
         elif isinstance(index, np.ndarray) \
             and np.issubdtype(index.dtype, np.integer):
                 ## Handle index array
-                copy = self.copy()
+                copy = BondList(self._atom_count)
+                copy._bonds = self._bonds.copy()
                 all_bonds_v = copy._bonds
 
                 index = _to_positive_index_array(index, self._atom_count)
@@ -1074,12 +1063,12 @@ class BondList(Copyable):
                 # for unsorted index arrays
                 copy._bonds[:,:2] = np.sort(copy._bonds[:,:2], axis=1)
                 copy._atom_count = len(index)
-                copy._max_bonds_per_atom = copy._get_max_bonds_per_atom()
                 return copy
 
         else:
             ## Handle all other arrays as boolean mask
-            copy = self.copy()
+            copy = BondList(self._atom_count)
+            copy._bonds = self._bonds.copy()
             all_bonds_v = copy._bonds
 
             mask = _to_bool_mask(index, length=copy._atom_count)
@@ -1115,7 +1104,6 @@ class BondList(Copyable):
             # Apply the bond removal filter
             copy._bonds = copy._bonds[removal_filter.astype(bool, copy=False)]
             copy._atom_count = len(np.nonzero(mask)[0])
-            copy._max_bonds_per_atom = copy._get_max_bonds_per_atom()
             return copy
 
     def __iter__(self):
@@ -1134,38 +1122,41 @@ class BondList(Copyable):
         if not isinstance(item, tuple) and len(tuple) != 2:
             raise TypeError("Expected a tuple of atom indices")
 
-        cdef int i=0
-
-        cdef uint32 match_index1, match_index2
-        # Sort indices for faster search in loop
         cdef uint32 atom_index1 = min(item)
         cdef uint32 atom_index2 = max(item)
+        if atom_index2 >= self._atom_count:
+            return False
 
-        cdef uint32[:,:] all_bonds_v = self._bonds
-        for i in range(all_bonds_v.shape[0]):
-            match_index1 = all_bonds_v[i,0]
-            match_index2 = all_bonds_v[i,1]
-            if atom_index1 == match_index1 and atom_index2 == match_index2:
-                return True
+        indptr, neighbors, _ = self._get_adjacency()
+        return atom_index2 in neighbors[
+            indptr[atom_index1] : indptr[atom_index1 + 1]
+        ]
 
-        return False
 
+    def _get_adjacency(self):
+        """
+        Get the bonded atoms for each atom in *compressed sparse row*
+        (CSR) format.
 
-    def _get_max_bonds_per_atom(self):
-        if self._atom_count == 0:
-            return 0
+        The adjacency is created on the first call and reused until the
+        bonds are modified.
+        The returned arrays must not be modified.
 
-        cdef int i
-        cdef uint32[:,:] all_bonds_v = self._bonds
-        # Create an array that counts number of occurences of each index
-        cdef np.ndarray index_count = np.zeros(self._atom_count,
-                                               dtype=np.uint32)
-        cdef uint32[:] index_count_v = index_count
-        for i in range(all_bonds_v.shape[0]):
-            # Increment count of both indices found in bond list at i
-            index_count_v[all_bonds_v[i,0]] += 1
-            index_count_v[all_bonds_v[i,1]] += 1
-        return np.max(index_count_v)
+        Returns
+        -------
+        indptr : ndarray, shape=(n+1,), dtype=np.int64
+            The bonded atoms of atom *i* are located at
+            ``indptr[i] : indptr[i+1]`` in `neighbors`.
+        neighbors : ndarray, shape=(2*m,), dtype=np.uint32
+            The indices of bonded atoms.
+            For each atom the bonded atoms appear in the order of the
+            bonds in this :class:`BondList`.
+        bond_types : ndarray, shape=(2*m,), dtype=np.uint8
+            The types of the bonds corresponding to `neighbors`.
+        """
+        if self._adjacency is None:
+            self._adjacency = _create_adjacency(self._bonds, self._atom_count)
+        return self._adjacency
 
     def _remove_redundant_bonds(self):
         cdef int j
@@ -1221,6 +1212,46 @@ class BondList(Copyable):
         self._bonds = self._bonds[redundancy_filter.astype(bool, copy=False)]
 
 
+@cython.wraparound(False)
+def _create_adjacency(uint32[:,:] all_bonds_v, uint32 atom_count):
+    """
+    Create the adjacency of the given bonds in *compressed sparse row*
+    (CSR) format (see :meth:`BondList._get_adjacency()`).
+    """
+    cdef int64 i
+    cdef uint32 atom_index_i, atom_index_j
+    cdef uint8 bond_type
+
+    # Count the bonds of each atom
+    cdef np.ndarray indptr = np.zeros(atom_count + 1, dtype=np.int64)
+    cdef int64[:] indptr_v = indptr
+    for i in range(all_bonds_v.shape[0]):
+        indptr_v[all_bonds_v[i,0] + 1] += 1
+        indptr_v[all_bonds_v[i,1] + 1] += 1
+    np.cumsum(indptr, out=indptr)
+
+    cdef np.ndarray neighbors = np.zeros(indptr_v[atom_count], dtype=np.uint32)
+    cdef uint32[:] neighbors_v = neighbors
+    cdef np.ndarray bond_types = np.zeros(indptr_v[atom_count], dtype=np.uint8)
+    cdef uint8[:] bond_types_v = bond_types
+    # The position where the next bonded atom is inserted for each atom
+    cdef int64[:] insert_pos_v = indptr[:atom_count].copy()
+    for i in range(all_bonds_v.shape[0]):
+        atom_index_i = all_bonds_v[i,0]
+        atom_index_j = all_bonds_v[i,1]
+        bond_type = all_bonds_v[i,2]
+        # Add second bonded atom for the first bonded atom
+        # and vice versa
+        neighbors_v[insert_pos_v[atom_index_i]] = atom_index_j
+        bond_types_v[insert_pos_v[atom_index_i]] = bond_type
+        insert_pos_v[atom_index_i] += 1
+        neighbors_v[insert_pos_v[atom_index_j]] = atom_index_i
+        bond_types_v[insert_pos_v[atom_index_j]] = bond_type
+        insert_pos_v[atom_index_j] += 1
+
+    return indptr, neighbors, bond_types
+
+
 cdef uint32 _to_positive_index(int32 index, uint32 array_length) except -1:
     """
     Convert a potentially negative index into a positive index.
@@ -1386,6 +1417,10 @@ _DEFAULT_DISTANCE_RANGE = {
     ("SI", "SE") : (2.359 - 2*0.012,  2.359 + 2*0.012),
 }
 
+# Relative enlargement of the search radius for candidate bonds in
+# 'connect_via_distances()'
+_DISTANCE_TOLERANCE = 1e-4
+
 def connect_via_distances(atoms, dict distance_range=None, atom_mask=None,
                           bint inter_residue=True,
                           default_bond_type=BondType.ANY, bint periodic=False):
@@ -1455,22 +1490,11 @@ def connect_via_distances(atoms, dict distance_range=None, atom_mask=None,
     .. footbibliography::
     """
     from .atoms import AtomArray
+    from .celllist import CellList
     from .geometry import distance
     from .residues import get_residue_starts
 
-    cdef list bonds = []
-    cdef int i
-    cdef int curr_start_i, next_start_i
-    cdef np.ndarray coord = atoms.coord
-    cdef np.ndarray coord_in_res
-    cdef np.ndarray distances
-    cdef float dist
-    cdef np.ndarray elements = atoms.element
-    cdef np.ndarray elements_in_res
-    cdef int atom_index1, atom_index2
     cdef dict dist_ranges = {}
-    cdef tuple dist_range
-    cdef float min_dist, max_dist
 
     if not isinstance(atoms, AtomArray):
         raise TypeError(f"Expected 'AtomArray', not '{type(atoms).__name__}'")
@@ -1493,41 +1517,61 @@ def connect_via_distances(atoms, dict distance_range=None, atom_mask=None,
         dist_ranges[(element1.upper(), element2.upper())] = val
         dist_ranges[(element2.upper(), element1.upper())] = val
 
+    # ...and convert it into matrices indexed by the element types
+    # of the atoms in the structure
+    elements, element_types = np.unique(atoms.element, return_inverse=True)
+    # Element combinations without entry have an empty range
+    min_dist = np.full((len(elements), len(elements)), np.inf, np.float32)
+    max_dist = np.full((len(elements), len(elements)), -np.inf, np.float32)
+    for i, element1 in enumerate(elements):
+        for j, element2 in enumerate(elements):
+            dist_range = dist_ranges.get((element1, element2))
+            if dist_range is not None:
+                min_dist[i, j], max_dist[i, j] = dist_range
+
     residue_starts = get_residue_starts(atoms, add_exclusive_stop=True)
-    # Omit exclsive stop in 'residue_starts'
-    for i in range(len(residue_starts)-1):
-        curr_start_i = residue_starts[i]
-        next_start_i = residue_starts[i+1]
-
-        elements_in_res = elements[curr_start_i : next_start_i]
-        coord_in_res = coord[curr_start_i : next_start_i]
-        # Matrix containing all pairwise atom distances in the residue
-        distances = distance(
-            coord_in_res[:, np.newaxis, :],
-            coord_in_res[np.newaxis, :, :],
-            box
+    residue_indices = np.repeat(
+        np.arange(len(residue_starts) - 1), np.diff(residue_starts)
+    )
+
+    # Atoms with NaN coordinates cannot form bonds
+    valid_indices = np.where(~np.isnan(atoms.coord).any(axis=-1))[0]
+    bond_threshold = np.max(max_dist, initial=0)
+    if len(valid_indices) > 0 and bond_threshold > 0:
+        coord = atoms.coord[valid_indices]
+        cell_list = CellList(
+            coord, cell_size=bond_threshold, periodic=periodic, box=box
         )
-        for atom_index1 in range(len(elements_in_res)):
-            for atom_index2 in range(atom_index1):
-                dist_range = dist_ranges.get((
-                    elements_in_res[atom_index1],
-                    elements_in_res[atom_index2]
-                ))
-                if dist_range is None:
-                    # No bond distance entry for this element
-                    # combination -> skip
-                    continue
-                else:
-                    min_dist, max_dist = dist_range
-                dist = distances[atom_index1, atom_index2]
-                if dist >= min_dist and dist <= max_dist:
-                    bonds.append((
-                        curr_start_i + atom_index1,
-                        curr_start_i + atom_index2,
-                        default_bond_type
-                    ))
+        # Find candidate atom pairs within the maximum bond distance
+        # The search radius is slightly enlarged, so that no pair is
+        # missed due to rounding errors
+        pairs, _ = cell_list.get_atom_pairs(
+            coord, bond_threshold * (1 + _DISTANCE_TOLERANCE)
+        )
+        pairs = valid_indices[pairs]
+        # Only pairs within the same residue are bonded
+        # and each pair is only considered once
+        pairs = pairs[
+            (pairs[:, 0] > pairs[:, 1])
+            & (residue_indices[pairs[:, 0]] == residue_indices[pairs[:, 1]])
+        ]
+        distances = distance(
+            atoms.coord[pairs[:, 0]], atoms.coord[pairs[:, 1]], box
+        ).astype(np.float32, copy=False)
+        pair_types = (element_types[pairs[:, 0]], element_types[pairs[:, 1]])
+        pairs = pairs[
+            (distances >= min_dist[pair_types])
+            & (distances <= max_dist[pair_types])
+        ]
+        # Sort the pairs
+        pairs = np.unique(pairs, axis=0)
+    else:
+        pairs = np.zeros((0, 2), dtype=int)
+    bonds = np.zeros((len(pairs), 3), dtype=int)
+    bonds[:, :2] = pairs
+    bonds[:, 2] = default_bond_type
 
-    bond_list = BondList(atoms.array_length(), np.array(bonds))
+    bond_list = BondList(atoms.array_length(), bonds)
 
     if inter_residue:
         inter_bonds = _connect_inter_residue(atoms, residue_starts)
@@ -1589,6 +1633,10 @@ def connect_via_residue_names(atoms, atom_mask=None, bint inter_residue=True,
     Although this includes most molecules one encounters, this will fail
     for exotic molecules, e.g. specialized inhibitors.
 
+    The bonds are determined only once for all residues with the same
+    name and the same atom names in the same order and are then applied
+    to all of these residues at once.
+
     .. currentmodule:: biotite.structure.info
 
     To supplement `custom_bond_dict` with bonds for residues from the
@@ -1625,48 +1673,78 @@ def connect_via_residue_names(atoms, atom_mask=None, bint inter_residue=True,
     from .info.bonds import bonds_in_residue
     from .residues import get_residue_starts
 
-    cdef list bonds = []
-    cdef int res_i
-    cdef int i, j
-    cdef int curr_start_i, next_start_i
-    cdef np.ndarray atom_names = atoms.atom_name
-    cdef np.ndarray atom_names_in_res
-    cdef np.ndarray res_names = atoms.res_name
-    cdef str atom_name1, atom_name2
-    cdef int64[:] atom_indices1, atom_indices2
+    cdef int64 res_i
+    cdef int64 curr_start_i, next_start_i
+    cdef np.ndarray atom_names = np.asarray(atoms.atom_name)
+    cdef np.ndarray res_names = np.asarray(atoms.res_name)
     cdef dict bond_dict_for_res
+    # Maps a residue name and the atom names in the residue
+    # to the index of the corresponding template
+    cdef dict template_indices = {}
+    cdef list templates = []
 
     residue_starts = get_residue_starts(atoms, add_exclusive_stop=True)
-    # Omit exclsive stop in 'residue_starts'
-    for res_i in range(len(residue_starts)-1):
-        curr_start_i = residue_starts[res_i]
-        next_start_i = residue_starts[res_i+1]
-
-        if custom_bond_dict is None:
-            bond_dict_for_res = bonds_in_residue(res_names[curr_start_i])
-        else:
-            bond_dict_for_res = custom_bond_dict.get(
-                res_names[curr_start_i], {}
+    cdef int64[:] residue_starts_v = residue_starts.astype(
+        np.int64, copy=False
+    )
+    cdef int64 residue_count = len(residue_starts) - 1
+    # The index of the bond template for each residue
+    cdef np.ndarray residue_templates = np.zeros(residue_count, dtype=np.int64)
+    cdef int64[:] residue_templates_v = residue_templates
+
+    # Residues with the same name and the same atom names in the same
+    # order have the same bonds relative to the start of the residue
+    # -> Find the bonds only once for each such combination
+    for res_i in range(residue_count):
+        curr_start_i = residue_starts_v[res_i]
+        next_start_i = residue_starts_v[res_i+1]
+        res_name = res_names[curr_start_i]
+        atom_names_in_res = atom_names[curr_start_i : next_start_i]
+        key = (res_name, atom_names_in_res.tobytes())
+        template_i = template_indices.get(key)
+        if template_i is None:
+            if custom_bond_dict is None:
+                bond_dict_for_res = bonds_in_residue(res_name)
+            else:
+                bond_dict_for_res = custom_bond_dict.get(res_name, {})
+            template_i = len(templates)
+            template_indices[key] = template_i
+            templates.append(
+                _create_bond_template(atom_names_in_res, bond_dict_for_res)
             )
+        residue_templates_v[res_i] = template_i
 
-        atom_names_in_res = atom_names[curr_start_i : next_start_i]
-        for (atom_name1, atom_name2), bond_type in bond_dict_for_res.items():
-            atom_indices1 = np.where(atom_names_in_res == atom_name1)[0] \
-                            .astype(np.int64, copy=False)
-            atom_indices2 = np.where(atom_names_in_res == atom_name2)[0] \
-                            .astype(np.int64, copy=False)
-            # In rare cases the same atom name may appear multiple times
-            # (e.g. in altlocs)
-            # -> create all possible bond combinations
-            for i in range(atom_indices1.shape[0]):
-                for j in range(atom_indices2.shape[0]):
-                    bonds.append((
-                        curr_start_i + atom_indices1[i],
-                        curr_start_i + atom_indices2[j],
-                        bond_type
-                    ))
-
-    bond_list = BondList(atoms.array_length(), np.array(bonds))
+    # Concatenate the templates and determine for each residue the
+    # position of its bonds in the concatenated templates
+    template_bond_counts = np.array(
+        [len(template) for template in templates], dtype=np.int64
+    )
+    template_starts = np.concatenate(
+        ([0], np.cumsum(template_bond_counts))
+    )
+    all_template_bonds = np.concatenate(
+        templates + [np.zeros((0, 3), dtype=np.int64)]
+    )
+    residue_bond_counts = template_bond_counts[residue_templates]
+    bond_residue_indices = np.repeat(
+        np.arange(residue_count), residue_bond_counts
+    )
+    # The position of each bond within the template of its residue
+    positions_in_template = (
+        np.arange(len(bond_residue_indices))
+        - (np.cumsum(residue_bond_counts) - residue_bond_counts)
+        [bond_residue_indices]
+    )
+    # Apply the templates to all residues at once:
+    # The local atom indices of the template are offset by the start
+    # of the respective residue
+    bonds = all_template_bonds[
+        template_starts[residue_templates][bond_residue_indices]
+        + positions_in_template
+    ]
+    bonds[:, :2] += residue_starts[bond_residue_indices, np.newaxis]
+
+    bond_list = BondList(atoms.array_length(), bonds)
 
     if inter_residue:
         inter_bonds = _connect_inter_residue(atoms, residue_starts)
@@ -1675,6 +1753,44 @@ def connect_via_residue_names(atoms, atom_mask=None, bint inter_residue=True,
         return bond_list
 
 
+def _create_bond_template(np.ndarray atom_names, dict bond_dict):
+    """
+    Create the bonds for a single residue.
+
+    Parameters
+    ----------
+    atom_names : ndarray, dtype=str
+        The atom names of the residue.
+    bond_dict : dict ((str, str) -> int)
+        The bonds of the residue based on atom names.
+
+    Returns
+    -------
+    bonds : ndarray, shape=(n,3), dtype=np.int64
+        The bonds, where the atom indices are relative to the start of
+        the residue.
+    """
+    cdef list bonds = []
+    cdef int i, j
+    cdef str atom_name1, atom_name2
+    cdef int64[:] atom_indices1, atom_indices2
+
+    for (atom_name1, atom_name2), bond_type in bond_dict.items():
+        atom_indices1 = np.where(atom_names == atom_name1)[0] \
+                        .astype(np.int64, copy=False)
+        atom_indices2 = np.where(atom_names == atom_name2)[0] \
+                        .astype(np.int64, copy=False)
+        # In rare cases the same atom name may appear multiple times
+        # (e.g. in altlocs)
+        # -> create all possible bond combinations
+        for i in range(atom_indices1.shape[0]):
+            for j in range(atom_indices2.shape[0]):
+                bonds.append(
+                    (atom_indices1[i], atom_indices2[j], int(bond_type))
+                )
+    return np.array(bonds, dtype=np.int64).reshape(-1, 3)
+
+
 
 _PEPTIDE_LINKS = ["PEPTIDE LINKING", "L-PEPTIDE LINKING", "D-PEPTIDE LINKING"]
 _NUCLEIC_LINKS = ["RNA LINKING", "DNA LINKING"]
@@ -1699,71 +1815,100 @@ def _connect_inter_residue(atoms, residue_starts):
     """
     from .info.misc import link_type
 
-    cdef list bonds = []
-    cdef int i
-    cdef np.ndarray atom_names = atoms.atom_name
-    cdef np.ndarray res_names = atoms.res_name
-    cdef np.ndarray res_ids = atoms.res_id
-    cdef np.ndarray chain_ids = atoms.chain_id
-    cdef int curr_start_i, next_start_i, after_next_start_i
-    cdef str curr_connect_atom_name, next_connect_atom_name
-    cdef np.ndarray curr_connect_indices, next_connect_indices
-
-    # Iterate over all starts excluding:
-    #   - the last residue and
-    #   - exclusive end index of 'atoms'
-    for i in range(len(residue_starts)-2):
-        curr_start_i = residue_starts[i]
-        next_start_i = residue_starts[i+1]
-        after_next_start_i = residue_starts[i+2]
-
-        # Check if the current and next residue is in the same chain
-        if chain_ids[next_start_i] != chain_ids[curr_start_i]:
-            continue
-        # Check if the current and next residue
-        # have consecutive residue IDs
-        if res_ids[next_start_i] != res_ids[curr_start_i] + 1:
-            continue
-
-        # Get link type for this residue from RCSB components.cif
-        curr_link = link_type(res_names[curr_start_i])
-        next_link = link_type(res_names[next_start_i])
-
-        if curr_link in _PEPTIDE_LINKS and next_link in _PEPTIDE_LINKS:
-            curr_connect_atom_name = "C"
-            next_connect_atom_name = "N"
-        elif curr_link in _NUCLEIC_LINKS and next_link in _NUCLEIC_LINKS:
-            curr_connect_atom_name = "O3'"
-            next_connect_atom_name = "P"
-        else:
-            # Create no bond if the connection types of consecutive
-            # residues are not compatible
-            continue
-
-        # Index in atom array for atom name in current residue
-        # Addition of 'curr_start_i' is necessary, as only a slice of
-        # 'atom_names' is taken, beginning at 'curr_start_i'
-        curr_connect_indices = curr_start_i + np.where(
-            atom_names[curr_start_i : next_start_i]
-            == curr_connect_atom_name
-        )[0]
-        # Index in atom array for atom name in next residue
-        next_connect_indices = next_start_i + np.where(
-            atom_names[next_start_i : after_next_start_i]
-            == next_connect_atom_name
-        )[0]
-        if len(curr_connect_indices) == 0 or len(next_connect_indices) == 0:
-            # The connector atoms are not found in the adjacent residues
-            # -> skip this bond
-            continue
-
-        bonds.append((
-            curr_connect_indices[0],
-            next_connect_indices[0],
-            BondType.SINGLE
-        ))
-
-    return BondList(atoms.array_length(), np.array(bonds, dtype=np.uint32))
+    cdef np.ndarray atom_names = np.asarray(atoms.atom_name)
+    cdef np.ndarray res_names = np.asarray(atoms.res_name)
+    cdef np.ndarray res_ids = np.asarray(atoms.res_id)
+    cdef np.ndarray chain_ids = np.asarray(atoms.chain_id)
+
+    starts = residue_starts[:-1]
+    if len(starts) < 2:
+        return BondList(atoms.array_length())
+    curr_starts = starts[:-1]
+    next_starts = starts[1:]
+
+    # The current and next residue must be in the same chain
+    # and must have consecutive residue IDs
+    is_consecutive = (
+        (chain_ids[next_starts] == chain_ids[curr_starts])
+        & (res_ids[next_starts] == res_ids[curr_starts] + 1)
+    )
+
+    # Get link type for each residue from RCSB components.cif
+    unique_res_names, res_name_indices = np.unique(
+        res_names[starts], return_inverse=True
+    )
+    unique_links = [link_type(res_name) for res_name in unique_res_names]
+    is_peptide = np.array(
+        [link in _PEPTIDE_LINKS for link in unique_links], dtype=bool
+    )[res_name_indices]
+    is_nucleotide = np.array(
+        [link in _NUCLEIC_LINKS for link in unique_links], dtype=bool
+    )[res_name_indices]
+    # Create no bond if the connection types of consecutive
+    # residues are not compatible
+    is_peptide_link = is_consecutive & is_peptide[:-1] & is_peptide[1:]
+    is_nucleotide_link = (
+        is_consecutive & is_nucleotide[:-1] & is_nucleotide[1:]
+    )
+
+    curr_connect_indices = np.where(
+        is_peptide_link,
+        _find_first_atom(atom_names, residue_starts, "C")[:-1],
+        _find_first_atom(atom_names, residue_starts, "O3'")[:-1]
+    )
+    next_connect_indices = np.where(
+        is_peptide_link,
+        _find_first_atom(atom_names, residue_starts, "N")[1:],
+        _find_first_atom(atom_names, residue_starts, "P")[1:]
+    )
+    # Skip bonds, where the connector atoms are not found in the
+    # adjacent residues
+    is_bonded = (
+        (is_peptide_link | is_nucleotide_link)
+        & (curr_connect_indices != -1)
+        & (next_connect_indices != -1)
+    )
+
+    bonds = np.zeros((np.count_nonzero(is_bonded), 3), dtype=np.uint32)
+    bonds[:, 0] = curr_connect_indices[is_bonded]
+    bonds[:, 1] = next_connect_indices[is_bonded]
+    bonds[:, 2] = BondType.SINGLE
+    return BondList(atoms.array_length(), bonds)
+
+
+def _find_first_atom(atom_names, residue_starts, atom_name):
+    """
+    Find the index of the first atom with the given name in each
+    residue.
+
+    Parameters
+    ----------
+    atom_names : ndarray, dtype=str
+        The atom names of the structure.
+    residue_starts : ndarray, dtype=int
+        Return value of
+        ``get_residue_starts(atoms, add_exclusive_stop=True)``.
+    atom_name : str
+        The atom name to look for.
+
+    Returns
+    -------
+    indices : ndarray, dtype=int
+        The index of the first matching atom for each residue.
+        ``-1``, if the residue has no atom with the given name.
+    """
+    indices = np.full(len(residue_starts) - 1, -1, dtype=np.int64)
+    atom_indices = np.where(atom_names == atom_name)[0]
+    residue_indices = np.searchsorted(
+        residue_starts, atom_indices, side="right"
+    ) - 1
+    # As the atom indices are sorted, the first occurence of a residue
+    # belongs to the first matching atom in that residue
+    residue_indices, first_occurences = np.unique(
+        residue_indices, return_index=True
+    )
+    indices[residue_indices] = atom_indices[first_occurences]
+    return indices
 
 
 
@@ -1818,46 +1963,108 @@ def find_connected(bond_list, uint32 root, bint as_mask=False):
     >>> print(find_connected(bonds, 3))
     [3]
     """
-    all_bonds, _ = bond_list.get_all_bonds()
-
     if root >= bond_list.get_atom_count():
         raise ValueError(
             f"Root atom index {root} is out of bounds for bond list "
             f"representing {bond_list.get_atom_count()} atoms"
         )
 
-    cdef uint8[:] is_connected_mask = np.zeros(
+    indptr, neighbors, _ = bond_list._get_adjacency()
+    cdef int64[:] indptr_v = indptr
+    cdef uint32[:] neighbors_v = neighbors
+
+    cdef np.ndarray is_connected_mask = np.zeros(
         bond_list.get_atom_count(), dtype=np.uint8
     )
-    # Find connections in a recursive way,
-    # by visiting all atoms that are reachable by a bond
-    _find_connected(bond_list, root, is_connected_mask, all_bonds)
+    cdef uint8[:] is_connected_mask_v = is_connected_mask
+    # Find connections by visiting all atoms that are reachable by a
+    # bond via depth-first search
+    # Each atom is put at most once on the stack of atoms to be visited
+    cdef uint32[:] stack_v = np.zeros(
+        bond_list.get_atom_count(), dtype=np.uint32
+    )
+    cdef int64 stack_size = 1
+    cdef int64 j
+    cdef uint32 index, connected_index
+    stack_v[0] = root
+    is_connected_mask_v[root] = True
+    while stack_size > 0:
+        stack_size -= 1
+        index = stack_v[stack_size]
+        for j in range(indptr_v[index], indptr_v[index + 1]):
+            connected_index = neighbors_v[j]
+            if not is_connected_mask_v[connected_index]:
+                is_connected_mask_v[connected_index] = True
+                stack_v[stack_size] = connected_index
+                stack_size += 1
+
     if as_mask:
-        return is_connected_mask
+        return is_connected_mask.astype(bool)
     else:
-        return np.where(np.asarray(is_connected_mask))[0]
-
-
-cdef _find_connected(bond_list,
-                     int32 index,
-                     uint8[:] is_connected_mask,
-                     int32[:,:] all_bonds):
-    if is_connected_mask[index]:
-        # This atom has already been visited
-        # -> exit condition
-        return
-    is_connected_mask[index] = True
-
-    cdef int32 j
-    cdef int32 connected_index
-    for j in range(all_bonds.shape[1]):
-        connected_index = all_bonds[index, j]
-        if connected_index == -1:
-            # Ignore padding values
-            continue
-        _find_connected(
-            bond_list, connected_index, is_connected_mask, all_bonds
-        )
+        return np.where(is_connected_mask)[0]
+
+
+@cython.wraparound(False)
+def _find_components(bond_list):
+    """
+    Label the connected components, i.e. molecules, in the given
+    :class:`BondList` via union-find.
+
+    Parameters
+    ----------
+    bond_list : BondList
+        The bonds to find the connected components in.
+
+    Returns
+    -------
+    labels : ndarray, shape=(n,), dtype=np.int64
+        The component label for each atom.
+        The labels are consecutive integers starting at 0, in the order
+        of the first atom of each component.
+    """
+    cdef uint32 atom_count = bond_list.get_atom_count()
+    cdef uint32[:,:] all_bonds_v = bond_list._bonds
+    cdef int64 i
+    cdef uint32 root_i, root_j
+
+    # Each atom points to another atom in the same component,
+    # the root of a component points to itself
+    cdef np.ndarray parents = np.arange(atom_count, dtype=np.uint32)
+    cdef uint32[:] parents_v = parents
+    for i in range(all_bonds_v.shape[0]):
+        root_i = _find_root(parents_v, all_bonds_v[i,0])
+        root_j = _find_root(parents_v, all_bonds_v[i,1])
+        # Join the components of the two bonded atoms,
+        # the root is always the lowest atom index of a component
+        if root_i < root_j:
+            parents_v[root_j] = root_i
+        elif root_j < root_i:
+            parents_v[root_i] = root_j
+
+    cdef np.ndarray labels = np.zeros(atom_count, dtype=np.int64)
+    cdef int64[:] labels_v = labels
+    cdef int64 label_count = 0
+    for i in range(atom_count):
+        root_i = _find_root(parents_v, i)
+        if root_i == i:
+            # First atom of a new component
+            labels_v[i] = label_count
+            label_count += 1
+        else:
+            # The root has a lower index and is already labeled
+            labels_v[i] = labels_v[root_i]
+    return labels
+
+
+cdef inline uint32 _find_root(uint32[:] parents_v, uint32 index):
+    """
+    Find the root of the component the given atom belongs to.
+    The path to the root is shortened on the way (path halving).
+    """
+    while parents_v[index] != index:
+        parents_v[index] = parents_v[parents_v[index]]
+        index = parents_v[index]
+    return index
 
 
 def find_rotatable_bonds(bonds):
@@ -1899,6 +2106,10 @@ def find_rotatable_bonds(bonds):
     CB CG
     CZ OH
     """
+    # Importing NetworkX is expensive
+    # -> import it only when it is actually needed
+    import networkx as nx
+
     cdef uint32 i, j
     cdef uint32 bond_type
     cdef uint32 SINGLE = int(BondType.SINGLE)
@@ -1907,10 +2118,8 @@ def find_rotatable_bonds(bonds):
     bond_graph = bonds.as_graph()
     cycles = nx.algorithms.cycles.cycle_basis(bond_graph)
 
-    cdef int64[:] number_of_partners_v = np.count_nonzero(
-        bonds.get_all_bonds()[0] != -1,
-        axis=1
-    ).astype(np.int64, copy=False)
+    indptr, _, _ = bonds._get_adjacency()
+    cdef int64[:] number_of_partners_v = np.diff(indptr)
 
     rotatable_bonds = []
     cdef uint32[:,:] bonds_v = bonds.as_array()
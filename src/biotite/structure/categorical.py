@@ -0,0 +1,455 @@
+# This source code is part of the Biotite package and is distributed
+# under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
+# information.
+
+"""
+This module provides a compact representation for string annotation
+arrays with only few distinct values.
+"""
+
+__name__ = "biotite.structure"
+__author__ = "Patrick Kunzmann"
+__all__ = ["CategoricalArray"]
+
+from collections.abc import Sequence
+import numpy as np
+
+
+class CategoricalArray:
+    """
+    A one-dimensional array of strings, that is represented by integer
+    codes pointing into a sorted vocabulary of the distinct strings,
+    the *categories*.
+
+    String annotations like ``res_name`` or ``atom_name`` contain only
+    few distinct values, but a fixed-width *NumPy* string array requires
+    4 bytes per character for each atom.
+    A :class:`CategoricalArray` requires only a single byte per atom
+    for up to 256 categories instead.
+    Furthermore, comparisons with a string, comparisons between arrays
+    with the same categories and :func:`numpy.isin()` are performed on
+    the small vocabulary and the integer codes, instead of comparing
+    the strings of each atom.
+
+    A :class:`CategoricalArray` can be used as drop-in replacement for a
+    string annotation array of an :class:`AtomArray` or
+    :class:`AtomArrayStack`, via :meth:`AtomArray.set_annotation()`.
+    Indexing, masking, comparisons and concatenation keep the
+    categorical representation.
+    Other *NumPy* functions work on the decoded string array instead,
+    i.e. the :class:`CategoricalArray` is converted into an
+    :class:`ndarray` via :func:`numpy.asarray()`.
+
+    Parameters
+    ----------
+    values : array-like of str
+        The strings to be encoded.
+    categories : array-like of str, optional
+        The categories, the `values` are encoded with.
+        If omitted, the categories are the distinct `values`.
+        Otherwise, all `values` must be present in the `categories`.
+
+    Attributes
+    ----------
+    categories : ndarray, dtype=str
+        The sorted distinct strings.
+        The string type of this array is the type of the decoded
+        strings.
+    codes : ndarray, dtype=int
+        For each element the index of its string in `categories`.
+    dtype : dtype
+        The string type of the decoded strings.
+    shape : tuple of int
+        The shape of the decoded array.
+
+    Notes
+    -----
+    Like the string type of an annotation array, the string type of
+    the `categories` is fixed:
+    Assigned strings that are longer, are truncated.
+
+    When a string is assigned, that is not yet part of the
+    `categories`, the `categories` are extended and the `codes` are
+    reallocated.
+    In this case the array is not a view into another
+    :class:`CategoricalArray` anymore.
+
+    Examples
+    --------
+
+    >>> res_name = CategoricalArray(atom_array.res_name)
+    >>> print(res_name.categories)
+    ['ARG' 'ASN' 'ASP' 'GLN' 'GLY' 'ILE' 'LEU' 'LYS' 'PRO' 'SER' 'TRP' 'TYR']
+    >>> print(res_name.codes[:10])
+    [1 1 1 1 1 1 1 1 1 1]
+    >>> print(res_name[:10] == "ASN")
+    [ True  True  True  True  True  True  True  True  True  True]
+    >>> atom_array.set_annotation("res_name", res_name)
+    >>> print(np.count_nonzero(filter_amino_acids(atom_array)))
+    304
+    """
+
+    def __init__(self, values, categories=None):
+        values = np.asarray(values)
+        if values.ndim != 1:
+            raise ValueError(
+                f"Expected one-dimensional array, "
+                f"but got {values.ndim} dimensions"
+            )
+        if categories is None:
+            categories, codes = np.unique(values, return_inverse=True)
+        else:
+            categories = np.unique(np.asarray(categories, dtype=values.dtype))
+            codes = _lookup(categories, values)
+            if (codes == -1).any():
+                missing = values[codes == -1][0]
+                raise ValueError(
+                    f"The value '{missing}' is not present in the categories"
+                )
+        self._categories = categories
+        self._codes = codes.astype(_code_dtype(len(categories)))
+
+    @staticmethod
+    def _from_codes(codes, categories):
+        # Bypass the constructor, as the codes are already computed
+        array = CategoricalArray.__new__(CategoricalArray)
+        array._codes = codes
+        array._categories = categories
+        return array
+
+    @property
+    def categories(self):
+        return self._categories
+
+    @property
+    def codes(self):
+        return self._codes
+
+    @property
+    def dtype(self):
+        return self._categories.dtype
+
+    @property
+    def shape(self):
+        return self._codes.shape
+
+    @property
+    def ndim(self):
+        return 1
+
+    @property
+    def size(self):
+        return self._codes.size
+
+    @property
+    def nbytes(self):
+        return self._codes.nbytes + self._categories.nbytes
+
+    @property
+    def flags(self):
+        # The writeability is determined by the codes
+        return self._codes.flags
+
+    def copy(self):
+        """
+        Create a deep copy of this array.
+
+        Returns
+        -------
+        copy : CategoricalArray
+            A copy of this array.
+        """
+        return CategoricalArray._from_codes(
+            self._codes.copy(), self._categories
+        )
+
+    def view(self):
+        """
+        Create a new :class:`CategoricalArray` with codes, that are a
+        view into the codes of this array.
+
+        Returns
+        -------
+        view : CategoricalArray
+            The view on this array.
+        """
+        return CategoricalArray._from_codes(
+            self._codes.view(), self._categories
+        )
+
+    def astype(self, dtype, copy=True):
+        """
+        Decode the array into an :class:`ndarray` of the given type.
+
+        Parameters
+        ----------
+        dtype : dtype
+            The type of the returned array.
+        copy : bool, optional
+            Has no effect, as the decoded array is always a new array.
+            Only present for compatibility with
+            :meth:`ndarray.astype()`.
+
+        Returns
+        -------
+        array : ndarray
+            The decoded array.
+        """
+        return np.asarray(self).astype(dtype, copy=False)
+
+    def tolist(self):
+        """
+        Decode the array into a list of strings.
+
+        Returns
+        -------
+        values : list of str
+            The decoded strings.
+        """
+        return self._categories[self._codes].tolist()
+
+    def __array__(self, dtype=None, copy=None):
+        array = self._categories[self._codes]
+        if dtype is not None:
+            array = array.astype(dtype, copy=False)
+        return array
+
+    def __array_function__(self, func, types, args, kwargs):
+        handler = _HANDLED_FUNCTIONS.get(func)
+        if handler is not None:
+            result = handler(*args, **kwargs)
+            if result is not NotImplemented:
+                return result
+        elif func in _CODE_WISE_FUNCTIONS:
+            array, *args = args
+            if isinstance(array, CategoricalArray) \
+               and not _contains_categorical(args) \
+               and not _contains_categorical(kwargs):
+                codes = func(array._codes, *args, **kwargs)
+                if codes.ndim == 1:
+                    return CategoricalArray._from_codes(
+                        codes, array._categories
+                    )
+                else:
+                    return array._categories[codes]
+            args = [array] + args
+        # Fall back to the decoded strings
+        return func(*_decode(args), **_decode(kwargs))
+
+    def __len__(self):
+        return len(self._codes)
+
+    def __iter__(self):
+        categories = self._categories
+        for code in self._codes:
+            yield categories[code]
+
+    def __contains__(self, value):
+        code = _lookup(self._categories, value)
+        return code != -1 and bool((self._codes == code).any())
+
+    def __getitem__(self, index):
+        codes = self._codes[index]
+        if isinstance(codes, np.ndarray):
+            return CategoricalArray._from_codes(codes, self._categories)
+        else:
+            return self._categories[codes]
+
+    def __setitem__(self, index, value):
+        if isinstance(value, CategoricalArray):
+            value = np.asarray(value)
+        value = np.asarray(value, dtype=self._categories.dtype)
+        new_categories = np.setdiff1d(value, self._categories)
+        if len(new_categories) > 0:
+            if not self._codes.flags.writeable:
+                raise ValueError("assignment destination is read-only")
+            categories = np.union1d(self._categories, new_categories)
+            # Map the old codes to the codes in the extended categories
+            code_map = np.searchsorted(categories, self._categories)
+            self._codes = code_map[self._codes].astype(
+                _code_dtype(len(categories)), copy=False
+            )
+            self._categories = categories
+        self._codes[index] = np.searchsorted(self._categories, value)
+
+    def __eq__(self, item):
+        if isinstance(item, str):
+            code = _lookup(self._categories, item)
+            if code == -1:
+                return np.zeros(len(self), dtype=bool)
+            return self._codes == code
+        elif isinstance(item, CategoricalArray):
+            codes, item_codes = _unify_codes(self, item)
+            return codes == item_codes
+        else:
+            return np.asarray(self) == item
+
+    def __ne__(self, item):
+        if isinstance(item, (str, CategoricalArray)):
+            return ~(self == item)
+        else:
+            return np.asarray(self) != item
+
+    def __lt__(self, item):
+        return np.asarray(self) < _decode(item)
+
+    def __le__(self, item):
+        return np.asarray(self) <= _decode(item)
+
+    def __gt__(self, item):
+        return np.asarray(self) > _decode(item)
+
+    def __ge__(self, item):
+        return np.asarray(self) >= _decode(item)
+
+    # Comparisons return arrays
+    __hash__ = None
+
+    def __repr__(self):
+        return f"CategoricalArray({np.asarray(self)!r})"
+
+    def __str__(self):
+        return str(np.asarray(self))
+
+
+# Like a list of strings, the array can be used wherever a sequence of
+# strings is accepted
+Sequence.register(CategoricalArray)
+
+
+def _code_dtype(n_categories):
+    """
+    Get the smallest unsigned integer type, that can represent the codes
+    for the given number of categories.
+    """
+    return np.min_scalar_type(max(n_categories - 1, 0))
+
+
+def _lookup(categories, values):
+    """
+    Get the codes of the given value(s) in the sorted categories.
+    Values that are not present in the categories get the code -1.
+    """
+    values = np.asarray(values)
+    if len(categories) == 0:
+        return np.full(values.shape, -1, dtype=np.int64)[()]
+    codes = np.searchsorted(categories, values)
+    # The index after the last category is never a match
+    codes = np.minimum(codes, len(categories) - 1)
+    is_present = categories[codes] == values
+    return np.where(is_present, codes, -1)[()]
+
+
+def _unify_codes(*arrays):
+    """
+    Get the codes of the given :class:`CategoricalArray` objects with
+    respect to common categories.
+    """
+    categories = arrays[0]._categories
+    if all(
+        array._categories is categories
+        or np.array_equal(array._categories, categories)
+        for array in arrays
+    ):
+        return tuple(array._codes for array in arrays)
+    categories = _union_categories(arrays)
+    return tuple(
+        np.searchsorted(categories, array._categories)[array._codes]
+        for array in arrays
+    )
+
+
+def _union_categories(arrays):
+    categories = arrays[0]._categories
+    for array in arrays[1:]:
+        categories = np.union1d(categories, array._categories)
+    return categories
+
+
+def _contains_categorical(obj):
+    if isinstance(obj, CategoricalArray):
+        return True
+    elif isinstance(obj, (list, tuple)):
+        return any(_contains_categorical(item) for item in obj)
+    elif isinstance(obj, dict):
+        return any(_contains_categorical(item) for item in obj.values())
+    else:
+        return False
+
+
+def _decode(obj):
+    """
+    Replace all :class:`CategoricalArray` objects in the given object
+    with the decoded :class:`ndarray`.
+    """
+    if isinstance(obj, CategoricalArray):
+        return np.asarray(obj)
+    elif isinstance(obj, list):
+        return [_decode(item) for item in obj]
+    elif isinstance(obj, tuple):
+        return tuple(_decode(item) for item in obj)
+    elif isinstance(obj, dict):
+        return {key: _decode(item) for key, item in obj.items()}
+    else:
+        return obj
+
+
+def _concatenate(arrays, axis=0, **kwargs):
+    arrays = list(arrays)
+    if axis != 0 or len(kwargs) > 0 \
+       or any(np.ndim(array) != 1 for array in arrays):
+        return NotImplemented
+    arrays = [
+        array if isinstance(array, CategoricalArray)
+        else CategoricalArray(array)
+        for array in arrays
+    ]
+    categories = _union_categories(arrays)
+    codes = np.concatenate(_unify_codes(*arrays)) if len(arrays) > 1 \
+            else arrays[0]._codes.copy()
+    return CategoricalArray._from_codes(
+        codes.astype(_code_dtype(len(categories)), copy=False), categories
+    )
+
+
+def _isin(element, test_elements, assume_unique=False, invert=False,
+          **kwargs):
+    if not isinstance(element, CategoricalArray):
+        return NotImplemented
+    # Test only each category instead of each element
+    return np.isin(
+        element._categories, _decode(test_elements), invert=invert, **kwargs
+    )[element._codes]
+
+
+def _unique(ar, return_index=False, return_inverse=False,
+            return_counts=False, axis=None, **kwargs):
+    if return_index or return_inverse or return_counts or axis is not None \
+       or len(kwargs) > 0:
+        return NotImplemented
+    return ar._categories[np.unique(ar._codes)]
+
+
+def _array_equal(a1, a2, equal_nan=False):
+    if not isinstance(a1, CategoricalArray) \
+       or not isinstance(a2, CategoricalArray):
+        return NotImplemented
+    if a1.shape != a2.shape:
+        return False
+    codes1, codes2 = _unify_codes(a1, a2)
+    return bool(np.array_equal(codes1, codes2))
+
+
+_HANDLED_FUNCTIONS = {
+    np.concatenate: _concatenate,
+    np.isin: _isin,
+    np.in1d: _isin,
+    np.unique: _unique,
+    np.array_equal: _array_equal,
+}
+
+# Functions that only rearrange the elements of an array,
+# and hence can be applied to the codes directly
+_CODE_WISE_FUNCTIONS = {
+    np.copy, np.delete, np.tile, np.repeat, np.take, np.flip, np.roll,
+}
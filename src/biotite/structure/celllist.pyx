@@ -13,14 +13,14 @@ __all__ = ["CellList"]
 
 cimport cython
 cimport numpy as np
-from libc.stdlib cimport realloc, malloc, free
 
 import numpy as np
 from .atoms import coord as to_coord
-from .atoms import AtomArrayStack
-from .box import repeat_box_coord, move_inside_box
+from .box import move_inside_box
+from .geometry import displacement
 
-ctypedef np.uint64_t ptr
+ctypedef np.int32_t int32
+ctypedef np.int64_t int64
 ctypedef np.float32_t float32
 ctypedef np.uint8_t uint8
 
@@ -44,10 +44,15 @@ cdef class CellList:
     
     Parameters
     ----------
-    atom_array : AtomArray or ndarray, dtype=float, shape=(n,3)
+    atom_array : AtomArray or AtomArrayStack or ndarray, dtype=float, shape=(n,3) or shape=(m,n,3)
         The :class:`AtomArray` to create the :class:`CellList` for.
         Alternatively the atom coordinates are accepted directly.
         In this case `box` must be set, if `periodic` is true.
+        If an :class:`AtomArrayStack` is given, the cell grid covers
+        the atoms of all models, but the cells are filled with the
+        atoms of the first model.
+        The cell list can be efficiently switched to other models via
+        :meth:`update()`.
     cell_size : float
         The coordinate interval each cell has for x, y and z axis.
         The amount of cells depends on the range of coordinates in the
@@ -55,16 +60,36 @@ cdef class CellList:
     periodic : bool, optional
         If true, the cell list considers periodic copies of atoms.
         The periodicity is based on the `box` attribute of `atom_array`.
+        Distances are measured to the nearest periodic copy of an atom
+        (minimum-image convention).
         (Default: False)
-    box : ndarray, dtype=float, shape=(3,3), optional
+    box : ndarray, dtype=float, shape=(3,3) or shape=(m,3,3), optional
         If provided, the periodicity is based on this parameter instead
         of the :attr:`box` attribute of `atom_array`.
+        If a box is given for multiple models, the box of the first
+        model is used.
         Only has an effect, if `periodic` is ``True``.
     selection : ndarray, dtype=bool, shape=(n,), optional
         If provided, only the atoms masked by this array are stored in
         the cell list. However, the indices stored in the cell list
         will still refer to the original unfiltered `atom_array`.
-            
+
+    Notes
+    -----
+    The atoms are sorted into the cells via counting sort:
+    The atom indices are stored in a single array sorted by cell,
+    so that the atoms of each cell are contiguous in memory.
+    An additional array points to the start of each cell in this array.
+
+    If the cell list is periodic, the cell grid divides the box instead
+    of the coordinate range of the atoms and the indices of adjacent
+    cells wrap around at the box boundaries.
+    Hence, the periodic copies of the atoms are not stored explicitly.
+
+    Since :class:`CellList` supports the *pickle* protocol, it can be
+    sent to other processes and copied via :func:`copy.copy()` and
+    :func:`copy.deepcopy()`.
+
     Examples
     --------
     
@@ -77,150 +102,460 @@ cdef class CellList:
     # A boolean mask that covers the selected atoms
     cdef uint8[:] _selection
     cdef bint _has_selection
-    # The cells to store the coordinates in; an ndarray of pointers
-    cdef ptr[:,:,:] _cells
-    # The amount elements in each C-array in '_cells'
-    cdef int[:,:,:] _cell_length
-    # The maximum value of '_cell_length' over all cells,
+    # The cells are stored in a compressed sparse row (CSR) like format:
+    # The indices of the atoms in the cell with the flat cell index 'c'
+    # are '_cell_atoms[_cell_starts[c] : _cell_stops[c]]'.
+    # The positions between '_cell_stops[c]' and '_cell_starts[c+1]'
+    # are free space for atoms moving into the cell, indicated by -1
+    cdef int32[:] _cell_atoms
+    cdef int64[:] _cell_starts
+    cdef int64[:] _cell_stops
+    # The coordinates of the atoms in '_cell_atoms', i.e. the
+    # coordinates of atoms in the same cell are contiguous in memory
+    cdef float32[:,:] _cell_coord
+    # For each atom the flat index of its cell and its position in
+    # '_cell_atoms', -1 if the atom is not in the cell list
+    cdef int64[:] _atom_cells
+    cdef int64[:] _atom_positions
+    # The amount of cells in each dimension (x,y,z)
+    cdef int _cell_count[3]
+    # The maximum amount of atoms in a cell,
     # required for worst case assumption on size of output arrays
     cdef int _max_cell_length
     # The length of the cell in each direction (x,y,z)
     cdef float _cellsize
     # The minimum and maximum coordinates for all atoms
-    # Used as origin ('_min_coord' is at _cells[0,0,0])
+    # Used as origin ('_min_coord' is at cell (0,0,0))
     # and for bound checks
     cdef float32[:] _min_coord
     cdef float32[:] _max_coord
     # Indicates whether the cell list takes periodicity into account
     cdef bint _periodic
     cdef np.ndarray _box
-    # The length of the array before appending periodic copies
-    # if 'periodic' is true
-    cdef int _orig_length
-    cdef float32[:] _orig_min_coord
-    cdef float32[:] _orig_max_coord
-    
-    
-    @cython.initializedcheck(False)
-    @cython.boundscheck(False)
-    @cython.wraparound(False)
-    def __cinit__(self, atom_array not None, float cell_size,
-                  bint periodic=False, box=None, np.ndarray selection=None):
-        cdef float32 x, y, z
-        cdef int i, j, k
-        cdef int atom_array_i
-        cdef int* cell_ptr = NULL
-        cdef int length
+    # The inverse of the box, to convert coordinates into fractions of
+    # the box vectors, which determine the cell in a periodic cell list
+    cdef float32[:,:] _inv_box
+    # The number of atoms in the cell list
+    cdef int _atom_count
+
+
+    def __init__(self, atom_array not None, float cell_size,
+                 bint periodic=False, box=None, np.ndarray selection=None):
+        if self._has_initialized_cells():
+            raise Exception("Duplicate call of constructor")
 
-        if isinstance(atom_array, AtomArrayStack):
-            raise TypeError("Expected 'AtomArray' but got 'AtomArrayStack'")
         coord = to_coord(atom_array)
-        # the length of the array before appending periodic copies
-        # if 'periodic' is true
-        self._orig_length = coord.shape[0]
+        if coord.ndim == 3:
+            # The cell grid spans the coordinates of all models,
+            # but the cells are filled with the first model
+            all_coord = coord
+            coord = coord[0]
+        elif coord.ndim == 2:
+            all_coord = None
+        else:
+            raise ValueError("Coordinates must have shape (n,3) or (m,n,3)")
+        self._atom_count = coord.shape[0]
         self._box = None
-        if coord.ndim != 2:
-            raise ValueError("Coordinates must have shape (n,3)")
         if coord.shape[0] == 0:
             raise ValueError("Coordinates must not be empty")
         if coord.shape[1] != 3:
             raise ValueError("Coordinates must have form (x,y,z)")
-        if np.isnan(coord).any():
+        if np.isnan(coord if all_coord is None else all_coord).any():
             raise ValueError("Coordinates contain NaN values")
 
         if periodic:
-            if box is not None:
-                self._box = box
-            elif atom_array.box is not None:
-                if atom_array.box.shape != (3,3):
+            if box is None:
+                box = getattr(atom_array, "box", None)
+                if box is None:
                     raise ValueError(
-                        "Box has invalid shape"
+                        "AtomArray must have a box to enable periodicity"
                     )
-                self._box = atom_array.box
-            else:
-                raise ValueError(
-                    "AtomArray must have a box to enable periodicity"
-                )
-            if np.isnan(self._box).any():
-                raise ValueError("Box contains NaN values")
-            coord = move_inside_box(coord, self._box)
-            coord, indices = repeat_box_coord(coord, self._box)
-        
-        if self._has_initialized_cells():
-            raise Exception("Duplicate call of constructor")
-        self._cells = None
+            self._box = _prepare_box(box)
+
         if cell_size <= 0:
             raise ValueError("Cell size must be greater than 0")
         self._periodic = periodic
-        self._coord = coord.astype(np.float32, copy=False)
         self._cellsize = cell_size
-        # calculate how many cells are required for each dimension
-        min_coord = np.min(coord, axis=0).astype(np.float32)
-        max_coord = np.max(coord, axis=0).astype(np.float32)
-        self._min_coord = min_coord
-        self._max_coord = max_coord
-        cell_count = (((max_coord - min_coord) / cell_size) +1).astype(int)
-        if self._periodic:
-            self._orig_min_coord = np.min(coord[:self._orig_length], axis=0) \
-                                   .astype(np.float32)
-            self._orig_max_coord = np.max(coord[:self._orig_length], axis=0) \
-                                   .astype(np.float32)
-        
-        # ndarray of pointers to C-arrays
-        # containing indices to atom array
-        self._cells = np.zeros(cell_count, dtype=np.uint64)
-        # Stores the length of the C-arrays
-        self._cell_length = np.zeros(cell_count, dtype=np.int32)
-        
+
         # Prepare selection
         if selection is not None:
             self._has_selection = True
             self._selection = np.frombuffer(selection, dtype=np.uint8)
-            if self._selection.shape[0] != self._orig_length:
+            if self._selection.shape[0] != self._atom_count:
                 raise IndexError(
-                    f"Atom array has length {self._orig_length}, "
+                    f"Atom array has length {self._atom_count}, "
                     f"but selection has length {self._selection.shape[0]}"
                 )
         else:
             self._has_selection = False
-        
-        # Fill cells
-        for atom_array_i in range(self._coord.shape[0]):
+
+        self._coord = self._prepare_coord(coord)
+        if all_coord is not None and not periodic:
+            self._create_grid(all_coord.reshape(-1, 3))
+        else:
+            self._create_grid(np.asarray(self._coord))
+        self._fill_cells(0)
+
+
+    def update(self, atom_array not None, box=None):
+        """
+        update(atom_array, box=None)
+
+        Update the cell list with new coordinates of the same atoms,
+        e.g. the next model of a trajectory.
+
+        Only the atoms that moved into another cell are relocated.
+        Hence, the effort for updating the cell list mostly depends on
+        the movement of the atoms, rather than on the number of atoms.
+        The cell list is only rebuilt from scratch, if the atoms moved
+        outside the cell grid, a cell has no free space left or the box
+        changed.
+
+        Parameters
+        ----------
+        atom_array : AtomArray or ndarray, dtype=float, shape=(n,3)
+            The new coordinates for the atoms in the cell list.
+            The atom count must be the same as for the atoms the
+            :class:`CellList` was created with.
+        box : ndarray, dtype=float, shape=(3,3), optional
+            The new box for a periodic :class:`CellList`.
+            By default, the :attr:`box` attribute of `atom_array` is
+            used, or the current box is retained, if the coordinates are
+            given directly.
+            Only has an effect, if the :class:`CellList` is periodic.
+
+        Examples
+        --------
+        Create a cell list based on the coordinates of all models, so
+        that the atoms of each model are within the cell grid, and
+        update it for each model:
+
+        >>> cell_list = CellList(atom_array_stack, cell_size=5)
+        >>> for model in atom_array_stack:
+        ...     cell_list.update(model)
+        ...     near_atoms = cell_list.get_atoms(model.coord[0], radius=5)
+        """
+        coord = to_coord(atom_array)
+        if coord.ndim != 2 or coord.shape[0] != self._atom_count \
+           or coord.shape[1] != 3:
+            raise IndexError(
+                f"Expected coordinates with shape "
+                f"({self._atom_count}, 3), but got {coord.shape}"
+            )
+        if np.isnan(coord).any():
+            raise ValueError("Coordinates contain NaN values")
+
+        cdef bint box_changed = False
+        if self._periodic:
+            if box is None:
+                box = getattr(atom_array, "box", None)
+            if box is not None:
+                box = _prepare_box(box)
+                box_changed = not np.array_equal(box, self._box)
+                self._box = box
+
+        self._coord = self._prepare_coord(coord)
+        if box_changed:
+            # The cell grid divides the box
+            self._create_grid(np.asarray(self._coord))
+            self._fill_cells(_FREE_SPACE)
+            return
+        cdef int status = self._relocate_atoms()
+        if status == _OUTSIDE_GRID:
+            self._create_grid(np.asarray(self._coord))
+            self._fill_cells(_FREE_SPACE)
+        elif status == _CELL_FULL:
+            self._fill_cells(_FREE_SPACE)
+
+
+    cdef np.ndarray _prepare_coord(self, np.ndarray coord):
+        """
+        Create the coordinates that are actually stored in the cell
+        list, i.e. the coordinates are moved into the box if the cell
+        list is periodic.
+        """
+        if self._periodic:
+            coord = move_inside_box(coord, self._box)
+        return coord.astype(np.float32, copy=False)
+
+
+    cdef _create_grid(self, np.ndarray coord):
+        """
+        Set the origin and the amount of cells, so that the grid covers
+        the given coordinates, or the box if the cell list is periodic.
+        """
+        if self._periodic:
+            # The cells divide each box vector into equal parts,
+            # whose width perpendicular to the other two box vectors
+            # is at least the cell size
+            box = self._box
+            volume = abs(np.linalg.det(box))
+            for dim in range(3):
+                width = volume / np.linalg.norm(
+                    np.cross(box[(dim + 1) % 3], box[(dim + 2) % 3])
+                )
+                self._cell_count[dim] = max(int(width / self._cellsize), 1)
+            self._inv_box = np.linalg.inv(box).astype(np.float32)
+            self._min_coord = np.zeros(3, dtype=np.float32)
+            self._max_coord = np.zeros(3, dtype=np.float32)
+            return
+
+        # calculate how many cells are required for each dimension
+        min_coord = np.min(coord, axis=0).astype(np.float32)
+        max_coord = np.max(coord, axis=0).astype(np.float32)
+        self._min_coord = min_coord
+        self._max_coord = max_coord
+        cell_count = (((max_coord - min_coord) / self._cellsize) +1) \
+                     .astype(int)
+        for dim in range(3):
+            self._cell_count[dim] = cell_count[dim]
+
+
+    @cython.initializedcheck(False)
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.cdivision(True)
+    cdef _fill_cells(self, float free_space):
+        """
+        Sort the atoms into the cells via counting sort.
+
+        In the first pass the number of atoms in each cell is counted,
+        which gives the start of each cell in the sorted atom array.
+        In the second pass the atoms are placed at these positions.
+        Within each cell the original order of the atoms is retained.
+
+        Each cell reserves additional space for the given fraction of
+        its atoms (at least one), to accommodate atoms moving into the
+        cell in :meth:`update()`.
+        """
+        cdef int64 atom_i, cell_i, pos
+        cdef int i, j, k
+        cdef int dim
+
+        cdef float32[:,:] coord = self._coord
+        cdef int64 n_atoms = coord.shape[0]
+        cdef bint has_selection = self._has_selection
+        cdef uint8[:] selection = self._selection if has_selection else None
+        cdef int64 n_cells = (
+            <int64> self._cell_count[0]
+            * <int64> self._cell_count[1]
+            * <int64> self._cell_count[2]
+        )
+
+        # The flat cell index of each atom, -1 for unselected atoms
+        atom_cells = np.full(n_atoms, -1, dtype=np.int64)
+        cdef int64[:] atom_cells_v = atom_cells
+        # The start of each cell in the sorted atoms, the final element
+        # is the exclusive stop of the last cell
+        cell_starts = np.zeros(n_cells + 1, dtype=np.int64)
+        cdef int64[:] cell_starts_v = cell_starts
+
+        # First pass: Count the atoms in each cell
+        for atom_i in range(n_atoms):
             # Only put selected atoms into cell list
-            if not self._has_selection \
-               or self._selection[atom_array_i % self._orig_length]:
-                    x = self._coord[atom_array_i, 0]
-                    y = self._coord[atom_array_i, 1]
-                    z = self._coord[atom_array_i, 2]
-                    # Get cell indices for coordinates
-                    self._get_cell_index(x, y, z, &i, &j, &k)
-                    # Increment cell length and reallocate
-                    length = self._cell_length[i,j,k] + 1
-                    cell_ptr = <int*>self._cells[i,j,k]
-                    cell_ptr = <int*>realloc(cell_ptr, length * sizeof(int))
-                    if not cell_ptr:
-                        raise MemoryError()
-                    # Potentially increase max cell length
-                    if length > self._max_cell_length:
-                        self._max_cell_length = length
-                    # Store atom array index in respective cell
-                    cell_ptr[length-1] = atom_array_i
-                    # Store new cell pointer and length
-                    self._cell_length[i,j,k] = length
-                    self._cells[i,j,k] = <ptr> cell_ptr
-            
-    
-    def __dealloc__(self):
-        if self._has_initialized_cells():
-            deallocate_ptrs(self._cells)
-    
-    
+            if has_selection and not selection[atom_i]:
+                continue
+            self._get_cell_index(
+                coord[atom_i, 0], coord[atom_i, 1], coord[atom_i, 2],
+                &i, &j, &k
+            )
+            cell_i = self._to_flat_cell_index(i, j, k)
+            atom_cells_v[atom_i] = cell_i
+            # Count into the following cell, so that the cumulative
+            # sum gives the start of each cell
+            cell_starts_v[cell_i + 1] += 1
+        self._max_cell_length = np.max(cell_starts)
+        if free_space > 0:
+            cell_starts[1:] += (cell_starts[1:] * free_space).astype(np.int64)
+            cell_starts[1:] += 1
+        np.cumsum(cell_starts, out=cell_starts)
+
+        # Second pass: Put the atoms at the position of their cell
+        cdef int64 n_positions = cell_starts_v[n_cells]
+        cdef int32[:] cell_atoms = np.full(n_positions, -1, dtype=np.int32)
+        cdef float32[:,:] cell_coord = np.zeros(
+            (n_positions, 3), dtype=np.float32
+        )
+        atom_positions = np.full(n_atoms, -1, dtype=np.int64)
+        cdef int64[:] atom_positions_v = atom_positions
+        # The next free position in each cell
+        cell_stops = cell_starts[:n_cells].copy()
+        cdef int64[:] cell_stops_v = cell_stops
+        for atom_i in range(n_atoms):
+            cell_i = atom_cells_v[atom_i]
+            if cell_i == -1:
+                continue
+            pos = cell_stops_v[cell_i]
+            cell_stops_v[cell_i] += 1
+            cell_atoms[pos] = atom_i
+            atom_positions_v[atom_i] = pos
+            for dim in range(3):
+                cell_coord[pos, dim] = coord[atom_i, dim]
+
+        self._cell_starts = cell_starts
+        self._cell_stops = cell_stops
+        self._cell_atoms = cell_atoms
+        self._cell_coord = cell_coord
+        self._atom_cells = atom_cells
+        self._atom_positions = atom_positions
+
+
+    @cython.initializedcheck(False)
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.cdivision(True)
+    cdef int _relocate_atoms(self):
+        """
+        Move the atoms that changed their cell, after the coordinates
+        were updated.
+
+        Returns
+        -------
+        status : int
+            ``_SUCCESS``, if all atoms were relocated,
+            ``_OUTSIDE_GRID``, if an atom is outside the cell grid, or
+            ``_CELL_FULL``, if a cell has no space left for an atom.
+            In the latter two cases the cell list is in an inconsistent
+            state and must be rebuilt.
+        """
+        cdef int64 atom_i, moved_atom_i, cell_i, old_cell_i, pos, last_pos
+        cdef float32 cell_x, cell_y, cell_z
+        cdef int i=0, j=0, k=0
+        cdef int dim
+
+        cdef float32[:,:] coord = self._coord
+        cdef int64 n_atoms = coord.shape[0]
+        cdef int32[:] cell_atoms = self._cell_atoms
+        cdef float32[:,:] cell_coord = self._cell_coord
+        cdef int64[:] cell_starts = self._cell_starts
+        cdef int64[:] cell_stops = self._cell_stops
+        cdef int64[:] atom_cells = self._atom_cells
+        cdef int64[:] atom_positions = self._atom_positions
+        cdef float32 min_x = self._min_coord[0]
+        cdef float32 min_y = self._min_coord[1]
+        cdef float32 min_z = self._min_coord[2]
+        cdef float32 cellsize = self._cellsize
+
+        # Find the new cell of each atom
+        cdef int64[:] new_cells = np.full(n_atoms, -1, dtype=np.int64)
+        for atom_i in range(n_atoms):
+            if atom_cells[atom_i] == -1:
+                continue
+            if self._periodic:
+                # Atoms cannot leave the grid, as it spans the box
+                self._get_cell_index(
+                    coord[atom_i, 0], coord[atom_i, 1], coord[atom_i, 2],
+                    &i, &j, &k
+                )
+                new_cells[atom_i] = self._to_flat_cell_index(i, j, k)
+                continue
+            cell_x = (coord[atom_i, 0] - min_x) / cellsize
+            cell_y = (coord[atom_i, 1] - min_y) / cellsize
+            cell_z = (coord[atom_i, 2] - min_z) / cellsize
+            if (
+                cell_x < 0 or cell_x >= self._cell_count[0] or
+                cell_y < 0 or cell_y >= self._cell_count[1] or
+                cell_z < 0 or cell_z >= self._cell_count[2]
+            ):
+                return _OUTSIDE_GRID
+            new_cells[atom_i] = self._to_flat_cell_index(
+                <int> cell_x, <int> cell_y, <int> cell_z
+            )
+
+        # Remove the moving atoms from their cell,
+        # by replacing each one with the last atom in the cell
+        for atom_i in range(n_atoms):
+            old_cell_i = atom_cells[atom_i]
+            if new_cells[atom_i] == old_cell_i:
+                continue
+            pos = atom_positions[atom_i]
+            last_pos = cell_stops[old_cell_i] - 1
+            moved_atom_i = cell_atoms[last_pos]
+            cell_atoms[pos] = moved_atom_i
+            atom_positions[moved_atom_i] = pos
+            cell_atoms[last_pos] = -1
+            cell_stops[old_cell_i] = last_pos
+
+        # Append the moving atoms to their new cell
+        for atom_i in range(n_atoms):
+            cell_i = new_cells[atom_i]
+            if cell_i == atom_cells[atom_i]:
+                continue
+            pos = cell_stops[cell_i]
+            if pos == cell_starts[cell_i + 1]:
+                return _CELL_FULL
+            cell_stops[cell_i] = pos + 1
+            if pos + 1 - cell_starts[cell_i] > self._max_cell_length:
+                self._max_cell_length = pos + 1 - cell_starts[cell_i]
+            cell_atoms[pos] = atom_i
+            atom_positions[atom_i] = pos
+            atom_cells[atom_i] = cell_i
+
+        # Update the coordinates of all atoms in the cell list
+        for atom_i in range(n_atoms):
+            pos = atom_positions[atom_i]
+            if pos == -1:
+                continue
+            for dim in range(3):
+                cell_coord[pos, dim] = coord[atom_i, dim]
+
+        return _SUCCESS
+
+
+    def __getstate__(self):
+        return {
+            "coord": np.asarray(self._coord),
+            "selection": np.asarray(self._selection)
+                         if self._has_selection else None,
+            "cell_atoms": np.asarray(self._cell_atoms),
+            "cell_starts": np.asarray(self._cell_starts),
+            "cell_stops": np.asarray(self._cell_stops),
+            "cell_coord": np.asarray(self._cell_coord),
+            "atom_cells": np.asarray(self._atom_cells),
+            "atom_positions": np.asarray(self._atom_positions),
+            "cell_count": [self._cell_count[dim] for dim in range(3)],
+            "max_cell_length": self._max_cell_length,
+            "cellsize": self._cellsize,
+            "min_coord": np.asarray(self._min_coord),
+            "max_coord": np.asarray(self._max_coord),
+            "periodic": self._periodic,
+            "box": self._box,
+            "inv_box": np.asarray(self._inv_box) if self._periodic else None,
+            "atom_count": self._atom_count,
+        }
+
+
+    def __setstate__(self, state):
+        self._coord = state["coord"]
+        self._has_selection = state["selection"] is not None
+        if self._has_selection:
+            self._selection = state["selection"]
+        self._cell_atoms = state["cell_atoms"]
+        self._cell_starts = state["cell_starts"]
+        self._cell_stops = state["cell_stops"]
+        self._cell_coord = state["cell_coord"]
+        self._atom_cells = state["atom_cells"]
+        self._atom_positions = state["atom_positions"]
+        for dim in range(3):
+            self._cell_count[dim] = state["cell_count"][dim]
+        self._max_cell_length = state["max_cell_length"]
+        self._cellsize = state["cellsize"]
+        self._min_coord = state["min_coord"]
+        self._max_coord = state["max_coord"]
+        self._periodic = state["periodic"]
+        self._box = state["box"]
+        if self._periodic:
+            self._inv_box = state["inv_box"]
+        self._atom_count = state["atom_count"]
+
+
     @cython.initializedcheck(False)
     @cython.boundscheck(False)
     @cython.wraparound(False)
-    def create_adjacency_matrix(self, float32 threshold_distance):
+    def create_adjacency_matrix(self, float32 threshold_distance,
+                                bint as_sparse=False):
         """
-        create_adjacency_matrix(threshold_distance)
+        create_adjacency_matrix(threshold_distance, as_sparse=False)
         
         Create an adjacency matrix for the atoms in this cell list.
 
@@ -235,10 +570,16 @@ cdef class CellList:
             The threshold distance. All atom pairs that have a distance
             lower than this value are indicated by ``True`` values in
             the resulting matrix.
+        as_sparse : bool, optional
+            If true, the adjacency matrix is returned as sparse
+            :class:`scipy.sparse.csr_matrix`.
+            This requires the *SciPy* package.
+            In contrast to the dense matrix, the memory requirement is
+            proportional to the number of adjacent atom pairs.
         
         Returns
         -------
-        matrix : ndarray, dtype=bool, shape=(n,n)
+        matrix : ndarray or csr_matrix, dtype=bool, shape=(n,n)
             An *n x n* adjacency matrix.
             If a `selection` was given to the constructor of the
             :class:`CellList`, the rows and columns corresponding to
@@ -252,6 +593,9 @@ cdef class CellList:
         optinal: The resulting adjacency matrix is the same for every
         cell size.
 
+        For a sparse list of adjacent atom pairs without the
+        dependency on *SciPy*, use :meth:`create_pair_list()`.
+
         Although the adjacency matrix should be symmetric in most cases,
         it may occur that ``m[i,j] != m[j,i]``, when ``distance(i,j)``
         is very close to the `threshold_distance` due to numerical
@@ -268,27 +612,42 @@ cdef class CellList:
         """
         if threshold_distance < 0:
             raise ValueError("Threshold must be a positive value")
-        cdef int i=0
-        
-        # Get atom position for all original positions
-        # (no periodic copies)
-        coord = np.asarray(self._coord[:self._orig_length])
 
-        if self._has_selection:
-            selection = np.asarray(self._selection, dtype=bool)
-            # Create matrix with all elements set to False
-            matrix = np.zeros(
-                (self._orig_length, self._orig_length), dtype=bool
+        if as_sparse:
+            # Import here, as SciPy is an optional dependency
+            from scipy.sparse import csr_matrix
+            pairs, _ = self._find_all_pairs(threshold_distance)
+            return csr_matrix(
+                (np.ones(len(pairs), dtype=bool), (pairs[:, 0], pairs[:, 1])),
+                shape=(self._atom_count, self._atom_count)
             )
-            # Set only those rows that belong to masked atoms
-            matrix[selection, :] = self.get_atoms(
-                coord[selection], threshold_distance, as_mask=True
+        if self._periodic:
+            pairs, _ = self._find_all_pairs(threshold_distance)
+            matrix = np.zeros(
+                (self._atom_count, self._atom_count), dtype=bool
             )
+            matrix[pairs[:, 0], pairs[:, 1]] = True
             return matrix
+
+        coord = np.asarray(self._coord)
+        if self._has_selection:
+            # Rows of atoms, that are not masked by the selection,
+            # stay 'False'
+            positions = np.where(np.asarray(self._selection, dtype=bool))[0]
         else:
-            return self.get_atoms(coord, threshold_distance, as_mask=True)
-        
-    
+            positions = np.arange(self._atom_count)
+
+        matrix = np.zeros((self._atom_count, self._atom_count), dtype=bool)
+        self._fill_adjacency_matrix(
+            coord,
+            positions.astype(np.int32),
+            threshold_distance * threshold_distance,
+            int(np.ceil(threshold_distance / self._cellsize)),
+            matrix.view(np.uint8)
+        )
+        return matrix
+
+
     @cython.initializedcheck(False)
     @cython.boundscheck(False)
     @cython.wraparound(False)
@@ -342,11 +701,10 @@ cdef class CellList:
 
         Notes
         -----
-        In case of a :class:`CellList` with `periodic` set to `True`:
-        If more than one periodic copy of an atom is within the
-        threshold radius, the returned `indices` array contains the
-        corresponding index multiple times.
-        Please use ``numpy.unique()``, if this is undesireable.
+        In case of a :class:`CellList` with `periodic` set to `True`,
+        the distance to the nearest periodic copy of an atom is
+        considered (minimum-image convention).
+        Hence, each atom index appears at most once for each position.
 
         Examples
         --------
@@ -394,29 +752,20 @@ cdef class CellList:
         [104 114  45  46  55  44  54 105 271 273 265 268 269 272 275]
         [ 46  55 273 268 269 272 274 275]
         """
-        cdef int i=0, j=0
-        cdef int array_i = 0
-        cdef int max_array_length = 0
-        cdef int coord_index
-        cdef float32 x1, y1, z1, x2, y2, z2
-        cdef float32 sq_dist
-        cdef float32 sq_radius
-        cdef float32[:] sq_radii
+        cdef np.ndarray sq_radii
         cdef np.ndarray cell_radii
-        
-        cdef int[:,:] all_indices
-        cdef int[:,:] indices
-        cdef float32[:,:] coord_v
 
         if len(coord) == 0:
             return _empty_result(as_mask)
-        
+
         # Handle periodicity for the input coordinates
         if self._periodic:
             coord = move_inside_box(coord, self._box)
         # Convert input parameters into a uniform format
         coord, radius, is_multi_coord, is_multi_radius \
             = _prepare_vectorization(coord, radius, np.float32)
+        # Using the squared distance is computationally cheaper than
+        # calculating the sqaure root for every distance
         if is_multi_radius:
             sq_radii = radius * radius
             cell_radii = np.ceil(radius / self._cellsize).astype(np.int32)
@@ -431,46 +780,18 @@ cdef class CellList:
                 dtype=np.int32
             )
 
-        # Get indices for adjacent atoms, based on a cell radius
-        all_indices = self._get_atoms_in_cells(
-            coord, cell_radii, is_multi_radius
-        )
-        # These have to be narrowed down in the next step
-        # using the Euclidian distance
-        
-        # Filter all indices from all_indices
-        # where squared distance is smaller than squared radius
-        # Using the squared distance is computationally cheaper than
-        # calculating the sqaure root for every distance
-        indices = np.full(
-            (all_indices.shape[0], all_indices.shape[1]), -1, dtype=np.int32
-        )
-        coord_v = coord
-        for i in range(all_indices.shape[0]):
-            sq_radius = sq_radii[i]
-            x1 = coord_v[i,0]
-            y1 = coord_v[i,1]
-            z1 = coord_v[i,2]
-            array_i = 0
-            for j in range(all_indices.shape[1]):
-                coord_index = all_indices[i,j]
-                if coord_index != -1:
-                    x2 = self._coord[coord_index, 0]
-                    y2 = self._coord[coord_index, 1]
-                    z2 = self._coord[coord_index, 2]
-                    sq_dist = squared_distance(x1, y1, z1, x2, y2, z2)
-                    if sq_dist <= sq_radius:
-                        indices[i, array_i] = coord_index
-                        array_i += 1
-            if array_i > max_array_length:
-                max_array_length = array_i
-        
-        return self._post_process(
-            np.asarray(indices)[:, :max_array_length],
-            as_mask, is_multi_coord
-        )
-    
-    
+        # Get indices for adjacent atoms, based on a cell radius,
+        # narrowed down to the atoms within the Euclidian distance
+        if self._periodic:
+            pairs, _ = self._find_pairs(coord, cell_radii, sq_radii, True)
+            indices = _pairs_to_indices(pairs, len(coord))
+        else:
+            indices = self._get_atoms_in_cells(
+                coord, cell_radii, is_multi_radius, sq_radii
+            )
+        return self._post_process(indices, as_mask, is_multi_coord)
+
+
     @cython.boundscheck(False)
     @cython.wraparound(False)
     def get_atoms_in_cells(self, np.ndarray coord,
@@ -539,11 +860,9 @@ cdef class CellList:
 
         Notes
         -----
-        In case of a :class:`CellList` with `periodic` set to `True`:
-        If more than one periodic copy of an atom is within the
-        threshold radius, the returned `indices` array contains the
-        corresponding index multiple times.
-        Please use ``numpy.unique()``, if this is undesireable.
+        In case of a :class:`CellList` with `periodic` set to `True`,
+        the cells wrap around at the box boundaries.
+        Hence, each atom index appears at most once for each position.
         """
         # This function is a thin wrapper around the private method
         # with the same name, with addition of handling periodicty
@@ -559,21 +878,272 @@ cdef class CellList:
         coord, cell_radius, is_multi_coord, is_multi_radius \
             = _prepare_vectorization(coord, cell_radius, np.int32)
         # Get adjacent atom indices
-        array_indices = self._get_atoms_in_cells(
-            coord, cell_radius, is_multi_radius
-        )
+        if self._periodic:
+            pairs, _ = self._find_pairs(
+                coord, cell_radius,
+                np.zeros(len(coord), dtype=np.float32), False
+            )
+            array_indices = _pairs_to_indices(pairs, len(coord))
+        else:
+            array_indices = self._get_atoms_in_cells(
+                coord, cell_radius, is_multi_radius
+            )
         return self._post_process(array_indices, as_mask, is_multi_coord)
     
     
+    def get_atom_pairs(self, np.ndarray coord, radius):
+        """
+        get_atom_pairs(coord, radius)
+
+        Find atoms with a maximum distance from given coordinates and
+        return them as sparse list of pairs.
+
+        In contrast to :meth:`get_atoms()`, the memory requirement of
+        the return value is proportional to the number of found pairs,
+        instead of the number of positions times the highest number of
+        atoms found for any position.
+
+        Parameters
+        ----------
+        coord : ndarray, dtype=float, shape=(3,) or shape=(m,3)
+            The central coordinates, around which the atoms are
+            searched.
+        radius : float or ndarray, shape=(m,), dtype=float
+            The radius around `coord`, in which the atoms are searched.
+            Either a single radius can be given as scalar, or individual
+            radii for each position in `coord` can be provided as
+            :class:`ndarray`.
+
+        Returns
+        -------
+        pairs : ndarray, dtype=int32, shape=(p,2)
+            Each row contains the index of a position in `coord`
+            (always 0, if a single position is given) and the index of
+            an atom in the defined `radius` around this position.
+            The pairs are sorted by the position index.
+        distances : ndarray, dtype=float32, shape=(p,)
+            The distance between the position and the atom for each
+            pair.
+
+        See Also
+        --------
+        get_atoms
+        get_atom_pairs_in_cells
+
+        Notes
+        -----
+        In case of a :class:`CellList` with `periodic` set to `True`,
+        the distance to the nearest periodic copy of an atom is
+        considered (minimum-image convention).
+
+        Examples
+        --------
+
+        >>> cell_list = CellList(atom_array, 3)
+        >>> pos = np.array([[1.0,2.0,3.0], [3.0,4.0,5.0]])
+        >>> pairs, distances = cell_list.get_atom_pairs(pos, radius=2.0)
+        >>> for (pos_i, atom_i), dist in zip(pairs, distances):
+        ...     print(f"{pos_i} {atom_i:>3d} {dist:.2f}")
+        0 102 1.50
+        0 104 1.94
+        0 112 1.94
+        1  55 1.99
+        1 273 1.60
+        1 268 1.82
+        1 269 1.99
+        1 275 1.58
+        """
+        cdef np.ndarray sq_radii
+        cdef np.ndarray cell_radii
+
+        if len(coord) == 0:
+            return _empty_pairs()
+
+        if self._periodic:
+            coord = move_inside_box(coord, self._box)
+        coord, radius, _, is_multi_radius \
+            = _prepare_vectorization(coord, radius, np.float32)
+        if is_multi_radius:
+            sq_radii = radius * radius
+            cell_radii = np.ceil(radius / self._cellsize).astype(np.int32)
+        else:
+            sq_radii = np.full(
+                len(coord), radius[0]*radius[0], dtype=np.float32
+            )
+            cell_radii = np.full(
+                len(coord),
+                int(np.ceil(radius[0] / self._cellsize)),
+                dtype=np.int32
+            )
+
+        pairs, sq_distances = self._find_pairs(
+            coord, cell_radii, sq_radii, True
+        )
+        return pairs, np.sqrt(sq_distances)
+
+
+    def get_atom_pairs_in_cells(self, np.ndarray coord, cell_radius=1):
+        """
+        get_atom_pairs_in_cells(coord, cell_radius=1)
+
+        Find atoms with a maximum cell distance from given coordinates
+        and return them as sparse list of pairs.
+
+        This is the counterpart of :meth:`get_atoms_in_cells()` with
+        the output format of :meth:`get_atom_pairs()`.
+
+        Parameters
+        ----------
+        coord : ndarray, dtype=float, shape=(3,) or shape=(m,3)
+            The central coordinates, around which the atoms are
+            searched.
+        cell_radius : int or ndarray, shape=(m,), dtype=int, optional
+            The radius around `coord` (in amount of cells), in which
+            the atoms are searched.
+            By default atoms are searched in the cell of `coord`
+            and directly adjacent cells (cell_radius = 1).
+
+        Returns
+        -------
+        pairs : ndarray, dtype=int32, shape=(p,2)
+            Each row contains the index of a position in `coord`
+            (always 0, if a single position is given) and the index of
+            an atom in the defined cell radius around this position.
+            The pairs are sorted by the position index.
+
+        See Also
+        --------
+        get_atoms_in_cells
+        get_atom_pairs
+        """
+        if len(coord) == 0:
+            return _empty_pairs()[0]
+
+        if self._periodic:
+            coord = move_inside_box(coord, self._box)
+        coord, cell_radius, _, is_multi_radius \
+            = _prepare_vectorization(coord, cell_radius, np.int32)
+        pairs, _ = self._find_pairs(
+            coord, cell_radius, np.zeros(len(coord), dtype=np.float32), False
+        )
+        return pairs
+
+
+    def create_pair_list(self, threshold_distance, types=None):
+        """
+        create_pair_list(threshold_distance, types=None)
+
+        Find all pairs of atoms in this cell list, whose distance is
+        lower than a given threshold distance.
+
+        This is the sparse counterpart of
+        :meth:`create_adjacency_matrix()`:
+        The memory requirement is proportional to the number of pairs
+        instead of the squared number of atoms.
+
+        Parameters
+        ----------
+        threshold_distance : float or ndarray, shape=(t,t), dtype=float
+            The threshold distance.
+            If `types` is given, this is a symmetric matrix, that
+            contains the threshold distance for each pair of types.
+        types : ndarray, shape=(n,), dtype=int, optional
+            The type of each atom, e.g. the index of its element in a
+            list of elements.
+            The types are used as indices into `threshold_distance`.
+
+        Returns
+        -------
+        pairs : ndarray, dtype=int32, shape=(p,2)
+            The indices of the atoms in each pair.
+            The first index is always lower than the second one and the
+            pairs are sorted.
+            Atoms that are not masked by the `selection` given to the
+            constructor do not appear in any pair.
+        distances : ndarray, dtype=float32, shape=(p,)
+            The distance between the atoms of each pair.
+
+        See Also
+        --------
+        create_adjacency_matrix
+
+        Notes
+        -----
+        In case of a :class:`CellList` with `periodic` set to `True`,
+        the distance of a pair is the distance to the nearest periodic
+        copy.
+
+        Examples
+        --------
+        Find pairs of CA atoms within a distance of 4 Å:
+
+        >>> ca = atom_array[atom_array.atom_name == "CA"]
+        >>> cell_list = CellList(ca, 4)
+        >>> pairs, distances = cell_list.create_pair_list(4)
+        >>> print(pairs[:3])
+        [[0 1]
+         [1 2]
+         [2 3]]
+        >>> print(distances[:3])
+        [3.876 3.861 3.871]
+
+        Use an individual threshold for each pair of atom types,
+        here to find only pairs of a CA and a N atom:
+
+        >>> backbone = atom_array[np.isin(atom_array.atom_name, ["N", "CA"])]
+        >>> types = np.where(backbone.atom_name == "N", 0, 1)
+        >>> thresholds = np.array([
+        ...     [0.0, 1.6],
+        ...     [1.6, 0.0]
+        ... ])
+        >>> cell_list = CellList(backbone, 1.6)
+        >>> pairs, distances = cell_list.create_pair_list(thresholds, types)
+        >>> print(backbone.atom_name[pairs[:3]])
+        [['N' 'CA']
+         ['N' 'CA']
+         ['N' 'CA']]
+        """
+        if types is None:
+            max_threshold = float(threshold_distance)
+            if max_threshold < 0:
+                raise ValueError("Threshold must be a positive value")
+        else:
+            threshold_distance = np.asarray(threshold_distance)
+            types = np.asarray(types)
+            if types.shape != (self._atom_count,):
+                raise IndexError(
+                    f"Expected {self._atom_count} types, "
+                    f"but got shape {types.shape}"
+                )
+            max_threshold = float(np.max(threshold_distance))
+
+        pairs, distances = self._find_all_pairs(max_threshold)
+        # Only retain each pair in one order
+        pairs, distances = _unique_pairs(
+            pairs[pairs[:, 0] < pairs[:, 1]],
+            distances[pairs[:, 0] < pairs[:, 1]],
+            self._atom_count
+        )
+        if types is not None:
+            pair_thresholds = threshold_distance[
+                types[pairs[:, 0]], types[pairs[:, 1]]
+            ]
+            within_threshold = distances <= pair_thresholds
+            pairs = pairs[within_threshold]
+            distances = distances[within_threshold]
+        return pairs, distances
+
+
     @cython.boundscheck(False)
     @cython.wraparound(False)
     def _get_atoms_in_cells(self,
                             np.ndarray coord,
                             np.ndarray cell_radii,
-                            bint is_multi_radius):
+                            bint is_multi_radius,
+                            np.ndarray sq_radii=None):
         """
         Get the indices of atoms in `cell_radii` adjacency of `coord`.
-        
+
         Parameters
         ----------
         coord : ndarray, dtype=float32, shape=(n,3)
@@ -583,7 +1153,10 @@ cdef class CellList:
         is_multi_radius : bool
             True indicates, that all values in `cell_radii` are the
             same.
-        
+        sq_radii : ndarray, dtype=float32, shape=(n), optional
+            If given, only atoms within this squared Euclidian distance
+            to the respective position are included.
+
         Returns
         -------
         array_indices : ndarray, dtype=int32, shape=(m,p)
@@ -601,69 +1174,459 @@ cdef class CellList:
         # maximum amount of atoms per cell times the amount of cells
         # Since the cells extend in 3 dimensions the amount of cells is
         # (2*r + 1)**3
-        cdef int length = (2*max_cell_radius + 1)**3 * self._max_cell_length
+        # However, it can never be larger than the number of atoms in
+        # the cell list
+        cdef int64 length = min(
+            (2*max_cell_radius + 1)**3 * self._max_cell_length,
+            self._atom_cells.shape[0]
+        )
         array_indices = np.full((len(coord), length), -1, dtype=np.int32)
         # Fill index array
-        cdef int max_array_length \
-            = self._find_adjacent_atoms(coord, array_indices, cell_radii)
+        cdef int max_array_length = self._find_adjacent_atoms(
+            coord, array_indices, cell_radii,
+            sq_radii, sq_radii is not None
+        )
         return array_indices[:, :max_array_length]
-    
-    
+
+
+    @cython.initializedcheck(False)
     @cython.boundscheck(False)
     @cython.wraparound(False)
     cdef int _find_adjacent_atoms(self,
                                   float32[:,:] coord,
-                                  int[:,:] indices,
-                                  int[:] cell_radius):
+                                  int32[:,:] indices,
+                                  int32[:] cell_radius,
+                                  float32[:] sq_radii,
+                                  bint check_distance):
         """
         This method fills the given empty index array
         with actual indices of adjacent atoms.
-    
+
         Since the length of 'indices' (second dimension) is
         the worst case assumption, this method returns the actual
         required length, i.e. the highest length of all arrays
         in this 'array of arrays'.
         """
-        cdef int length
-        cdef int* list_ptr
-        cdef float32 x, y,z
+        cdef float32 x, y, z
+        cdef float32 sq_radius = 0
         cdef int i=0, j=0, k=0
-        cdef int adj_i, adj_j, adj_k
-        cdef int pos_i, array_i, cell_i
+        cdef int adj_i, adj_j
+        cdef int min_i, max_i, min_j, max_j, min_k, max_k
+        cdef int pos_i, array_i
+        cdef int64 cell_atom_i
         cdef int max_array_length = 0
         cdef int cell_r
-        
-        cdef ptr[:,:,:] cells = self._cells
-        cdef int[:,:,:] cell_length = self._cell_length
+
+        cdef int32[:] cell_atoms = self._cell_atoms
+        cdef int64[:] cell_starts = self._cell_starts
+        cdef int64[:] cell_stops = self._cell_stops
+        cdef float32[:,:] cell_coord = self._cell_coord
 
         for pos_i in range(coord.shape[0]):
             array_i = 0
             cell_r = cell_radius[pos_i]
+            if check_distance:
+                sq_radius = sq_radii[pos_i]
             x = coord[pos_i, 0]
             y = coord[pos_i, 1]
             z = coord[pos_i, 2]
             self._get_cell_index(x, y, z, &i, &j, &k)
             # Look into cells of the indices and adjacent cells
             # in all 3 dimensions
-
-            for adj_i in range(i-cell_r, i+cell_r+1):
-                if (adj_i >= 0 and adj_i < cells.shape[0]):
-                    for adj_j in range(j-cell_r, j+cell_r+1):
-                        if (adj_j >= 0 and adj_j < cells.shape[1]):
-                            for adj_k in range(k-cell_r, k+cell_r+1):
-                                if (adj_k >= 0 and adj_k < cells.shape[2]):
-                                    # Fill index array
-                                    # with indices in cell
-                                    list_ptr = <int*>cells[adj_i, adj_j, adj_k]
-                                    length = cell_length[adj_i, adj_j, adj_k]
-                                    for cell_i in range(length):
-                                        indices[pos_i, array_i] = \
-                                            list_ptr[cell_i]
-                                        array_i += 1
+            min_i = max(i - cell_r, 0)
+            max_i = min(i + cell_r + 1, self._cell_count[0])
+            min_j = max(j - cell_r, 0)
+            max_j = min(j + cell_r + 1, self._cell_count[1])
+            min_k = max(k - cell_r, 0)
+            max_k = min(k + cell_r + 1, self._cell_count[2])
+            if min_k >= max_k:
+                continue
+            for adj_i in range(min_i, max_i):
+                for adj_j in range(min_j, max_j):
+                    # The atoms of adjacent cells in the last
+                    # dimension are contiguous in memory,
+                    # only interrupted by free space
+                    for cell_atom_i in range(
+                        cell_starts[self._to_flat_cell_index(
+                            adj_i, adj_j, min_k
+                        )],
+                        cell_stops[self._to_flat_cell_index(
+                            adj_i, adj_j, max_k - 1
+                        )]
+                    ):
+                        if cell_atoms[cell_atom_i] == -1:
+                            continue
+                        if check_distance and squared_distance(
+                            x, y, z,
+                            cell_coord[cell_atom_i, 0],
+                            cell_coord[cell_atom_i, 1],
+                            cell_coord[cell_atom_i, 2]
+                        ) > sq_radius:
+                            continue
+                        indices[pos_i, array_i] = cell_atoms[cell_atom_i]
+                        array_i += 1
             if array_i > max_array_length:
                 max_array_length = array_i
         return max_array_length
-    
+
+
+    @cython.initializedcheck(False)
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.cdivision(True)
+    cdef _fill_adjacency_matrix(self,
+                                float32[:,:] coord,
+                                int32[:] positions,
+                                float32 sq_radius,
+                                int cell_r,
+                                uint8[:,:] matrix):
+        """
+        Set the elements of the given adjacency matrix to true for all
+        atoms within the squared radius of the coordinates at the given
+        positions.
+        """
+        cdef float32 x, y, z
+        cdef int i=0, j=0, k=0
+        cdef int adj_i, adj_j
+        cdef int min_i, max_i, min_j, max_j, min_k, max_k
+        cdef int pos_i, row
+        cdef int64 cell_atom_i
+
+        cdef int32[:] cell_atoms = self._cell_atoms
+        cdef int64[:] cell_starts = self._cell_starts
+        cdef int64[:] cell_stops = self._cell_stops
+        cdef float32[:,:] cell_coord = self._cell_coord
+
+        for pos_i in range(positions.shape[0]):
+            row = positions[pos_i]
+            x = coord[row, 0]
+            y = coord[row, 1]
+            z = coord[row, 2]
+            self._get_cell_index(x, y, z, &i, &j, &k)
+            min_i = max(i - cell_r, 0)
+            max_i = min(i + cell_r + 1, self._cell_count[0])
+            min_j = max(j - cell_r, 0)
+            max_j = min(j + cell_r + 1, self._cell_count[1])
+            min_k = max(k - cell_r, 0)
+            max_k = min(k + cell_r + 1, self._cell_count[2])
+            if min_k >= max_k:
+                continue
+            for adj_i in range(min_i, max_i):
+                for adj_j in range(min_j, max_j):
+                    for cell_atom_i in range(
+                        cell_starts[self._to_flat_cell_index(
+                            adj_i, adj_j, min_k
+                        )],
+                        cell_stops[self._to_flat_cell_index(
+                            adj_i, adj_j, max_k - 1
+                        )]
+                    ):
+                        if cell_atoms[cell_atom_i] == -1:
+                            continue
+                        if squared_distance(
+                            x, y, z,
+                            cell_coord[cell_atom_i, 0],
+                            cell_coord[cell_atom_i, 1],
+                            cell_coord[cell_atom_i, 2]
+                        ) <= sq_radius:
+                            matrix[row, cell_atoms[cell_atom_i]] = True
+
+
+    def _find_all_pairs(self, float32 threshold_distance):
+        """
+        Find all pairs of atoms in the cell list within the threshold
+        distance, in both orders and including each atom paired with
+        itself.
+
+        Returns
+        -------
+        pairs : ndarray, dtype=int32, shape=(p,2)
+            Indices of the atoms in each pair.
+        distances : ndarray, dtype=float32, shape=(p,)
+            The distances of the pairs.
+        """
+        coord = np.asarray(self._coord)
+        if self._has_selection:
+            positions = np.where(np.asarray(self._selection, dtype=bool))[0]
+            coord = coord[positions]
+        else:
+            positions = None
+        pairs, sq_distances = self._find_pairs(
+            coord,
+            np.full(
+                len(coord),
+                int(np.ceil(threshold_distance / self._cellsize)),
+                dtype=np.int32
+            ),
+            np.full(
+                len(coord),
+                threshold_distance * threshold_distance,
+                dtype=np.float32
+            ),
+            True
+        )
+        if positions is not None:
+            pairs[:, 0] = positions[pairs[:, 0]]
+        return pairs, np.sqrt(sq_distances)
+
+
+    @cython.initializedcheck(False)
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.cdivision(True)
+    cdef tuple _find_pairs(self,
+                           float32[:,:] coord,
+                           int32[:] cell_radius,
+                           float32[:] sq_radii,
+                           bint check_distance):
+        """
+        Find the atoms within the cell radius and optionally the
+        squared radius of each position.
+
+        Returns
+        -------
+        pairs : ndarray, dtype=int32, shape=(p,2)
+            The index of the position and the index of the atom in
+            each pair.
+        sq_distances : ndarray, dtype=float32, shape=(p,)
+            The squared distances of the pairs.
+            For a periodic cell list, the distances are only computed
+            if `check_distance` is true.
+        """
+        if self._periodic:
+            return self._find_periodic_pairs(
+                coord, cell_radius, sq_radii, check_distance
+            )
+
+        cdef float32 x, y, z
+        cdef float32 sq_dist
+        cdef float32 sq_radius = 0
+        cdef int i=0, j=0, k=0
+        cdef int adj_i, adj_j
+        cdef int min_i, max_i, min_j, max_j, min_k, max_k
+        cdef int pos_i
+        cdef int cell_r
+        cdef int64 cell_atom_i
+        cdef int64 n_pairs = 0
+
+        cdef int32[:] cell_atoms = self._cell_atoms
+        cdef int64[:] cell_starts = self._cell_starts
+        cdef int64[:] cell_stops = self._cell_stops
+        cdef float32[:,:] cell_coord = self._cell_coord
+
+        # The arrays are enlarged when they run full,
+        # hence the initial capacity is only a rough estimate
+        cdef int64 capacity = max(coord.shape[0], 1) * 16
+        pairs = np.empty((capacity, 2), dtype=np.int32)
+        sq_distances = np.empty(capacity, dtype=np.float32)
+        cdef int32[:,:] pairs_v = pairs
+        cdef float32[:] sq_distances_v = sq_distances
+
+        for pos_i in range(coord.shape[0]):
+            cell_r = cell_radius[pos_i]
+            if check_distance:
+                sq_radius = sq_radii[pos_i]
+            x = coord[pos_i, 0]
+            y = coord[pos_i, 1]
+            z = coord[pos_i, 2]
+            self._get_cell_index(x, y, z, &i, &j, &k)
+            min_i = max(i - cell_r, 0)
+            max_i = min(i + cell_r + 1, self._cell_count[0])
+            min_j = max(j - cell_r, 0)
+            max_j = min(j + cell_r + 1, self._cell_count[1])
+            min_k = max(k - cell_r, 0)
+            max_k = min(k + cell_r + 1, self._cell_count[2])
+            if min_k >= max_k:
+                continue
+            for adj_i in range(min_i, max_i):
+                for adj_j in range(min_j, max_j):
+                    for cell_atom_i in range(
+                        cell_starts[self._to_flat_cell_index(
+                            adj_i, adj_j, min_k
+                        )],
+                        cell_stops[self._to_flat_cell_index(
+                            adj_i, adj_j, max_k - 1
+                        )]
+                    ):
+                        if cell_atoms[cell_atom_i] == -1:
+                            continue
+                        sq_dist = squared_distance(
+                            x, y, z,
+                            cell_coord[cell_atom_i, 0],
+                            cell_coord[cell_atom_i, 1],
+                            cell_coord[cell_atom_i, 2]
+                        )
+                        if check_distance and sq_dist > sq_radius:
+                            continue
+                        if n_pairs == capacity:
+                            capacity *= 2
+                            pairs = np.resize(pairs, (capacity, 2))
+                            sq_distances = np.resize(sq_distances, capacity)
+                            pairs_v = pairs
+                            sq_distances_v = sq_distances
+                        pairs_v[n_pairs, 0] = pos_i
+                        pairs_v[n_pairs, 1] = cell_atoms[cell_atom_i]
+                        sq_distances_v[n_pairs] = sq_dist
+                        n_pairs += 1
+
+        return pairs[:n_pairs], sq_distances[:n_pairs]
+
+
+    @cython.initializedcheck(False)
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.cdivision(True)
+    cdef tuple _find_periodic_pairs(self,
+                                    float32[:,:] coord,
+                                    int32[:] cell_radius,
+                                    float32[:] sq_radii,
+                                    bint check_distance):
+        """
+        The counterpart of :meth:`_find_pairs()` for a periodic cell
+        list.
+
+        The indices of adjacent cells wrap around at the box
+        boundaries.
+        The distance of an atom in a wrapped cell is measured to its
+        periodic copy shifted by the corresponding box vectors.
+        Only if the cell radius spans the entire box, multiple periodic
+        copies of an atom may be within the radius:
+        In this case each cell is visited only once and the distances
+        are computed afterwards via the minimum-image convention.
+        """
+        cdef float32 x, y, z
+        cdef float32 shift_x, shift_y, shift_z
+        cdef float32 sq_dist
+        cdef float32 sq_radius = 0
+        cdef int i=0, j=0, k=0
+        cdef int adj_i, adj_j, adj_k
+        cdef int off_i, off_j, off_k
+        cdef int start_i, start_j, start_k
+        cdef int span_i, span_j, span_k
+        cdef int shift_i, shift_j, shift_k
+        cdef int pos_i
+        cdef int cell_r
+        cdef bint is_minimum_image
+        cdef int64 cell_i
+        cdef int64 cell_atom_i
+        cdef int64 n_pairs = 0
+        cdef int n_i = self._cell_count[0]
+        cdef int n_j = self._cell_count[1]
+        cdef int n_k = self._cell_count[2]
+
+        cdef int32[:] cell_atoms = self._cell_atoms
+        cdef int64[:] cell_starts = self._cell_starts
+        cdef int64[:] cell_stops = self._cell_stops
+        cdef float32[:,:] cell_coord = self._cell_coord
+        cdef float32[:,:] box = self._box.astype(np.float32)
+
+        cdef int64 capacity = max(coord.shape[0], 1) * 16
+        pairs = np.empty((capacity, 2), dtype=np.int32)
+        sq_distances = np.empty(capacity, dtype=np.float32)
+        # Indicates pairs whose distance is determined afterwards
+        unchecked = np.zeros(capacity, dtype=np.uint8)
+        cdef int32[:,:] pairs_v = pairs
+        cdef float32[:] sq_distances_v = sq_distances
+        cdef uint8[:] unchecked_v = unchecked
+
+        for pos_i in range(coord.shape[0]):
+            cell_r = cell_radius[pos_i]
+            if check_distance:
+                sq_radius = sq_radii[pos_i]
+            x = coord[pos_i, 0]
+            y = coord[pos_i, 1]
+            z = coord[pos_i, 2]
+            self._get_cell_index(x, y, z, &i, &j, &k)
+            # If the cell radius spans the entire box in a dimension,
+            # each cell is visited only once
+            is_minimum_image = True
+            if 2 * cell_r + 1 < n_i:
+                start_i = i - cell_r
+                span_i = 2 * cell_r + 1
+            else:
+                start_i = 0
+                span_i = n_i
+                is_minimum_image = False
+            if 2 * cell_r + 1 < n_j:
+                start_j = j - cell_r
+                span_j = 2 * cell_r + 1
+            else:
+                start_j = 0
+                span_j = n_j
+                is_minimum_image = False
+            if 2 * cell_r + 1 < n_k:
+                start_k = k - cell_r
+                span_k = 2 * cell_r + 1
+            else:
+                start_k = 0
+                span_k = n_k
+                is_minimum_image = False
+            for off_i in range(span_i):
+                # The periodic copy of the cell is shifted by
+                # 'shift_i' box vectors
+                shift_i = _floor_div(start_i + off_i, n_i)
+                adj_i = start_i + off_i - shift_i * n_i
+                for off_j in range(span_j):
+                    shift_j = _floor_div(start_j + off_j, n_j)
+                    adj_j = start_j + off_j - shift_j * n_j
+                    for off_k in range(span_k):
+                        shift_k = _floor_div(start_k + off_k, n_k)
+                        adj_k = start_k + off_k - shift_k * n_k
+                        shift_x = (shift_i * box[0, 0] + shift_j * box[1, 0]
+                                   + shift_k * box[2, 0])
+                        shift_y = (shift_i * box[0, 1] + shift_j * box[1, 1]
+                                   + shift_k * box[2, 1])
+                        shift_z = (shift_i * box[0, 2] + shift_j * box[1, 2]
+                                   + shift_k * box[2, 2])
+                        cell_i = self._to_flat_cell_index(adj_i, adj_j, adj_k)
+                        for cell_atom_i in range(
+                            cell_starts[cell_i], cell_stops[cell_i]
+                        ):
+                            sq_dist = 0
+                            if check_distance and is_minimum_image:
+                                sq_dist = squared_distance(
+                                    x, y, z,
+                                    cell_coord[cell_atom_i, 0] + shift_x,
+                                    cell_coord[cell_atom_i, 1] + shift_y,
+                                    cell_coord[cell_atom_i, 2] + shift_z
+                                )
+                                if sq_dist > sq_radius:
+                                    continue
+                            if n_pairs == capacity:
+                                capacity *= 2
+                                pairs = np.resize(pairs, (capacity, 2))
+                                sq_distances = np.resize(sq_distances, capacity)
+                                unchecked = np.resize(unchecked, capacity)
+                                pairs_v = pairs
+                                sq_distances_v = sq_distances
+                                unchecked_v = unchecked
+                            pairs_v[n_pairs, 0] = pos_i
+                            pairs_v[n_pairs, 1] = cell_atoms[cell_atom_i]
+                            sq_distances_v[n_pairs] = sq_dist
+                            unchecked_v[n_pairs] = (
+                                check_distance and not is_minimum_image
+                            )
+                            n_pairs += 1
+        pairs = pairs[:n_pairs]
+        sq_distances = sq_distances[:n_pairs]
+        unchecked = unchecked[:n_pairs].astype(bool)
+
+        if not unchecked.any():
+            return pairs, sq_distances
+        unchecked_pairs = pairs[unchecked]
+        disp = displacement(
+            np.asarray(coord)[unchecked_pairs[:, 0]],
+            np.asarray(self._coord)[unchecked_pairs[:, 1]],
+            self._box
+        )
+        sq_distances[unchecked] = np.sum(disp * disp, axis=-1)
+        is_within = ~unchecked
+        is_within[unchecked] = (
+            sq_distances[unchecked]
+            <= np.asarray(sq_radii)[unchecked_pairs[:, 0]]
+        )
+        return pairs[is_within], sq_distances[is_within]
+
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
@@ -673,17 +1636,8 @@ cdef class CellList:
                      bint is_multi_coord):
         """
         Post process the resulting indices of adjacent atoms,
-        including periodicity handling and optional conversion into a
-        boolean matrix.
+        including optional conversion into a boolean matrix.
         """
-        # Handle periodicity for the output indices
-        if self._periodic:
-            # Map indices of repeated coordinates to original
-            # coordinates, i.e. the coordinates in the central box
-            # -> Remainder of dividing index by original array length
-            # Furthermore this ensures, that the indices have valid
-            # values for '_as_mask()'
-            indices[indices != -1] %= self._orig_length
         if as_mask:
             matrix = self._as_mask(indices)
             if is_multi_coord:
@@ -703,10 +1657,36 @@ cdef class CellList:
     @cython.cdivision(True)
     cdef inline void _get_cell_index(self, float32 x, float32 y, float32 z,
                              int* i, int* j, int* k):
+        cdef float32 frac_x, frac_y, frac_z
+        if self._periodic:
+            # The coordinates are inside the box,
+            # hence the fractions are in the range [0, 1)
+            frac_x = (x * self._inv_box[0, 0] + y * self._inv_box[1, 0]
+                      + z * self._inv_box[2, 0])
+            frac_y = (x * self._inv_box[0, 1] + y * self._inv_box[1, 1]
+                      + z * self._inv_box[2, 1])
+            frac_z = (x * self._inv_box[0, 2] + y * self._inv_box[1, 2]
+                      + z * self._inv_box[2, 2])
+            # Clip to the grid to account for rounding errors
+            i[0] = _clip(<int>(frac_x * self._cell_count[0]),
+                         self._cell_count[0])
+            j[0] = _clip(<int>(frac_y * self._cell_count[1]),
+                         self._cell_count[1])
+            k[0] = _clip(<int>(frac_z * self._cell_count[2]),
+                         self._cell_count[2])
+            return
         i[0] = <int>((x - self._min_coord[0]) / self._cellsize)
         j[0] = <int>((y - self._min_coord[1]) / self._cellsize)
         k[0] = <int>((z - self._min_coord[2]) / self._cellsize)
     
+    @cython.initializedcheck(False)
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef inline int64 _to_flat_cell_index(self, int i, int j, int k):
+        return (
+            (<int64> i * self._cell_count[1] + j) * self._cell_count[2] + k
+        )
+
     @cython.initializedcheck(False)
     @cython.boundscheck(False)
     @cython.wraparound(False)
@@ -722,11 +1702,11 @@ cdef class CellList:
     @cython.initializedcheck(False)
     @cython.boundscheck(False)
     @cython.wraparound(False)
-    cdef np.ndarray _as_mask(self, int[:,:] indices):
+    cdef np.ndarray _as_mask(self, int32[:,:] indices):
         cdef int i,j
         cdef int index
         cdef uint8[:,:] matrix = np.zeros(
-            (indices.shape[0], self._orig_length), dtype=np.uint8
+            (indices.shape[0], self._atom_count), dtype=np.uint8
         )
         # Fill matrix
         for i in range(indices.shape[0]):
@@ -740,10 +1720,10 @@ cdef class CellList:
     
     cdef inline bint _has_initialized_cells(self):
         # Memoryviews are not initialized on class creation
-        # This method checks if the _cells memoryview was initialized
-        # and is not None
+        # This method checks if the _cell_starts memoryview was
+        # initialized and is not None
         try:
-            if self._cells is not None:
+            if self._cell_starts is not None:
                 return True
             else:
                 return False
@@ -751,6 +1731,30 @@ cdef class CellList:
             return False
 
 
+# Return values of 'CellList._relocate_atoms()'
+cdef int _SUCCESS = 0
+cdef int _OUTSIDE_GRID = 1
+cdef int _CELL_FULL = 2
+# The fraction of additional space reserved in each cell,
+# when the cell list is rebuilt in 'CellList.update()'
+cdef float _FREE_SPACE = 0.25
+
+
+def _prepare_box(box):
+    """
+    Check the given box and use the box of the first model, if the box
+    is given for multiple models.
+    """
+    box = np.asarray(box)
+    if box.ndim == 3:
+        box = box[0]
+    if box.shape != (3,3):
+        raise ValueError("Box has invalid shape")
+    if np.isnan(box).any():
+        raise ValueError("Box contains NaN values")
+    return box
+
+
 def _empty_result(as_mask):
     """
     Create return value for :func:`get_atoms()` and
@@ -762,6 +1766,43 @@ def _empty_result(as_mask):
         return np.array([], dtype=np.int32)
 
 
+def _empty_pairs():
+    """
+    Create return value for :func:`get_atom_pairs()` and
+    :func:`get_atom_pairs_in_cells()`, if no coordinates are given.
+    """
+    return np.zeros((0, 2), dtype=np.int32), np.zeros(0, dtype=np.float32)
+
+
+def _pairs_to_indices(pairs, n_positions):
+    """
+    Convert the pairs of positions and atom indices into an index array
+    for each position, padded with trailing -1 values.
+    """
+    counts = np.bincount(pairs[:, 0], minlength=n_positions)
+    max_count = np.max(counts) if len(counts) > 0 else 0
+    indices = np.full((n_positions, max_count), -1, dtype=np.int32)
+    # The pairs are sorted by the position index
+    starts = np.cumsum(counts) - counts
+    columns = np.arange(len(pairs)) - starts[pairs[:, 0]]
+    indices[pairs[:, 0], columns] = pairs[:, 1]
+    return indices
+
+
+def _unique_pairs(pairs, distances, n_atoms):
+    """
+    Sort the pairs and remove duplicate pairs, retaining the lowest
+    distance.
+    """
+    codes = pairs[:, 0].astype(np.int64) * n_atoms + pairs[:, 1]
+    order = np.lexsort((distances, codes))
+    codes = codes[order]
+    is_first = np.ones(len(codes), dtype=bool)
+    is_first[1:] = codes[1:] != codes[:-1]
+    order = order[is_first]
+    return pairs[order], distances[order]
+
+
 def _prepare_vectorization(np.ndarray coord, radius, radius_dtype):
     """
     Since `get_atoms()` and `get_atoms_in_cells()`, may take different
@@ -830,15 +1871,19 @@ def _prepare_vectorization(np.ndarray coord, radius, radius_dtype):
     return coord, radius, is_multi_coord, is_multi_radius
 
 
-cdef inline void deallocate_ptrs(ptr[:,:,:] ptrs):
-    cdef int i, j, k
-    cdef int* cell_ptr
-    # Free cell pointers
-    for i in range(ptrs.shape[0]):
-        for j in range(ptrs.shape[1]):
-            for k in range(ptrs.shape[2]):
-                cell_ptr = <int*>ptrs[i,j,k]
-                free(cell_ptr)
+cdef inline int _floor_div(int a, int b):
+    # In contrast to C division, round towards negative infinity
+    if a < 0:
+        return -((-a + b - 1) // b)
+    return a // b
+
+
+cdef inline int _clip(int index, int count):
+    if index < 0:
+        return 0
+    if index >= count:
+        return count - 1
+    return index
 
 
 cdef inline float32 squared_distance(float32 x1, float32 y1, float32 z1,
@@ -43,11 +43,32 @@ def get_chain_starts(array, add_exclusive_stop=False):
     -----
     This method is internally used by all other chain-related
     functions.
+
+    Like the residue starts, the chain starts are cached only, if the
+    relevant annotation arrays are frozen via
+    :meth:`AtomArray.freeze_annotations()` (see
+    :func:`get_residue_starts()`).
+    For an ordinary atom array, e.g. from :func:`load_structure()`,
+    the chain starts are determined anew in each call.
     
     See also
     --------
     get_residue_starts
     """
+    starts = array._get_cached(
+        "chain_starts", ("chain_id", "res_id"), _get_chain_starts
+    )
+    # Return a copy, as the cached array must not be modified
+    if add_exclusive_stop:
+        return starts.copy()
+    else:
+        return starts[:-1].copy()
+
+
+def _get_chain_starts(array):
+    """
+    Compute the chain starts including the exclusive stop.
+    """
     diff = np.diff(array.res_id)
     res_id_decrement = diff < 0
     # This mask is 'true' at indices where the value changes
@@ -59,10 +80,7 @@ def get_chain_starts(array, add_exclusive_stop=False):
     chain_starts = np.where(res_id_decrement | chain_id_changes)[0] + 1
     
     # The first chain is not included yet -> Insert '[0]'
-    if add_exclusive_stop:
-        return np.concatenate(([0], chain_starts, [array.array_length()]))
-    else:
-        return np.concatenate(([0], chain_starts))
+    return np.concatenate(([0], chain_starts, [array.array_length()]))
 
 
 def apply_chain_wise(array, data, function, axis=None):
@@ -99,6 +117,12 @@ def apply_chain_wise(array, data, function, axis=None):
         Chain-wise evaluation of `data` by `function`. The size of the
         first dimension of this array is equal to the amount of
         chains.
+
+    Notes
+    -----
+    Like for :func:`apply_residue_wise()`, common reductions such as
+    :func:`numpy.sum()` or :func:`numpy.mean()` are evaluated for all
+    chains in a single pass.
         
     See also
     --------
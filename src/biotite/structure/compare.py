@@ -9,8 +9,9 @@ comparing multiple structures with each other.
 
 __name__ = "biotite.structure"
 __author__ = "Patrick Kunzmann"
-__all__ = ["rmsd", "rmspd", "rmsf", "average"]
+__all__ = ["rmsd", "pairwise_rmsd", "rmspd", "rmsf", "average"]
 
+import functools
 import numpy as np
 from .atoms import Atom, AtomArray, AtomArrayStack, coord
 from .geometry import index_distance
@@ -71,6 +72,133 @@ def rmsd(reference, subject):
     """
     return np.sqrt(np.mean(_sq_euclidian(reference, subject), axis=-1))
 
+
+def pairwise_rmsd(atoms, block_size=128, executor=None):
+    r"""
+    Calculate the RMSD between all pairs of models after optimal
+    superimposition.
+
+    In contrast to :func:`rmsd()`, each pair of models is superimposed
+    onto each other before the RMSD is measured, i.e. the minimal RMSD
+    is calculated.
+    The result can be used for clustering of structure ensembles, e.g.
+    of the frames of a trajectory.
+
+    Parameters
+    ----------
+    atoms : AtomArrayStack or ndarray, dtype=float, shape=(m,n,3)
+        The models to be compared with each other.
+        Alternatively, coordinates can be provided directly as
+        :class:`ndarray`.
+    block_size : int, optional
+        The models are compared in blocks of
+        `block_size` x `block_size` pairs.
+        Larger values decrease the overhead of the computation, but
+        increase the memory consumption.
+    executor : concurrent.futures.Executor, optional
+        If given, the blocks are computed in parallel by this executor,
+        e.g. a :class:`concurrent.futures.ThreadPoolExecutor`.
+
+    Returns
+    -------
+    rmsd : ndarray, dtype=float, shape=(m*(m-1)/2,)
+        The condensed RMSD matrix:
+        Like for :func:`scipy.spatial.distance.pdist()`, the RMSD
+        between the models *i* and *j* with *i < j* is located at index
+        ``m * i + j - ((i + 2) * (i + 1)) // 2``.
+
+    See Also
+    --------
+    rmsd
+    superimpose
+
+    Notes
+    -----
+    The RMSD is computed without calculating the superimposed
+    coordinates, using the *quaternion characteristic polynomial* (QCP)
+    method :footcite:`Theobald2005, Liu2010`.
+    The inner products of all model pairs in a block are obtained via
+    a single matrix multiplication.
+
+    References
+    ----------
+
+    .. footbibliography::
+
+    Examples
+    --------
+
+    >>> ca = atom_array_stack[:, atom_array_stack.atom_name == "CA"]
+    >>> condensed = pairwise_rmsd(ca)
+    >>> # Compare to the RMSD of superimposed models
+    >>> superimposed, _ = superimpose(ca[0], ca[1:])
+    >>> print(np.allclose(condensed[:len(ca)-1], rmsd(ca[0], superimposed)))
+    True
+
+    The condensed matrix can be converted into a square matrix,
+    e.g. for clustering via :func:`biotite.sequence.phylo.upgma()`:
+
+    >>> n_models = len(ca)
+    >>> square = np.zeros((n_models, n_models))
+    >>> square[np.triu_indices(n_models, k=1)] = condensed
+    >>> square += square.T
+    >>> print(np.around(square[:4, :4], decimals=3))
+    [[0.000 0.784 1.008 0.552]
+     [0.784 0.000 0.530 0.765]
+     [1.008 0.530 0.000 0.972]
+     [0.552 0.765 0.972 0.000]]
+    """
+    coords = coord(atoms).astype(np.float64)
+    if coords.ndim != 3:
+        raise TypeError(
+            "Expected an AtomArrayStack or an ndarray with shape (m,n,3)"
+        )
+    if block_size < 1:
+        raise ValueError("The block size must be positive")
+    n_models, n_atoms, _ = coords.shape
+    coords = coords - np.mean(coords, axis=-2, keepdims=True)
+    # The inner products of each model with itself
+    sq_norms = np.sum(coords * coords, axis=(-2, -1))
+    # Shape (m*3, n):
+    # Rows (i*3, i*3+1, i*3+2) contain the x, y and z components of
+    # model i, so that the covariance matrices of multiple model pairs
+    # are computed via a single matrix multiplication
+    flat_coords = np.ascontiguousarray(
+        coords.transpose(0, 2, 1).reshape(n_models * 3, n_atoms)
+    )
+
+    condensed = np.zeros(n_models * (n_models - 1) // 2, dtype=np.float64)
+    block_starts = range(0, n_models, block_size)
+    blocks = [
+        (start_i, start_j)
+        for start_i in block_starts for start_j in block_starts
+        if start_j >= start_i
+    ]
+    compute_block = functools.partial(
+        _pairwise_rmsd_block, flat_coords, sq_norms, n_atoms,
+        block_size=block_size
+    )
+    if executor is None:
+        results = (compute_block(*block) for block in blocks)
+    else:
+        results = executor.map(compute_block, *zip(*blocks))
+    for (start_i, start_j), block_rmsd in zip(blocks, results):
+        indices_i, indices_j = np.meshgrid(
+            np.arange(start_i, start_i + block_rmsd.shape[0]),
+            np.arange(start_j, start_j + block_rmsd.shape[1]),
+            indexing="ij"
+        )
+        # Only pairs with i < j are part of the condensed matrix
+        mask = indices_i < indices_j
+        indices_i = indices_i[mask]
+        indices_j = indices_j[mask]
+        condensed[
+            n_models * indices_i + indices_j
+            - ((indices_i + 2) * (indices_i + 1)) // 2
+        ] = block_rmsd[mask]
+    return condensed
+
+
 def rmspd(reference, subject, periodic=False, box=None):
     r"""
     Calculate the RMSD of atom pair distances for given structures 
@@ -271,4 +399,96 @@ def _sq_euclidian(reference, subject):
             "Expected an AtomArray or an ndarray with shape (n,3) as reference"
         )
     dif = subject_coord - reference_coord
-    return vector_dot(dif, dif)
\ No newline at end of file
+    return vector_dot(dif, dif)
+
+
+def _pairwise_rmsd_block(flat_coords, sq_norms, n_atoms, start_i, start_j,
+                         block_size):
+    """
+    Calculate the minimal RMSD between the models
+    ``start_i:start_i+block_size`` and the models
+    ``start_j:start_j+block_size``.
+
+    `flat_coords` contains the centered coordinates of each model as
+    three consecutive rows.
+    """
+    rows_i = flat_coords[start_i*3 : (start_i+block_size)*3]
+    rows_j = flat_coords[start_j*3 : (start_j+block_size)*3]
+    n_i = len(rows_i) // 3
+    n_j = len(rows_j) // 3
+    # Cross-covariance matrices with shape (n_i, n_j, 3, 3)
+    cov = np.matmul(rows_i, rows_j.T) \
+        .reshape(n_i, 3, n_j, 3) \
+        .transpose(0, 2, 1, 3)
+    e0 = (
+        sq_norms[start_i : start_i+n_i, np.newaxis]
+        + sq_norms[np.newaxis, start_j : start_j+n_j]
+    ) / 2
+    max_eigenvalue = _qcp_max_eigenvalue(cov, e0)
+    return np.sqrt(np.abs(2 * (e0 - max_eigenvalue) / n_atoms))
+
+
+def _qcp_max_eigenvalue(cov, e0, max_iterations=50, precision=1e-11):
+    """
+    Find the largest eigenvalue of the key matrices of the QCP method
+    for the given cross-covariance matrices :footcite:`Liu2010`.
+
+    The eigenvalue is found via Newton's method on the characteristic
+    polynomial, starting from the upper bound `e0`.
+    """
+    s_xx, s_xy, s_xz = cov[..., 0, 0], cov[..., 0, 1], cov[..., 0, 2]
+    s_yx, s_yy, s_yz = cov[..., 1, 0], cov[..., 1, 1], cov[..., 1, 2]
+    s_zx, s_zy, s_zz = cov[..., 2, 0], cov[..., 2, 1], cov[..., 2, 2]
+    s_xx2, s_yy2, s_zz2 = s_xx * s_xx, s_yy * s_yy, s_zz * s_zz
+    s_xy2, s_yz2, s_xz2 = s_xy * s_xy, s_yz * s_yz, s_xz * s_xz
+    s_yx2, s_zy2, s_zx2 = s_yx * s_yx, s_zy * s_zy, s_zx * s_zx
+
+    # Coefficients of the characteristic polynomial
+    # x^4 + c2*x^2 + c1*x + c0
+    c2 = -2 * (
+        s_xx2 + s_yy2 + s_zz2 + s_xy2 + s_yx2 + s_xz2 + s_zx2 + s_yz2 + s_zy2
+    )
+    c1 = 8 * (
+        s_xx * s_yz * s_zy + s_yy * s_zx * s_xz + s_zz * s_xy * s_yx
+        - s_xx * s_yy * s_zz - s_yz * s_zx * s_xy - s_zy * s_yx * s_xz
+    )
+    syz_szy_m_syy_szz_2 = 2 * (s_yz * s_zy - s_yy * s_zz)
+    sxx2_syy2_szz2_syz2_szy2 = s_yy2 + s_zz2 - s_xx2 + s_yz2 + s_zy2
+    sxy2_sxz2_syx2_szx2 = s_xy2 + s_xz2 - s_yx2 - s_zx2
+    sxz_p_szx = s_xz + s_zx
+    syz_p_szy = s_yz + s_zy
+    sxy_p_syx = s_xy + s_yx
+    syz_m_szy = s_yz - s_zy
+    sxz_m_szx = s_xz - s_zx
+    sxy_m_syx = s_xy - s_yx
+    sxx_p_syy = s_xx + s_yy
+    sxx_m_syy = s_xx - s_yy
+    c0 = (
+        sxy2_sxz2_syx2_szx2 * sxy2_sxz2_syx2_szx2
+        + (sxx2_syy2_szz2_syz2_szy2 + syz_szy_m_syy_szz_2)
+        * (sxx2_syy2_szz2_syz2_szy2 - syz_szy_m_syy_szz_2)
+        + (-sxz_p_szx * syz_m_szy + sxy_m_syx * (sxx_m_syy - s_zz))
+        * (-sxz_m_szx * syz_p_szy + sxy_m_syx * (sxx_m_syy + s_zz))
+        + (-sxz_p_szx * syz_p_szy - sxy_p_syx * (sxx_p_syy - s_zz))
+        * (-sxz_m_szx * syz_m_szy - sxy_p_syx * (sxx_p_syy + s_zz))
+        + (sxy_p_syx * syz_p_szy + sxz_p_szx * (sxx_m_syy + s_zz))
+        * (-sxy_m_syx * syz_m_szy + sxz_p_szx * (sxx_p_syy + s_zz))
+        + (sxy_p_syx * syz_m_szy + sxz_m_szx * (sxx_m_syy - s_zz))
+        * (-sxy_m_syx * syz_p_szy + sxz_m_szx * (sxx_p_syy - s_zz))
+    )
+
+    eigenvalue = e0.copy()
+    for _ in range(max_iterations):
+        x2 = eigenvalue * eigenvalue
+        b = (x2 + c2) * eigenvalue
+        a = b + c1
+        denominator = 2 * x2 * eigenvalue + b + a
+        # Avoid division by zero for models without extent
+        delta = np.divide(
+            a * eigenvalue + c0, denominator,
+            out=np.zeros_like(eigenvalue), where=(denominator != 0)
+        )
+        eigenvalue -= delta
+        if np.all(np.abs(delta) <= np.abs(precision * eigenvalue)):
+            break
+    return eigenvalue
@@ -8,7 +8,7 @@ This module provides functions to calculate atomistic densities.
 
 __name__ = "biotite.structure"
 __author__ = "Daniel Bauer"
-__all__ = ["density"]
+__all__ = ["density", "DensityAccumulator"]
 
 import numpy as np
 from .atoms import coord
@@ -40,8 +40,11 @@ def density(atoms, selection=None, delta=1.0, bins=None,
         Bins for the RDF.
 
         - If `bins` is an `int`, it defines the number of bins.
-        - If `bins` is a sequence, it defines the bin edges, ignoring
-          the actual coordinates of the `atoms` selection.
+        - If `bins` is a sequence, each element defines the bins for
+          the respective dimension, either as number of bins or as bin
+          edges.
+          Bin edges ignore the actual coordinates of the `atoms`
+          selection.
         - If `bins` is a string, it defines the function used to
           calculate the bins.
 
@@ -69,8 +72,9 @@ def density(atoms, selection=None, delta=1.0, bins=None,
         A list containing the 3 arrays describing the bin edges.
     """
     coords = coord(atoms)
-    
-    is_stack = coords.ndim == 3
+    if selection is not None:
+        coords = coords[..., selection, :]
+    flat_coords = coords.reshape(-1, 3)
 
     # Define the grid for coordinate binning based on coordinates of
     # supplied atoms
@@ -80,35 +84,150 @@ def density(atoms, selection=None, delta=1.0, bins=None,
     # interest is in the center of the box, i.e. by centering the
     # investigated protein in the box.
     if bins is None:
-        if is_stack:
-            axis = (0, 1)
-        else:
-            axis = 0
-        grid_min, grid_max = np.min(
-            coords, axis=axis), np.max(coords, axis=axis
-        )
+        # The grid is based on all atoms, not only the selected ones
+        all_coords = coord(atoms).reshape(-1, 3)
+        grid_min = np.min(all_coords, axis=0)
+        grid_max = np.max(all_coords, axis=0)
         bins = [
             np.arange(grid_min[0], grid_max[0]+delta, delta),
             np.arange(grid_min[1], grid_max[1]+delta, delta),
             np.arange(grid_min[2], grid_max[2]+delta, delta),
         ]
-
-    if selection is None:
-        selected_coords = coords
     else:
-        selected_coords = coords[...,selection, :]
+        if isinstance(bins, (int, np.integer, str)):
+            bins = [bins] * 3
+        # Resolve the number of bins or binning method given for a
+        # dimension into the bin edges of this dimension
+        bins = [
+            np.histogram_bin_edges(flat_coords[:, dim].astype(float), bins[dim])
+            if isinstance(bins[dim], (int, np.integer, str))
+            else bins[dim]
+            for dim in range(3)
+        ]
 
-    # Reshape the coords into Nx3
-    coords = selected_coords.reshape((np.prod(selected_coords.shape[:-1]), 3))
+    accumulator = DensityAccumulator(bins, density=density)
+    accumulator.add(coords, weights)
+    return accumulator.result()
 
-    # We need a weight value per coordinate, but input might be per atom
-    if weights is not None:
-        if is_stack and len(weights.shape) < 2:
-            weights = np.tile(weights, len(selected_coords))
-        weights = weights.reshape(coords.shape[0])
-    
-    # Calculate the histogram
-    hist = np.histogramdd(
-        coords, bins=bins, density=density, weights=weights
-    )
-    return hist
+
+class DensityAccumulator:
+    r"""
+    __init__(bins, selection=None, density=False)
+
+    Accumulate the density of the selected atoms over chunks of frames,
+    e.g. from a trajectory that is too large to be loaded into memory
+    at once.
+
+    The frames are added successively via :meth:`add()`.
+    Only the running 3D histogram is kept, hence the memory
+    requirement is independent of the number of frames.
+    In contrast to :func:`density()`, the grid cannot be derived from
+    the coordinates, since not all frames are known in advance.
+
+    Parameters
+    ----------
+    bins : sequence of ndarray or ndarray, shape=(3,k)
+        The bin edges for each of the three dimensions.
+    selection : ndarray, dtype=bool, shape=(n,), optional
+        Boolean mask for the atoms given to :meth:`add()` to calculate
+        the density only on a set of atoms.
+    density : boolean, optional
+        If False, the (weighted) number of samples in each bin is
+        returned by :meth:`result()`.
+        Otherwise, the probability density function of each bin is
+        returned.
+
+    See also
+    --------
+    density
+
+    Examples
+    --------
+    Calculate the density of water oxygen atoms on a 1 Å grid
+    spanning the box of a trajectory:
+
+    .. code-block:: python
+
+        edges = [np.arange(0, 50 + 1.0, 1.0)] * 3
+        accumulator = DensityAccumulator(edges, selection=is_water_oxygen)
+        for chunk in XTCFile.read_iter_structure(
+            "trajectory.xtc", template, stack_size=100
+        ):
+            accumulator.add(chunk)
+        hist, edges = accumulator.result()
+    """
+
+    def __init__(self, bins, selection=None, density=False):
+        self._edges = [np.asarray(edges, dtype=float) for edges in bins]
+        if len(self._edges) != 3:
+            raise IndexError(
+                f"Expected bin edges for 3 dimensions, "
+                f"but got {len(self._edges)}"
+            )
+        self._selection = selection
+        self._density = density
+        self._hist = np.zeros(
+            [len(edges) - 1 for edges in self._edges], dtype=float
+        )
+
+    def add(self, atoms, weights=None):
+        """
+        add(atoms, weights=None)
+
+        Add the positions of the given atoms to the density.
+
+        Parameters
+        ----------
+        atoms : AtomArray or AtomArrayStack or ndarray, shape=(n,3) or shape=(m,n,3)
+            The atoms to be added.
+            Alternatively, the coordinates can be directly provided as
+            `ndarray`, e.g. from :meth:`TrajectoryFile.read_iter()`.
+        weights: ndarray, shape=(n,) or shape=(m,n), optional
+            An array of values to weight the contribution of *n* atoms
+            in *m* models.
+            If the shape is *(n,)*, the weights will be interpreted as
+            *per atom*.
+            A shape of *(m,n)* allows to additionally weight atoms on a
+            *per model* basis.
+            The weights refer to the selected atoms.
+        """
+        coords = coord(atoms)
+        if self._selection is not None:
+            coords = coords[..., self._selection, :]
+        # Reshape the coords into Nx3
+        flat_coords = coords.reshape(-1, 3)
+
+        # We need a weight value per coordinate, but input might be per
+        # atom
+        if weights is not None:
+            weights = np.asarray(weights)
+            if coords.ndim == 3 and weights.ndim < 2:
+                weights = np.tile(weights, len(coords))
+            weights = weights.reshape(flat_coords.shape[0])
+
+        self._hist += np.histogramdd(
+            flat_coords, bins=self._edges, weights=weights
+        )[0]
+
+    def result(self):
+        """
+        result()
+
+        Get the density of all frames added so far.
+
+        Returns
+        -------
+        H : ndarray, dtype=float
+            The threedimensional histogram of the selected atoms.
+        edges : list of ndarray, dtype=float
+            A list containing the 3 arrays describing the bin edges.
+        """
+        hist = self._hist.copy()
+        if self._density:
+            # Same normalization as in 'numpy.histogramdd()'
+            hist /= hist.sum()
+            for dim, edges in enumerate(self._edges):
+                shape = np.ones(3, dtype=int)
+                shape[dim] = len(edges) - 1
+                hist /= np.diff(edges).reshape(shape)
+        return hist, [edges.copy() for edges in self._edges]
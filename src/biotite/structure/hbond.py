@@ -20,7 +20,7 @@ from .celllist import CellList
 def hbond(atoms, selection1=None, selection2=None, selection1_type='both',
           cutoff_dist=2.5, cutoff_angle=120,
           donor_elements=('O', 'N', 'S'), acceptor_elements=('O', 'N', 'S'),
-          periodic=False):
+          periodic=False, sparse=False):
     r"""
     Find hydrogen bonds in a structure using the Baker-Hubbard
     algorithm. :footcite:`Baker1984`
@@ -60,6 +60,13 @@ def hbond(atoms, selection1=None, selection2=None, selection1_type='both',
         boundary conditions.
         The `box` attribute of `atoms` is required in this case.
         (Default: False).
+    sparse : bool, optional
+        If true, the hydrogen bonds in an :class:`AtomArrayStack` are
+        not returned as dense `mask`, but as `indices` of the models
+        and triplets, where a hydrogen bond is present.
+        This saves memory for structures with many models, as most
+        hydrogen bonds are only present in a few models.
+        (Default: False).
         
     Returns
     -------
@@ -73,7 +80,17 @@ def hbond(atoms, selection1=None, selection2=None, selection1_type='both',
     mask : ndarry, dtype=bool, shape=(m,n)
         *m x n* matrix that shows if an interaction with index *n* in
         `triplets` is present in the model *m* of the input `atoms`.
-        Only returned if `atoms` is an :class:`AtomArrayStack`.
+        Only returned if `atoms` is an :class:`AtomArrayStack` and
+        `sparse` is false.
+    indices : ndarray, dtype=int, shape=(k,2)
+        Each row contains the index of a model in `atoms` and the index
+        of a triplet, whose hydrogen bond is present in this model.
+        The rows are sorted by the model index.
+        This is the sparse representation of `mask`, i.e.
+        ``mask[indices[:,0], indices[:,1]]`` is ``True`` and all other
+        elements of `mask` are ``False``.
+        Only returned if `atoms` is an :class:`AtomArrayStack` and
+        `sparse` is true.
     
     Notes
     -----
@@ -84,6 +101,14 @@ def hbond(atoms, selection1=None, selection2=None, selection1_type='both',
     For example, a nitrogen atom with positive charge could be
     considered as acceptor atom by this method, although this does
     make sense from a chemical perspective.
+
+    The hydrogen bonds are identified for each model separately.
+    Hence, the memory requirement of this function scales with the
+    number of hydrogen bond candidates in a single model, if `sparse`
+    is true.
+    To analyze a trajectory that is too large to be loaded at once,
+    :meth:`TrajectoryFile.analyze()` can be used in conjunction with a
+    :class:`FrequencyReducer`.
         
     Examples
     --------
@@ -116,6 +141,15 @@ def hbond(atoms, selection1=None, selection2=None, selection1_type='both',
         A      16  ARG N      N         8.043   -1.206   -1.866
         A       6  TRP NE1    N         3.420    0.332   -0.121
 
+    The same information can be obtained from the sparse
+    representation:
+
+    >>> triplets, indices = hbond(atom_array_stack, sparse=True)
+    >>> hbonds_per_model = np.bincount(indices[:,0])
+    >>> print(hbonds_per_model)
+    [14 14 14 12 11 12  9 13  9 14 13 13 14 11 11 12 11 14 14 13 14 13 15 17
+     14 12 15 12 12 13 13 13 12 12 11 14 10 11]
+
     See Also
     --------
     hbond_frequency
@@ -180,27 +214,33 @@ def hbond(atoms, selection1=None, selection2=None, selection1_type='both',
         ]
         
         all_comb_triplets = []
-        all_comb_mask = []
+        all_comb_indices = []
+        triplet_count = 0
         for selection_index1, selection_index2 in selection_combinations:
             donor_mask = selections[selection_index1]
             acceptor_mask = selections[selection_index2]
             if  np.count_nonzero(donor_mask) != 0 and \
                 np.count_nonzero(acceptor_mask) != 0:
-                    # Calculate triplets and mask
-                    triplets, mask = _hbond(
+                    # Calculate triplets and model indices
+                    triplets, indices = _hbond(
                         atoms, donor_mask, acceptor_mask,
                         donor_element_mask, acceptor_element_mask,
                         cutoff_dist, cutoff_angle,
                         box
                     )
+                    # Triplet indices refer to the merged triplets
+                    indices[:, 1] += triplet_count
+                    triplet_count += len(triplets)
                     all_comb_triplets.append(triplets)
-                    all_comb_mask.append(mask)
+                    all_comb_indices.append(indices)
         # Merge results from all combinations
         triplets = np.concatenate(all_comb_triplets, axis=0)
-        mask = np.concatenate(all_comb_mask, axis=1)
+        indices = np.concatenate(all_comb_indices, axis=0)
+        # Sort by model again
+        indices = indices[np.lexsort((indices[:, 1], indices[:, 0]))]
 
     elif selection1_type == 'donor':
-        triplets, mask = _hbond(
+        triplets, indices = _hbond(
             atoms, selection1, selection2,
             donor_element_mask, acceptor_element_mask,
             cutoff_dist, cutoff_angle,
@@ -208,7 +248,7 @@ def hbond(atoms, selection1=None, selection2=None, selection1_type='both',
         )
     
     elif selection1_type == 'acceptor':
-        triplets, mask = _hbond(
+        triplets, indices = _hbond(
             atoms, selection2, selection1,
             donor_element_mask, acceptor_element_mask,
             cutoff_dist, cutoff_angle,
@@ -224,7 +264,11 @@ def hbond(atoms, selection1=None, selection2=None, selection1_type='both',
         # since all interaction are in the one model
         # -> Simply return triplets without hbond_mask
         return triplets
+    elif sparse:
+        return triplets, indices
     else:
+        mask = np.zeros((atoms.stack_depth(), len(triplets)), dtype=bool)
+        mask[indices[:, 0], indices[:, 1]] = True
         return triplets, mask
 
 
@@ -252,57 +296,61 @@ def _hbond(atoms, donor_mask, acceptor_mask,
     donor_h_i = np.where(donor_h_mask)[0]
     acceptor_i = np.where(acceptor_mask)[0]
     if len(donor_h_i) == 0 or len(acceptor_i) == 0:
-        # Return empty triplets and mask
-        return (
-            np.zeros((0,3), dtype=int),
-            np.zeros((atoms.stack_depth(),0), dtype=bool)
-        )
+        # Return empty triplets and indices
+        return np.zeros((0,3), dtype=int), np.zeros((0,2), dtype=int)
     
     # Narrow the amount of possible acceptor to donor-H connections
     # down via the distance cutoff parameter using a cell list
-    # Save in acceptor-to-hydrogen matrix
-    # (true when distance smaller than cutoff)
+    # and check the hydrogen bond criteria for these candidates
+    # in each model separately
+    # Save the found acceptor-to-hydrogen pairs as codes
+    # 'acceptor * n_donor_h + donor_h' to unite them over all models
     coord = atoms.coord
-    possible_bonds = np.zeros(
-        (len(acceptor_i), len(donor_h_i)),
-        dtype=bool
-    )
+    bond_codes = []
     periodic = False if box is None else True
+    # The cell list is created only once and updated for each model
+    cell_list = CellList(
+        coord[:, donor_h_mask], cell_size=cutoff_dist,
+        periodic=periodic, box=box
+    )
     for model_i in range(atoms.stack_depth()):
-        donor_h_coord = coord[model_i, donor_h_mask]
-        acceptor_coord = coord[model_i, acceptor_mask]
+        model_coord = coord[model_i]
         box_for_model = box[model_i] if box is not None else None
-        cell_list = CellList(
-            donor_h_coord, cell_size=cutoff_dist,
-            periodic=periodic, box=box_for_model
+        if model_i > 0:
+            cell_list.update(model_coord[donor_h_mask], box=box_for_model)
+        pairs = cell_list.get_atom_pairs_in_cells(model_coord[acceptor_mask])
+        candidate_acceptor_i = acceptor_i[pairs[:, 0]]
+        candidate_donor_h_i = donor_h_i[pairs[:, 1]]
+        candidate_donor_i = associated_donor_indices[candidate_donor_h_i]
+        is_hbond = _is_hbond(
+            model_coord[candidate_donor_i],
+            model_coord[candidate_donor_h_i],
+            model_coord[candidate_acceptor_i],
+            box_for_model, cutoff_dist=cutoff_dist, cutoff_angle=cutoff_angle
         )
-        possible_bonds |= cell_list.get_atoms_in_cells(
-            acceptor_coord, as_mask=True
-        )
-    possible_bonds_i = np.where(possible_bonds)
-    # Narrow down
-    acceptor_i = acceptor_i[possible_bonds_i[0]]
-    donor_h_i = donor_h_i[possible_bonds_i[1]]
+        # Remove entries where donor and acceptor are the same
+        is_hbond &= (candidate_donor_i != candidate_acceptor_i)
+        pairs = pairs[is_hbond]
+        bond_codes.append(np.unique(
+            pairs[:, 0].astype(np.int64) * len(donor_h_i) + pairs[:, 1]
+        ))
+    model_indices = np.repeat(
+        np.arange(atoms.stack_depth()),
+        [len(codes) for codes in bond_codes]
+    )
+    # Triplets counted in at least one model
+    unique_bond_codes, triplet_indices = np.unique(
+        np.concatenate(bond_codes), return_inverse=True
+    )
     
     # Build D-H..A triplets
+    acceptor_i = acceptor_i[unique_bond_codes // len(donor_h_i)]
+    donor_h_i = donor_h_i[unique_bond_codes % len(donor_h_i)]
     donor_i = associated_donor_indices[donor_h_i]
     triplets = np.stack((donor_i, donor_h_i, acceptor_i), axis=1)
-    # Remove entries where donor and acceptor are the same
-    triplets = triplets[donor_i != acceptor_i]
-    
-    hbond_mask = _is_hbond(
-        coord[:, triplets[:,0]],  # donors
-        coord[:, triplets[:,1]],  # donor hydrogens
-        coord[:, triplets[:,2]],  # acceptors
-        box, cutoff_dist=cutoff_dist, cutoff_angle=cutoff_angle
-    )
-
-    # Reduce output to contain only triplets counted at least once
-    is_counted = hbond_mask.any(axis=0)
-    triplets = triplets[is_counted]
-    hbond_mask = hbond_mask[:, is_counted]
+    indices = np.stack((model_indices, triplet_indices), axis=1)
 
-    return triplets, hbond_mask
+    return triplets, indices
 
 
 def _get_bonded_h(array, donor_mask, bonds):
@@ -316,13 +364,10 @@ def _get_bonded_h(array, donor_mask, bonds):
     donor_hydrogen_mask = np.zeros(len(array), dtype=bool)
     associated_donor_indices = np.full(len(array), -1, dtype=int)
 
-    all_bond_indices, _ = bonds.get_all_bonds()
     donor_indices = np.where(donor_mask)[0]
     
     for donor_i in donor_indices:
-        bonded_indices = all_bond_indices[donor_i]
-        # Remove padding values
-        bonded_indices = bonded_indices[bonded_indices != -1]
+        bonded_indices, _ = bonds.get_bonds(donor_i)
         # Filter hydrogen atoms
         bonded_indices = bonded_indices[hydrogen_mask[bonded_indices]]
         donor_hydrogen_mask[bonded_indices] = True
@@ -20,6 +20,8 @@ INDEX_COLUMN_NAME = {
 _ccd_block = None
 # For each category this index gives the start and stop for each residue
 _residue_index = {}
+# For each category the already decoded columns
+_column_cache = {}
 
 
 def get_ccd():
@@ -30,6 +32,11 @@ def get_ccd():
     -------
     ccd : BinaryCIFFile
         The CCD.
+
+    Notes
+    -----
+    The CCD file is memory mapped, i.e. only the categories and columns
+    that are actually accessed are read and decoded.
     """
     # Avoid circular import
     from ..io.pdbx.bcif import BinaryCIFFile
@@ -62,34 +69,123 @@ def get_from_ccd(category_name, comp_id, column_name=None):
     value : ndarray or dict or None
         The array of the given column or all columns as dictionary.
         ``None`` if the `comp_id` is not found in the category.
+
+    Notes
+    -----
+    Only the category given by `category_name` is loaded from the CCD.
+    Each column is decoded only once, when it is requested for the
+    first time.
     """
-    global _residue_index
-    ccd = get_ccd()
-    category = ccd[category_name]
-    if category_name not in _residue_index:
-        _residue_index[category_name] = _index_residues(
-            category[INDEX_COLUMN_NAME[category_name]].as_array()
-        )
     try:
-        start, stop = _residue_index[category_name][comp_id]
+        start, stop = _get_residue_index(category_name)[comp_id]
     except KeyError:
         return None
 
     if column_name is None:
         return {
-            col_name: category[col_name].as_array()[start:stop]
-            for col_name in category.keys()
+            col_name: _get_column(category_name, col_name)[start:stop]
+            for col_name in get_ccd()[category_name].keys()
         }
     else:
-        return category[column_name].as_array()[start:stop]
+        return _get_column(category_name, column_name)[start:stop]
+
+
+def _get_column(category_name, column_name):
+    """
+    Get the decoded column from the CCD and cache it for subsequent
+    calls.
+    """
+    columns = _column_cache.setdefault(category_name, {})
+    if column_name not in columns:
+        columns[column_name] \
+            = get_ccd()[category_name][column_name].as_array()
+    return columns[column_name]
+
+
+def _get_residue_index(category_name):
+    """
+    Get the index that maps each residue to its start and stop in the
+    given category.
+    """
+    global _residue_index
+    if category_name not in _residue_index:
+        # Use the index created together with the CCD, if it is
+        # consistent with the CCD
+        index = _read_residue_index(
+            CCD_DIR / "components_index.npz", category_name
+        )
+        if index is None:
+            index = _index_residues(_get_column(
+                category_name, INDEX_COLUMN_NAME[category_name]
+            ))
+        comp_ids, starts = index
+        _residue_index[category_name] = dict(zip(
+            comp_ids.tolist(), zip(starts[:-1].tolist(), starts[1:].tolist())
+        ))
+    return _residue_index[category_name]
+
+
+def _read_residue_index(file_path, category_name):
+    """
+    Read the residue IDs and residue starts of the given category from
+    an index file written by :func:`_write_residue_index()`.
+
+    ``None`` is returned, if the file does not exist or if it does not
+    fit the row count of the category in the CCD, e.g. because only
+    one of both files was updated.
+    """
+    if not file_path.exists():
+        return None
+    with np.load(file_path, allow_pickle=False) as index_file:
+        try:
+            comp_ids = index_file[f"{category_name}.comp_id"]
+            starts = index_file[f"{category_name}.start"]
+            row_count = index_file[f"{category_name}.row_count"].item()
+        except KeyError:
+            return None
+    if row_count != get_ccd()[category_name].row_count \
+            or starts[-1] != row_count:
+        return None
+    return comp_ids, starts
+
+
+def _write_residue_index(block, file_name):
+    """
+    Write the start and stop of each residue in each category of
+    :data:`INDEX_COLUMN_NAME` into a file.
+
+    This index is loaded by :func:`get_from_ccd()` and avoids scanning
+    the ID column of the respective category at runtime.
+
+    Parameters
+    ----------
+    block : BinaryCIFBlock
+        The block containing the concatenated categories.
+    file_name : Path or str
+        The path of the output ``.npz`` file.
+        For each category the residue IDs are stored as
+        ``<category>.comp_id``, the residue starts are stored as
+        ``<category>.start`` and the number of rows of the category
+        is stored as ``<category>.row_count``.
+        The final start is the exclusive stop of the last residue.
+    """
+    index = {}
+    for category_name, column_name in INDEX_COLUMN_NAME.items():
+        comp_ids, starts = _index_residues(
+            block[category_name][column_name].as_array()
+        )
+        index[f"{category_name}.comp_id"] = comp_ids
+        index[f"{category_name}.start"] = starts
+        index[f"{category_name}.row_count"] = block[category_name].row_count
+    np.savez(file_name, **index)
 
 
 def _index_residues(id_column):
+    """
+    Get the residue IDs and residue starts of the given CCD column.
+
+    The final start is the exclusive stop of the last residue.
+    """
     residue_starts = np.where(id_column[:-1] != id_column[1:])[0] + 1
-    # The final start is the exclusive stop of last residue
     residue_starts = np.concatenate(([0], residue_starts, [len(id_column)]))
-    index = {}
-    for i in range(len(residue_starts)-1):
-        comp_id = id_column[residue_starts[i]].item()
-        index[comp_id] = (residue_starts[i], residue_starts[i+1])
-    return index
\ No newline at end of file
+    return id_column[residue_starts[:-1]], residue_starts
@@ -25,6 +25,22 @@ loaded, if `mdtraj` is installed.
 __name__ = "biotite.structure.io"
 __author__ = "Patrick Kunzmann"
 
-from .ctab import *
-from .general import *
-from .trajfile import *
\ No newline at end of file
+# The modules are only imported when one of their attributes is accessed
+# for the first time, to keep 'import biotite.structure.io' fast
+from ...lazy import attach_lazy_modules as _attach_lazy_modules
+__getattr__, __dir__, __all__ = _attach_lazy_modules(
+    __name__, globals(),
+    {
+        "ctab": ["read_structure_from_ctab", "write_structure_to_ctab"],
+        "general": ["load_structure", "save_structure"],
+        "reducer": [
+            "Reducer", "ConcatenationReducer", "MeanReducer",
+            "HistogramReducer", "FrequencyReducer"
+        ],
+        "trajfile": ["TrajectoryFile"],
+    },
+    subpackages=[
+        "dcd", "gro", "mmtf", "mol", "netcdf", "npz", "pdb", "pdbqt",
+        "pdbx", "tng", "trr", "xtc"
+    ]
+)
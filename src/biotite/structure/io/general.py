@@ -221,6 +221,12 @@ def save_structure(file_path, array, **kwargs):
 def _as_single_model_if_possible(atoms):
     if isinstance(atoms, AtomArrayStack) and atoms.stack_depth() == 1:
         # Stack containing only one model -> return as atom array
-        return atoms[0]
+        array = atoms[0]
+        # As the stack is discarded, the array can take over its
+        # annotation arrays instead of sharing them read-only
+        for category in atoms.get_annotation_categories():
+            array.set_annotation(category, atoms.get_annotation(category))
+        array.bonds = atoms.bonds
+        return array
     else:
         return atoms
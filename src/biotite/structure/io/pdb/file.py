@@ -8,10 +8,12 @@ __all__ = ["PDBFile"]
 
 import warnings
 import numpy as np
-from ...atoms import AtomArray, AtomArrayStack, repeat
+from ...atoms import (
+    AtomArray, AtomArrayStack, repeat, _read_only_annotations, _array_view
+)
 from ...bonds import BondList, connect_via_residue_names
 from ...box import vectors_from_unitcell, unitcell_from_vectors
-from ....file import TextFile, InvalidFileError
+from ....file import TextFile, InvalidFileError, is_open_compatible, is_text
 from ...repair import infer_elements
 from ...error import BadStructureError
 from ...filter import (
@@ -20,9 +22,18 @@ from ...filter import (
     filter_solvent,
 )
 from ...util import matrix_rotate
-from .hybrid36 import encode_hybrid36, decode_hybrid36, max_hybrid36_number
+from .hybrid36 import (
+    encode_hybrid36,
+    decode_hybrid36,
+    max_hybrid36_number,
+    _decode_hybrid36_array,
+)
 
 
+_LINE_LENGTH = 80
+# Lookup tables for formatting coordinates, created on first use
+_number_table_cache = {}
+
 # slice objects for readability
 # ATOM/HETATM
 _record = slice(0, 6)
@@ -234,35 +245,15 @@ class PDBFile(TextFile):
         True
         """
         if model is None:
-            coord = np.zeros(
-                (len(self._model_start_i), self._get_model_length(), 3),
-                dtype=np.float32
+            chars = self._get_atom_chars(self._get_atom_record_indices())
+            return _parse_coord(chars).reshape(
+                len(self._model_start_i), self._get_model_length(), 3
             )
-            m = 0
-            i = 0
-            for line_i in self._atom_line_i:
-                if (
-                    m < len(self._model_start_i)-1
-                    and line_i > self._model_start_i[m+1]
-                ):
-                    m += 1
-                    i = 0
-                line = self.lines[line_i]
-                coord[m,i,0] = float(line[_coord_x])
-                coord[m,i,1] = float(line[_coord_y])
-                coord[m,i,2] = float(line[_coord_z])
-                i += 1
-            return coord
-
         else:
-            coord_i = self._get_atom_record_indices_for_model(model)
-            coord = np.zeros((len(coord_i), 3), dtype=np.float32)
-            for i, line_i in enumerate(coord_i):
-                line = self.lines[line_i]
-                coord[i,0] = float(line[_coord_x])
-                coord[i,1] = float(line[_coord_y])
-                coord[i,2] = float(line[_coord_z])
-            return coord
+            chars = self._get_atom_chars(
+                self._get_atom_record_indices_for_model(model)
+            )
+            return _parse_coord(chars)
 
 
     def get_b_factor(self, model=None):
@@ -296,31 +287,15 @@ class PDBFile(TextFile):
         *altloc* IDs, while `get_b_factor()` does not.
         """
         if model is None:
-            b_factor = np.zeros(
-                (len(self._model_start_i), self._get_model_length()),
-                dtype=np.float32
+            chars = self._get_atom_chars(self._get_atom_record_indices())
+            return _parse_float(chars[:, _temp_f]).astype(np.float32).reshape(
+                len(self._model_start_i), self._get_model_length()
             )
-            m = 0
-            i = 0
-            for line_i in self._atom_line_i:
-                if (
-                    m < len(self._model_start_i)-1
-                    and line_i > self._model_start_i[m+1]
-                ):
-                    m += 1
-                    i = 0
-                line = self.lines[line_i]
-                b_factor[m,i] = float(line[_temp_f])
-                i += 1
-            return b_factor
-
         else:
-            b_factor_i = self._get_atom_record_indices_for_model(model)
-            b_factor = np.zeros(len(b_factor_i), dtype=np.float32)
-            for i, line_i in enumerate(b_factor_i):
-                line = self.lines[line_i]
-                b_factor[i] = float(line[_temp_f])
-            return b_factor
+            chars = self._get_atom_chars(
+                self._get_atom_record_indices_for_model(model)
+            )
+            return _parse_float(chars[:, _temp_f]).astype(np.float32)
 
 
     def get_structure(self, model=None, altloc="first", extra_fields=[],
@@ -377,84 +352,59 @@ class PDBFile(TextFile):
             depth = len(self._model_start_i)
             length = self._get_model_length()
             array = AtomArrayStack(depth, length)
-            # Record indices for annotation determination
-            # Annotation is determined from model 1
-            annot_i = self._get_atom_record_indices_for_model(1)
-            # Record indices for coordinate determination
-            coord_i = self._atom_line_i
+            # The records of all models are parsed at once for the
+            # coordinates, the annotations are taken from model 1,
+            # i.e. the first records
+            chars = self._get_atom_chars(self._get_atom_record_indices())
+            annot_chars = chars[:length]
+            array.coord = _parse_coord(chars).reshape(depth, length, 3)
 
         else:
-            annot_i = coord_i = self._get_atom_record_indices_for_model(model)
-            array = AtomArray(len(coord_i))
-
-        # Create mandatory and optional annotation arrays
-        chain_id  = np.zeros(array.array_length(), array.chain_id.dtype)
-        res_id    = np.zeros(array.array_length(), array.res_id.dtype)
-        ins_code  = np.zeros(array.array_length(), array.ins_code.dtype)
-        res_name  = np.zeros(array.array_length(), array.res_name.dtype)
-        hetero    = np.zeros(array.array_length(), array.hetero.dtype)
-        atom_name = np.zeros(array.array_length(), array.atom_name.dtype)
-        element   = np.zeros(array.array_length(), array.element.dtype)
-        atom_id_raw = np.zeros(array.array_length(), "U5")
-        charge_raw  = np.zeros(array.array_length(), "U2")
-        occupancy = np.zeros(array.array_length(), float)
-        b_factor  = np.zeros(array.array_length(), float)
-        altloc_id = np.zeros(array.array_length(), dtype="U1")
-
-        # Fill annotation array
-        # i is index in array, line_i is line index
-        for i, line_i in enumerate(annot_i):
-            line = self.lines[line_i]
-            chain_id[i] = line[_chain_id].strip()
-            res_id[i] = decode_hybrid36(line[_res_id])
-            ins_code[i] = line[_ins_code].strip()
-            res_name[i] = line[_res_name].strip()
-            hetero[i] = line[_record] == "HETATM"
-            atom_name[i] = line[_atom_name].strip()
-            element[i] = line[_element].strip()
-            altloc_id[i] = line[_alt_loc]
-            atom_id_raw[i] = line[_atom_id]
-            # turn "1-" into "-1", if necessary
-            if line[_charge][0] in "+-":
-                charge_raw[i] = line[_charge]
-            else:
-                charge_raw[i] = line[_charge][::-1]
-            occupancy[i] = float(line[_occupancy].strip())
-            b_factor[i] = float(line[_temp_f].strip())
+            chars = self._get_atom_chars(
+                self._get_atom_record_indices_for_model(model)
+            )
+            annot_chars = chars
+            array = AtomArray(len(chars))
+            array.coord = _parse_coord(chars)
+
+        # Fill annotation arrays column-wise
+        array.chain_id = _parse_string(annot_chars[:, _chain_id])
+        array.res_id = _decode_hybrid36_array(annot_chars[:, _res_id])
+        array.ins_code = _parse_string(annot_chars[:, _ins_code])
+        array.res_name = _parse_string(annot_chars[:, _res_name])
+        array.hetero = np.all(
+            annot_chars[:, _record] == np.frombuffer(b"HETATM", np.uint8),
+            axis=-1
+        )
+        array.atom_name = _parse_string(annot_chars[:, _atom_name])
+        array.element = _parse_string(annot_chars[:, _element])
+        # Unlike the other string annotations, the altloc ID is not
+        # stripped, i.e. a missing altloc ID is represented by ' '
+        altloc_id = _as_strings(annot_chars[:, _alt_loc])
+        occupancy = _parse_float(annot_chars[:, _occupancy])
 
         if include_bonds or \
             (extra_fields is not None and "atom_id" in extra_fields):
                 # The atom IDs are only required in these two cases
-                atom_id = np.array(
-                    [decode_hybrid36(raw_id.item()) for raw_id in atom_id_raw],
-                    dtype=int
-                )
+                atom_id = _decode_hybrid36_array(annot_chars[:, _atom_id])
         else:
             atom_id = None
 
-        # Add annotation arrays to atom array (stack)
-        array.chain_id = chain_id
-        array.res_id = res_id
-        array.ins_code = ins_code
-        array.res_name = res_name
-        array.hetero = hetero
-        array.atom_name = atom_name
-        array.element = element
-
         for field in (extra_fields if extra_fields is not None else []):
             if field == "atom_id":
                 # Copy is necessary to avoid double masking in
                 # later altloc ID filtering
                 array.set_annotation("atom_id", atom_id.copy())
             elif field == "charge":
-                charge = np.array(charge_raw)
-                array.set_annotation("charge", np.where(
-                    charge == "  ", "0", charge
-                ).astype(int))
+                array.set_annotation(
+                    "charge", _parse_charge(annot_chars[:, _charge])
+                )
             elif field == "occupancy":
                 array.set_annotation("occupancy", occupancy)
             elif field == "b_factor":
-                array.set_annotation("b_factor", b_factor)
+                array.set_annotation(
+                    "b_factor", _parse_float(annot_chars[:, _temp_f])
+                )
             else:
                 raise ValueError(f"Unknown extra field: {field}")
 
@@ -470,27 +420,6 @@ class PDBFile(TextFile):
                 array.atom_name[empty_element_mask]
             )
 
-        # Fill in coordinates
-        if isinstance(array, AtomArray):
-            for i, line_i in enumerate(coord_i):
-                line = self.lines[line_i]
-                array.coord[i, 0] = float(line[_coord_x])
-                array.coord[i, 1] = float(line[_coord_y])
-                array.coord[i, 2] = float(line[_coord_z])
-
-        elif isinstance(array, AtomArrayStack):
-            m = 0
-            i = 0
-            for line_i in self._atom_line_i:
-                if m < len(self._model_start_i)-1 and line_i > self._model_start_i[m+1]:
-                    m += 1
-                    i = 0
-                line = self.lines[line_i]
-                array.coord[m, i, 0] = float(line[_coord_x])
-                array.coord[m, i, 1] = float(line[_coord_y])
-                array.coord[m, i, 2] = float(line[_coord_z])
-                i += 1
-
         # Fill in box vectors
         # PDB does not support changing box dimensions. CRYST1 is a one-time
         # record so we can extract it directly
@@ -522,20 +451,12 @@ class PDBFile(TextFile):
                 break
 
         # Filter altloc IDs
-        if altloc == "occupancy":
-            filter = filter_highest_occupancy_altloc(
-                array, altloc_id, occupancy
-            )
-            array = array[..., filter]
-            atom_id = atom_id[filter] if atom_id is not None else None
-        elif altloc == "first":
-            filter = filter_first_altloc(array, altloc_id)
-            array = array[..., filter]
-            atom_id = atom_id[filter] if atom_id is not None else None
-        elif altloc == "all":
+        filter = _get_altloc_filter(array, altloc_id, occupancy, altloc)
+        if filter is None:
             array.set_annotation("altloc_id", altloc_id)
         else:
-            raise ValueError(f"'{altloc}' is not a valid 'altloc' option")
+            array = array[..., filter]
+            atom_id = atom_id[filter] if atom_id is not None else None
 
         # Read bonds
         if include_bonds:
@@ -546,6 +467,129 @@ class PDBFile(TextFile):
         return array
 
 
+    @staticmethod
+    def read_iter_structure(file, altloc="first", extra_fields=[]):
+        """
+        Create an iterator over each model of the given PDB file.
+
+        In contrast to :meth:`read()` and :meth:`get_structure()`,
+        only the lines of the current model are kept in memory and
+        each model is returned as separate :class:`AtomArray`.
+        All returned :class:`AtomArray` objects share the same
+        annotation arrays, that are parsed only once from the first
+        model.
+        Only the coordinates are newly parsed for each model.
+        Hence, this static method is suitable for files with a large
+        number of models, e.g. NMR or cryo-EM ensembles or docking
+        results.
+
+        Parameters
+        ----------
+        file : file-like object or str
+            The file to be read.
+            Alternatively a file path can be supplied.
+        altloc : {'first', 'occupancy', 'all'}
+            This parameter defines how *altloc* IDs are handled, as
+            described in :meth:`get_structure()`.
+            The selection is based on the first model and applied to
+            all models.
+        extra_fields : list of str, optional
+            The strings in the list are optional annotation categories
+            that should be stored in the output arrays.
+            These are valid values:
+            ``'atom_id'``, ``'b_factor'``, ``'occupancy'`` and
+            ``'charge'``.
+
+        Yields
+        ------
+        array : AtomArray
+            The structure of the current model.
+
+        See also
+        --------
+        get_structure
+
+        Notes
+        -----
+        Like in a :class:`AtomArrayStack` the annotations of the first
+        model apply to all models, hence all models must have the same
+        atoms.
+        The shared annotation arrays are read-only and copied on write
+        (see :meth:`AtomArrayStack.get_array()`).
+
+        Bonds are not read, as the *CONECT* records are located at the
+        end of the file.
+        If required, they can be created with
+        :func:`connect_via_residue_names()` from the first model and
+        assigned to the others.
+
+        Examples
+        --------
+
+        >>> import os.path
+        >>> path = os.path.join(path_to_structures, "1l2y.pdb")
+        >>> for model in PDBFile.read_iter_structure(path):
+        ...     print(f"{model.array_length()} atoms, "
+        ...           f"first CA at {model.coord[1]}")
+        ...     break
+        304 atoms, first CA at [-8.608  3.135 -1.618]
+        """
+        header = []
+        template = None
+        altloc_filter = None
+        for model_num, records in enumerate(
+            _iter_model_records(TextFile.read_iter(file), header), start=1
+        ):
+            if template is None:
+                # Parse the annotations from the first model,
+                # the header may contain the CRYST1 record
+                fields = list(extra_fields) if extra_fields is not None \
+                         else []
+                model_file = PDBFile()
+                model_file.lines = [line.ljust(80) for line in header + records]
+                model_file._index_models_and_atoms()
+                template = model_file.get_structure(
+                    model=1, altloc="all",
+                    extra_fields=fields + ["occupancy"]
+                    if "occupancy" not in fields else fields
+                )
+                altloc_filter = _get_altloc_filter(
+                    template, template.altloc_id, template.occupancy, altloc
+                )
+                if "occupancy" not in fields:
+                    template.del_annotation("occupancy")
+                if altloc_filter is not None:
+                    template.del_annotation("altloc_id")
+                    template = template[altloc_filter]
+                model_length = len(records)
+                # The template is not handed out, so its frozen annotation
+                # arrays cannot be modified and derived values can be cached
+                template.freeze_annotations()
+                annot = _read_only_annotations(template)
+                # All models have the same annotations, so cached values
+                # derived from them are shared
+                cache = {}
+                box = template.box
+                yield _array_view(
+                    annot, template.coord,
+                    box.copy() if box is not None else None, None, cache
+                )
+                continue
+
+            if len(records) != model_length:
+                raise InvalidFileError(
+                    f"Model {model_num} has {len(records)} atoms, "
+                    f"but model 1 has {model_length} atoms, must be equal"
+                )
+            coord = _parse_coord(_to_atom_chars(records))
+            if altloc_filter is not None:
+                coord = coord[altloc_filter]
+            yield _array_view(
+                annot, coord, box.copy() if box is not None else None,
+                None, cache
+            )
+
+
     def set_structure(self, array, hybrid36=False):
         """
         Set the :class:`AtomArray` or :class:`AtomArrayStack` for the
@@ -573,96 +617,10 @@ class PDBFile(TextFile):
         records are also written for all non-water hetero residues
         and all inter-residue connections.
         """
-        natoms = array.array_length()
-        annot_categories = array.get_annotation_categories()
-        record = np.char.array(np.where(array.hetero, "HETATM", "ATOM"))
-        # Check for optional annotation categories
-        if "atom_id" in annot_categories:
-            atom_id = array.atom_id
-        else:
-            atom_id = np.arange(1, natoms + 1)
-        if "b_factor" in annot_categories:
-            b_factor = np.char.array([f"{b:>6.2f}" for b in array.b_factor])
-        else:
-            b_factor = np.char.array(np.full(natoms, "  0.00", dtype="U6"))
-        if "occupancy" in annot_categories:
-            occupancy = np.char.array([f"{o:>6.2f}" for o in array.occupancy])
-        else:
-            occupancy = np.char.array(np.full(natoms, "  1.00", dtype="U6"))
-        if "charge" in annot_categories:
-            charge = np.char.array(
-                [str(np.abs(charge)) + "+" if charge > 0 else
-                 (str(np.abs(charge)) + "-" if charge < 0 else "")
-                 for charge in array.get_annotation("charge")]
-            )
-        else:
-            charge = np.char.array(np.full(natoms, "  ", dtype="U2"))
-
-        # Do checks on atom array (stack)
-        if hybrid36:
-            max_atoms = max_hybrid36_number(5)
-            max_residues = max_hybrid36_number(4)
-        else:
-            max_atoms, max_residues = 99999, 9999
-        if array.array_length() > max_atoms:
-            warnings.warn(f"More then {max_atoms:,} atoms per model")
-        if (array.res_id > max_residues).any():
-            warnings.warn(f"Residue IDs exceed {max_residues:,}")
-        if np.isnan(array.coord).any():
-            raise BadStructureError("Coordinates contain 'NaN' values")
-        if any([len(name) > 1 for name in array.chain_id]):
-            raise BadStructureError("Some chain IDs exceed 1 character")
-        if any([len(name) > 3 for name in array.res_name]):
-            raise BadStructureError("Some residue names exceed 3 characters")
-        if any([len(name) > 4 for name in array.atom_name]):
-            raise BadStructureError("Some atom names exceed 4 characters")
-
-        if hybrid36:
-            pdb_atom_id = np.char.array(
-                [encode_hybrid36(i, 5) for i in atom_id]
-            )
-            pdb_res_id = np.char.array(
-                [encode_hybrid36(i, 4) for i in array.res_id]
-            )
-        else:
-            # Atom IDs are supported up to 99999,
-            # but negative IDs are also possible
-            pdb_atom_id = np.char.array(np.where(
-                atom_id > 0,
-                ((atom_id - 1) % 99999) + 1,
-                atom_id
-            ).astype(str))
-            # Residue IDs are supported up to 9999,
-            # but negative IDs are also possible
-            pdb_res_id = np.char.array(np.where(
-                array.res_id > 0,
-                ((array.res_id - 1) % 9999) + 1,
-                array.res_id
-            ).astype(str))
-
-        names = np.char.array(
-            [f" {atm}" if len(elem) == 1 and len(atm) < 4 else atm
-             for atm, elem in zip(array.atom_name, array.element)]
-        )
-        res_names = np.char.array(array.res_name)
-        chain_ids = np.char.array(array.chain_id)
-        ins_codes = np.char.array(array.ins_code)
-        spaces = np.char.array(np.full(natoms, " ", dtype="U1"))
-        elements = np.char.array(array.element)
-
-        first_half = (
-            record.ljust(6) +
-            pdb_atom_id.rjust(5) +
-            spaces +
-            names.ljust(4) +
-            spaces + res_names.rjust(3) + spaces + chain_ids +
-            pdb_res_id.rjust(4) + ins_codes.rjust(1)
-        )
-
-        second_half = (
-            occupancy + b_factor + 10 * spaces +
-            elements.rjust(2) + charge.rjust(2)
+        first_half, second_half, pdb_atom_id = _format_annotations(
+            array, hybrid36
         )
+        template = _atom_line_template(first_half, second_half)
 
         coords = array.coord
         if coords.ndim == 2:
@@ -674,46 +632,124 @@ class PDBFile(TextFile):
             box = array.box
             if len(box.shape) == 3:
                 box = box[0]
-            a, b, c, alpha, beta, gamma = unitcell_from_vectors(box)
-            self.lines.append(
-                f"CRYST1{a:>9.3f}{b:>9.3f}{c:>9.3f}"
-                f"{np.rad2deg(alpha):>7.2f}{np.rad2deg(beta):>7.2f}"
-                f"{np.rad2deg(gamma):>7.2f} P 1           1          "
-            )
+            self.lines.append(_format_cryst1(box))
         is_stack = coords.shape[0] > 1
-        for model_num, coord_i in enumerate(coords, start=1):
+        models = _format_models(first_half, second_half, template, coords)
+        for model_num, model_text in enumerate(models, start=1):
             # for an ArrayStack, this is run once
             # only add model lines if is_stack
             if is_stack:
                 self.lines.append(f"MODEL     {model_num:4}")
-            # Bundle non-coordinate data to simplify iteration
-            self.lines.extend(
-                [f"{start:27}   {x:>8.3f}{y:>8.3f}{z:>8.3f}{end:26}"
-                 for start, (x, y, z), end in
-                 zip(first_half, coord_i, second_half)]
-            )
+            self.lines.extend(model_text.splitlines())
             if is_stack:
                 self.lines.append("ENDMDL")
 
         # Add CONECT records if bonds are present
         if array.bonds is not None:
-            # Only non-water hetero records and connections between
-            # residues are added to the records
-            hetero_indices = np.where(array.hetero & ~filter_solvent(array))[0]
-            bond_array = array.bonds.as_array()
-            bond_array = bond_array[
-                np.isin(bond_array[:,0], hetero_indices) |
-                np.isin(bond_array[:,1], hetero_indices) |
-                (array.res_id  [bond_array[:,0]] != array.res_id  [bond_array[:,1]]) |
-                (array.chain_id[bond_array[:,0]] != array.chain_id[bond_array[:,1]])
-            ]
-            self._set_bonds(
-                BondList(array.array_length(), bond_array), pdb_atom_id
-            )
+            self.lines.extend(_format_conect_records(array, pdb_atom_id))
 
         self._index_models_and_atoms()
 
 
+    @staticmethod
+    def write_iter(file, template, coord, hybrid36=False):
+        """
+        Iterate over the given `coord` and write each item as model
+        into the specified `file`.
+
+        In contrast to :meth:`set_structure()` and :meth:`write()`,
+        the lines of text are not stored in an intermediate
+        :class:`PDBFile`, but are directly written to the file.
+        Hence, this static method may save a large amount of memory if
+        a structure with many models should be written, especially if
+        the `coord` are provided as generator.
+
+        Parameters
+        ----------
+        file : file-like object or str
+            The file to be written to.
+            Alternatively a file path can be supplied.
+        template : AtomArray or AtomArrayStack
+            The annotations, box and bonds of this structure are used
+            for each written model.
+            Its coordinates are ignored.
+            If an :class:`AtomArrayStack` is given, the box of the first
+            model is used.
+        coord : generator or array-like of ndarray, shape=(n,3) or shape=(m,n,3), dtype=float
+            The atom coordinates for each model.
+            If an item has three dimensions, e.g. a chunk of frames from
+            :meth:`TrajectoryFile.read_iter()`, each element of it is
+            written as separate model.
+        hybrid36: bool, optional
+            Defines wether the file should be written in hybrid-36
+            format.
+
+        See also
+        --------
+        set_structure
+
+        Notes
+        -----
+        In contrast to :meth:`set_structure()`, *MODEL* and *ENDMDL*
+        records are also written, if only a single model is given.
+
+        Examples
+        --------
+
+        >>> import os.path
+        >>> file_name = os.path.join(path_to_directory, "1l2y_models.pdb")
+        >>> PDBFile.write_iter(
+        ...     file_name, atom_array,
+        ...     (model.coord for model in atom_array_stack)
+        ... )
+        >>> print(PDBFile.read(file_name).get_model_count())
+        38
+        """
+        first_half, second_half, pdb_atom_id = _format_annotations(
+            template, hybrid36, check_coord=False
+        )
+        atom_line_template = _atom_line_template(first_half, second_half)
+        n_atoms = template.array_length()
+
+        def write_models(file):
+            if template.box is not None:
+                box = template.box
+                if len(box.shape) == 3:
+                    box = box[0]
+                file.write(_format_cryst1(box) + "\n")
+            model_num = 1
+            for item in coord:
+                item = np.asarray(item, dtype=np.float32)
+                if item.ndim == 2:
+                    item = item[np.newaxis, ...]
+                if item.ndim != 3 or item.shape[1:] != (n_atoms, 3):
+                    raise IndexError(
+                        f"Expected coordinates for {n_atoms} atoms, "
+                        f"but got shape {item.shape}"
+                    )
+                if np.isnan(item).any():
+                    raise BadStructureError("Coordinates contain 'NaN' values")
+                # The records of each model are written as a whole
+                for model_text in _format_models(
+                    first_half, second_half, atom_line_template, item
+                ):
+                    file.write(f"MODEL     {model_num:4}\n")
+                    file.write(model_text)
+                    file.write("ENDMDL\n")
+                    model_num += 1
+            if template.bonds is not None:
+                for line in _format_conect_records(template, pdb_atom_id):
+                    file.write(line + "\n")
+
+        if is_open_compatible(file):
+            with open(file, "w") as f:
+                write_models(f)
+        else:
+            if not is_text(file):
+                raise TypeError("A file opened in 'text' mode is required")
+            write_models(file)
+
+
     def list_assemblies(self):
         """
         List the biological assemblies that are available for the
@@ -999,31 +1035,33 @@ class PDBFile(TextFile):
 
 
     def _index_models_and_atoms(self):
+        # The record name is given by the first characters of each line,
+        # represented as matrix of Unicode code points
+        # (longer strings are truncated to the given dtype)
+        records = np.array(self.lines, dtype="U6") \
+                  .view(np.uint32).reshape(-1, 6)
         # Line indices where a new model starts
-        self._model_start_i = np.array(
-            [
-                i for i in range(len(self.lines))
-                if self.lines[i].startswith(("MODEL"))
-            ],
-            dtype=int
-        )
-        if len(self._model_start_i) == 0:
-            # It could be an empty file or a file with a single model,
-            # where the 'MODEL' line is missing
-            for line in self.lines:
-                if line.startswith(("ATOM", "HETATM")):
-                    # Single model
-                    self._model_start_i = np.array([0])
-                    break
-
+        self._model_start_i = np.where(_has_prefix(records, "MODEL"))[0]
         # Line indices with ATOM or HETATM records
-        self._atom_line_i = np.array(
-            [
-                i for i in range(len(self.lines))
-                if self.lines[i].startswith(("ATOM", "HETATM"))
-            ],
-            dtype=int
-        )
+        self._atom_line_i = np.where(
+            _has_prefix(records, "ATOM") | _has_prefix(records, "HETATM")
+        )[0]
+        if len(self._model_start_i) == 0 and len(self._atom_line_i) > 0:
+            # File with a single model, where the 'MODEL' line is missing
+            self._model_start_i = np.array([0])
+
+
+    def _get_atom_record_indices(self):
+        """
+        Get the line indices of the ATOM and HETATM records of all
+        models.
+        """
+        if len(self._model_start_i) == 0:
+            return self._atom_line_i
+        # Ignore records before the first model
+        return self._atom_line_i[
+            self._atom_line_i >= self._model_start_i[0]
+        ]
 
 
     def _get_atom_record_indices_for_model(self, model):
@@ -1053,26 +1091,42 @@ class PDBFile(TextFile):
         Determine length of models and check that all models
         have equal length.
         """
-        n_models = len(self._model_start_i)
-        length = None
-        for model_i in range(len(self._model_start_i)):
-            model_start = self._model_start_i[model_i]
-            model_stop = self._model_start_i[model_i+1] \
-                         if model_i+1 < n_models else len(self.lines)
-            model_length = np.count_nonzero(
-                (self._atom_line_i >= model_start) &
-                (self._atom_line_i < model_stop)
+        if len(self._model_start_i) == 0:
+            return None
+        model_bounds = np.append(self._model_start_i, len(self.lines))
+        model_lengths = np.diff(
+            np.searchsorted(self._atom_line_i, model_bounds)
+        )
+        length = model_lengths[0]
+        unequal_models = np.where(model_lengths != length)[0]
+        if len(unequal_models) > 0:
+            model_i = unequal_models[0]
+            raise InvalidFileError(
+                f"Model {model_i+1} has {model_lengths[model_i]} atoms, "
+                f"but model 1 has {length} atoms, must be equal"
             )
-            if length is None:
-                length = model_length
-            if model_length != length:
-                raise InvalidFileError(
-                    f"Model {model_i+1} has {model_length} atoms, "
-                    f"but model 1 has {length} atoms, must be equal"
-                )
         return length
 
 
+    def _get_atom_chars(self, line_indices):
+        """
+        Get the given ATOM/HETATM records as fixed-width character
+        matrix.
+
+        Parameters
+        ----------
+        line_indices : ndarray, dtype=int
+            The indices of the lines to get.
+
+        Returns
+        -------
+        chars : ndarray, dtype=uint8, shape=(n,80)
+            The ASCII codes of the first 80 characters of each line.
+            Non-ASCII characters are replaced by ``'?'``.
+        """
+        return _to_atom_chars([self.lines[i] for i in line_indices.tolist()])
+
+
     def _get_bonds(self, atom_ids):
         conect_lines = [line for line in self.lines
                         if line.startswith("CONECT")]
@@ -1104,31 +1158,6 @@ class PDBFile(TextFile):
         return BondList(len(atom_ids), np.array(bonds, dtype=np.uint32))
 
 
-    def _set_bonds(self, bond_list, atom_ids):
-        # Bond type is unused since PDB does not support bond orders
-        bonds, _ = bond_list.get_all_bonds()
-
-        for center_i, bonded_indices in enumerate(bonds):
-            n_added = 0
-            for bonded_i in bonded_indices:
-                if bonded_i == -1:
-                    # Reached padding values
-                    break
-                if n_added == 0:
-                    # Add new record
-                    line = f"CONECT{atom_ids[center_i]:>5}"
-                line += f"{atom_ids[bonded_i]:>5}"
-                n_added += 1
-                if n_added == 4:
-                    # Only a maximum of 4 bond partners can be put
-                    # into a single line
-                    # If there are more, use an extra record
-                    n_added = 0
-                    self.lines.append(line)
-            if n_added > 0:
-                self.lines.append(line)
-
-
 def _parse_transformations(lines):
     """
     Parse the rotation and translation transformations from
@@ -1183,4 +1212,494 @@ def _apply_transformations(structure, rotations, translations):
         coord += translation
         assembly_coord[i] = coord
 
-    return repeat(structure, assembly_coord)
\ No newline at end of file
+    return repeat(structure, assembly_coord)
+
+
+def _format_annotations(array, hybrid36, check_coord=True):
+    """
+    Format the annotation columns of ATOM/HETATM records.
+
+    Parameters
+    ----------
+    array : AtomArray or AtomArrayStack
+        The structure to get the annotations from.
+    hybrid36: bool
+        Whether the atom and residue IDs are written in hybrid-36
+        format.
+    check_coord : bool, optional
+        Whether to check the coordinates of `array` for *NaN* values.
+
+    Returns
+    -------
+    first_half : ndarray, dtype=str
+        The columns in front of the coordinates for each atom.
+    second_half : ndarray, dtype=str
+        The columns after the coordinates for each atom.
+    pdb_atom_id : ndarray, dtype=str
+        The atom ID column for each atom, as used in *CONECT* records.
+    """
+    natoms = array.array_length()
+    annot_categories = array.get_annotation_categories()
+    record = np.char.array(np.where(array.hetero, "HETATM", "ATOM"))
+    # Check for optional annotation categories
+    if "atom_id" in annot_categories:
+        atom_id = array.atom_id
+    else:
+        atom_id = np.arange(1, natoms + 1)
+    if "b_factor" in annot_categories:
+        b_factor = np.char.array([f"{b:>6.2f}" for b in array.b_factor])
+    else:
+        b_factor = np.char.array(np.full(natoms, "  0.00", dtype="U6"))
+    if "occupancy" in annot_categories:
+        occupancy = np.char.array([f"{o:>6.2f}" for o in array.occupancy])
+    else:
+        occupancy = np.char.array(np.full(natoms, "  1.00", dtype="U6"))
+    if "charge" in annot_categories:
+        charge = np.char.array(
+            [str(np.abs(charge)) + "+" if charge > 0 else
+             (str(np.abs(charge)) + "-" if charge < 0 else "")
+             for charge in array.get_annotation("charge")]
+        )
+    else:
+        charge = np.char.array(np.full(natoms, "  ", dtype="U2"))
+
+    # Do checks on atom array (stack)
+    if hybrid36:
+        max_atoms = max_hybrid36_number(5)
+        max_residues = max_hybrid36_number(4)
+    else:
+        max_atoms, max_residues = 99999, 9999
+    if array.array_length() > max_atoms:
+        warnings.warn(f"More then {max_atoms:,} atoms per model")
+    if (array.res_id > max_residues).any():
+        warnings.warn(f"Residue IDs exceed {max_residues:,}")
+    if check_coord and np.isnan(array.coord).any():
+        raise BadStructureError("Coordinates contain 'NaN' values")
+    if any([len(name) > 1 for name in array.chain_id]):
+        raise BadStructureError("Some chain IDs exceed 1 character")
+    if any([len(name) > 3 for name in array.res_name]):
+        raise BadStructureError("Some residue names exceed 3 characters")
+    if any([len(name) > 4 for name in array.atom_name]):
+        raise BadStructureError("Some atom names exceed 4 characters")
+
+    if hybrid36:
+        pdb_atom_id = np.char.array(
+            [encode_hybrid36(i, 5) for i in atom_id]
+        )
+        pdb_res_id = np.char.array(
+            [encode_hybrid36(i, 4) for i in array.res_id]
+        )
+    else:
+        # Atom IDs are supported up to 99999,
+        # but negative IDs are also possible
+        pdb_atom_id = np.char.array(np.where(
+            atom_id > 0,
+            ((atom_id - 1) % 99999) + 1,
+            atom_id
+        ).astype(str))
+        # Residue IDs are supported up to 9999,
+        # but negative IDs are also possible
+        pdb_res_id = np.char.array(np.where(
+            array.res_id > 0,
+            ((array.res_id - 1) % 9999) + 1,
+            array.res_id
+        ).astype(str))
+
+    names = np.char.array(
+        [f" {atm}" if len(elem) == 1 and len(atm) < 4 else atm
+         for atm, elem in zip(array.atom_name, array.element)]
+    )
+    # 'np.asarray()' decodes categorical annotations
+    res_names = np.char.array(np.asarray(array.res_name))
+    chain_ids = np.char.array(np.asarray(array.chain_id))
+    ins_codes = np.char.array(np.asarray(array.ins_code))
+    spaces = np.char.array(np.full(natoms, " ", dtype="U1"))
+    elements = np.char.array(np.asarray(array.element))
+
+    first_half = (
+        record.ljust(6) +
+        pdb_atom_id.rjust(5) +
+        spaces +
+        names.ljust(4) +
+        spaces + res_names.rjust(3) + spaces + chain_ids +
+        pdb_res_id.rjust(4) + ins_codes.rjust(1)
+    )
+
+    second_half = (
+        occupancy + b_factor + 10 * spaces +
+        elements.rjust(2) + charge.rjust(2)
+    )
+
+    return first_half, second_half, pdb_atom_id
+
+
+def _atom_line_template(first_half, second_half):
+    """
+    Create fixed-width ATOM/HETATM records with blank coordinate
+    columns from the formatted annotation columns.
+
+    Returns
+    -------
+    template : ndarray, dtype=uint8, shape=(n,80) or None
+        The ASCII codes of the records.
+        *None*, if any of the annotation columns do not fit into the
+        fixed-width format or contain non-ASCII characters.
+    """
+    first_half = np.asarray(first_half, dtype=str)
+    second_half = np.asarray(second_half, dtype=str)
+    first_width = _coord_x.start - 3
+    second_width = _LINE_LENGTH - _coord_z.stop
+    if (
+        np.any(np.char.str_len(first_half) > first_width)
+        or np.any(np.char.str_len(second_half) > second_width)
+    ):
+        return None
+    try:
+        template = np.full(
+            (len(first_half), _LINE_LENGTH), ord(" "), dtype=np.uint8
+        )
+        # Shorter strings are padded with null characters
+        template[:, :first_width] = np.frombuffer(
+            first_half.astype(f"S{first_width}").tobytes(), dtype=np.uint8
+        ).reshape(-1, first_width)
+        template[:, _coord_z.stop:] = np.frombuffer(
+            second_half.astype(f"S{second_width}").tobytes(), dtype=np.uint8
+        ).reshape(-1, second_width)
+    except UnicodeEncodeError:
+        return None
+    # Pad with whitespace as in formatted strings
+    template[template == 0] = ord(" ")
+    return template
+
+
+def _format_models(first_half, second_half, template, coord):
+    """
+    Create the ATOM/HETATM records of multiple models, from the output
+    of :func:`_format_annotations()` and :func:`_atom_line_template()`.
+
+    Parameters
+    ----------
+    coord : ndarray, dtype=float32, shape=(m,n,3)
+        The coordinates of each model.
+
+    Returns
+    -------
+    models : list of str
+        The records of each model as text, where each line is
+        terminated by a line break.
+    """
+    n_models, n_atoms, _ = coord.shape
+    if template is not None:
+        coord_chars = _format_coord(coord.reshape(-1, 3))
+        if coord_chars is not None:
+            # All models are formatted at once,
+            # the additional last column contains the line breaks
+            chars = np.full(
+                (n_models, n_atoms, _LINE_LENGTH + 1), ord("\n"),
+                dtype=np.uint8
+            )
+            chars[:, :, :_LINE_LENGTH] = template
+            chars[:, :, _coord_x.start : _coord_z.stop] \
+                = coord_chars.reshape(n_models, n_atoms, -1)
+            return [
+                model_chars.tobytes().decode("ascii") for model_chars in chars
+            ]
+    # Fall back to formatting each line separately
+    return [
+        "".join([
+            f"{start:27}   {x:>8.3f}{y:>8.3f}{z:>8.3f}{end:26}\n"
+            for start, (x, y, z), end
+            in zip(first_half, model_coord, second_half)
+        ])
+        for model_coord in coord
+    ]
+
+
+def _format_coord(coord):
+    """
+    Format coordinates with three decimals into fixed-width columns,
+    equivalent to ``f"{x:>8.3f}"``.
+
+    Parameters
+    ----------
+    coord : ndarray, dtype=float32, shape=(n,3)
+        The coordinates to be formatted.
+
+    Returns
+    -------
+    coord_chars : ndarray, dtype=uint8, shape=(n,24) or None
+        The ASCII codes of the formatted coordinates.
+        *None*, if any value does not fit into the column width.
+    """
+    values = np.asarray(coord, dtype=np.float32).astype(np.float64).flatten()
+    # The product of a 32-bit float and 1000 is exact in 64-bit
+    # precision, so rounding to even gives the same result
+    # as string formatting
+    thousandths = np.rint(values * 1000)
+    if np.any(thousandths > 9999999) or np.any(thousandths < -999999):
+        return None
+    thousandths = np.abs(thousandths).astype(np.int32)
+    integer_part, decimals = np.divmod(thousandths, 1000)
+    # Negative zero is formatted with sign as well
+    is_negative = np.signbit(values)
+    positive_integers, negative_integers, decimal_digits \
+        = _get_number_tables()
+
+    chars = np.empty((len(values), _coord_x.stop - _coord_x.start), np.uint8)
+    chars[:, :4] = np.where(
+        is_negative[:, np.newaxis],
+        negative_integers[np.minimum(integer_part, 999)],
+        positive_integers[integer_part]
+    )
+    chars[:, 4] = ord(".")
+    chars[:, 5:] = decimal_digits[decimals]
+    return chars.reshape(len(coord), -1)
+
+
+def _get_number_tables():
+    """
+    Get the lookup tables used by :func:`_format_coord()` for the
+    characters of the integer and decimal part of formatted numbers.
+
+    Returns
+    -------
+    positive_integers, negative_integers : ndarray, dtype=uint8, shape=(k,4)
+        The right-justified representation of integers in
+        ``range(10000)``, without and with sign.
+    decimal_digits : ndarray, dtype=uint8, shape=(1000,3)
+        The zero-padded representation of integers in ``range(1000)``.
+    """
+    if len(_number_table_cache) == 0:
+        _number_table_cache["positive_integers"] = _to_char_matrix(
+            [f"{i:>4d}" for i in range(10000)]
+        )
+        _number_table_cache["negative_integers"] = _to_char_matrix(
+            [f"{'-' + str(i):>4}" for i in range(1000)]
+        )
+        _number_table_cache["decimal_digits"] = _to_char_matrix(
+            [f"{i:03d}" for i in range(1000)]
+        )
+    return (
+        _number_table_cache["positive_integers"],
+        _number_table_cache["negative_integers"],
+        _number_table_cache["decimal_digits"],
+    )
+
+
+def _to_char_matrix(strings):
+    """
+    Convert equal-length ASCII strings into a character matrix.
+    """
+    return np.frombuffer("".join(strings).encode("ascii"), dtype=np.uint8) \
+           .reshape(len(strings), -1)
+
+
+def _format_cryst1(box):
+    """
+    Create the CRYST1 record for the given box vectors.
+    """
+    a, b, c, alpha, beta, gamma = unitcell_from_vectors(box)
+    return (
+        f"CRYST1{a:>9.3f}{b:>9.3f}{c:>9.3f}"
+        f"{np.rad2deg(alpha):>7.2f}{np.rad2deg(beta):>7.2f}"
+        f"{np.rad2deg(gamma):>7.2f} P 1           1          "
+    )
+
+
+def _format_conect_records(array, pdb_atom_id):
+    """
+    Create the CONECT records for the bonds of the given structure.
+
+    Only non-water hetero records and connections between residues are
+    added to the records.
+    """
+    hetero_indices = np.where(array.hetero & ~filter_solvent(array))[0]
+    bond_array = array.bonds.as_array()
+    bond_array = bond_array[
+        np.isin(bond_array[:,0], hetero_indices) |
+        np.isin(bond_array[:,1], hetero_indices) |
+        (array.res_id  [bond_array[:,0]] != array.res_id  [bond_array[:,1]]) |
+        (array.chain_id[bond_array[:,0]] != array.chain_id[bond_array[:,1]])
+    ]
+    bond_list = BondList(array.array_length(), bond_array)
+    # Bond type is unused since PDB does not support bond orders
+    bonds, _ = bond_list.get_all_bonds()
+
+    lines = []
+    for center_i, bonded_indices in enumerate(bonds):
+        n_added = 0
+        for bonded_i in bonded_indices:
+            if bonded_i == -1:
+                # Reached padding values
+                break
+            if n_added == 0:
+                # Add new record
+                line = f"CONECT{pdb_atom_id[center_i]:>5}"
+            line += f"{pdb_atom_id[bonded_i]:>5}"
+            n_added += 1
+            if n_added == 4:
+                # Only a maximum of 4 bond partners can be put
+                # into a single line
+                # If there are more, use an extra record
+                n_added = 0
+                lines.append(line)
+        if n_added > 0:
+            lines.append(line)
+    return lines
+
+
+def _to_atom_chars(lines):
+    """
+    Convert ATOM/HETATM records into a fixed-width character matrix.
+
+    Parameters
+    ----------
+    lines : list of str
+        The records.
+
+    Returns
+    -------
+    chars : ndarray, dtype=uint8, shape=(n,80)
+        The ASCII codes of the first 80 characters of each line.
+        Non-ASCII characters are replaced by ``'?'``.
+    """
+    if set(map(len, lines)) != {_LINE_LENGTH}:
+        lines = [line.ljust(_LINE_LENGTH)[:_LINE_LENGTH] for line in lines]
+    text = "".join(lines)
+    return np.frombuffer(
+        text.encode("ascii", errors="replace"), dtype=np.uint8
+    ).reshape(-1, _LINE_LENGTH)
+
+
+def _get_altloc_filter(array, altloc_id, occupancy, altloc):
+    """
+    Get the boolean mask for the atoms to be kept according to the
+    `altloc` option or *None*, if all atoms are kept.
+    """
+    if altloc == "occupancy":
+        return filter_highest_occupancy_altloc(array, altloc_id, occupancy)
+    elif altloc == "first":
+        return filter_first_altloc(array, altloc_id)
+    elif altloc == "all":
+        return None
+    else:
+        raise ValueError(f"'{altloc}' is not a valid 'altloc' option")
+
+
+def _iter_model_records(lines, header):
+    """
+    Iterate over the ATOM/HETATM records of each model in the given
+    lines.
+
+    Parameters
+    ----------
+    lines : iterable object of str
+        The lines of a PDB file.
+    header : list of str
+        Lines in front of the first ATOM/HETATM record are appended to
+        this list.
+
+    Yields
+    ------
+    records : list of str
+        The ATOM/HETATM records of a model, without line breaks.
+    """
+    records = []
+    is_header = True
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line.startswith(("ATOM", "HETATM")):
+            is_header = False
+            records.append(line)
+        elif line.startswith(("MODEL", "ENDMDL")):
+            if len(records) > 0:
+                yield records
+                records = []
+        elif is_header:
+            header.append(line)
+    if len(records) > 0:
+        yield records
+
+
+def _has_prefix(records, prefix):
+    """
+    Check which rows of a code point matrix start with the given
+    prefix.
+    """
+    code_points = np.array([ord(char) for char in prefix], dtype=np.uint32)
+    return np.all(records[:, :len(prefix)] == code_points, axis=-1)
+
+
+def _as_strings(chars):
+    """
+    Convert a fixed-width ASCII character matrix into an array of
+    strings, one for each row.
+    """
+    width = chars.shape[-1]
+    return np.ascontiguousarray(chars).view(f"S{width}")[:, 0] \
+           .astype(f"U{width}")
+
+
+def _parse_string(chars):
+    """
+    Convert a fixed-width ASCII character matrix into an array of
+    strings, one for each row, with leading and trailing whitespace
+    removed.
+    """
+    width = chars.shape[-1]
+    positions = np.arange(width)
+    is_space = chars == ord(" ")
+    # Left-align the strings by removing leading whitespace
+    n_leading = np.argmin(is_space, axis=-1)
+    source_positions = positions + n_leading[:, np.newaxis]
+    chars = np.take_along_axis(
+        chars, np.minimum(source_positions, width - 1), axis=-1
+    )
+    is_space = np.take_along_axis(
+        is_space, np.minimum(source_positions, width - 1), axis=-1
+    )
+    # Remove trailing whitespace, including the characters moved from
+    # the end in the preceding step:
+    # Trailing null characters are removed in the conversion to strings
+    is_content = ~is_space & (source_positions < width)
+    has_content = np.any(is_content, axis=-1)
+    content_stop = np.where(
+        has_content, width - np.argmax(is_content[:, ::-1], axis=-1), 0
+    )
+    chars[positions >= content_stop[:, np.newaxis]] = 0
+    return _as_strings(chars)
+
+
+def _parse_float(chars):
+    """
+    Parse each row of a fixed-width ASCII character matrix as floating
+    point value.
+    """
+    width = chars.shape[-1]
+    return np.ascontiguousarray(chars).view(f"S{width}")[:, 0] \
+           .astype(np.float64)
+
+
+def _parse_coord(chars):
+    """
+    Parse the coordinates from ATOM/HETATM records given as fixed-width
+    character matrix.
+    """
+    # The coordinate columns are adjacent and have equal width
+    coord_width = _coord_x.stop - _coord_x.start
+    coord_chars = chars[:, _coord_x.start:_coord_z.stop]
+    return _parse_float(coord_chars.reshape(-1, coord_width)) \
+           .reshape(-1, 3).astype(np.float32)
+
+
+def _parse_charge(chars):
+    """
+    Parse the charges from the charge column of ATOM/HETATM records
+    given as fixed-width character matrix.
+    """
+    # Turn "1-" into "-1", if necessary
+    has_leading_sign = (chars[:, 0] == ord("+")) | (chars[:, 0] == ord("-"))
+    charge = _as_strings(
+        np.where(has_leading_sign[:, np.newaxis], chars, chars[:, ::-1])
+    )
+    return np.where(charge == "  ", "0", charge).astype(int)
@@ -7,8 +7,16 @@ __author__ = "Patrick Kunzmann"
 __all__ = ["encode_hybrid36", "decode_hybrid36", "max_hybrid36_number"]
 
 cimport cython
+cimport numpy as np
 
+import numpy as np
 
+ctypedef np.int64_t int64
+
+
+cdef int _ASCII_SPACE = 32
+cdef int _ASCII_PLUS = 43
+cdef int _ASCII_MINUS = 45
 cdef int _ASCII_FIRST_NUMBER = 48
 cdef int _ASCII_FIRST_LETTER_UPPER = 65
 cdef int _ASCII_FIRST_LETTER_LOWER = 97
@@ -239,4 +247,118 @@ def max_hybrid36_number(length):
         string of the given `length`.
     """
     #      |-- Decimal -|     |--- lo + up base-36 ---|
-    return 10**length - 1  +  2 * (26 * 36**(length-1))
\ No newline at end of file
+    return 10**length - 1  +  2 * (26 * 36**(length-1))
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cpow(True)
+def _decode_hybrid36_array(const unsigned char[:,:] chars):
+    """
+    Convert each row of a fixed-width character matrix, containing
+    decimal or hybrid-36 strings, into an integer value.
+
+    This is the vectorized counterpart of :func:`decode_hybrid36()`.
+
+    Parameters
+    ----------
+    chars : ndarray, dtype=uint8, shape=(n,w)
+        The ASCII codes of the strings.
+        Leading and trailing whitespace is ignored.
+
+    Returns
+    -------
+    numbers : ndarray, dtype=int64, shape=(n,)
+        The decoded integer values.
+    """
+    cdef int i, j
+    cdef int start, stop, length
+    cdef int64 number
+    cdef bint is_negative
+    cdef unsigned char ascii_code
+
+    numbers = np.zeros(chars.shape[0], dtype=np.int64)
+    cdef int64[:] numbers_v = numbers
+
+    for i in range(chars.shape[0]):
+        # Ignore surrounding whitespace
+        start = 0
+        while start < chars.shape[1] and chars[i, start] == _ASCII_SPACE:
+            start += 1
+        stop = chars.shape[1]
+        while stop > start and chars[i, stop-1] == _ASCII_SPACE:
+            stop -= 1
+        length = stop - start
+        if length == 0:
+            raise ValueError("Cannot parse empty string into integer")
+
+        ascii_code = chars[i, start]
+        if      ascii_code >= _ASCII_FIRST_LETTER_UPPER \
+            and ascii_code <= _ASCII_LAST_LETTER_UPPER:
+                number = _decode_base36_row(
+                    chars, i, start, stop, _ASCII_FIRST_LETTER_UPPER
+                )
+                if number < 0:
+                    _raise_illegal(chars, i)
+                number = number - 10 * 36**(length-1) + 10**length
+        elif    ascii_code >= _ASCII_FIRST_LETTER_LOWER \
+            and ascii_code <= _ASCII_LAST_LETTER_LOWER:
+                number = _decode_base36_row(
+                    chars, i, start, stop, _ASCII_FIRST_LETTER_LOWER
+                )
+                if number < 0:
+                    _raise_illegal(chars, i)
+                number = number + (26-10) * 36**(length-1) + 10**length
+        else:
+            # Decimal representation with optional sign
+            is_negative = False
+            if ascii_code == _ASCII_MINUS or ascii_code == _ASCII_PLUS:
+                is_negative = ascii_code == _ASCII_MINUS
+                start += 1
+                if start == stop:
+                    _raise_illegal(chars, i)
+            number = 0
+            for j in range(start, stop):
+                ascii_code = chars[i, j]
+                if      ascii_code < _ASCII_FIRST_NUMBER \
+                     or ascii_code > _ASCII_LAST_NUMBER:
+                        _raise_illegal(chars, i)
+                number = number * 10 + (ascii_code - _ASCII_FIRST_NUMBER)
+            if is_negative:
+                number = -number
+        numbers_v[i] = number
+
+    return numbers
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef int64 _decode_base36_row(const unsigned char[:,:] chars, int row,
+                              int start, int stop,
+                              unsigned int ascii_letter_offset):
+    """
+    Convert a base-36 string in a row of a character matrix into an
+    integer value.
+
+    Returns -1, if the string contains invalid characters.
+    """
+    cdef int j
+    cdef int64 number = 0
+    cdef unsigned char ascii_code
+    for j in range(start, stop):
+        number *= 36
+        ascii_code = chars[row, j]
+        if      ascii_code >= _ASCII_FIRST_NUMBER \
+            and ascii_code <= _ASCII_LAST_NUMBER:
+                number += ascii_code - _ASCII_FIRST_NUMBER
+        elif    ascii_code >= ascii_letter_offset \
+            and ascii_code < ascii_letter_offset + 26:
+                number += ascii_code - ascii_letter_offset + 10
+        else:
+            return -1
+    return number
+
+
+cdef _raise_illegal(const unsigned char[:,:] chars, int row):
+    string = bytes(chars[row]).decode("ascii", errors="replace").strip()
+    raise ValueError(f"Illegal hybrid-36 string '{string}'")
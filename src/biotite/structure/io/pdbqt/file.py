@@ -10,7 +10,9 @@ import warnings
 import numpy as np
 from ....file import TextFile, InvalidFileError
 from ...error import BadStructureError
-from ...atoms import AtomArray, AtomArrayStack
+from ...atoms import (
+    AtomArray, AtomArrayStack, _read_only_annotations, _array_view
+)
 from ...charges import partial_charges
 from ...bonds import BondList, BondType, find_connected, find_rotatable_bonds
 
@@ -298,6 +300,75 @@ class PDBQTFile(TextFile):
         return array
 
 
+    @staticmethod
+    def read_iter_structure(file):
+        """
+        Create an iterator over each model of the given PDBQT file,
+        e.g. each docked pose.
+
+        In contrast to :meth:`read()` and :meth:`get_structure()`,
+        only the lines of the current model are kept in memory and
+        each model is returned as separate :class:`AtomArray`.
+        All returned :class:`AtomArray` objects share the same
+        annotation arrays, that are parsed only once from the first
+        model.
+
+        Parameters
+        ----------
+        file : file-like object or str
+            The file to be read.
+            Alternatively a file path can be supplied.
+
+        Yields
+        ------
+        array : AtomArray
+            The structure of the current model.
+
+        See also
+        --------
+        get_structure
+
+        Notes
+        -----
+        The shared annotation arrays are read-only and copied on write
+        (see :meth:`AtomArrayStack.get_array()`).
+        """
+        template = None
+        for model_num, records in enumerate(
+            _iter_model_records(TextFile.read_iter(file)), start=1
+        ):
+            if template is None:
+                model_file = PDBQTFile()
+                model_file.lines = records
+                template = model_file.get_structure(model=1)
+                # The atoms are sorted into the original atom order
+                order = np.argsort([int(line[6:11]) for line in records])
+                # The template is not handed out, so its frozen annotation
+                # arrays cannot be modified and derived values can be cached
+                template.freeze_annotations()
+                annot = _read_only_annotations(template)
+                # All models have the same annotations, so cached values
+                # derived from them are shared
+                cache = {}
+                yield _array_view(annot, template.coord, None, None, cache)
+                continue
+
+            if len(records) != len(order):
+                raise InvalidFileError(
+                    f"Model {model_num} has {len(records)} atoms, "
+                    f"but model 1 has {len(order)} atoms, must be equal"
+                )
+            coord = np.array(
+                [
+                    (float(line[30:38]), float(line[38:46]),
+                     float(line[46:54]))
+                    for line in records
+                ],
+                dtype=np.float32
+            )
+            yield _array_view(annot, coord[order], None, None, cache)
+
+
     def set_structure(self, atoms, charges=None, atom_types=None,
                       rotatable_bonds=None, root=None, include_torsdof=True):
         """
@@ -561,6 +632,24 @@ class PDBQTFile(TextFile):
         return length
 
 
+def _iter_model_records(lines):
+    """
+    Iterate over the ATOM/HETATM records of each model in the given
+    lines.
+    """
+    records = []
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line.startswith(("ATOM", "HETATM")):
+            records.append(line)
+        elif line.startswith(("MODEL", "ENDMDL")):
+            if len(records) > 0:
+                yield records
+                records = []
+    if len(records) > 0:
+        yield records
+
+
 def convert_atoms(atoms, charges):
     """
     Convert atoms into *AutoDock* compatible atoms.
@@ -7,6 +7,7 @@ __author__ = "Patrick Kunzmann"
 __all__ = ["BinaryCIFFile", "BinaryCIFBlock", "BinaryCIFCategory",
            "BinaryCIFColumn", "BinaryCIFData"]
 
+import mmap
 from collections.abc import Sequence
 import numpy as np
 import msgpack
@@ -14,6 +15,7 @@ from .component import _Component, _HierarchicalContainer, MaskValue
 from .encoding import decode_stepwise, encode_stepwise, deserialize_encoding, \
                       create_uncompressed_encoding, ByteArrayEncoding
 from .error import SerializationError
+from .unpack import unpack_without_copy
 from ....file import File, is_binary, is_open_compatible
 
 
@@ -36,6 +38,11 @@ class BinaryCIFData(_Component):
     encoding : list of Encoding
         The encoding steps.
 
+    Notes
+    -----
+    If the object is deserialized from a file, the data is decoded only
+    when :attr:`array` is accessed for the first time.
+
     Examples
     --------
 
@@ -85,6 +92,8 @@ class BinaryCIFData(_Component):
             raise ValueError("Object arrays are not supported")
 
         self._array = array
+        # The still encoded data, if the array is not decoded yet
+        self._encoded_data = None
         if encoding is None:
             self._encoding = create_uncompressed_encoding(array)
         else:
@@ -92,6 +101,10 @@ class BinaryCIFData(_Component):
 
     @property
     def array(self):
+        if self._array is None:
+            # Lazy decoding of deserialized data
+            self._array = decode_stepwise(self._encoded_data, self._encoding)
+            self._encoded_data = None
         return self._array
 
     @property
@@ -111,26 +124,36 @@ class BinaryCIFData(_Component):
         encoding = [
             deserialize_encoding(enc) for enc in content["encoding"]
         ]
-        return BinaryCIFData(
-            decode_stepwise(content["data"], encoding), encoding
-        )
+        # Bypass the constructor, as the array is only decoded
+        # when it is accessed
+        data = BinaryCIFData.__new__(BinaryCIFData)
+        data._array = None
+        data._encoded_data = content["data"]
+        data._encoding = encoding
+        return data
 
     def serialize(self):
-        serialized_data = encode_stepwise(self._array, self._encoding)
-        if not isinstance(serialized_data, bytes):
-            raise SerializationError(
-                "Final encoding must return 'bytes'"
-            )
+        if self._array is None:
+            # The data was never decoded -> no need to encode it again
+            serialized_data = self._encoded_data
+        else:
+            serialized_data = encode_stepwise(self._array, self._encoding)
+            if not isinstance(serialized_data, bytes):
+                raise SerializationError(
+                    "Final encoding must return 'bytes'"
+                )
+        # The encoding is serialized after encoding the data,
+        # as some parameters are only determined during encoding
         serialized_encoding = [enc.serialize() for enc in self._encoding]
         return {"data": serialized_data, "encoding": serialized_encoding}
 
     def __len__(self):
-        return len(self._array)
+        return len(self.array)
 
     def __eq__(self, other):
         if not isinstance(other, type(self)):
             return False
-        if not np.array_equal(self._array, other._array):
+        if not np.array_equal(self.array, other.array):
             return False
         if self._encoding != other._encoding:
             return False
@@ -391,8 +414,31 @@ class BinaryCIFCategory(_HierarchicalContainer):
         return BinaryCIFBlock
 
     def filter(self, index):
+        """
+        Create a new category, containing only the given rows of this
+        category.
+
+        Parameters
+        ----------
+        index : slice or ndarray, dtype=bool or dtype=int
+            The rows to keep.
+
+        Returns
+        -------
+        filtered_category : BinaryCIFCategory
+            The filtered category.
+        """
         return BinaryCIFCategory(
-            {key: column.filter(index) for key, column in self.items()},
+            {
+                key: BinaryCIFColumn(
+                    BinaryCIFData(column.data.array[index]),
+                    (
+                        BinaryCIFData(column.mask.array[index])
+                        if column.mask is not None else None
+                    )
+                )
+                for key, column in self.items()
+            },
             # Create placeholder array just to check how many elements
             # remain after filtering
             len(np.empty(self.row_count, dtype=bool)[index]),
@@ -521,6 +567,15 @@ class BinaryCIFFile(File, _HierarchicalContainer):
     The decoded :class:`BinaryCIFBlock`/:class:`BinaryCIFCategory`
     objects are cached for subsequent accesses.
 
+    If a file path is given to :meth:`read()`, the file is memory
+    mapped, i.e. the encoded column data is not copied into memory.
+    Column data that is only encoded with a :class:`ByteArrayEncoding`
+    is hence a read-only view into the file.
+    The memory map is closed, when the :class:`BinaryCIFFile` and all
+    objects referring to the mapped data, i.e. blocks, categories and
+    columns obtained from it as well as arrays from
+    :class:`ByteArrayEncoding` columns, are released.
+
     Attributes
     ----------
     block : BinaryCIFBlock
@@ -595,11 +650,15 @@ class BinaryCIFFile(File, _HierarchicalContainer):
         # File name
         if is_open_compatible(file):
             with open(file, "rb") as f:
-                return BinaryCIFFile.deserialize(
-                    msgpack.unpackb(
-                        f.read(), use_list=True, raw=False
-                    )
+                # The memory map stays valid after the file is closed
+                # It is closed when the last object referring to the
+                # mapped data is released
+                mapped_file = mmap.mmap(
+                    f.fileno(), 0, access=mmap.ACCESS_READ
                 )
+            return BinaryCIFFile.deserialize(
+                unpack_without_copy(mapped_file)
+            )
         # File object
         else:
             if not is_binary(file):
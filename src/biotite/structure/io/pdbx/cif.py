@@ -6,12 +6,13 @@ __name__ = "biotite.structure.io.pdbx"
 __author__ = "Patrick Kunzmann"
 __all__ = ["CIFFile", "CIFBlock", "CIFCategory", "CIFColumn", "CIFData"]
 
-import itertools
 import shlex
+import warnings
 from collections.abc import MutableMapping, Sequence
 import numpy as np
 from .component import _Component, MaskValue
 from .error import DeserializationError, SerializationError
+from .tokenize import tokenize, extract_tokens
 from ....file import File, is_open_compatible, is_text
 
 
@@ -301,6 +302,12 @@ class CIFCategory(_Component, MutableMapping):
     When a column containing strings with line breaks are added, these
     strings are written as multiline strings to the CIF file.
 
+    The columns of a looped category read from a file are lazily
+    deserialized:
+    The category is tokenized only once and the tokens of a column are
+    only converted into a :class:`CIFColumn`, when the column is
+    accessed.
+
     Examples
     --------
 
@@ -334,6 +341,11 @@ class CIFCategory(_Component, MutableMapping):
 
         self._row_count = None
         self._columns = columns
+        # The encoded text and the token positions for columns that are
+        # not deserialized yet (see 'deserialize()')
+        self._text = None
+        self._token_starts = None
+        self._token_stops = None
 
     @property
     def name(self):
@@ -360,32 +372,83 @@ class CIFCategory(_Component, MutableMapping):
         return CIFBlock
 
     @staticmethod
-    def deserialize(text, expect_whitespace=True):
+    def deserialize(text, expect_whitespace=None):
+        if expect_whitespace is not None:
+            warnings.warn(
+                "The 'expect_whitespace' parameter is deprecated and has "
+                "no effect, as the tokenizer handles values with and "
+                "without surrounding whitespace",
+                DeprecationWarning
+            )
+        # Only the first line is required to decide whether the category
+        # is looped, avoid splitting the entire (potentially large) text
+        first_line = next(
+            line for line in _iter_lines(text) if not _is_empty(line)
+        )
+        if _is_loop_start(first_line.strip()):
+            return CIFCategory._deserialize_looped(text)
+
         lines = [
             line.strip() for line in text.splitlines() if not _is_empty(line)
         ]
-
-        if _is_loop_start(lines[0]):
-            is_looped = True
-            lines.pop(0)
-        else:
-            is_looped = False
-
         category_name = _parse_category_name(lines[0])
         if category_name is None:
             raise DeserializationError(
                 "Failed to parse category name"
             )
-
-        lines = _to_single(lines, is_looped)
-        if is_looped:
-            category_dict = CIFCategory._deserialize_looped(
-                lines, expect_whitespace
-            )
-        else:
-            category_dict = CIFCategory._deserialize_single(lines)
+        lines = _to_single(lines)
+        category_dict = CIFCategory._deserialize_single(lines)
         return CIFCategory(category_dict, category_name)
 
+    def filter(self, index):
+        """
+        Create a new category, containing only the given rows of this
+        category.
+
+        Columns that are not deserialized yet, are also filtered lazily,
+        i.e. only the accessed columns of the new category are
+        deserialized.
+
+        Parameters
+        ----------
+        index : slice or ndarray, dtype=bool or dtype=int
+            The rows to keep.
+
+        Returns
+        -------
+        filtered_category : CIFCategory
+            The filtered category.
+
+        Examples
+        --------
+
+        >>> category = CIFCategory({"fruit": ["apple", "banana", "cherry"]})
+        >>> print(category.filter([True, False, True])["fruit"].as_array())
+        ['apple' 'cherry']
+        """
+        filtered_category = CIFCategory(name=self._name)
+        # Convert any kind of index into row indices, which can be
+        # combined with the row indices of further filtering steps
+        row_indices = np.arange(self.row_count)[index]
+        if self._text is not None:
+            filtered_category._text = self._text
+            filtered_category._token_starts = self._token_starts[row_indices]
+            filtered_category._token_stops = self._token_stops[row_indices]
+        filtered_category._row_count = len(row_indices)
+        for key, column in self._columns.items():
+            if isinstance(column, CIFColumn):
+                filtered_category._columns[key] = CIFColumn(
+                    CIFData(column.data.array[row_indices]),
+                    (
+                        CIFData(column.mask.array[row_indices])
+                        if column.mask is not None else None
+                    )
+                )
+            else:
+                # Column is still stored as position in the tokens
+                filtered_category._columns[key] = column
+        return filtered_category
+
     def serialize(self):
         if self._name is None:
             raise SerializationError("Category name is required")
@@ -411,7 +474,19 @@ class CIFCategory(_Component, MutableMapping):
         return "\n".join(lines)
 
     def __getitem__(self, key):
-        return self._columns[key]
+        column = self._columns[key]
+        if not isinstance(column, CIFColumn):
+            # Column is stored as position in the tokens
+            # -> must be deserialized first
+            try:
+                column = self._deserialize_column(column)
+            except:
+                raise DeserializationError(
+                    f"Failed to deserialize column '{key}'"
+                )
+            # Update with deserialized object
+            self._columns[key] = column
+        return column
 
     def __setitem__(self, key, column):
         if not isinstance(column, CIFColumn):
@@ -454,49 +529,69 @@ class CIFCategory(_Component, MutableMapping):
         return category_dict
 
     @staticmethod
-    def _deserialize_looped(lines, expect_whitespace):
+    def _deserialize_looped(text):
         """
         Process a category where each field has multiple values
         (category is a table).
+
+        The values are only tokenized here, the columns are created
+        from the tokens, when they are accessed.
         """
-        category_dict = {}
         column_names = []
-        i = 0
-        for key_line in lines:
-            if key_line[0] == "_":
+        category_name = None
+        # The position in the text, where the values begin
+        data_start = 0
+        for line in _iter_lines(text):
+            stripped_line = line.strip()
+            if _is_empty(line) or _is_loop_start(stripped_line):
+                data_start += len(line)
+            elif stripped_line[0] == "_":
                 # Key line
-                key = key_line.split(".")[1]
-                column_names.append(key)
-                category_dict[key] = []
-                i += 1
+                if category_name is None:
+                    category_name = _parse_category_name(stripped_line)
+                column_names.append(stripped_line.split(".")[1])
+                data_start += len(line)
             else:
                 break
+        if category_name is None:
+            raise DeserializationError(
+                "Failed to parse category name"
+            )
 
-        data_lines = lines[i:]
+        encoded_text = np.frombuffer(
+            text[data_start:].encode("utf-8"), dtype=np.uint8
+        )
         # Rows may be split over multiple lines -> do not rely on
-        # row-line-alignment at all and simply cycle through columns
-        column_names = itertools.cycle(column_names)
-        for data_line in data_lines:
-            # If whitespace is expected in quote protected values,
-            # use standard shlex split
-            # Otherwise use much more faster whitespace split
-            # and quote removal if applicable,
-            # bypassing the slow shlex module
-            if expect_whitespace:
-                values = shlex.split(data_line)
-            else:
-                values = data_line.split()
-                for k in range(len(values)):
-                    # Remove quotes
-                    if (values[k][0] == '"' and values[k][-1] == '"') or (
-                        values[k][0] == "'" and values[k][-1] == "'"
-                    ):
-                        values[k] = values[k][1:-1]
-            for val in values:
-                column_name = next(column_names)
-                category_dict[column_name].append(val)
+        # row-line-alignment at all and simply split all values
+        starts, stops = tokenize(encoded_text)
+        if len(starts) % len(column_names) != 0:
+            raise DeserializationError(
+                f"Category has {len(column_names)} columns, "
+                f"but {len(starts)} values"
+            )
 
-        return category_dict
+        category = CIFCategory(name=category_name)
+        category._text = encoded_text
+        # Each row contains the positions of the values in one row
+        category._token_starts = starts.reshape(-1, len(column_names))
+        category._token_stops = stops.reshape(-1, len(column_names))
+        category._row_count = category._token_starts.shape[0]
+        category._columns = {
+            name: position for position, name in enumerate(column_names)
+        }
+        return category
+
+    def _deserialize_column(self, position):
+        """
+        Create a :class:`CIFColumn` from the tokens at the given column
+        position.
+        """
+        return CIFColumn(extract_tokens(
+            self._text,
+            # Contiguous arrays are required for the extraction
+            np.ascontiguousarray(self._token_starts[:, position]),
+            np.ascontiguousarray(self._token_stops[:, position]),
+        ))
 
     def _serialize_single(self):
         keys = ["_" + self._name + "." + name for name in self.keys()]
@@ -647,15 +742,7 @@ class CIFBlock(_Component, MutableMapping):
             # Element is stored in serialized form
             # -> must be deserialized first
             try:
-                # Special optimization for "atom_site":
-                # Even if the values are quote protected,
-                # no whitespace is expected in escaped values
-                # Therefore slow shlex.split() call is not necessary
-                if key == "atom_site":
-                    expect_whitespace = False
-                else:
-                    expect_whitespace = True
-                category = CIFCategory.deserialize(category, expect_whitespace)
+                category = CIFCategory.deserialize(category)
             except:
                 raise DeserializationError(
                     f"Failed to deserialize category '{key}'"
@@ -906,6 +993,20 @@ def _is_empty(line):
     return len(line.strip()) == 0 or line[0] == "#"
 
 
+def _iter_lines(text):
+    """
+    Lazily iterate over the lines in the given text.
+    In contrast to ``str.splitlines()``, the line breaks are kept and
+    the text after the currently required line is not split.
+    """
+    position = 0
+    while position < len(text):
+        line_end = text.find("\n", position)
+        line_end = len(text) if line_end == -1 else line_end + 1
+        yield text[position : line_end]
+        position = line_end
+
+
 def _create_element_dict(lines, element_names, element_starts):
     """
     Create a dict mapping the `element_names` to the corresponding
@@ -951,10 +1052,10 @@ def _is_loop_start(line):
     return line.startswith("loop_")
 
 
-def _to_single(lines, is_looped):
+def _to_single(lines):
     """
     Convert multiline values into singleline values
-    (in terms of 'lines' list elements).
+    (in terms of 'lines' list elements) of a non-looped category.
     Linebreaks are preserved.
     """
     processed_lines = [None] * len(lines)
@@ -969,16 +1070,11 @@ def _to_single(lines, is_looped):
                 # Preserve linebreaks
                 multi_line_str += "\n" + lines[j]
                 j += 1
-            if is_looped:
-                # Create a line for the multiline string only
-                processed_lines[out_i] = shlex.quote(multi_line_str)
-                out_i += 1
-            else:
-                # Append multiline string to previous line
-                processed_lines[out_i - 1] += " " + shlex.quote(multi_line_str)
+            # Append multiline string to previous line
+            processed_lines[out_i - 1] += " " + shlex.quote(multi_line_str)
             in_i = j + 1
 
-        elif not is_looped and lines[in_i][0] != "_":
+        elif lines[in_i][0] != "_":
             # Singleline value in the line after the corresponding key
             processed_lines[out_i - 1] += " " + lines[in_i]
             in_i += 1
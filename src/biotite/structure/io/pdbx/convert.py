@@ -8,6 +8,7 @@ __all__ = [
     "get_sequence",
     "get_model_count",
     "get_structure",
+    "get_structure_iter",
     "set_structure",
     "get_component",
     "set_component",
@@ -20,7 +21,9 @@ import warnings
 import numpy as np
 from ....file import InvalidFileError
 from ....sequence.seqtypes import NucleotideSequence, ProteinSequence
-from ...atoms import AtomArray, AtomArrayStack, repeat
+from ...atoms import (
+    AtomArray, AtomArrayStack, repeat, _read_only_annotations, _array_view
+)
 from ...bonds import BondList, BondType, connect_via_residue_names
 from ...box import unitcell_from_vectors, vectors_from_unitcell
 from ...filter import filter_first_altloc, filter_highest_occupancy_altloc
@@ -89,27 +92,6 @@ _other_type_list = [
 ]
 
 
-def _filter(category, index):
-    """
-    Reduce the ``atom_site`` category to the values for the given
-    model.
-    """
-    Category = type(category)
-    Column = Category.subcomponent_class()
-    Data = Column.subcomponent_class()
-
-    return Category({
-        key: Column(
-            Data(column.data.array[index]),
-            (
-                Data(column.mask.array[index])
-                if column.mask is not None else None
-            )
-        )
-        for key, column in category.items()
-    })
-
-
 def get_sequence(pdbx_file, data_block=None):
     """
     Get the protein and nucleotide sequences from the
@@ -356,6 +338,137 @@ def get_structure(pdbx_file, model=None, data_block=None, altloc="first",
     return atoms
 
 
+def get_structure_iter(pdbx_file, data_block=None, altloc="first",
+                       extra_fields=None, use_author_fields=True,
+                       include_bonds=False):
+    """
+    Create an iterator over each model in the ``atom_site`` category
+    of a :class:`PDBxFile`.
+
+    In contrast to :func:`get_structure()`, each model is returned as
+    separate :class:`AtomArray`, instead of creating an
+    :class:`AtomArrayStack` of all models at once.
+    All returned :class:`AtomArray` objects share the same annotation
+    arrays and bonds, that are created only once from the first model.
+    Only the coordinates are parsed for each model.
+    Hence, this function is suitable for files with a large number of
+    models, e.g. NMR or cryo-EM ensembles.
+
+    Parameters
+    ----------
+    pdbx_file : CIFFile or CIFBlock or BinaryCIFFile or BinaryCIFBlock
+        The file object.
+    data_block : str, optional
+        The name of the data block.
+        Default is the first (and most times only) data block of the
+        file.
+        If the data block object is passed directly to `pdbx_file`,
+        this parameter is ignored.
+    altloc : {'first', 'occupancy', 'all'}
+        This parameter defines how *altloc* IDs are handled, as
+        described in :func:`get_structure()`.
+        The selection is based on the first model and applied to all
+        models.
+    extra_fields : list of str, optional
+        Additional annotation arrays, as described in
+        :func:`get_structure()`.
+    use_author_fields : bool, optional
+        Whether to use the ``auth_xxx`` instead of the ``label_xxx``
+        fields, as described in :func:`get_structure()`.
+    include_bonds : bool, optional
+        If set to true, a :class:`BondList` will be created for the
+        returned :class:`AtomArray` objects, as described in
+        :func:`get_structure()`.
+
+    Yields
+    ------
+    array : AtomArray
+        The structure of the current model.
+
+    See also
+    --------
+    get_structure
+
+    Notes
+    -----
+    Like in a :class:`AtomArrayStack` the annotations of the first
+    model apply to all models, hence all models must have the same
+    atoms.
+    The shared annotation arrays and bond list are copied on write
+    (see :meth:`AtomArrayStack.get_array()`).
+
+    Examples
+    --------
+
+    >>> import os.path
+    >>> file = CIFFile.read(os.path.join(path_to_structures, "1l2y.cif"))
+    >>> for model in get_structure_iter(file):
+    ...     print(f"{model.array_length()} atoms, "
+    ...           f"first CA at {model.coord[1]}")
+    ...     break
+    304 atoms, first CA at [-8.608  3.135 -1.618]
+    """
+    block = _get_block(pdbx_file, data_block)
+
+    atom_site = block.get("atom_site")
+    if atom_site is None:
+        raise InvalidFileError("Missing 'atom_site' category in file")
+
+    models = atom_site["pdbx_PDB_model_num"].as_array(np.int32)
+    model_starts = _get_model_starts(models)
+    model_count = len(model_starts)
+
+    # Get the annotations for all models from the first model,
+    # all atoms are kept, as the altloc IDs are filtered below
+    template = get_structure(
+        block, model=1, altloc="all", extra_fields=extra_fields,
+        use_author_fields=use_author_fields, include_bonds=include_bonds
+    )
+    model_atom_site = _filter_model(atom_site, model_starts, 1)
+    model_length = model_atom_site.row_count
+    altloc_filter = _get_altloc_filter(template, model_atom_site, altloc)
+    if altloc_filter is not None:
+        if "altloc_id" in template.get_annotation_categories():
+            template.del_annotation("altloc_id")
+        template = template[altloc_filter]
+    # The template is not handed out, so its frozen annotation
+    # arrays cannot be modified and derived values can be cached
+    template.freeze_annotations()
+    annot = _read_only_annotations(template)
+    box = template.box
+    # The bond list is shared and copied on access
+    bonds = template.bonds
+    # All models have the same annotations, so cached values derived
+    # from them are shared
+    cache = {}
+    yield _array_view(
+        annot, template.coord, box.copy() if box is not None else None,
+        bonds, cache
+    )
+
+    for model in range(2, model_count + 1):
+        model_atom_site = _filter_model(atom_site, model_starts, model)
+        if model_atom_site.row_count != model_length:
+            raise InvalidFileError(
+                "The models in the file have unequal "
+                "amount of atoms, give an explicit model "
+                "instead"
+            )
+        coord = np.stack(
+            [
+                model_atom_site[f"Cartn_{dim}"].as_array(np.float32)
+                for dim in ("x", "y", "z")
+            ],
+            axis=-1
+        )
+        if altloc_filter is not None:
+            coord = coord[altloc_filter]
+        yield _array_view(
+            annot, coord, box.copy() if box is not None else None, bonds,
+            cache
+        )
+
+
 def _get_block(pdbx_component, block_name):
     if isinstance(pdbx_component, PDBxFile):
         # The deprecated 'PDBxFile' is a thin wrapper around 'CIFFile'
@@ -626,25 +739,35 @@ def _get_struct_conn_col_name(col_name, partner):
 
 
 def _filter_altloc(array, atom_site, altloc):
+    altloc_filter = _get_altloc_filter(array, atom_site, altloc)
+    if altloc_filter is not None:
+        return array[..., altloc_filter]
+    if altloc == "all" and "label_alt_id" in atom_site:
+        array.set_annotation(
+            "altloc_id", atom_site["label_alt_id"].as_array(str)
+        )
+    return array
+
+
+def _get_altloc_filter(array, atom_site, altloc):
+    """
+    Get the boolean mask for the atoms to be kept according to the
+    `altloc` option or *None*, if all atoms are kept.
+    """
     altloc_ids = atom_site.get("label_alt_id")
     occupancy = atom_site.get("occupancy")
 
-    # Filter altloc IDs and return
     if altloc_ids is None:
-        return array
+        return None
     elif altloc == "occupancy" and occupancy is not None:
-        return array[
-            ...,
-            filter_highest_occupancy_altloc(
-                array, altloc_ids.as_array(str), occupancy.as_array(float)
-            ),
-        ]
+        return filter_highest_occupancy_altloc(
+            array, altloc_ids.as_array(str), occupancy.as_array(float)
+        )
     # 'first' is also fallback if file has no occupancy information
     elif altloc == "first":
-        return array[..., filter_first_altloc(array, altloc_ids.as_array(str))]
+        return filter_first_altloc(array, altloc_ids.as_array(str))
     elif altloc == "all":
-        array.set_annotation("altloc_id", altloc_ids.as_array(str))
-        return array
+        return None
     else:
         raise ValueError(f"'{altloc}' is not a valid 'altloc' option")
 
@@ -664,10 +787,6 @@ def _filter_model(atom_site, model_starts, model):
     Reduce the ``atom_site`` category to the values for the given
     model.
     """
-    Category = type(atom_site)
-    Column = Category.subcomponent_class()
-    Data = Column.subcomponent_class()
-
     # Append exclusive stop
     model_starts = np.append(
         model_starts, [atom_site.row_count]
@@ -675,7 +794,7 @@ def _filter_model(atom_site, model_starts, model):
     # Indexing starts at 0, but model number starts at 1
     model_index = model - 1
     index = slice(model_starts[model_index], model_starts[model_index + 1])
-    return _filter(atom_site, index)
+    return atom_site.filter(index)
 
 
 def _get_box(block):
@@ -1109,8 +1228,8 @@ def get_component(pdbx_file, data_block=None, use_ideal_coord=True,
     except KeyError:
         raise InvalidFileError("Missing 'chem_comp_atom' category in file")
     if res_name is not None:
-        atom_category = _filter(
-            atom_category, atom_category["comp_id"].as_array() == res_name
+        atom_category = atom_category.filter(
+            atom_category["comp_id"].as_array() == res_name
         )
         if len(atom_category) == 0:
             raise KeyError(
@@ -1148,8 +1267,8 @@ def get_component(pdbx_file, data_block=None, use_ideal_coord=True,
     try:
         bond_category = block["chem_comp_bond"]
         if res_name is not None:
-            bond_category = _filter(
-                bond_category, bond_category["comp_id"].as_array() == res_name
+            bond_category = bond_category.filter(
+                bond_category["comp_id"].as_array() == res_name
             )
     except KeyError:
         warnings.warn(
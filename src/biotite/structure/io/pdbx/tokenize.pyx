@@ -0,0 +1,233 @@
+# This source code is part of the Biotite package and is distributed
+# under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
+# information.
+
+"""
+A module for Biotite's internal use only.
+Contains a fast tokenizer for the values of looped CIF categories.
+"""
+
+__name__ = "biotite.structure.io.pdbx"
+__author__ = "Patrick Kunzmann"
+__all__ = []
+
+cimport cython
+cimport numpy as np
+
+import numpy as np
+from .error import DeserializationError
+
+ctypedef np.uint8_t uint8
+ctypedef np.uint32_t uint32
+ctypedef np.int64_t int64
+
+
+cdef uint8 _NEWLINE = ord("\n")
+cdef uint8 _CARRIAGE_RETURN = ord("\r")
+cdef uint8 _SPACE = ord(" ")
+cdef uint8 _TAB = ord("\t")
+cdef uint8 _COMMENT = ord("#")
+cdef uint8 _SEMICOLON = ord(";")
+cdef uint8 _SINGLE_QUOTE = ord("'")
+cdef uint8 _DOUBLE_QUOTE = ord('"')
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def tokenize(const uint8[::1] text not None):
+    """
+    Split the values of a looped CIF category into tokens.
+
+    The following rules are applied:
+
+        - Tokens are separated by whitespace.
+        - Quote characters (``'`` or ``"``) at the start of a token
+          protect whitespace within the value.
+          The value ends at the next matching quote character, that is
+          followed by whitespace.
+        - A ``;`` at the start of a line begins a multiline value, that
+          ends with a ``;`` at the start of a line.
+        - A ``#`` at the start of a token comments out the rest of the
+          line.
+
+    Parameters
+    ----------
+    text : ndarray, dtype=uint8
+        The UTF-8 encoded text, containing only the values of the
+        category, i.e. the text after the lines containing the column
+        names.
+
+    Returns
+    -------
+    starts, stops : ndarray, dtype=int64
+        The start and exclusive stop position of each token in `text`.
+        Quote characters and multiline delimiters are not part of the
+        tokens.
+    """
+    cdef int64 length = text.shape[0]
+    # Each token requires at least one character and one separator
+    # -> Start with a reasonable guess and grow the arrays if necessary
+    cdef int64 capacity = length // 8 + 1
+    starts = np.empty(capacity, dtype=np.int64)
+    stops = np.empty(capacity, dtype=np.int64)
+    cdef int64[:] starts_v = starts
+    cdef int64[:] stops_v = stops
+
+    cdef int64 count = 0
+    cdef int64 i = 0
+    cdef int64 start, stop
+    cdef uint8 c, quote
+    cdef bint is_line_start = True
+
+    while i < length:
+        c = text[i]
+
+        if c == _NEWLINE or c == _CARRIAGE_RETURN:
+            is_line_start = True
+            i += 1
+            continue
+        if c == _SPACE or c == _TAB:
+            is_line_start = False
+            i += 1
+            continue
+        if c == _COMMENT:
+            while i < length and text[i] != _NEWLINE:
+                i += 1
+            continue
+
+        if c == _SEMICOLON and is_line_start:
+            # Multiline value
+            start = i + 1
+            i = start
+            while True:
+                while i < length and text[i] != _NEWLINE:
+                    i += 1
+                if i >= length:
+                    raise DeserializationError(
+                        "Multiline value is not terminated"
+                    )
+                if i + 1 < length and text[i+1] == _SEMICOLON:
+                    break
+                i += 1
+            stop = i
+            if stop > start and text[stop-1] == _CARRIAGE_RETURN:
+                stop -= 1
+            # Skip the terminating line break and semicolon
+            i += 2
+        elif c == _SINGLE_QUOTE or c == _DOUBLE_QUOTE:
+            # Quote protected value, the quote character only ends the
+            # value, if it is followed by whitespace
+            quote = c
+            start = i + 1
+            i = start
+            while i < length and not (
+                text[i] == quote and (
+                    i + 1 == length
+                    or text[i+1] == _SPACE
+                    or text[i+1] == _TAB
+                    or text[i+1] == _NEWLINE
+                    or text[i+1] == _CARRIAGE_RETURN
+                )
+            ):
+                i += 1
+            if i >= length:
+                raise DeserializationError("Quoted value is not terminated")
+            stop = i
+            # Skip the closing quote
+            i += 1
+        else:
+            # Plain value
+            start = i
+            while i < length and not (
+                text[i] == _SPACE
+                or text[i] == _TAB
+                or text[i] == _NEWLINE
+                or text[i] == _CARRIAGE_RETURN
+            ):
+                i += 1
+            stop = i
+
+        if count == capacity:
+            capacity *= 2
+            starts = _grow(starts, capacity)
+            stops = _grow(stops, capacity)
+            starts_v = starts
+            stops_v = stops
+        starts_v[count] = start
+        stops_v[count] = stop
+        count += 1
+        is_line_start = False
+
+    return starts[:count], stops[:count]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def extract_tokens(const uint8[::1] text not None,
+                   const int64[:] starts not None,
+                   const int64[:] stops not None):
+    """
+    Create a string array from the given tokens in `text`.
+
+    Parameters
+    ----------
+    text : ndarray, dtype=uint8
+        The UTF-8 encoded text the tokens point to.
+    starts, stops : ndarray, dtype=int64
+        The start and exclusive stop position of each token, as
+        returned by :func:`tokenize()`.
+
+    Returns
+    -------
+    array : ndarray, dtype=str
+        The tokens as string array.
+    """
+    cdef int64 n_tokens = starts.shape[0]
+    cdef int64 i, j
+    cdef int64 max_length = 0
+    cdef int64 total_length = 0
+    cdef int64 token_length
+    for i in range(n_tokens):
+        token_length = stops[i] - starts[i]
+        total_length += token_length
+        if token_length > max_length:
+            max_length = token_length
+
+    if n_tokens * max_length > 4 * total_length + 1_000_000:
+        # Few very long values (e.g. multiline values) would inflate
+        # the fixed-width array
+        # -> decode the tokens separately
+        return _decode_separately(text, starts, stops)
+
+    # Do not create a zero-width string type
+    max_length = max(max_length, 1)
+    # Fill the UCS4 code points of the string array directly,
+    # which is much faster than decoding a byte string array
+    code_points = np.zeros((n_tokens, max_length), dtype=np.uint32)
+    cdef uint32[:, :] code_points_v = code_points
+    cdef uint8 c
+    for i in range(n_tokens):
+        for j in range(stops[i] - starts[i]):
+            c = text[starts[i] + j]
+            if c >= 128:
+                # Non-ASCII characters require actual UTF-8 decoding
+                return _decode_separately(text, starts, stops)
+            code_points_v[i, j] = c
+    return code_points.view(f"U{max_length}").reshape(n_tokens)
+
+
+def _decode_separately(text, starts, stops):
+    data = np.asarray(text).tobytes()
+    return np.array(
+        [
+            data[start : stop].decode("utf-8")
+            for start, stop in zip(starts, stops)
+        ],
+        dtype=str
+    )
+
+
+def _grow(array, capacity):
+    new_array = np.empty(capacity, dtype=array.dtype)
+    new_array[:len(array)] = array
+    return new_array
@@ -0,0 +1,197 @@
+# This source code is part of the Biotite package and is distributed
+# under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
+# information.
+
+"""
+A module for Biotite's internal use only.
+Contains a *MessagePack* unpacker that does not copy binary values.
+"""
+
+__name__ = "biotite.structure.io.pdbx"
+__author__ = "Patrick Kunzmann"
+__all__ = []
+
+cimport cython
+cimport numpy as np
+
+from libc.string cimport memcpy
+
+ctypedef np.uint8_t uint8
+ctypedef np.uint16_t uint16
+ctypedef np.uint32_t uint32
+ctypedef np.uint64_t uint64
+ctypedef np.int8_t int8
+ctypedef np.int16_t int16
+ctypedef np.int32_t int32
+ctypedef np.int64_t int64
+ctypedef np.float32_t float32
+ctypedef np.float64_t float64
+
+
+def unpack_without_copy(buffer):
+    """
+    Unpack the *MessagePack* encoded `buffer`.
+
+    In contrast to :func:`msgpack.unpackb()`, binary values are not
+    copied into :class:`bytes` objects, but are returned as
+    :class:`memoryview` into the `buffer`.
+    As the actual column data of *BinaryCIF* files is stored as binary
+    values, the largest part of a memory mapped file is not read until
+    the data is decoded.
+
+    Parameters
+    ----------
+    buffer : bytes-like object
+        The *MessagePack* encoded data.
+
+    Returns
+    -------
+    content : object
+        The unpacked content.
+    """
+    cdef _Unpacker unpacker = _Unpacker(buffer)
+    content = unpacker.unpack_object()
+    if unpacker.position != unpacker.length:
+        raise ValueError("Extra data after the MessagePack object")
+    return content
+
+
+@cython.final
+cdef class _Unpacker:
+
+    cdef object view
+    cdef const uint8* data
+    cdef Py_ssize_t length
+    cdef Py_ssize_t position
+
+    def __cinit__(self, buffer):
+        cdef const uint8[::1] typed_view = buffer
+        self.view = memoryview(buffer)
+        self.length = typed_view.shape[0]
+        self.data = &typed_view[0] if self.length > 0 else NULL
+        self.position = 0
+
+    cdef object unpack_object(self):
+        cdef uint8 code = self.read_bytes(1)[0]
+        cdef Py_ssize_t length
+
+        # Single-byte types
+        if code <= 0x7f:
+            # Positive fixint
+            return code
+        if code >= 0xe0:
+            # Negative fixint
+            return <int8> code
+        if code <= 0x8f:
+            return self.unpack_map(code & 0x0f)
+        if code <= 0x9f:
+            return self.unpack_array(code & 0x0f)
+        if code <= 0xbf:
+            return self.unpack_str(code & 0x1f)
+        if code == 0xc0:
+            return None
+        if code == 0xc2:
+            return False
+        if code == 0xc3:
+            return True
+
+        # Binary values
+        if code == 0xc4:
+            return self.unpack_bin(self.read_uint(1))
+        if code == 0xc5:
+            return self.unpack_bin(self.read_uint(2))
+        if code == 0xc6:
+            return self.unpack_bin(self.read_uint(4))
+        # Numbers
+        if code == 0xca:
+            return self.read_float32()
+        if code == 0xcb:
+            return self.read_float64()
+        if code == 0xcc:
+            return self.read_uint(1)
+        if code == 0xcd:
+            return self.read_uint(2)
+        if code == 0xce:
+            return self.read_uint(4)
+        if code == 0xcf:
+            return self.read_uint(8)
+        if code == 0xd0:
+            return <int8> self.read_uint(1)
+        if code == 0xd1:
+            return <int16> self.read_uint(2)
+        if code == 0xd2:
+            return <int32> self.read_uint(4)
+        if code == 0xd3:
+            return <int64> self.read_uint(8)
+        # Strings
+        if code == 0xd9:
+            return self.unpack_str(self.read_uint(1))
+        if code == 0xda:
+            return self.unpack_str(self.read_uint(2))
+        if code == 0xdb:
+            return self.unpack_str(self.read_uint(4))
+        # Containers
+        if code == 0xdc:
+            return self.unpack_array(self.read_uint(2))
+        if code == 0xdd:
+            return self.unpack_array(self.read_uint(4))
+        if code == 0xde:
+            return self.unpack_map(self.read_uint(2))
+        if code == 0xdf:
+            return self.unpack_map(self.read_uint(4))
+
+        raise ValueError(f"Unsupported MessagePack type code 0x{code:02x}")
+
+    cdef inline const uint8* read_bytes(self, Py_ssize_t n) except NULL:
+        cdef const uint8* pointer
+        if self.position + n > self.length:
+            raise ValueError("Unexpected end of MessagePack data")
+        pointer = self.data + self.position
+        self.position += n
+        return pointer
+
+    cdef inline uint64 read_uint(self, int n_bytes) except? 0:
+        # MessagePack uses big-endian byte order
+        cdef const uint8* pointer = self.read_bytes(n_bytes)
+        cdef uint64 value = 0
+        cdef int i
+        for i in range(n_bytes):
+            value = (value << 8) | pointer[i]
+        return value
+
+    cdef inline float32 read_float32(self) except? -1:
+        cdef uint32 bits = <uint32> self.read_uint(4)
+        cdef float32 value
+        memcpy(&value, &bits, 4)
+        return value
+
+    cdef inline float64 read_float64(self) except? -1:
+        cdef uint64 bits = self.read_uint(8)
+        cdef float64 value
+        memcpy(&value, &bits, 8)
+        return value
+
+    cdef object unpack_bin(self, Py_ssize_t length):
+        cdef Py_ssize_t start = self.position
+        self.read_bytes(length)
+        # Binary values are not copied
+        return self.view[start : start + length]
+
+    cdef str unpack_str(self, Py_ssize_t length):
+        cdef const uint8* pointer = self.read_bytes(length)
+        return (<const char*> pointer)[:length].decode("utf-8")
+
+    cdef list unpack_array(self, Py_ssize_t length):
+        cdef list array = [None] * length
+        cdef Py_ssize_t i
+        for i in range(length):
+            array[i] = self.unpack_object()
+        return array
+
+    cdef dict unpack_map(self, Py_ssize_t length):
+        cdef dict mapping = {}
+        cdef Py_ssize_t i
+        for i in range(length):
+            key = self.unpack_object()
+            mapping[key] = self.unpack_object()
+        return mapping
@@ -0,0 +1,335 @@
+# This source code is part of the Biotite package and is distributed
+# under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
+# information.
+
+"""
+This module provides reducers, that combine the results of an analysis
+over chunks of trajectory frames into a single result.
+"""
+
+__name__ = "biotite.structure.io"
+__author__ = "Patrick Kunzmann"
+__all__ = ["Reducer", "ConcatenationReducer", "MeanReducer",
+           "HistogramReducer", "FrequencyReducer"]
+
+import abc
+import numpy as np
+
+
+class Reducer(metaclass=abc.ABCMeta):
+    """
+    A reducer successively combines the values computed for chunks of
+    trajectory frames into a single result, without the need to store
+    the values of all chunks.
+
+    The values for each chunk are given to :meth:`add()` in the order
+    of the frames.
+    The combined result is obtained from :meth:`result()`.
+
+    This is an abstract base class.
+    Subclasses must override :meth:`add()` and :meth:`result()`.
+    """
+
+    @abc.abstractmethod
+    def add(self, value):
+        """
+        Add the value computed for a chunk of frames.
+
+        Parameters
+        ----------
+        value : object
+            The value computed for the chunk.
+            Usually this is an :class:`ndarray`, whose first dimension
+            represents the frames in the chunk.
+        """
+        pass
+
+    @abc.abstractmethod
+    def result(self):
+        """
+        Get the result combined from all values added so far.
+
+        Returns
+        -------
+        result : object
+            The combined result.
+        """
+        pass
+
+
+class ConcatenationReducer(Reducer):
+    """
+    Concatenate the values of all chunks along the first dimension,
+    e.g. to obtain a per-frame quantity over the entire trajectory.
+
+    If the values are tuples of arrays, e.g. the return value of
+    :func:`dihedral_backbone()`, each element of the tuple is
+    concatenated separately.
+
+    Notes
+    -----
+    In contrast to the other reducers, the memory requirement grows
+    with the number of frames, since the values for all frames are kept.
+
+    Examples
+    --------
+
+    >>> reducer = ConcatenationReducer()
+    >>> reducer.add(np.array([1, 2]))
+    >>> reducer.add(np.array([3]))
+    >>> print(reducer.result())
+    [1 2 3]
+    """
+
+    def __init__(self):
+        self._values = []
+
+    def add(self, value):
+        self._values.append(value)
+
+    def result(self):
+        if len(self._values) == 0:
+            return None
+        if isinstance(self._values[0], tuple):
+            return tuple(
+                np.concatenate(values) for values in zip(*self._values)
+            )
+        return np.concatenate(self._values)
+
+
+class MeanReducer(Reducer):
+    """
+    Compute the mean of the values over all frames, e.g. the average
+    structure of a trajectory.
+
+    Parameters
+    ----------
+    nan_policy : {'propagate', 'omit'}, optional
+        If set to ``'omit'``, *NaN* values are not included in the
+        mean, similar to :func:`numpy.nanmean()`.
+        By default, a *NaN* value in any frame results in a *NaN*
+        mean.
+
+    Examples
+    --------
+
+    >>> reducer = MeanReducer()
+    >>> reducer.add(np.array([[1.0, 2.0], [3.0, 4.0]]))
+    >>> reducer.add(np.array([[5.0, 6.0]]))
+    >>> print(reducer.result())
+    [3. 4.]
+    """
+
+    def __init__(self, nan_policy="propagate"):
+        if nan_policy not in ("propagate", "omit"):
+            raise ValueError(f"'{nan_policy}' is not a valid NaN policy")
+        self._omit_nan = nan_policy == "omit"
+        self._sum = None
+        self._count = None
+
+    def add(self, value):
+        value = np.asarray(value, dtype=np.float64)
+        if self._omit_nan:
+            is_nan = np.isnan(value)
+            value_sum = np.sum(np.where(is_nan, 0, value), axis=0)
+            count = np.count_nonzero(~is_nan, axis=0)
+        else:
+            value_sum = np.sum(value, axis=0)
+            count = len(value)
+        if self._sum is None:
+            self._sum = value_sum
+            self._count = count
+        else:
+            self._sum += value_sum
+            self._count += count
+
+    def result(self):
+        if self._sum is None:
+            return None
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self._sum / self._count
+
+
+class HistogramReducer(Reducer):
+    """
+    Accumulate the histogram of the values over all frames,
+    e.g. for a distance distribution.
+
+    As the bins must be the same for all chunks, they must be known in
+    advance.
+
+    Parameters
+    ----------
+    bins : ndarray, dtype=float
+        The edges of the bins, including the rightmost edge, as used by
+        :func:`numpy.histogram()`.
+    density : bool, optional
+        If true, the result is normalized, so that the integral over
+        the histogram is 1.
+
+    Examples
+    --------
+
+    >>> reducer = HistogramReducer(bins=np.array([0, 1, 2, 3]))
+    >>> reducer.add(np.array([0.5, 1.5, 1.7]))
+    >>> reducer.add(np.array([2.5, 0.2]))
+    >>> print(reducer.result())
+    [2 2 1]
+    """
+
+    def __init__(self, bins, density=False):
+        self._bins = np.asarray(bins)
+        if self._bins.ndim != 1 or len(self._bins) < 2:
+            raise ValueError("At least two bin edges are required")
+        self._density = density
+        self._counts = np.zeros(len(self._bins) - 1, dtype=np.int64)
+
+    @property
+    def bins(self):
+        return self._bins
+
+    def add(self, value):
+        counts, _ = np.histogram(value, bins=self._bins)
+        self._counts += counts
+
+    def result(self):
+        if self._density:
+            total = np.sum(self._counts)
+            return self._counts / (total * np.diff(self._bins))
+        return self._counts.copy()
+
+
+class FrequencyReducer(Reducer):
+    """
+    Determine how often each item occurs over all frames, relative to
+    the number of frames, e.g. the frequency of each hydrogen bond.
+
+    The value for each chunk must be a tuple of an array of items and
+    a boolean mask, that indicates for each frame in the chunk which
+    of the items are present, like the return value of :func:`hbond()`.
+    Alternatively, the presence of items can be given in sparse form
+    as tuple of the items, the *(frame, item)* index pairs and the
+    number of frames in the chunk, like the return value of
+    :func:`hbond()` with ``sparse=True`` complemented by the number of
+    frames.
+    The items may differ between chunks.
+
+    Examples
+    --------
+
+    >>> reducer = FrequencyReducer()
+    >>> items = np.array([[0, 1], [2, 3]])
+    >>> reducer.add((items, np.array([[True, False], [True, True]])))
+    >>> items = np.array([[2, 3], [4, 5]])
+    >>> reducer.add((items, np.array([[False, True], [False, False]])))
+    >>> items, frequency = reducer.result()
+    >>> print(items)
+    [[0 1]
+     [2 3]
+     [4 5]]
+    >>> print(frequency)
+    [0.50 0.25 0.25]
+
+    Use the sparse form to compute the frequency of each hydrogen bond
+    in a trajectory:
+
+    .. code-block:: python
+
+        def sparse_hbond(frames):
+            triplets, indices = struc.hbond(frames, sparse=True)
+            return triplets, indices, frames.stack_depth()
+
+        triplets, frequency = XTCFile.analyze(
+            "trajectory.xtc", sparse_hbond,
+            reducer=FrequencyReducer(), template=template
+        )
+    """
+
+    def __init__(self):
+        self._counts = {}
+        self._items = {}
+        self._n_frames = 0
+        # Shape and dtype of a single item, to return an empty array
+        # of items with the correct shape
+        self._item_shape = None
+        self._item_dtype = None
+
+    def add(self, value):
+        """
+        Add the presence of items in a chunk of frames.
+
+        Parameters
+        ----------
+        value : tuple(ndarray, ndarray) or tuple(ndarray, ndarray, int)
+            The items and their presence in each frame of the chunk.
+            The form is determined by the length of the tuple:
+            A tuple of two elements contains the items and a boolean
+            mask with shape *(m, k)* for *m* frames and *k* items.
+            A tuple of three elements contains the items, the *(frame,
+            item)* index pairs with shape *(p, 2)* and the number of
+            frames in the chunk.
+        """
+        if len(value) == 3:
+            items, indices, n_frames = value
+            items = np.asarray(items)
+            indices = np.asarray(indices)
+            if indices.ndim != 2 or indices.shape[1] != 2:
+                raise IndexError(
+                    f"Expected indices with shape (k, 2), "
+                    f"but got {indices.shape}"
+                )
+            counts = np.bincount(indices[:, 1], minlength=len(items))
+            if len(counts) > len(items):
+                raise IndexError(
+                    f"Item index {len(counts) - 1} is out of bounds "
+                    f"for {len(items)} items"
+                )
+        else:
+            items, mask = value
+            items = np.asarray(items)
+            mask = np.asarray(mask, dtype=bool)
+            if mask.ndim != 2 or mask.shape[1] != len(items):
+                raise IndexError(
+                    f"Expected mask with shape (m, {len(items)}), "
+                    f"but got {mask.shape}"
+                )
+            counts = np.count_nonzero(mask, axis=0)
+            n_frames = mask.shape[0]
+        if self._item_shape is None:
+            self._item_shape = items.shape[1:]
+            self._item_dtype = items.dtype
+        for item, count in zip(items, counts):
+            if count == 0:
+                continue
+            key = item.tobytes()
+            if key in self._counts:
+                self._counts[key] += count
+            else:
+                self._counts[key] = count
+                self._items[key] = item
+        self._n_frames += n_frames
+
+    def result(self):
+        """
+        Get the frequency of each item over all frames added so far.
+
+        Returns
+        -------
+        items : ndarray, shape=(k,...)
+            All items, that are present in at least one frame, in the
+            order of their first occurrence.
+        frequency : ndarray, dtype=float, shape=(k,)
+            The fraction of frames in which the respective item is
+            present.
+        """
+        if len(self._items) == 0:
+            if self._item_shape is None:
+                # No chunk was added
+                return np.zeros(0), np.zeros(0)
+            return (
+                np.zeros((0,) + self._item_shape, dtype=self._item_dtype),
+                np.zeros(0)
+            )
+        items = np.stack(list(self._items.values()))
+        frequency = np.array(list(self._counts.values())) / self._n_frames
+        return items, frequency
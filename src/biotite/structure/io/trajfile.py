@@ -8,8 +8,11 @@ __all__ = ["TrajectoryFile"]
 
 import itertools
 import abc
+import collections
+import os
 import numpy as np
 from ..atoms import AtomArray, AtomArrayStack, stack, from_template
+from .reducer import ConcatenationReducer
 from ...file import File
 
 
@@ -364,6 +367,143 @@ class TrajectoryFile(File, metaclass=abc.ABCMeta):
             f.write(**param)
     
 
+    @classmethod
+    def analyze(cls, file_name, function, reducer=None, template=None,
+                start=None, stop=None, step=None, atom_i=None,
+                chunk_size=100, executor=None, max_pending=None):
+        """
+        Apply an analysis function to chunks of frames from the given
+        trajectory file and combine the results for all chunks.
+
+        Only a limited number of chunks is kept in memory at the same
+        time.
+        Hence, this class method is able to analyze trajectories that
+        are too large to be read at once.
+        If an `executor` is given, the chunks are analyzed in parallel,
+        while the next chunks are read.
+
+        Parameters
+        ----------
+        file_name : str
+            The path of the file to be read.
+            A file-like-object cannot be used.
+        function : callable
+            The analysis function.
+            If a `template` is given, the function takes an
+            :class:`AtomArrayStack` of the frames in the chunk,
+            otherwise it takes the coordinates, the box and the time of
+            the frames as returned by :meth:`read_iter()` with the
+            `stack_size` parameter.
+            The values returned by this function are given to the
+            `reducer`.
+            If a :class:`concurrent.futures.ProcessPoolExecutor` is
+            used, the function must be picklable, i.e. it must be
+            defined at the top level of a module.
+        reducer : Reducer, optional
+            Combines the values returned by `function` into the result.
+            By default, a :class:`ConcatenationReducer` is used, i.e.
+            the values are concatenated along the first dimension.
+        template : AtomArray or AtomArrayStack, optional
+            If given, the chunks are given to `function` as
+            :class:`AtomArrayStack`, where the atom annotations are
+            taken from this template.
+        start, stop, step : int, optional
+            The range of frames to be analyzed, as in
+            :meth:`read_iter()`.
+        atom_i : ndarray, dtype=int, optional
+            If this parameter is set, only the atoms at the given
+            indices are read from each frame.
+        chunk_size : int, optional
+            The number of frames in each chunk.
+            The final chunk may contain less frames.
+        executor : concurrent.futures.Executor, optional
+            If given, the analysis function is executed via this
+            executor, e.g. a
+            :class:`concurrent.futures.ThreadPoolExecutor` or
+            :class:`concurrent.futures.ProcessPoolExecutor`.
+            By default, the chunks are analyzed in the calling thread.
+        max_pending : int, optional
+            The maximum number of chunks that are submitted to the
+            `executor` but not yet reduced.
+            This bounds the memory requirement.
+            By default, twice the number of CPUs is used.
+
+        Returns
+        -------
+        result : object
+            The result of the `reducer`.
+
+        See also
+        --------
+        read_iter
+        read_iter_structure
+
+        Notes
+        -----
+        The values of the chunks are always given to the `reducer` in
+        the order of the frames, independent of the order in which the
+        chunks are finished.
+
+        Examples
+        --------
+
+        Compute the RMSD of each frame to the first frame and the
+        average structure of the trajectory, using all CPU cores:
+
+        .. code-block:: python
+
+            from concurrent.futures import ThreadPoolExecutor
+            from functools import partial
+
+            with ThreadPoolExecutor() as executor:
+                rmsd = XTCFile.analyze(
+                    "trajectory.xtc", partial(struc.rmsd, reference),
+                    template=reference, executor=executor
+                )
+                mean_coord = XTCFile.analyze(
+                    "trajectory.xtc", struc.coord,
+                    reducer=MeanReducer(), template=reference,
+                    executor=executor
+                )
+        """
+        if reducer is None:
+            reducer = ConcatenationReducer()
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be greater than 0")
+
+        if template is None:
+            chunks = cls.read_iter(
+                file_name, start, stop, step, atom_i, chunk_size
+            )
+        else:
+            chunks = cls.read_iter_structure(
+                file_name, template, start, stop, step, atom_i, chunk_size
+            )
+
+        if executor is None:
+            for chunk in chunks:
+                if template is None:
+                    reducer.add(function(*chunk))
+                else:
+                    reducer.add(function(chunk))
+            return reducer.result()
+
+        if max_pending is None:
+            max_pending = 2 * (os.cpu_count() or 1)
+        pending = collections.deque()
+        for chunk in chunks:
+            if template is None:
+                pending.append(executor.submit(function, *chunk))
+            else:
+                pending.append(executor.submit(function, chunk))
+            if len(pending) >= max_pending:
+                # Wait for the oldest chunk to retain the frame order
+                reducer.add(pending.popleft().result())
+        while pending:
+            reducer.add(pending.popleft().result())
+        return reducer.result()
+
+
     @classmethod
     def write_iter(cls, file_name, coord, box=None, time=None):
         """
@@ -9,11 +9,62 @@ molecules.
 
 __name__ = "biotite.structure"
 __author__ = "Patrick Kunzmann"
-__all__ = ["get_molecule_indices", "get_molecule_masks", "molecule_iter"]
+__all__ = ["get_molecule_ids", "get_molecule_indices", "get_molecule_masks",
+           "molecule_iter"]
 
 import numpy as np
 from .atoms import AtomArray, AtomArrayStack
-from .bonds import BondList, find_connected
+from .bonds import BondList, _find_components
+
+
+def get_molecule_ids(array):
+    """
+    Get the molecule ID for each atom in the given structure.
+
+    A molecule is defined as a group of atoms that are directly or
+    indirectly connected via covalent bonds.
+    In this function a single atom, that has no connection to any other
+    atom (e.g. an ion), also qualifies as a molecule.
+
+    The molecules are found in a single pass over the bonds, so this
+    function is also suitable for systems with a large number of
+    molecules, e.g. solvated systems.
+
+    Parameters
+    ----------
+    array : AtomArray or AtomArrayStack or BondList
+        The input structure with an associated :class:`BondList`.
+        Alternatively, the :class:`BondList` can be directly supplied.
+
+    Returns
+    -------
+    ids : ndarray, shape=(n,), dtype=int
+        The molecule ID for each atom.
+        The IDs are consecutive integers starting at 0.
+        The molecules are numbered in the order of their first atom,
+        i.e. the order is the same as in :func:`get_molecule_indices()`.
+
+    See also
+    --------
+    get_molecule_indices
+    get_molecule_masks
+    molecule_iter
+
+    Examples
+    --------
+    Separate ATP into two molecules by breaking the glycosidic bond
+    to the triphosphate and store the molecule ID of each atom as
+    annotation:
+
+    >>> atp = residue("ATP")
+    >>> i, j = np.where(np.isin(atp.atom_name, ("O5'", "PA")))[0]
+    >>> atp.bonds.remove_bond(i, j)
+    >>> atp.set_annotation("molecule_id", get_molecule_ids(atp))
+    >>> print(atp.molecule_id)
+    [0 0 0 0 0 0 0 0 0 0 0 0 1 1 1 1 1 1 1 1 1 1 1 1 1 1 1 1 1 1 1 0 0 0 0 1 1
+     1 1 1 1 1 1 1 1 1 1]
+    """
+    return _find_components(_get_bonds(array))
 
 
 def get_molecule_indices(array):
@@ -112,26 +163,14 @@ def get_molecule_indices(array):
     HET         0  ATP HN62   H         4.020    1.300    7.060
     HET         0  ATP H2     H         0.170   -2.010    8.490
     """
-    if isinstance(array, BondList):
-        bonds = array
-    elif isinstance(array, (AtomArray, AtomArrayStack)):
-        if array.bonds is None:
-            raise ValueError("An associated BondList is required")
-        bonds = array.bonds
-    else:
-        raise TypeError(
-            f"Expected a 'BondList', 'AtomArray' or 'AtomArrayStack', "
-            f"not '{type(array).__name__}'"
-        )
-
-    molecule_indices = []
-    visited_mask = np.zeros(bonds.get_atom_count(), dtype=bool)
-    while not visited_mask.all():
-        root = np.argmin(visited_mask)
-        connected = find_connected(bonds, root)
-        visited_mask[connected] = True
-        molecule_indices.append(connected)
-    return molecule_indices
+    molecule_ids = get_molecule_ids(array)
+    if len(molecule_ids) == 0:
+        return []
+    # Group the atom indices by molecule,
+    # the stable sort keeps the indices of each molecule sorted
+    order = np.argsort(molecule_ids, kind="stable")
+    molecule_stops = np.cumsum(np.bincount(molecule_ids))
+    return np.split(order, molecule_stops[:-1])
 
 
 def get_molecule_masks(array):
@@ -230,26 +269,10 @@ def get_molecule_masks(array):
     HET         0  ATP HN62   H         4.020    1.300    7.060
     HET         0  ATP H2     H         0.170   -2.010    8.490
     """
-    if isinstance(array, BondList):
-        bonds = array
-    elif isinstance(array, (AtomArray, AtomArrayStack)):
-        if array.bonds is None:
-            raise ValueError("An associated BondList is required")
-        bonds = array.bonds
-    else:
-        raise TypeError(
-            f"Expected a 'BondList', 'AtomArray' or 'AtomArrayStack', "
-            f"not '{type(array).__name__}'"
-        )
-
-    molecule_indices = get_molecule_indices(bonds)
-    molecule_masks = np.zeros(
-        (len(molecule_indices), bonds.get_atom_count()),
-        dtype=bool
-    )
-    for i in range(len(molecule_indices)):
-        molecule_masks[i, molecule_indices[i]] = True
-    return molecule_masks
+    molecule_ids = get_molecule_ids(array)
+    molecule_count = np.max(molecule_ids) + 1 if len(molecule_ids) > 0 else 0
+    return molecule_ids[np.newaxis, :] \
+        == np.arange(molecule_count)[:, np.newaxis]
 
 
 def molecule_iter(array):
@@ -342,12 +365,24 @@ def molecule_iter(array):
     """
     if array.bonds is None:
         raise ValueError("An associated BondList is required")
-    bonds = array.bonds
-
-    visited_mask = np.zeros(bonds.get_atom_count(), dtype=bool)
-    while not visited_mask.all():
-        # Take the first atom that has not been considered yet as root
-        root = np.argmin(visited_mask)
-        connected = find_connected(bonds, root)
-        visited_mask[connected] = True
-        yield array[..., connected]
+
+    for indices in get_molecule_indices(array):
+        yield array[..., indices]
+
+
+def _get_bonds(array):
+    """
+    Get the :class:`BondList` of the given structure or the
+    :class:`BondList` itself.
+    """
+    if isinstance(array, BondList):
+        return array
+    elif isinstance(array, (AtomArray, AtomArrayStack)):
+        if array.bonds is None:
+            raise ValueError("An associated BondList is required")
+        return array.bonds
+    else:
+        raise TypeError(
+            f"Expected a 'BondList', 'AtomArray' or 'AtomArrayStack', "
+            f"not '{type(array).__name__}'"
+        )
@@ -11,7 +11,6 @@ __author__ = "Tom David Müller"
 __all__ = ["pseudoknots"]
 
 import numpy as np
-import networkx as nx
 from itertools import chain, product
 
 def pseudoknots(base_pairs, scores=None, max_pseudoknot_order=None):
@@ -287,6 +286,10 @@ def _generate_graphical_representation(regions):
         conflicts.
     """
 
+    # Importing NetworkX is expensive
+    # -> import it only when it is actually needed
+    import networkx as nx
+
     # Create a graph
     region_graph = nx.Graph()
 
@@ -580,6 +583,8 @@ def _get_results(regions, results, max_pseudoknot_order, order=0):
         The results
     """
 
+    import networkx as nx
+
     # Remove non-conflicting regions
     non_conflicting = [isolate for isolate in nx.isolates(regions)]
     regions.remove_nodes_from(non_conflicting)
@@ -8,14 +8,12 @@ This module provides functions to calculate the radial distribution function.
 
 __name__ = "biotite.structure"
 __author__ = "Daniel Bauer, Patrick Kunzmann"
-__all__ = ["rdf"]
+__all__ = ["rdf", "RDFAccumulator"]
 
 from numbers import Integral
 import numpy as np
-from .atoms import Atom, AtomArray, stack, array, coord, AtomArrayStack
+from .atoms import coord
 from .box import box_volume
-from .geometry import displacement
-from .util import vector_dot
 from .celllist import CellList
 
 
@@ -160,77 +158,205 @@ def rdf(center, atoms, selection=None, interval=(0, 10), bins=100, box=None,
     >>> print(f"{bins[peak_position]/10:.2f} nm")
     0.29 nm
     """
-    if isinstance(atoms, AtomArray):
-        # Reshape always to a stack for easier calculation
-        atoms = stack([atoms])
-    if selection is not None:
-        atoms = atoms[..., selection]
-    
-    atom_coord = atoms.coord
-    
-    if box is None:
-        if atoms.box is None:
-            raise ValueError("A box must be supplied")
+    accumulator = RDFAccumulator(interval, bins, selection, periodic)
+    accumulator.add(center, atoms, box)
+    return accumulator.result()
+
+
+class RDFAccumulator:
+    r"""
+    __init__(interval=(0, 10), bins=100, selection=None, periodic=False)
+
+    Accumulate the radial distribution function *g(r)* (RDF) over
+    chunks of frames, e.g. from a trajectory that is too large to be
+    loaded into memory at once.
+
+    The frames are added successively via :meth:`add()`.
+    Only a running histogram of the distances is kept, hence the memory
+    requirement is independent of the number of frames.
+    The RDF of all frames added so far is obtained from
+    :meth:`result()`.
+
+    Parameters
+    ----------
+    interval : tuple, optional
+        The range in which the RDF is calculated.
+    bins : int or sequence of scalars, optional
+        Bins for the RDF.
+
+        - If `bins` is an `int`, it defines the number of bins for the
+          given `interval`.
+        - If `bins` is a sequence, it defines the bin edges, ignoring
+          the `interval` parameter.
+
+    selection : ndarray, dtype=bool, shape=(n,), optional
+        Boolean mask for the atoms given to :meth:`add()` to limit the
+        RDF calculation to specific atoms.
+    periodic : bool, optional
+        Defines if periodic boundary conditions are taken into account.
+
+    See also
+    --------
+    rdf
+
+    Notes
+    -----
+    For each frame, the atoms within the range of the bins are found
+    via a :class:`CellList`, which is reused for all frames.
+
+    Examples
+    --------
+    Calculate the oxygen-oxygen radial distribution function of water
+    from chunks of the trajectory:
+
+    >>> from os.path import join
+    >>> waterbox = load_structure(join(path_to_structures, "waterbox.gro"))
+    >>> oxygens = waterbox[:, waterbox.atom_name == 'OW']
+    >>> accumulator = RDFAccumulator(bins=49, interval=(0.2, 10), periodic=True)
+    >>> for chunk_start in range(0, oxygens.stack_depth(), 10):
+    ...     chunk = oxygens[chunk_start : chunk_start + 10]
+    ...     accumulator.add(chunk, chunk)
+    >>> bins, g_r = accumulator.result()
+    >>> peak_position = np.argmax(g_r)
+    >>> print(f"{bins[peak_position]/10:.2f} nm")
+    0.29 nm
+
+    For a trajectory file, the chunks can be read via
+    :meth:`TrajectoryFile.read_iter_structure()`:
+
+    .. code-block:: python
+
+        accumulator = RDFAccumulator(interval=(0, 10), periodic=True)
+        for chunk in XTCFile.read_iter_structure(
+            "trajectory.xtc", template, stack_size=100
+        ):
+            ions = chunk[:, chunk.element == "NA"]
+            water_oxygens = chunk[:, chunk.atom_name == "OW"]
+            accumulator.add(ions, water_oxygens)
+        bins, g_r = accumulator.result()
+    """
+
+    def __init__(self, interval=(0, 10), bins=100, selection=None,
+                 periodic=False):
+        self._edges = _calculate_edges(interval, bins)
+        self._selection = selection
+        self._periodic = periodic
+        self._hist = np.zeros(len(self._edges) - 1, dtype=np.int64)
+        # The number of selected atoms, must be the same for all frames
+        self._atom_count = None
+        # The number of centers summed over all frames
+        self._center_count = 0
+        self._frame_count = 0
+        self._volume_sum = 0.0
+        # The cell list is created for the first frame
+        # and updated for all following frames
+        self._cell_list = None
+
+    def add(self, center, atoms, box=None):
+        """
+        add(center, atoms, box=None)
+
+        Add the distances from the given center positions to the given
+        atoms to the RDF.
+
+        Parameters
+        ----------
+        center : Atom or AtomArray or AtomArrayStack or ndarray, dtype=float
+            Coordinates or atoms(s) to use as origin(s) for RDF
+            calculation.
+            The same shapes as in :func:`rdf()` are accepted.
+        atoms : AtomArray or AtomArrayStack or ndarray, dtype=float, shape=(n,3) or shape=(m,n,3)
+            The distribution is calculated based on these atoms.
+            The number of atoms must be the same in each call.
+            Alternatively, the coordinates can be given directly, e.g.
+            from :meth:`TrajectoryFile.read_iter()`.
+            In this case `box` must be given.
+        box : ndarray, shape=(3,3) or shape=(m,3,3), optional
+            If this parameter is set, the given box is used instead of
+            the `box` attribute of `atoms`.
+        """
+        atom_coord = coord(atoms)
+        if atom_coord.ndim == 2:
+            # Reshape always to a stack for easier calculation
+            atom_coord = atom_coord[np.newaxis, :, :]
+            is_stack = False
         else:
-            box = atoms.box
-    elif box.ndim == 2 and atoms.stack_depth() == 1:
-        box = box[np.newaxis, :, :]
-    
-    center = coord(center)
-    if center.ndim == 1:
-        center = center.reshape((1, 1) + center.shape)
-    elif center.ndim == 2:
-        center = center.reshape((1,) + center.shape)
-    
-    if box.shape[0] != center.shape[0] or box.shape[0] != atom_coord.shape[0]:
-        raise ValueError(
-            "Center, box, and atoms must have the same model count"
-        )
-
-    # Calculate distance histogram
-    edges = _calculate_edges(interval, bins)
-    # Make histogram of quared distances to save computation time
-    # of sqrt calculation
-    sq_edges = edges**2
-    threshold_dist = edges[-1]
-    cell_size = threshold_dist
-    disp = []
-    for i in range(atoms.stack_depth()):
-        # Use cell list to efficiently preselect atoms that are in range
-        # of the desired bin range
-        cell_list = CellList(atom_coord[i], cell_size, periodic, box[i])
-        # 'cell_radius=1' is used in 'get_atoms_in_cells()'
-        # This is enough to find all atoms that are in the given
-        # interval (and more), since the size of each cell is as large
-        # as the last edge of the bins
-        near_atom_mask = cell_list.get_atoms_in_cells(center[i], as_mask=True)
-        # Calculate distances of each center to preselected atoms
-        # for each center
-        for j in range(center.shape[1]):
-            dist_box = box[i] if periodic else None
-            # Calculate squared distances
-            disp.append(displacement(
-                center[i,j], atom_coord[i, near_atom_mask[j]], box=dist_box
-            ))
-    # Make one array from multiple arrays with different length
-    disp = np.concatenate(disp)
-    sq_distances = vector_dot(disp, disp)
-    hist, _ = np.histogram(sq_distances, bins=sq_edges)
-
-    # Normalize with average particle density (N/V) in each bin
-    bin_volume =   (4 / 3 * np.pi * np.power(edges[1: ], 3)) \
-                 - (4 / 3 * np.pi * np.power(edges[:-1], 3))
-    n_frames = len(atoms)
-    volume = box_volume(box).mean()
-    density = atoms.array_length() / volume
-    g_r = hist / (bin_volume * density * n_frames)
-
-    # Normalize with number of centers
-    g_r /= center.shape[1]
-
-    bin_centers = (edges[:-1] + edges[1:]) * 0.5
-
-    return bin_centers, g_r
+            is_stack = True
+        if self._selection is not None:
+            atom_coord = atom_coord[:, self._selection]
+
+        if box is None:
+            box = getattr(atoms, "box", None)
+            if box is None:
+                raise ValueError("A box must be supplied")
+        box = np.asarray(box)
+        if box.ndim == 2 and not is_stack:
+            box = box[np.newaxis, :, :]
+
+        center = coord(center)
+        if center.ndim == 1:
+            center = center.reshape((1, 1) + center.shape)
+        elif center.ndim == 2:
+            center = center.reshape((1,) + center.shape)
+
+        if box.shape[0] != center.shape[0] \
+           or box.shape[0] != atom_coord.shape[0]:
+                raise ValueError(
+                    "Center, box, and atoms must have the same model count"
+                )
+        if self._atom_count is None:
+            self._atom_count = atom_coord.shape[1]
+        elif atom_coord.shape[1] != self._atom_count:
+            raise IndexError(
+                f"Expected {self._atom_count} atoms, "
+                f"but got {atom_coord.shape[1]}"
+            )
+
+        threshold_dist = self._edges[-1]
+        for i in range(atom_coord.shape[0]):
+            if self._cell_list is None:
+                # The cell size is as large as the last edge of the
+                # bins, so that only adjacent cells need to be searched
+                self._cell_list = CellList(
+                    atom_coord[i], threshold_dist, self._periodic, box[i]
+                )
+            else:
+                self._cell_list.update(atom_coord[i], box=box[i])
+            _, distances = self._cell_list.get_atom_pairs(
+                center[i], threshold_dist
+            )
+            self._hist += np.histogram(distances, bins=self._edges)[0]
+
+        self._frame_count += atom_coord.shape[0]
+        self._center_count += center.shape[0] * center.shape[1]
+        self._volume_sum += np.sum(box_volume(box))
+
+    def result(self):
+        """
+        result()
+
+        Get the RDF of all frames added so far.
+
+        Returns
+        -------
+        bins : ndarray, dtype=float, shape=n
+            The centers of the histogram bins.
+        rdf : ndarry, dtype=float, shape=n
+            RDF values for every bin.
+        """
+        if self._frame_count == 0:
+            raise ValueError("No frames were added")
+        # Normalize with average particle density (N/V) in each bin
+        bin_volume =   (4 / 3 * np.pi * np.power(self._edges[1: ], 3)) \
+                     - (4 / 3 * np.pi * np.power(self._edges[:-1], 3))
+        volume = self._volume_sum / self._frame_count
+        density = self._atom_count / volume
+        # Normalize with number of centers in all frames
+        g_r = self._hist / (bin_volume * density * self._center_count)
+
+        bin_centers = (self._edges[:-1] + self._edges[1:]) * 0.5
+
+        return bin_centers, g_r
 
 
 def _calculate_edges(interval, bins):
@@ -46,6 +46,18 @@ def get_residue_starts(array, add_exclusive_stop=False):
     This method is internally used by all other residue-related
     functions.
 
+    The residue starts are cached only, if the relevant annotation
+    arrays are frozen via :meth:`AtomArray.freeze_annotations()`.
+    This also applies to the arrays obtained from a frozen
+    :class:`AtomArrayStack`, which share the cache with the stack,
+    and to the models from the streaming structure readers, like
+    :meth:`PDBFile.read_iter_structure()`, which are frozen already.
+    An ordinary atom array, e.g. from :func:`load_structure()`, has
+    writable annotation arrays, hence the residue starts are
+    determined anew in each call.
+    The cached residue starts are invalidated, when one of the relevant
+    annotation arrays is replaced.
+
     Examples
     --------
 
@@ -56,6 +68,22 @@ def get_residue_starts(array, add_exclusive_stop=False):
     [  0  16  35  56  75  92 116 135 157 169 176 183 197 208 219 226 250 264
      278 292 304]
     """
+    starts = array._get_cached(
+        "residue_starts",
+        ("chain_id", "res_id", "ins_code", "res_name"),
+        _get_residue_starts
+    )
+    # Return a copy, as the cached array must not be modified
+    if add_exclusive_stop:
+        return starts.copy()
+    else:
+        return starts[:-1].copy()
+
+
+def _get_residue_starts(array):
+    """
+    Compute the residue starts including the exclusive stop.
+    """
     # These mask are 'true' at indices where the value changes
     chain_id_changes = (array.chain_id[1:] != array.chain_id[:-1])
     res_id_changes   = (array.res_id[1:]   != array.res_id[:-1]  )
@@ -76,10 +104,7 @@ def get_residue_starts(array, add_exclusive_stop=False):
     residue_starts = np.where(residue_change_mask)[0] +1
 
     # The first residue is not included yet -> Insert '[0]'
-    if add_exclusive_stop:
-        return np.concatenate(([0], residue_starts, [array.array_length()]))
-    else:
-        return np.concatenate(([0], residue_starts))
+    return np.concatenate(([0], residue_starts, [array.array_length()]))
 
 
 def apply_residue_wise(array, data, function, axis=None):
@@ -117,6 +142,20 @@ def apply_residue_wise(array, data, function, axis=None):
         first dimension of this array is equal to the amount of
         residues.
 
+    Notes
+    -----
+    Common reductions, i.e. :func:`numpy.sum()`, :func:`numpy.mean()`,
+    :func:`numpy.min()`, :func:`numpy.max()`, their *NaN*-ignoring
+    variants, :func:`numpy.count_nonzero()`, :func:`numpy.any()` and
+    :func:`numpy.all()` as well as the corresponding ufuncs
+    (e.g. :obj:`numpy.add`), are not called for each residue
+    separately.
+    Instead they are evaluated for all residues in a single pass via
+    :meth:`numpy.ufunc.reduceat()`, if `data` is a numeric
+    :class:`ndarray` and `axis` is either *None* or *0*.
+    Due to the different summation order, floating point results may
+    deviate from the per-residue function calls in the last digits.
+
     Examples
     --------
     Calculate residue-wise SASA from atom-wise SASA of a 20 residue
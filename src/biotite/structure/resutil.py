@@ -22,6 +22,10 @@ def apply_segment_wise(starts, data, function, axis):
         Includes exclusive stop, i.e. the length of the corresponding
         atom array.
     """
+    reduction = _REDUCTIONS.get(function)
+    if reduction is not None and _is_reducible(starts, data, axis):
+        return reduction(data, starts, axis)
+
     # The result array
     processed_data = None
     for i in range(len(starts)-1):
@@ -30,7 +34,6 @@ def apply_segment_wise(starts, data, function, axis):
             value = function(segment)
         else:
             value = function(segment, axis=axis)
-        value = function(segment, axis=axis)
         # Identify the shape of the resulting array by evaluation
         # of the function return value for the first segment
         if processed_data is None:
@@ -51,6 +54,134 @@ def apply_segment_wise(starts, data, function, axis):
     return processed_data
 
 
+def _is_reducible(starts, data, axis):
+    """
+    Check whether the segment-wise reduction of `data` can be performed
+    in a single pass via :meth:`numpy.ufunc.reduceat()`.
+    """
+    if not isinstance(data, np.ndarray) or data.ndim == 0:
+        return False
+    if data.dtype.kind not in "biufc":
+        # E.g. strings or objects
+        return False
+    if axis is not None and axis != 0 and axis != -data.ndim:
+        # The reduction would not be performed over the segment
+        return False
+    if len(data) != starts[-1] or len(starts) < 2:
+        return False
+    # 'reduceat()' would not give the reduction over an empty segment
+    return (starts[1:] > starts[:-1]).all()
+
+
+def _reduce(ufunc, data, starts, axis, dtype=None):
+    """
+    Apply the reduction of `ufunc` to each segment.
+    If `axis` is None, all other dimensions are reduced as well.
+    """
+    reduced = ufunc.reduceat(data, starts[:-1], axis=0, dtype=dtype)
+    if axis is None and reduced.ndim > 1:
+        reduced = ufunc.reduce(
+            reduced.reshape(len(reduced), -1), axis=1, dtype=dtype
+        )
+    return reduced
+
+
+def _segment_sizes(data, starts, axis):
+    """
+    Get the number of elements that are reduced for each segment.
+    """
+    sizes = np.diff(starts)
+    if axis is None:
+        return sizes * int(np.prod(data.shape[1:]))
+    else:
+        # Broadcast to the remaining dimensions
+        return sizes.reshape((-1,) + (1,) * (data.ndim - 1))
+
+
+def _reduce_sum(data, starts, axis):
+    # Like 'np.sum()', small integer types are upcast
+    dtype = np.sum(np.zeros(1, dtype=data.dtype)).dtype
+    return _reduce(np.add, data, starts, axis, dtype)
+
+
+def _reduce_nansum(data, starts, axis):
+    if data.dtype.kind in "fc":
+        data = np.where(np.isnan(data), 0, data)
+    return _reduce_sum(data, starts, axis)
+
+
+def _reduce_mean(data, starts, axis):
+    # Like 'np.mean()', integers are averaged as floating point values
+    dtype = np.mean(np.zeros(1, dtype=data.dtype)).dtype
+    sums = _reduce(np.add, data, starts, axis, dtype)
+    # Divide in the precision of the result, as 'np.mean()' does
+    return sums / _segment_sizes(data, starts, axis).astype(dtype)
+
+
+def _reduce_nanmean(data, starts, axis):
+    if data.dtype.kind not in "fc":
+        return _reduce_mean(data, starts, axis)
+    is_nan = np.isnan(data)
+    sums = _reduce(np.add, np.where(is_nan, 0, data), starts, axis)
+    counts = _reduce(np.add, ~is_nan, starts, axis, dtype=np.intp)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (sums / counts).astype(data.dtype, copy=False)
+
+
+def _reduce_min(data, starts, axis):
+    return _reduce(np.minimum, data, starts, axis)
+
+
+def _reduce_max(data, starts, axis):
+    return _reduce(np.maximum, data, starts, axis)
+
+
+def _reduce_nanmin(data, starts, axis):
+    return _reduce(np.fmin, data, starts, axis)
+
+
+def _reduce_nanmax(data, starts, axis):
+    return _reduce(np.fmax, data, starts, axis)
+
+
+def _reduce_count_nonzero(data, starts, axis):
+    return _reduce(np.add, data != 0, starts, axis, dtype=np.intp)
+
+
+def _reduce_any(data, starts, axis):
+    return _reduce(np.logical_or, data != 0, starts, axis)
+
+
+def _reduce_all(data, starts, axis):
+    return _reduce(np.logical_and, data != 0, starts, axis)
+
+
+# Functions that are evaluated segment-wise in a single pass,
+# instead of calling them for each segment separately
+_REDUCTIONS = {
+    np.sum: _reduce_sum,
+    np.add: _reduce_sum,
+    np.nansum: _reduce_nansum,
+    np.mean: _reduce_mean,
+    np.nanmean: _reduce_nanmean,
+    np.min: _reduce_min,
+    np.amin: _reduce_min,
+    np.minimum: _reduce_min,
+    np.max: _reduce_max,
+    np.amax: _reduce_max,
+    np.maximum: _reduce_max,
+    np.nanmin: _reduce_nanmin,
+    np.fmin: _reduce_nanmin,
+    np.nanmax: _reduce_nanmax,
+    np.fmax: _reduce_nanmax,
+    np.count_nonzero: _reduce_count_nonzero,
+    np.any: _reduce_any,
+    np.logical_or: _reduce_any,
+    np.all: _reduce_all,
+    np.logical_and: _reduce_all,
+}
+
+
 def spread_segment_wise(starts, input_data):
     """
     Generalized version of :func:`spread_residue_wise()`
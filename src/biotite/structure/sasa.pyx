@@ -15,24 +15,33 @@ cimport cython
 cimport numpy as np
 from libc.stdlib cimport malloc, free
 
+import collections
+import os
 import numpy as np
 from .celllist import CellList
 from .filter import filter_solvent, filter_monoatomic_ions
 from .info.radii import vdw_radius_protor, vdw_radius_single
+from .residues import get_residue_starts
 
 ctypedef np.uint8_t np_bool
+ctypedef np.int32_t int32
 ctypedef np.int64_t int64
 ctypedef np.float32_t float32
 
 
-@cython.boundscheck(False)
-@cython.wraparound(False)
+# Sphere meshes for each number of points, to avoid recomputation in
+# subsequent 'sasa()' calls
+_fibonacci_points_cache = {}
+
+
 def sasa(array, float probe_radius=1.4, np.ndarray atom_filter=None,
          bint ignore_ions=True, int point_number=1000,
-         point_distr="Fibonacci", vdw_radii="ProtOr"):
+         point_distr="Fibonacci", vdw_radii="ProtOr",
+         bint residue_wise=False, executor=None, max_pending=None):
     """
     sasa(array, probe_radius=1.4, atom_filter=None, ignore_ions=True,
-         point_number=1000, point_distr="Fibonacci", vdw_radii="ProtOr")
+         point_number=1000, point_distr="Fibonacci", vdw_radii="ProtOr",
+         residue_wise=False, executor=None, max_pending=None)
 
     Calculate the Solvent Accessible Surface Area (SASA) of a protein.
     
@@ -44,8 +53,8 @@ def sasa(array, float probe_radius=1.4, np.ndarray atom_filter=None,
     
     Parameters
     ----------
-    array : AtomArray
-        The protein model to calculate the SASA for.
+    array : AtomArray or AtomArrayStack
+        The protein model(s) to calculate the SASA for.
     probe_radius : float, optional
         The VdW-radius of the solvent molecules (default: 1.4).
     atom_filter : ndarray, dtype=bool, optional
@@ -86,14 +95,71 @@ def sasa(array, float probe_radius=1.4, np.ndarray atom_filter=None,
               :footcite:`Bondi1964`
               
         By default *ProtOr* is used.
-              
+    residue_wise : bool, optional
+        If true, the SASA of the atoms is summed up for each residue.
+        The sum omits the atoms, where the SASA has not been calculated.
+        This is equivalent to
+        ``apply_residue_wise(array, sasa(array), np.nansum)``.
+    executor : concurrent.futures.Executor, optional
+        If given, the calculation is distributed to this executor,
+        e.g. a :class:`concurrent.futures.ThreadPoolExecutor`:
+        For an :class:`AtomArrayStack` the models, for an
+        :class:`AtomArray` chunks of atoms are calculated in parallel.
+        As the calculation does not hold the global interpreter lock,
+        a :class:`concurrent.futures.ThreadPoolExecutor` is sufficient.
+    max_pending : int, optional
+        The maximum number of models or chunks that are submitted to the
+        `executor`, but not yet finished.
+        This limits the memory required for the adjacent atoms of the
+        pending calculations.
+        By default, this is twice the number of CPUs.
     
     Returns
     -------
-    sasa : ndarray, dtype=bool, shape=(n,)
+    sasa : ndarray, dtype=float32, shape=(n,) or shape=(m,n)
         Atom-wise SASA. `NaN` for atoms where SASA has not been 
         calculated
         (solvent atoms, hydrogen atoms (ProtOr), atoms not in `filter`).
+        If `residue_wise` is true, the shape is *(r,)* or *(m,r)*
+        instead, where *r* is the number of residues.
+        If an :class:`AtomArrayStack` is given, the SASA is calculated
+        for each model.
+
+    Notes
+    -----
+    The point mesh for each `point_number` is computed only once and
+    reused in subsequent calls.
+
+    The calculation is performed without holding the global
+    interpreter lock, so that it can run in parallel threads, if an
+    `executor` is given.
+    For an :class:`AtomArrayStack`, the cell list for finding adjacent
+    atoms is created only once and updated for each model.
+
+    Examples
+    --------
+
+    Calculate the SASA for each atom in each model:
+
+    >>> atom_sasa = sasa(atom_array_stack, vdw_radii="Single")
+    >>> print(atom_sasa.shape)
+    (38, 304)
+
+    Calculate the SASA for each residue:
+
+    >>> res_sasa = sasa(atom_array, vdw_radii="Single", residue_wise=True)
+    >>> print(res_sasa[:5])
+    [166.832 119.427  93.443 116.192 113.054]
+
+    Calculate the SASA of the models in parallel threads:
+
+    >>> from concurrent.futures import ThreadPoolExecutor
+    >>> with ThreadPoolExecutor() as executor:
+    ...     atom_sasa = sasa(
+    ...         atom_array_stack, vdw_radii="Single", executor=executor
+    ...     )
+    >>> print(atom_sasa.shape)
+    (38, 304)
         
     References
     ----------
@@ -101,18 +167,20 @@ def sasa(array, float probe_radius=1.4, np.ndarray atom_filter=None,
     .. footbibliography::
     
     """
-    cdef int i=0, j=0, k=0, adj_atom_i=0, rel_atom_i=0
-    
+    cdef int i
+    cdef int model_i
+    cdef int n_atoms = array.array_length()
+
     cdef np.ndarray sasa_filter
     cdef np.ndarray occl_filter
     if atom_filter is not None:
         # Filter for all atoms to calculate SASA for
         sasa_filter = np.array(atom_filter, dtype=bool)
     else:
-        sasa_filter = np.ones(len(array), dtype=bool)
+        sasa_filter = np.ones(n_atoms, dtype=bool)
     # Filter for all atoms that are considered for occlusion calculation
     # sasa_filter is subfilter of occlusion_filter
-    occl_filter = np.ones(len(array), dtype=bool)
+    occl_filter = np.ones(n_atoms, dtype=bool)
     # Remove water residues, since it is the solvent
     filter = ~filter_solvent(array)
     sasa_filter = sasa_filter & filter
@@ -124,32 +192,39 @@ def sasa(array, float probe_radius=1.4, np.ndarray atom_filter=None,
     
     cdef np.ndarray sphere_points
     if callable(point_distr):
-        sphere_points = point_distr(point_number)
+        sphere_points = np.asarray(
+            point_distr(point_number), dtype=np.float32
+        )
     elif point_distr == "Fibonacci":
-        sphere_points = _create_fibonacci_points(point_number)
+        sphere_points = _fibonacci_points_cache.get(point_number)
+        if sphere_points is None:
+            sphere_points = _create_fibonacci_points(point_number) \
+                            .astype(np.float32)
+            # Protect the cached mesh from accidental modification
+            sphere_points.setflags(write=False)
+            _fibonacci_points_cache[point_number] = sphere_points
     else:
         raise ValueError(f"'{point_distr}' is not a valid point distribution")
-    sphere_points = sphere_points.astype(np.float32)
     
     cdef np.ndarray radii
     if isinstance(vdw_radii, np.ndarray):
         radii = vdw_radii.astype(np.float32)
-        if len(radii) != array.array_length():
+        if len(radii) != n_atoms:
             raise ValueError(
                 f"Amount VdW radii ({len(radii)}) and "
-                f"amount of atoms ({array.array_length()}) are not equal"
+                f"amount of atoms ({n_atoms}) are not equal"
             )
     elif vdw_radii == "ProtOr":
         filter = (array.element != "H")
         sasa_filter = sasa_filter & filter
         occl_filter = occl_filter & filter
-        radii = np.full(len(array), np.nan, dtype=np.float32)
+        radii = np.full(n_atoms, np.nan, dtype=np.float32)
         for i in np.arange(len(radii))[occl_filter]:
             rad = vdw_radius_protor(array.res_name[i], array.atom_name[i])
             # 1.8 is default radius
             radii[i] = rad if rad is not None else 1.8
     elif vdw_radii == "Single":
-        radii = np.full(len(array), np.nan, dtype=np.float32)
+        radii = np.full(n_atoms, np.nan, dtype=np.float32)
         for i in np.arange(len(radii))[occl_filter]:
             rad = vdw_radius_single(array.element[i])
             # 1.5 is default radius
@@ -158,149 +233,249 @@ def sasa(array, float probe_radius=1.4, np.ndarray atom_filter=None,
         raise KeyError(f"'{vdw_radii}' is not a valid radii set")
     # Increase atom radii by probe size ("rolling probe")
     radii += probe_radius
-    
-    # Memoryview for filter
-    # Problem with creating boolean memoryviews
-    # -> Type uint8 is used
-    cdef np_bool[:] sasa_filter_view = np.frombuffer(sasa_filter,
-                                                     dtype=np.uint8)
-    
-    cdef np.ndarray occl_r = radii[occl_filter]
-    # Atom array containing occluding atoms
-    occl_array = array[occl_filter]
-    
-    # Memoryviews for coordinates of entire (main) array
-    # and for coordinates of occluding atom array
-    cdef float32[:,:] main_coord = array.coord.astype(np.float32,
-                                                      copy=False)
-    cdef float32[:,:] occl_coord = occl_array.coord.astype(np.float32,
-                                                           copy=False)
-    # Memoryviews for sphere points
-    cdef float32[:,:] sphere_coord = sphere_points
+
+    # Handle single models as stacks with one model
+    cdef np.ndarray coord = array.coord.astype(np.float32, copy=False)
+    cdef bint is_stack = coord.ndim == 3
+    if not is_stack:
+        coord = coord[np.newaxis, :, :]
+
+    cdef np.ndarray sasa_indices = np.where(sasa_filter)[0]
+    cdef np.ndarray occl_indices = np.where(occl_filter)[0]
     # Check if any of these arrays are empty to prevent segfault
-    if     main_coord.shape[0]   == 0 \
-        or occl_coord.shape[0]   == 0 \
-        or sphere_coord.shape[0] == 0:
+    if     n_atoms                 == 0 \
+        or len(occl_indices)       == 0 \
+        or sphere_points.shape[0]  == 0:
             raise ValueError("Coordinates are empty")
-    # Memoryviews for radii of SASA and occluding atoms
-    # their squares and their sum of sqaures
-    cdef float32[:] atom_radii = radii
-    cdef float32[:] atom_radii_sq = radii * radii
-    cdef float32[:] occl_radii = occl_r
-    cdef float32[:] occl_radii_sq = occl_r * occl_r
-    # Memoryview for atomwise SASA
-    cdef float32[:] sasa = np.full(len(array), np.nan, dtype=np.float32)
-    
+
+    cdef np.ndarray occl_radii = radii[occl_indices]
+    cdef np.ndarray atom_sasa = np.full(
+        (coord.shape[0], n_atoms), np.nan, dtype=np.float32
+    )
     # Area of a sphere point on a unit sphere
     cdef float32 area_per_point = 4.0 * np.pi / point_number
-    
-    # Define further statically typed variables
-    # that are needed for SASA calculation
-    cdef int n_accesible = 0
-    cdef float32 radius = 0
-    cdef float32 radius_sq = 0
-    cdef float32 adj_radius = 0
-    cdef float32 adj_radius_sq = 0
-    cdef float32 dist_sq = 0
-    cdef float32 point_x = 0
-    cdef float32 point_y = 0
-    cdef float32 point_z = 0
-    cdef float32 atom_x = 0
-    cdef float32 atom_y = 0
-    cdef float32 atom_z = 0
-    cdef float32 occl_x = 0
-    cdef float32 occl_y = 0
-    cdef float32 occl_z = 0
-    cdef float32[:,:] relevant_occl_coord = None
-    
-    # Cell size is as large as the maximum distance, 
+
+    # Cell size is as large as the maximum distance,
     # where two atom can intersect.
     # Therefore intersecting atoms are always in the same or adjacent cell.
-    cell_list = CellList(occl_array, np.max(radii[occl_filter])*2)
-    cdef np.ndarray cell_indices
-    cdef int[:,:] cell_indices_view
-    cdef int length
-    cdef int max_adj_list_length = 0
-    cdef int array_length = array.array_length()
-
-    cell_indices = cell_list.get_atoms_in_cells(array.coord)
-    cell_indices_view = cell_indices
-    max_adj_list_length = cell_indices.shape[0]
-        
-    # Later on, this array stores coordinates for actual
-    # occluding atoms for a certain atom to calculate the
-    # SASA for
-    # The first three indices of the second axis
-    # are x, y and z, the last one is the squared radius
-    # This list is as long as the maximal length of a list of
-    # adjacent atoms
-    relevant_occl_coord = np.zeros((max_adj_list_length, 4),
-                                   dtype=np.float32)
-    
-    # Actual SASA calculation
-    for i in range(array_length):
-        # First level: The atoms to calculate SASA for
-        if not sasa_filter_view[i]:
-            # SASA is not calculated for this atom
-            continue
-        n_accesible = point_number
-        atom_x = main_coord[i,0]
-        atom_y = main_coord[i,1]
-        atom_z = main_coord[i,2]
-        radius = atom_radii[i]
-        radius_sq = atom_radii_sq[i]
-        # Find occluding atoms from list of adjacent atoms
-        rel_atom_i = 0
-        for j in range(max_adj_list_length):
-            # Remove all atoms, where the distance to the relevant atom
-            # is larger than the sum of the radii,
-            # since those atoms do not touch
-            # If distance is 0, it is the same atom,
-            # and the atom is removed from the list as well
-            adj_atom_i = cell_indices_view[i,j]
-            if adj_atom_i == -1:
-                # -1 means end of list
+    # The cell list is created only once for all models and updated
+    # for each model
+    cell_list = CellList(
+        coord[:, occl_indices], np.max(occl_radii) * 2
+    )
+    # For a single model, the atoms are split into chunks instead,
+    # so that the executor can calculate them in parallel
+    if executor is not None and coord.shape[0] == 1:
+        n_chunks = os.cpu_count() or 1
+    else:
+        n_chunks = 1
+    if max_pending is None:
+        max_pending = 2 * (os.cpu_count() or 1)
+    pending = collections.deque()
+    for model_i in range(coord.shape[0]):
+        if model_i > 0:
+            cell_list.update(coord[model_i, occl_indices])
+        # The occluding atoms adjacent to each atom to calculate the
+        # SASA for, sorted by the latter one
+        adj_pairs = cell_list.get_atom_pairs_in_cells(
+            coord[model_i, sasa_indices]
+        )
+        adj_starts = np.searchsorted(
+            adj_pairs[:, 0], np.arange(len(sasa_indices) + 1)
+        )
+        adj_atoms = np.ascontiguousarray(adj_pairs[:, 1])
+        for chunk_indices in np.array_split(
+            np.arange(len(sasa_indices)), n_chunks
+        ):
+            if len(chunk_indices) == 0:
+                continue
+            chunk_start = chunk_indices[0]
+            chunk_stop = chunk_indices[-1] + 1
+            args = (
+                coord[model_i],
+                coord[model_i, occl_indices],
+                sasa_indices[chunk_start : chunk_stop],
+                radii,
+                occl_radii,
+                adj_atoms,
+                adj_starts[chunk_start : chunk_stop + 1],
+                sphere_points,
+                area_per_point,
+                atom_sasa[model_i]
+            )
+            if executor is None:
+                _calculate_sasa(*args)
+            else:
+                pending.append(executor.submit(_calculate_sasa, *args))
+                if len(pending) >= max_pending:
+                    pending.popleft().result()
+    while pending:
+        pending.popleft().result()
+
+    if residue_wise:
+        atom_sasa = _sum_residue_wise(array, atom_sasa)
+    if is_stack:
+        return atom_sasa
+    else:
+        return atom_sasa[0]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _sum_residue_wise(array, np.ndarray atom_sasa):
+    """
+    Sum up the atom-wise SASA of all models for each residue, omitting
+    *NaN* values.
+    """
+    cdef int model_i, res_i
+    cdef int64 atom_i
+    cdef float32 value
+
+    cdef int64[:] residue_starts = get_residue_starts(
+        array, add_exclusive_stop=True
+    ).astype(np.int64)
+    res_sasa = np.zeros(
+        (atom_sasa.shape[0], residue_starts.shape[0] - 1), dtype=np.float32
+    )
+    cdef float32[:,:] atom_sasa_v = atom_sasa
+    cdef float32[:,:] res_sasa_v = res_sasa
+
+    with nogil:
+        for model_i in range(atom_sasa_v.shape[0]):
+            for res_i in range(res_sasa_v.shape[1]):
+                for atom_i in range(
+                    residue_starts[res_i], residue_starts[res_i + 1]
+                ):
+                    value = atom_sasa_v[model_i, atom_i]
+                    # Omit NaN values
+                    if value == value:
+                        res_sasa_v[model_i, res_i] += value
+    return res_sasa
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.initializedcheck(False)
+def _calculate_sasa(const float32[:,:] main_coord,
+                    const float32[:,:] occl_coord,
+                    const int64[:] sasa_indices,
+                    const float32[:] atom_radii,
+                    const float32[:] occl_radii,
+                    const int32[:] adj_atoms,
+                    const int64[:] adj_starts,
+                    const float32[:,:] sphere_coord,
+                    float32 area_per_point,
+                    float32[:] sasa):
+    """
+    Calculate the SASA for the atoms at the given indices without
+    holding the global interpreter lock.
+
+    The occluding atoms adjacent to the atom at ``sasa_indices[i]``
+    are ``adj_atoms[adj_starts[i] : adj_starts[i+1]]``.
+    """
+    cdef int64 i
+    cdef int64 max_adj_length = 0
+    cdef float32* relevant_occl_coord
+
+    for i in range(sasa_indices.shape[0]):
+        if adj_starts[i+1] - adj_starts[i] > max_adj_length:
+            max_adj_length = adj_starts[i+1] - adj_starts[i]
+
+    # Stores the coordinates of the actual occluding atoms for the atom
+    # to calculate the SASA for
+    # The first three values of each entry are x, y and z, the last
+    # one is the squared radius
+    relevant_occl_coord = <float32*> malloc(
+        max(max_adj_length, 1) * 4 * sizeof(float32)
+    )
+    if relevant_occl_coord == NULL:
+        raise MemoryError()
+    try:
+        with nogil:
+            for i in range(sasa_indices.shape[0]):
+                sasa[sasa_indices[i]] = _atom_sasa(
+                    i, main_coord, occl_coord, sasa_indices,
+                    atom_radii, occl_radii, adj_atoms, adj_starts,
+                    sphere_coord, area_per_point, relevant_occl_coord
+                )
+    finally:
+        free(relevant_occl_coord)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.initializedcheck(False)
+cdef float32 _atom_sasa(int64 i,
+                        const float32[:,:] main_coord,
+                        const float32[:,:] occl_coord,
+                        const int64[:] sasa_indices,
+                        const float32[:] atom_radii,
+                        const float32[:] occl_radii,
+                        const int32[:] adj_atoms,
+                        const int64[:] adj_starts,
+                        const float32[:,:] sphere_coord,
+                        float32 area_per_point,
+                        float32* relevant_occl_coord) noexcept nogil:
+    cdef int64 j, k
+    cdef int32 adj_atom_i
+    cdef int64 atom_i = sasa_indices[i]
+    cdef int n_accesible = sphere_coord.shape[0]
+    cdef int rel_atom_i = 0
+    cdef float32 atom_x = main_coord[atom_i, 0]
+    cdef float32 atom_y = main_coord[atom_i, 1]
+    cdef float32 atom_z = main_coord[atom_i, 2]
+    cdef float32 radius = atom_radii[atom_i]
+    cdef float32 radius_sq = radius * radius
+    cdef float32 adj_radius
+    cdef float32 dist_sq
+    cdef float32 occl_x, occl_y, occl_z
+    cdef float32 point_x, point_y, point_z
+
+    # Find occluding atoms from list of adjacent atoms
+    for j in range(adj_starts[i], adj_starts[i+1]):
+        # Remove all atoms, where the distance to the relevant atom
+        # is larger than the sum of the radii,
+        # since those atoms do not touch
+        # If distance is 0, it is the same atom,
+        # and the atom is removed from the list as well
+        adj_atom_i = adj_atoms[j]
+        occl_x = occl_coord[adj_atom_i, 0]
+        occl_y = occl_coord[adj_atom_i, 1]
+        occl_z = occl_coord[adj_atom_i, 2]
+        adj_radius = occl_radii[adj_atom_i]
+        dist_sq = distance_sq(atom_x, atom_y, atom_z,
+                              occl_x, occl_y, occl_z)
+        if dist_sq != 0 \
+            and dist_sq < (adj_radius+radius) * (adj_radius+radius):
+                relevant_occl_coord[4*rel_atom_i    ] = occl_x
+                relevant_occl_coord[4*rel_atom_i + 1] = occl_y
+                relevant_occl_coord[4*rel_atom_i + 2] = occl_z
+                relevant_occl_coord[4*rel_atom_i + 3] = adj_radius*adj_radius
+                rel_atom_i += 1
+    for j in range(sphere_coord.shape[0]):
+        # Second level: The sphere points for that atom
+        # Transform sphere point to sphere of current atom
+        point_x = sphere_coord[j,0] * radius + atom_x
+        point_y = sphere_coord[j,1] * radius + atom_y
+        point_z = sphere_coord[j,2] * radius + atom_z
+        for k in range(rel_atom_i):
+            # Third level: Compare point to occluding atoms
+            dist_sq = distance_sq(point_x, point_y, point_z,
+                                  relevant_occl_coord[4*k    ],
+                                  relevant_occl_coord[4*k + 1],
+                                  relevant_occl_coord[4*k + 2])
+            # Compare squared distance
+            # to squared radius of occluding atom
+            if dist_sq < relevant_occl_coord[4*k + 3]:
+                # Point is occluded
+                # -> Continue with next point
+                n_accesible -= 1
                 break
-            occl_x = occl_coord[adj_atom_i,0]
-            occl_y = occl_coord[adj_atom_i,1]
-            occl_z = occl_coord[adj_atom_i,2]
-            adj_radius = occl_radii[adj_atom_i]
-            adj_radius_sq = occl_radii_sq[adj_atom_i]
-            dist_sq = distance_sq(atom_x, atom_y, atom_z,
-                                      occl_x, occl_y, occl_z)
-            if dist_sq != 0 \
-                and dist_sq < (adj_radius+radius) * (adj_radius+radius):
-                    relevant_occl_coord[rel_atom_i,0] = occl_x
-                    relevant_occl_coord[rel_atom_i,1] = occl_y
-                    relevant_occl_coord[rel_atom_i,2] = occl_z
-                    relevant_occl_coord[rel_atom_i,3] = adj_radius_sq
-                    rel_atom_i += 1
-        for j in range(sphere_coord.shape[0]):
-            # Second level: The sphere points for that atom
-            # Transform sphere point to sphere of current atom
-            point_x = sphere_coord[j,0] * radius + atom_x
-            point_y = sphere_coord[j,1] * radius + atom_y
-            point_z = sphere_coord[j,2] * radius + atom_z
-            for k in range(rel_atom_i):
-                # Third level: Compare point to occluding atoms
-                dist_sq = distance_sq(point_x, point_y, point_z,
-                                      relevant_occl_coord[k, 0],
-                                      relevant_occl_coord[k, 1],
-                                      relevant_occl_coord[k, 2])
-                # Compare squared distance
-                # to squared radius of occluding atom
-                # (Radius is relevant_occl_coord[3])
-                if dist_sq < relevant_occl_coord[k, 3]:
-                    # Point is occluded
-                    # -> Continue with next point
-                    n_accesible -= 1
-                    break
-        sasa[i] = area_per_point * n_accesible * radius_sq
-    return np.asarray(sasa)
+    return area_per_point * n_accesible * radius_sq
 
 
 cdef inline float32 distance_sq(float32 x1, float32 y1, float32 z1,
-                        float32 x2, float32 y2, float32 z2):
+                        float32 x2, float32 y2, float32 z2) noexcept nogil:
     cdef float32 dx = x2 - x1
     cdef float32 dy = y2 - y1
     cdef float32 dz = z2 - z1
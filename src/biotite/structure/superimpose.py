@@ -8,11 +8,14 @@ This module provides functions for structure superimposition.
 
 __name__ = "biotite.structure"
 __author__ = "Patrick Kunzmann, Claude J. Rogers"
-__all__ = ["superimpose", "superimpose_apply", "AffineTransformation"]
+__all__ = ["superimpose", "superimpose_without_outliers",
+           "superimpose_homologs", "superimpose_apply",
+           "AffineTransformation"]
 
 
 import numpy as np
 from .atoms import coord
+from .filter import filter_amino_acids
 from .geometry import centroid
 
 
@@ -308,6 +311,256 @@ def superimpose(fixed, mobile, atom_mask=None):
     return transform.apply(mobile), transform
 
 
+def superimpose_without_outliers(fixed, mobile, outlier_cutoff=2.0,
+                                 min_anchors=3, max_iterations=10):
+    """
+    Superimpose structures onto a fixed structure, ignoring atoms that
+    deviate strongly from the fixed structure.
+
+    At first, all atoms are used for superimposition via
+    :func:`superimpose()`.
+    Then the superimposition is iteratively refined using only the atoms
+    (*anchors*) whose distance to the corresponding fixed atom is at
+    most `outlier_cutoff`, until the anchors do not change anymore.
+    This is useful for structures, that share a common core but have
+    flexible or divergent regions.
+
+    Parameters
+    ----------
+    fixed : AtomArray, shape(n,) or AtomArrayStack, shape(m,n) or ndarray, shape(n,), dtype=float or ndarray, shape(m,n), dtype=float
+        The fixed structure.
+        Alternatively coordinates can be given.
+    mobile: AtomArray, shape(n,) or AtomArrayStack, shape(m,n) or ndarray, shape(n,), dtype=float or ndarray, shape(m,n), dtype=float
+        The structure(s) which is/are superimposed on the `fixed`
+        structure.
+        Each atom at index *i* in `mobile` must correspond the
+        atom at index *i* in `fixed`.
+        Alternatively coordinates can be given.
+        The anchors are determined independently for each model.
+    outlier_cutoff : float, optional
+        Atoms, whose distance to the corresponding fixed atom is larger
+        than this value (in Å) after superimposition, are not used as
+        anchors in the next iteration.
+    min_anchors : int, optional
+        The minimum number of anchors.
+        If less atoms are within `outlier_cutoff`, the `min_anchors`
+        closest atoms are used as anchors instead.
+    max_iterations : int, optional
+        The maximum number of refinement iterations.
+
+    Returns
+    -------
+    fitted : AtomArray or AtomArrayStack or ndarray, shape(n,), dtype=float or ndarray, shape(m,n), dtype=float
+        A copy of the `mobile` structure(s),
+        superimposed on the fixed structure.
+        Only coordinates are returned, if coordinates were given in
+        `mobile`.
+    transformation : AffineTransformation
+        This object contains the affine transformation(s) that were
+        applied on `mobile`.
+    anchors : ndarray, shape=(n,) or shape=(m,n), dtype=bool
+        A mask of the atoms that were used for the final
+        superimposition.
+
+    See Also
+    --------
+    superimpose
+    superimpose_homologs
+
+    Examples
+    --------
+
+    The C-terminal residues of the second model are displaced, hence
+    these atoms are not used for superimposition:
+
+    >>> ca = atom_array_stack[:, atom_array_stack.atom_name == "CA"]
+    >>> array1 = ca[0]
+    >>> array2 = ca[1].copy()
+    >>> array2.coord[array2.res_id > 16] += 10
+    >>> array2 = rotate(array2, [1,2,3])
+    >>> array2_fit, transformation, anchors = superimpose_without_outliers(
+    ...     array1, array2
+    ... )
+    >>> print(array2.res_id[~anchors])
+    [ 1 17 18 19 20]
+    >>> print("{:.3f}".format(rmsd(array1[anchors], array2_fit[anchors])))
+    0.297
+
+    In contrast, superimposing all atoms is distorted by the displaced
+    residues:
+
+    >>> array2_fit, _ = superimpose(array1, array2)
+    >>> print("{:.3f}".format(rmsd(array1, array2_fit)))
+    6.408
+    """
+    mob_coord = _reshape_to_3d(coord(mobile))
+    fix_coord = _reshape_to_3d(coord(fixed))
+    valid = np.ones(mob_coord.shape[:2], dtype=bool)
+    transform, anchors = _superimpose_without_outliers(
+        fix_coord, mob_coord, valid,
+        outlier_cutoff, min_anchors, max_iterations
+    )
+    if coord(mobile).ndim == 2:
+        anchors = anchors[0]
+    return transform.apply(mobile), transform, anchors
+
+
+def superimpose_homologs(fixed, mobile, substitution_matrix=None,
+                         gap_penalty=(-10, -1), outlier_cutoff=2.0,
+                         min_anchors=3, max_iterations=10):
+    r"""
+    Superimpose one or multiple protein chains onto a fixed protein
+    chain with homologous, but not necessarily identical, sequence.
+
+    The :math:`C_\alpha` atoms of the `fixed` and each `mobile`
+    structure are matched via a global sequence alignment computed with
+    :func:`biotite.sequence.align.align_optimal()`.
+    Subsequently, the matched :math:`C_\alpha` atoms are superimposed
+    as in :func:`superimpose_without_outliers()`, so that divergent
+    regions do not distort the superimposition of the common core.
+    The superimposition of all given `mobile` chains is refined
+    at once.
+
+    Parameters
+    ----------
+    fixed : AtomArray
+        The fixed structure.
+    mobile : AtomArray or list of AtomArray
+        The structure(s) that are superimposed on the `fixed`
+        structure.
+        The structures may have different lengths.
+    substitution_matrix : SubstitutionMatrix, optional
+        The substitution matrix used for the sequence alignment.
+        By default, *BLOSUM62* is used.
+    gap_penalty : int or tuple of int, optional
+        The gap penalty for the sequence alignment.
+        See :func:`biotite.sequence.align.align_optimal()` for details.
+    outlier_cutoff : float, optional
+        Matched :math:`C_\alpha` atoms, whose distance to each other is
+        larger than this value (in Å) after superimposition, are not
+        used as anchors in the next iteration.
+    min_anchors : int, optional
+        The minimum number of anchors.
+        If less matched atoms are within `outlier_cutoff`, the
+        `min_anchors` closest atoms are used as anchors instead.
+    max_iterations : int, optional
+        The maximum number of refinement iterations.
+
+    Returns
+    -------
+    fitted : AtomArray or list of AtomArray
+        A copy of the `mobile` structure(s), superimposed on the fixed
+        structure.
+        All atoms are transformed, not only the
+        :math:`C_\alpha` atoms.
+    transformation : AffineTransformation
+        This object contains the affine transformation(s) that were
+        applied on `mobile`.
+        If a list of structures is given as `mobile`, it contains one
+        transformation for each structure.
+    fixed_anchor_indices, mobile_anchor_indices : ndarray, dtype=int or list of ndarray, dtype=int
+        The indices of the :math:`C_\alpha` atoms in `fixed` and
+        `mobile`, respectively, that were used as anchors for the final
+        superimposition.
+        If a list of structures is given as `mobile`, one array is
+        given for each structure.
+
+    Raises
+    ------
+    ValueError
+        If the sequence alignment matches less than `min_anchors`
+        :math:`C_\alpha` atoms.
+
+    See Also
+    --------
+    superimpose
+    superimpose_without_outliers
+
+    Examples
+    --------
+
+    Superimpose a truncated and mutated variant of a structure
+    onto the original one:
+
+    >>> fixed = atom_array_stack[0]
+    >>> mobile = atom_array_stack[1]
+    >>> mobile = mobile[(mobile.res_id > 2) & (mobile.res_id < 19)]
+    >>> mobile.res_name[mobile.res_id == 10] = "ALA"
+    >>> mobile = rotate(mobile, [1,2,3])
+    >>> fitted, transformation, fixed_anchors, mobile_anchors = (
+    ...     superimpose_homologs(fixed, mobile)
+    ... )
+    >>> print(fixed.res_id[fixed_anchors])
+    [ 3  4  5  6  7  8  9 10 11 12 13 14 15 16 17 18]
+    >>> print("{:.3f}".format(
+    ...     rmsd(fixed.coord[fixed_anchors], fitted.coord[mobile_anchors])
+    ... ))
+    0.313
+    """
+    from ..sequence.align.matrix import SubstitutionMatrix
+    from ..sequence.align.pairwise import align_optimal
+
+    if substitution_matrix is None:
+        substitution_matrix = SubstitutionMatrix.std_protein_matrix()
+    is_list = not hasattr(mobile, "coord")
+    mobiles = list(mobile) if is_list else [mobile]
+
+    fixed_ca_indices = _get_ca_indices(fixed)
+    fixed_seq = _to_protein_sequence(fixed.res_name[fixed_ca_indices])
+    n_fixed_ca = len(fixed_ca_indices)
+    n_mobiles = len(mobiles)
+    # The matched mobile atoms are placed at the position of the
+    # corresponding fixed atom, so that the anchors of all mobile
+    # structures can be handled as a single (m,n,3) array
+    matched_coord = np.zeros((n_mobiles, n_fixed_ca, 3), dtype=np.float64)
+    matched_indices = np.full((n_mobiles, n_fixed_ca), -1, dtype=np.int64)
+    for i, mobile_struc in enumerate(mobiles):
+        mobile_ca_indices = _get_ca_indices(mobile_struc)
+        mobile_seq = _to_protein_sequence(
+            mobile_struc.res_name[mobile_ca_indices]
+        )
+        alignment = align_optimal(
+            fixed_seq, mobile_seq, substitution_matrix, gap_penalty,
+            terminal_penalty=False, max_number=1
+        )[0]
+        trace = alignment.trace
+        trace = trace[(trace != -1).all(axis=1)]
+        if len(trace) < min_anchors:
+            raise ValueError(
+                f"Only {len(trace)} residues could be matched via the "
+                f"sequence alignment, but at least {min_anchors} "
+                f"are required"
+            )
+        matched_indices[i, trace[:, 0]] = mobile_ca_indices[trace[:, 1]]
+        matched_coord[i, trace[:, 0]] \
+            = mobile_struc.coord[mobile_ca_indices[trace[:, 1]]]
+    valid = matched_indices != -1
+
+    transform, anchors = _superimpose_without_outliers(
+        fixed.coord[np.newaxis, fixed_ca_indices], matched_coord, valid,
+        outlier_cutoff, min_anchors, max_iterations
+    )
+
+    fitted = []
+    fixed_anchor_indices = []
+    mobile_anchor_indices = []
+    for i, mobile_struc in enumerate(mobiles):
+        fitted.append(AffineTransformation(
+            transform.center_translation[i],
+            transform.rotation[i],
+            transform.target_translation[i]
+        ).apply(mobile_struc))
+        fixed_anchor_indices.append(fixed_ca_indices[anchors[i]])
+        mobile_anchor_indices.append(matched_indices[i, anchors[i]])
+    if is_list:
+        return fitted, transform, fixed_anchor_indices, mobile_anchor_indices
+    else:
+        return (
+            fitted[0], transform,
+            fixed_anchor_indices[0], mobile_anchor_indices[0]
+        )
+
+
 def superimpose_apply(atoms, transformation):
     """
     Superimpose structures using a given :class:`AffineTransformation`.
@@ -367,7 +620,7 @@ def _get_rotation_matrices(fixed, mobile):
     Both sets of coordinates must already be centered at origin.
     """
     # Calculate cross-covariance matrices
-    cov = np.sum(fixed[:,:,:,np.newaxis] * mobile[:,:,np.newaxis,:], axis=1)
+    cov = np.matmul(fixed.transpose(0, 2, 1), mobile)
     v, s, w = np.linalg.svd(cov)
     # Remove possibility of reflected atom coordinates
     reflected_mask = (np.linalg.det(v) * np.linalg.det(w) < 0)
@@ -388,3 +641,93 @@ def _multi_matmul(matrices, vectors):
         ),
         axes=(0, 2, 1)
     )
+
+
+def _superimpose_without_outliers(fixed, mobile, valid, outlier_cutoff,
+                                  min_anchors, max_iterations):
+    """
+    Iteratively superimpose each model in `mobile` onto `fixed`, using
+    only the anchors from the `valid` atoms that are within
+    `outlier_cutoff` after the previous iteration.
+
+    `fixed` has the shape *(1,n,3)* or *(m,n,3)*, `mobile` the shape
+    *(m,n,3)* and `valid` the shape *(m,n)*.
+    """
+    if fixed.shape[0] != 1 and fixed.shape[0] != mobile.shape[0]:
+        raise IndexError(
+            f"Number of fixed models is {fixed.shape[0]}, "
+            f"but number of mobile models is {mobile.shape[0]}"
+        )
+    if fixed.shape[1] != mobile.shape[1]:
+        raise IndexError(
+            f"Fixed structure has {fixed.shape[1]} atoms, "
+            f"but mobile structure has {mobile.shape[1]} atoms"
+        )
+    if (np.count_nonzero(valid, axis=-1) < min_anchors).any():
+        raise ValueError(f"At least {min_anchors} anchors are required")
+    fixed = np.broadcast_to(fixed, mobile.shape)
+
+    anchors = valid
+    for _ in range(max_iterations):
+        transform = _superimpose_masked(fixed, mobile, anchors)
+        diff = transform.apply(mobile) - fixed
+        sq_dist = np.sum(diff * diff, axis=-1)
+        sq_dist[~valid] = np.inf
+        new_anchors = sq_dist <= outlier_cutoff**2
+        too_few = np.count_nonzero(new_anchors, axis=-1) < min_anchors
+        if too_few.any():
+            # Use the closest atoms instead
+            closest = np.argsort(sq_dist[too_few], axis=-1)[:, :min_anchors]
+            fallback_anchors = np.zeros((len(closest), valid.shape[1]), bool)
+            np.put_along_axis(fallback_anchors, closest, True, axis=-1)
+            new_anchors[too_few] = fallback_anchors
+        if (new_anchors == anchors).all():
+            break
+        anchors = new_anchors
+    else:
+        # The anchors changed in the last iteration
+        transform = _superimpose_masked(fixed, mobile, anchors)
+    return transform, anchors
+
+
+def _superimpose_masked(fixed, mobile, mask):
+    """
+    Superimpose each model in `mobile` onto the corresponding model in
+    `fixed`, only taking the atoms covered by the respective model in
+    `mask` into account.
+    """
+    weights = mask[:, :, np.newaxis].astype(np.float64)
+    counts = np.sum(weights, axis=1)
+    mob_centroid = np.sum(mobile * weights, axis=1) / counts
+    fix_centroid = np.sum(fixed * weights, axis=1) / counts
+    # Atoms outside the mask do not contribute to the covariance
+    mob_centered = (mobile - mob_centroid[:, np.newaxis, :]) * weights
+    fix_centered = fixed - fix_centroid[:, np.newaxis, :]
+    rotation = _get_rotation_matrices(fix_centered, mob_centered)
+    return AffineTransformation(-mob_centroid, rotation, fix_centroid)
+
+
+def _get_ca_indices(atoms):
+    """
+    Get the indices of the CA atoms of amino acids.
+    """
+    return np.where(
+        filter_amino_acids(atoms)
+        & (atoms.atom_name == "CA") & (atoms.element == "C")
+    )[0]
+
+
+def _to_protein_sequence(res_names):
+    """
+    Convert residue names into a :class:`ProteinSequence`, using ``'X'``
+    for unknown residues.
+    """
+    from ..sequence.seqtypes import ProteinSequence
+
+    symbols = []
+    for res_name in res_names:
+        try:
+            symbols.append(ProteinSequence.convert_letter_3to1(res_name))
+        except KeyError:
+            symbols.append("X")
+    return ProteinSequence(symbols)
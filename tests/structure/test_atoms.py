@@ -100,7 +100,45 @@ def test_stack_indexing(stack):
     filtered_stack = stack[:,0]
     assert filtered_stack.stack_depth() == 3
     assert filtered_stack.array_length() == 1
-    
+
+
+def test_stack_iteration(stack):
+    """
+    Check if the arrays obtained from an :class:`AtomArrayStack` share
+    the annotations with the stack and if modifications of these arrays
+    leave the stack untouched.
+    """
+    stack.bonds = struc.BondList(5, np.array([(0,1),(0,2),(2,3),(2,4)]))
+    ref_stack = stack.copy()
+
+    arrays = list(stack)
+    assert len(arrays) == stack.stack_depth()
+    for i, array in enumerate(arrays):
+        assert array == stack.get_array(i)
+        assert np.shares_memory(array.res_id, stack.res_id)
+        assert not array.res_id.flags.writeable
+
+    array = arrays[0]
+    with pytest.raises(ValueError):
+        array.res_id += 1
+    # Copy-on-write
+    array.res_id = array.res_id + 1
+    array.chain_id = np.full(5, "C")
+    array[0] = struc.Atom([0,0,0], **{
+        category: stack.get_annotation(category)[-1]
+        for category in stack.get_annotation_categories()
+    })
+    array.bonds.add_bond(1, 2)
+    assert array.res_id.tolist() == [2,2,2,2,3]
+    assert array.chain_id.tolist() == ["B","C","C","C","C"]
+    assert array.bonds.get_bond_count() == 5
+    assert stack == ref_stack
+    assert arrays[1] == ref_stack[1]
+    # A stack created from the arrays owns its annotations
+    new_stack = struc.stack(arrays[1:])
+    new_stack.res_id += 1
+    assert stack == ref_stack
+
 
 def test_concatenation(array, stack):
     concat_array = array[2:] + array[:2]
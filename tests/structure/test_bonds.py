@@ -2,6 +2,7 @@
 # under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
 # information.
 
+import itertools
 from os.path import join
 import numpy as np
 import pytest
@@ -54,7 +55,7 @@ def test_creation(bond_list):
                                              [3, 4, 0],
                                              [0, 4, 0],
                                              [4, 6, 0]]
-    assert bond_list._max_bonds_per_atom == 3
+    assert bond_list.get_all_bonds()[0].shape[1] == 3
     assert bond_list._atom_count == 7
 
 
@@ -195,7 +196,7 @@ def test_concatenation(bond_list):
                                              [4, 6, 0],
                                              [7, 8, 2],
                                              [8, 9, 2]]
-    assert bond_list._max_bonds_per_atom == 3
+    assert bond_list.get_all_bonds()[0].shape[1] == 3
     assert bond_list._atom_count == 10
 
 
@@ -258,6 +259,64 @@ def test_get_all_bonds():
     assert test_bonds == ref_bonds
 
 
+def test_adjacency_update():
+    """
+    Check if :func:`get_bonds()` and :func:`get_all_bonds()` reflect
+    the current bonds after each kind of modification of a
+    :class:`BondList`, as the bonded atoms of each atom are cached.
+    """
+    ATOM_COUNT = 100
+    BOND_COUNT = 500
+
+    def assert_consistent(bond_list):
+        bond_array = bond_list.as_array()
+        all_bonds, all_bond_types = bond_list.get_all_bonds()
+        for i in range(bond_list.get_atom_count()):
+            is_bonded = (bond_array[:, :2] == i).any(axis=1)
+            ref_bonds = np.where(
+                bond_array[is_bonded, 0] == i,
+                bond_array[is_bonded, 1],
+                bond_array[is_bonded, 0],
+            ).tolist()
+            ref_bond_types = bond_array[is_bonded, 2].tolist()
+            bonds, bond_types = bond_list.get_bonds(i)
+            assert bonds.tolist() == ref_bonds
+            assert bond_types.tolist() == ref_bond_types
+            assert all_bonds[i][all_bonds[i] != -1].tolist() == ref_bonds
+            assert all_bond_types[i][all_bond_types[i] != -1].tolist() \
+                == ref_bond_types
+            for j in ref_bonds:
+                assert (i, j) in bond_list
+
+    bond_list = generate_random_bond_list(ATOM_COUNT, BOND_COUNT)
+    assert_consistent(bond_list)
+    original = bond_list.copy()
+
+    bond_list.add_bond(0, 99, struc.BondType.TRIPLE)
+    assert_consistent(bond_list)
+    bond_list.add_bond(99, 0, struc.BondType.DOUBLE)
+    assert_consistent(bond_list)
+    bond_list.remove_bond(0, 99)
+    assert_consistent(bond_list)
+    bond_list.remove_bonds_to(1)
+    assert_consistent(bond_list)
+    bond_list.remove_bonds(original[:50])
+    assert_consistent(bond_list)
+    bond_list.remove_aromaticity()
+    assert_consistent(bond_list)
+    bond_list.remove_bond_order()
+    assert_consistent(bond_list)
+    bond_list.offset_indices(10)
+    assert_consistent(bond_list)
+    assert_consistent(bond_list[20:80])
+    assert_consistent(bond_list + original)
+    assert_consistent(original.merge(bond_list))
+    # The original bond list is not affected by modifications of a copy
+    assert_consistent(original)
+    assert original.get_bond_count() > bond_list.get_bond_count()
+
+
+
 def test_adjacency_matrix():
     """
     Test whether the matrix created from :func:`adjacency_matrix()`
@@ -445,6 +504,53 @@ def test_method_consistency(periodic):
         >= len(bonds_from_names.as_array()) * THRESHOLD_PERCENTAGE
 
 
+
+def test_connect_via_residue_names_templates():
+    """
+    Check if :func:`connect_via_residue_names()` gives the same bonds
+    for each residue as for the residue alone, even if residues with
+    the same name differ in their atoms or atom order, as the bonds are
+    reused for residues with the same name and atom names.
+    """
+    atoms = strucio.load_structure(join(data_dir("structure"), "1l2y.bcif"))[0]
+    # Each residue appears three times:
+    # Unmodified, with removed atoms and with reversed atom order
+    residues = []
+    for residue in struc.residue_iter(atoms):
+        residues.append(residue)
+        residues.append(residue[::2])
+        residues.append(residue[::-1])
+    atoms = residues[0]
+    for res_id, residue in enumerate(residues[1:], start=2):
+        residue = residue.copy()
+        residue.res_id[:] = res_id
+        atoms += residue
+    custom_bond_dict = {
+        res_name: {
+            (atom_name1, atom_name2): struc.BondType.SINGLE
+            for atom_name1, atom_name2 in itertools.combinations(
+                np.unique(atoms.atom_name[atoms.res_name == res_name])
+                .tolist(), 2
+            )
+            # Only some pseudo-bonds to keep the test fast
+            if atom_name1[0] == atom_name2[0]
+        }
+        for res_name in np.unique(atoms.res_name).tolist()
+    }
+
+    test_bonds = struc.connect_via_residue_names(
+        atoms, inter_residue=False, custom_bond_dict=custom_bond_dict
+    )
+
+    ref_bonds = struc.BondList(0)
+    for residue in struc.residue_iter(atoms):
+        ref_bonds += struc.connect_via_residue_names(
+            residue, inter_residue=False, custom_bond_dict=custom_bond_dict
+        )
+    assert test_bonds.get_bond_count() > 0
+    assert test_bonds == ref_bonds
+
+
 def test_find_connected(bond_list):
     """
     Find all connected atoms to an atom in a known example.
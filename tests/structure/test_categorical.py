@@ -0,0 +1,173 @@
+# This source code is part of the Biotite package and is distributed
+# under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
+# information.
+
+from os.path import join
+from tempfile import NamedTemporaryFile
+import numpy as np
+import pytest
+import biotite.structure as struc
+import biotite.structure.io as strucio
+from ..util import data_dir
+
+
+CATEGORICAL_ANNOTATIONS = ["chain_id", "res_name", "atom_name", "element"]
+
+
+@pytest.fixture
+def atoms():
+    return strucio.load_structure(
+        join(data_dir("structure"), "1l2y.bcif"), include_bonds=True
+    )[0]
+
+
+@pytest.fixture
+def categorical_atoms(atoms):
+    atoms = atoms.copy()
+    for category in CATEGORICAL_ANNOTATIONS:
+        atoms.set_annotation(
+            category, struc.CategoricalArray(atoms.get_annotation(category))
+        )
+    return atoms
+
+
+def test_encoding():
+    """
+    Check if encoding and decoding a string array gives the original
+    array.
+    """
+    values = np.array(["CA", "N", "C", "CA", "O", "N"])
+    array = struc.CategoricalArray(values)
+    assert array.categories.tolist() == ["C", "CA", "N", "O"]
+    assert array.codes.tolist() == [1, 2, 0, 1, 3, 2]
+    assert array.dtype == values.dtype
+    assert np.asarray(array).tolist() == values.tolist()
+    assert array.tolist() == values.tolist()
+    assert array[1] == "N"
+    assert array[1:3].tolist() == ["N", "C"]
+    assert array[[True, False] * 3].tolist() == ["CA", "C", "O"]
+
+    array = struc.CategoricalArray(values, categories=["O", "N", "CA", "C", "S"])
+    assert array.categories.tolist() == ["C", "CA", "N", "O", "S"]
+    assert np.asarray(array).tolist() == values.tolist()
+    with pytest.raises(ValueError):
+        struc.CategoricalArray(values, categories=["C", "CA"])
+
+
+def test_comparison():
+    """
+    Check if comparisons give the same results as for the decoded
+    arrays, also for arrays with different categories.
+    """
+    values1 = np.array(["A", "B", "C", "A", "D"])
+    values2 = np.array(["A", "C", "C", "E", "D"])
+    array1 = struc.CategoricalArray(values1)
+    array2 = struc.CategoricalArray(values2)
+
+    for value in ["A", "E", "AB", ""]:
+        assert ((array1 == value) == (values1 == value)).all()
+        assert ((array1 != value) == (values1 != value)).all()
+    assert ((array1 == array2) == (values1 == values2)).all()
+    assert ((array1 != array2) == (values1 != values2)).all()
+    assert ((array1 == values2) == (values1 == values2)).all()
+    assert ((array1 < "C") == (values1 < "C")).all()
+    assert (
+        np.isin(array1, ["A", "D", "E"]) == np.isin(values1, ["A", "D", "E"])
+    ).all()
+    assert np.unique(array1).tolist() == np.unique(values1).tolist()
+    assert "D" in array1
+    assert "E" not in array1
+
+
+def test_modification():
+    """
+    Check if assigning values, including values that are not part of
+    the categories yet, and concatenation gives the same results as
+    for the decoded arrays.
+    """
+    values = np.array(["A", "B", "C", "A"])
+    array = struc.CategoricalArray(values)
+
+    values[1] = "A"
+    array[1] = "A"
+    assert array.tolist() == values.tolist()
+    values[[0, 2]] = ["D", "B"]
+    array[[0, 2]] = ["D", "B"]
+    assert array.tolist() == values.tolist()
+    assert array.categories.tolist() == ["A", "B", "C", "D"]
+    # Too long strings are truncated, as for the decoded array
+    values[3] = "EF"
+    array[3] = "EF"
+    assert array.tolist() == values.tolist()
+
+    other_values = np.array(["X", "A"])
+    concat = np.concatenate(
+        [array, struc.CategoricalArray(other_values), other_values]
+    )
+    assert isinstance(concat, struc.CategoricalArray)
+    assert concat.tolist() \
+        == np.concatenate([values, other_values, other_values]).tolist()
+
+    copy = np.copy(array)
+    assert isinstance(copy, struc.CategoricalArray)
+    copy[0] = "A"
+    assert array.tolist() == values.tolist()
+
+
+def test_atom_array(atoms, categorical_atoms):
+    """
+    Check if an :class:`AtomArray` with categorical annotations behaves
+    like the same :class:`AtomArray` with string annotations.
+    """
+    assert categorical_atoms == atoms
+    assert categorical_atoms.res_name.nbytes < atoms.res_name.nbytes
+
+    for function in [
+        struc.filter_amino_acids,
+        struc.filter_peptide_backbone,
+        struc.filter_solvent,
+        struc.get_residue_starts,
+        struc.get_chain_starts,
+    ]:
+        assert (function(categorical_atoms) == function(atoms)).all()
+    assert struc.get_residues(categorical_atoms)[1].tolist() \
+        == struc.get_residues(atoms)[1].tolist()
+
+    mask = atoms.atom_name == "CA"
+    test_atoms = categorical_atoms[categorical_atoms.atom_name == "CA"]
+    assert test_atoms == atoms[mask]
+    assert isinstance(test_atoms.atom_name, struc.CategoricalArray)
+
+    test_atoms = categorical_atoms[:10] + categorical_atoms[10:]
+    assert test_atoms == atoms[:10] + atoms[10:]
+    assert isinstance(test_atoms.atom_name, struc.CategoricalArray)
+
+    test_atoms = categorical_atoms.copy()
+    test_atoms.res_name = np.full(atoms.array_length(), "ALA")
+    assert isinstance(test_atoms.res_name, struc.CategoricalArray)
+    assert (test_atoms.res_name == "ALA").all()
+    assert (categorical_atoms.res_name == atoms.res_name).all()
+
+    stack = struc.stack([categorical_atoms, categorical_atoms])
+    for model in stack:
+        assert model == atoms
+        assert not model.res_name.flags.writeable
+        # Copy-on-write
+        model[0] = atoms[-1]
+        assert model[0] == atoms[-1]
+    assert stack.equal_annotations(atoms)
+
+
+@pytest.mark.parametrize("suffix", ["pdb", "cif", "bcif"])
+def test_file_round_trip(atoms, categorical_atoms, suffix):
+    """
+    Check if structures with categorical annotations are written to
+    structure files in the same way as string annotations.
+    """
+    with NamedTemporaryFile("w", suffix=f".{suffix}") as temp_file:
+        strucio.save_structure(temp_file.name, atoms)
+        ref_atoms = strucio.load_structure(temp_file.name)
+        strucio.save_structure(temp_file.name, categorical_atoms)
+        test_atoms = strucio.load_structure(temp_file.name)
+
+    assert test_atoms == ref_atoms
@@ -4,6 +4,7 @@
 
 from os.path import join
 import itertools
+import pickle
 import numpy as np
 import pytest
 import biotite.structure as struc
@@ -104,6 +105,52 @@ def test_adjacency_matrix(cell_size, threshold, periodic, use_selection):
     assert np.array_equal(test_matrix, exp_matrix)
 
 
+@pytest.mark.parametrize(
+    "box, cell_size, radius",
+    itertools.product(
+        [
+            np.diag([20.0, 25.0, 30.0]),
+            struc.vectors_from_unitcell(
+                20, 25, 30, np.deg2rad(70), np.deg2rad(80), np.deg2rad(100)
+            ),
+            # Small box, where the radius exceeds half the box size
+            np.diag([5.0, 6.0, 7.0]),
+        ],
+        [2, 5],
+        [3, 6],
+    )
+)
+def test_periodic_minimum_image(box, cell_size, radius):
+    """
+    Check if a periodic cell list finds the same atoms as a distance
+    calculation using the minimum-image convention, both for
+    orthogonal and triclinic boxes.
+    """
+    np.random.seed(0)
+    # Also include atoms outside the box
+    coord = np.random.uniform(-20, 40, size=(500, 3)).astype(np.float32)
+    positions = np.random.uniform(-10, 30, size=(50, 3)).astype(np.float32)
+    cell_list = struc.CellList(coord, cell_size, periodic=True, box=box)
+
+    distances = struc.distance(
+        positions[:, np.newaxis, :], coord[np.newaxis, :, :], box=box
+    )
+    ref_mask = distances <= radius
+
+    indices = cell_list.get_atoms(positions, radius)
+    for ref_row, row in zip(ref_mask, indices):
+        row = row[row != -1]
+        # Each atom is found only once
+        assert len(np.unique(row)) == len(row)
+        assert sorted(row.tolist()) == np.where(ref_row)[0].tolist()
+
+    pairs, test_distances = cell_list.get_atom_pairs(positions, radius)
+    assert len(pairs) == np.count_nonzero(ref_mask)
+    assert test_distances == pytest.approx(
+        distances[pairs[:, 0], pairs[:, 1]], abs=1e-4
+    )
+
+
 def test_outside_location():
     """
     Test result for location outside any cell.
@@ -153,4 +200,208 @@ def test_empty_coordinates():
         assert len(indices) == 0
         assert len(mask) == 0
         assert indices.dtype == np.int32
-        assert mask.dtype == bool
\ No newline at end of file
+        assert mask.dtype == bool
+
+
+@pytest.mark.parametrize("periodic, use_selection", itertools.product(
+    [False, True], [False, True]
+))
+def test_pickle(periodic, use_selection):
+    """
+    Test whether a pickled and unpickled cell list gives the same
+    results as the original one.
+    """
+    array = strucio.load_structure(join(data_dir("structure"), "3o5r.bcif"))
+    if periodic:
+        array.box = np.diag(
+            np.max(array.coord, axis=-2) - np.min(array.coord, axis=-2)
+        )
+    if use_selection:
+        np.random.seed(0)
+        selection = np.random.choice((False, True), array.array_length())
+    else:
+        selection = None
+    cell_list = struc.CellList(
+        array, cell_size=5, periodic=periodic, selection=selection
+    )
+
+    test_cell_list = pickle.loads(pickle.dumps(cell_list))
+
+    assert np.array_equal(
+        test_cell_list.get_atoms(array.coord, 5),
+        cell_list.get_atoms(array.coord, 5)
+    )
+    assert np.array_equal(
+        test_cell_list.create_adjacency_matrix(5),
+        cell_list.create_adjacency_matrix(5)
+    )
+
+
+@pytest.mark.parametrize(
+    "periodic, use_selection, create_from_stack",
+    itertools.product([False, True], [False, True], [False, True])
+)
+def test_update(periodic, use_selection, create_from_stack):
+    """
+    Test whether a cell list that is updated with the coordinates of
+    each model of a random walk gives the same results as a cell list
+    that is created from scratch for each model.
+    """
+    N_MODELS = 20
+    N_ATOMS = 1000
+    BOX_LENGTH = 20
+    CELL_SIZE = 3
+    RADIUS = 5
+
+    np.random.seed(0)
+    coord = np.cumsum(
+        np.random.normal(scale=1, size=(N_MODELS, N_ATOMS, 3)), axis=0
+    )
+    coord[0] += np.random.rand(N_ATOMS, 3) * BOX_LENGTH
+    # Put some large jumps into the trajectory, that move atoms
+    # outside the initial cell grid
+    coord[N_MODELS // 2 :, :10] += 3 * BOX_LENGTH
+    box = np.repeat(
+        np.identity(3)[np.newaxis, ...] * BOX_LENGTH, N_MODELS, axis=0
+    )
+    # Change the box for some models
+    box[N_MODELS // 4 :] *= 1.1
+    if not periodic:
+        box = None
+    if use_selection:
+        selection = np.random.choice((False, True), N_ATOMS)
+    else:
+        selection = None
+
+    cell_list = struc.CellList(
+        coord if create_from_stack else coord[0],
+        cell_size=CELL_SIZE, periodic=periodic,
+        box=box if create_from_stack or box is None else box[0],
+        selection=selection
+    )
+    for model_i in range(N_MODELS):
+        model_box = box[model_i] if periodic else None
+        cell_list.update(coord[model_i], box=model_box)
+        ref_cell_list = struc.CellList(
+            coord[model_i], cell_size=CELL_SIZE, periodic=periodic,
+            box=model_box, selection=selection
+        )
+        assert np.array_equal(
+            cell_list.get_atoms(coord[model_i], RADIUS, as_mask=True),
+            ref_cell_list.get_atoms(coord[model_i], RADIUS, as_mask=True)
+        )
+        assert np.array_equal(
+            cell_list.create_adjacency_matrix(RADIUS),
+            ref_cell_list.create_adjacency_matrix(RADIUS)
+        )
+
+
+def test_update_shape_mismatch():
+    """
+    Test whether updating a cell list with a different number of atoms
+    raises an exception.
+    """
+    cell_list = struc.CellList(np.zeros((10, 3)), cell_size=1)
+    with pytest.raises(IndexError):
+        cell_list.update(np.zeros((11, 3)))
+
+
+@pytest.mark.parametrize(
+    "periodic, use_selection, use_types",
+    itertools.product([False, True], [False, True], [False, True])
+)
+def test_pair_list(periodic, use_selection, use_types):
+    """
+    Test whether the sparse pair list and the sparse adjacency matrix
+    contain the same atom pairs as the dense adjacency matrix.
+    """
+    THRESHOLD = 5
+
+    array = strucio.load_structure(join(data_dir("structure"), "3o5r.bcif"))
+    if periodic:
+        # Use a small box to produce pairs between periodic copies
+        array.box = np.identity(3) * 15
+        array.coord = struc.move_inside_box(array.coord, array.box)
+    np.random.seed(0)
+    if use_selection:
+        selection = np.random.choice((False, True), array.array_length())
+    else:
+        selection = None
+    if use_types:
+        types = np.random.randint(3, size=array.array_length())
+        threshold = np.random.uniform(0, THRESHOLD, size=(3, 3))
+        threshold = (threshold + threshold.T) / 2
+    else:
+        types = None
+        threshold = THRESHOLD
+    cell_list = struc.CellList(
+        array, cell_size=THRESHOLD, periodic=periodic, selection=selection
+    )
+
+    ref_matrix = cell_list.create_adjacency_matrix(THRESHOLD)
+    pairs, distances = cell_list.create_pair_list(threshold, types)
+
+    if use_types:
+        ref_matrix &= (
+            struc.distance(
+                array.coord[:, np.newaxis], array.coord[np.newaxis, :],
+                box=array.box
+            ) <= threshold[types[:, np.newaxis], types[np.newaxis, :]]
+        )
+    ref_pairs = np.stack(np.where(np.triu(ref_matrix, k=1)), axis=-1)
+    assert np.array_equal(pairs, ref_pairs)
+    assert distances == pytest.approx(
+        struc.distance(
+            array.coord[pairs[:, 0]], array.coord[pairs[:, 1]], box=array.box
+        ),
+        abs=1e-4
+    )
+
+    pytest.importorskip("scipy")
+    if not use_types:
+        sparse_matrix = cell_list.create_adjacency_matrix(
+            THRESHOLD, as_sparse=True
+        )
+        assert np.array_equal(sparse_matrix.toarray(), ref_matrix)
+
+
+@pytest.mark.parametrize("periodic, multi_radius", itertools.product(
+    [False, True], [False, True]
+))
+def test_atom_pairs(periodic, multi_radius):
+    """
+    Test whether the sparse pairs of :meth:`get_atom_pairs()` and
+    :meth:`get_atom_pairs_in_cells()` are equivalent to the dense
+    output of the corresponding :meth:`get_atoms()` and
+    :meth:`get_atoms_in_cells()` method.
+    """
+    array = strucio.load_structure(join(data_dir("structure"), "3o5r.bcif"))
+    if periodic:
+        array.box = np.identity(3) * 15
+    cell_list = struc.CellList(array, cell_size=5, periodic=periodic)
+    np.random.seed(0)
+    coord = array.coord[::10]
+    if multi_radius:
+        radius = np.random.uniform(0, 8, size=len(coord))
+        cell_radius = np.random.randint(3, size=len(coord))
+    else:
+        radius = 5
+        cell_radius = 1
+
+    for pair_function, dense_function, r in [
+        (cell_list.get_atom_pairs, cell_list.get_atoms, radius),
+        (
+            cell_list.get_atom_pairs_in_cells,
+            cell_list.get_atoms_in_cells,
+            cell_radius
+        ),
+    ]:
+        ref_mask = dense_function(coord, r, as_mask=True)
+        pairs = pair_function(coord, r)
+        if isinstance(pairs, tuple):
+            pairs, _ = pairs
+        # The pairs are sorted by the position index
+        assert (np.diff(pairs[:, 0]) >= 0).all()
+        test_mask = np.zeros(ref_mask.shape, dtype=bool)
+        test_mask[pairs[:, 0], pairs[:, 1]] = True
+        assert np.array_equal(test_mask, ref_mask)
@@ -108,4 +108,35 @@ def test_rmsf_gmx(load_stack_superimpose):
         0.059, 0.037, 0.0331, 0.0392, 0.0403, 0.0954
     ])
 
-    assert np.allclose(rmsf, rmsf_gmx, atol=1e-02)
\ No newline at end of file
+    assert np.allclose(rmsf, rmsf_gmx, atol=1e-02)
+
+
+@pytest.mark.parametrize(
+    "block_size, as_coord", [(1, False), (4, True), (128, False)]
+)
+def test_pairwise_rmsd(load_stack_superimpose, block_size, as_coord):
+    """
+    Compare the condensed matrix from :func:`pairwise_rmsd()` with the
+    RMSD of each pair of models after superimposition via
+    :func:`superimpose()`.
+    """
+    stack, _ = load_stack_superimpose
+    stack = stack[:10]
+    # Add a mirror image, whose superimposition must not be a reflection
+    mirrored = stack[0].copy()
+    mirrored.coord *= [1, 1, -1]
+    stack = struc.stack(list(stack) + [mirrored])
+    n_models = stack.stack_depth()
+
+    ref_rmsd = []
+    for i in range(n_models):
+        for j in range(i + 1, n_models):
+            superimposed, _ = struc.superimpose(stack[i], stack[j])
+            ref_rmsd.append(struc.rmsd(stack[i], superimposed))
+
+    test_rmsd = struc.pairwise_rmsd(
+        stack.coord if as_coord else stack, block_size=block_size
+    )
+
+    assert test_rmsd.shape == (n_models * (n_models - 1) // 2,)
+    assert test_rmsd == pytest.approx(ref_rmsd, abs=1e-4)
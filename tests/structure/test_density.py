@@ -54,6 +54,19 @@ def test_density_with_bins(array):
     assert density[1,1,1] == 1
     assert density[2,0,1] == 3
 
+def test_density_with_bin_counts(array):
+    density, edges = struc.density(array, bins=[4, 4, 4])
+    ref_density, ref_edges = np.histogramdd(array.coord, bins=[4, 4, 4])
+    assert density.shape == (4, 4, 4)
+    assert np.array_equal(density, ref_density)
+    for test_edges, ref_edge in zip(edges, ref_edges):
+        assert np.allclose(test_edges, ref_edge)
+
+    density, (x, y, z) = struc.density(array, bins=[2, [0, 1, 2, 3], 3])
+    assert np.array_equal(y, [0, 1, 2, 3])
+    assert density.shape == (2, 3, 3)
+    assert density.sum() == 6
+
 def test_density_with_delta(array):
     density, (x, y, z) = struc.density(array, delta=5.0)
     assert density.shape == (1, 1, 1)
@@ -86,3 +99,22 @@ def test_density_weights(array, stack):
     assert density[1,0] == density2[1,0]
     assert density[1,1] == density2[1,1]
     
+
+def test_density_accumulator(array, stack):
+    """
+    Check if accumulating the density over chunks of frames gives the
+    same result as computing it for all frames at once.
+    """
+    bins = np.array([[0, 1, 2, 3],[0, 1, 2, 3],[0, 1, 2, 3]])
+    atomic_weights = np.arange(0.1, 0.7, 0.1)
+    for density in (False, True):
+        ref_hist, ref_edges = struc.density(
+            stack, bins=bins, density=density, weights=atomic_weights
+        )
+        accumulator = struc.DensityAccumulator(bins, density=density)
+        accumulator.add(array, weights=atomic_weights)
+        accumulator.add(stack[1:], weights=atomic_weights)
+        test_hist, test_edges = accumulator.result()
+        assert np.allclose(test_hist, ref_hist)
+        for test_e, ref_e in zip(test_edges, ref_edges):
+            assert np.array_equal(test_e, ref_e)
@@ -163,6 +163,38 @@ def test_hbond_single_selection(stack):
     assert len(triplets) == 2
 
 
+@pytest.mark.parametrize(
+    "stack, selection1_type, periodic", itertools.product(
+        [False, True],
+        ["both", "donor", "acceptor"],
+        [False, True]
+    ),
+    indirect=["stack"]
+)
+def test_hbond_sparse(stack, selection1_type, periodic):
+    """
+    Check if the sparse representation of the hydrogen bonds points to
+    the same hydrogen bonds as the dense mask.
+    """
+    if periodic:
+        stack.box = np.array([np.identity(3) * 50] * stack.stack_depth())
+    selection1 = stack.res_id < 10
+    selection2 = stack.res_id > 5
+
+    ref_triplets, ref_mask = struc.hbond(
+        stack, selection1, selection2, selection1_type, periodic=periodic
+    )
+    test_triplets, test_indices = struc.hbond(
+        stack, selection1, selection2, selection1_type, periodic=periodic,
+        sparse=True
+    )
+
+    assert test_triplets.tolist() == ref_triplets.tolist()
+    # Indices are sorted by model
+    assert test_indices.tolist() \
+        == np.stack(np.where(ref_mask), axis=-1).tolist()
+
+
 def test_hbond_frequency():
     mask = np.array([
         [True, True, True, True, True], # 1.0
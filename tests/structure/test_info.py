@@ -8,6 +8,10 @@ import numpy as np
 import pytest
 import biotite.structure as struc
 import biotite.structure.info as strucinfo
+from biotite.structure.info.ccd import (
+    get_ccd, get_from_ccd, INDEX_COLUMN_NAME, _index_residues,
+    _read_residue_index, _write_residue_index
+)
 from biotite.structure.io import load_structure
 from ..util import data_dir
 
@@ -90,6 +94,68 @@ def test_single_radii():
     assert strucinfo.vdw_radius_single("N") == 1.55
 
 
+@pytest.mark.parametrize(
+    "category_name, id_column_name",
+    [
+        ("chem_comp", "id"),
+        ("chem_comp_atom", "comp_id"),
+        ("chem_comp_bond", "comp_id"),
+    ]
+)
+def test_get_from_ccd(category_name, id_column_name):
+    """
+    Check if the rows obtained via the residue index of the CCD are the
+    same as the ones obtained by a naive search in the ID column.
+    """
+    category = get_ccd()[category_name]
+    id_column = category[id_column_name].as_array()
+    for res_name in ["ALA", "HOH", "NON_EXISTING"]:
+        mask = (id_column == res_name)
+        if not mask.any():
+            assert get_from_ccd(category_name, res_name) is None
+            continue
+        # Run two times to check if caching works
+        for _ in range(2):
+            rows = get_from_ccd(category_name, res_name)
+            assert list(rows.keys()) == list(category.keys())
+            for col_name, array in rows.items():
+                assert array.tolist() \
+                    == category[col_name].as_array()[mask].tolist()
+            assert get_from_ccd(
+                category_name, res_name, id_column_name
+            ).tolist() == id_column[mask].tolist()
+
+
+@pytest.mark.parametrize("category_name", INDEX_COLUMN_NAME.keys())
+def test_residue_index_file(tmp_path, category_name):
+    """
+    Check if the residue index written into a file is equal to the
+    index computed from the CCD and if an index that does not fit the
+    CCD is rejected.
+    """
+    ccd = get_ccd()
+    ref_comp_ids, ref_starts = _index_residues(
+        ccd[category_name][INDEX_COLUMN_NAME[category_name]].as_array()
+    )
+
+    index_path = tmp_path / "components_index.npz"
+    _write_residue_index(ccd, index_path)
+    test_comp_ids, test_starts = _read_residue_index(index_path, category_name)
+    assert test_comp_ids.tolist() == ref_comp_ids.tolist()
+    assert test_starts.tolist() == ref_starts.tolist()
+
+    # Simulate an index created for a different version of the CCD
+    with np.load(index_path) as index_file:
+        index = dict(index_file)
+    index[f"{category_name}.row_count"] += 1
+    index[f"{category_name}.start"][-1] += 1
+    np.savez(index_path, **index)
+    assert _read_residue_index(index_path, category_name) is None
+
+    assert _read_residue_index(tmp_path / "non_existing.npz", category_name) \
+        is None
+
+
 def test_full_name():
     assert strucinfo.full_name("Ala").upper() == "ALANINE"
     assert strucinfo.full_name("ALA").upper() == "ALANINE"
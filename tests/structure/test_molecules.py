@@ -79,6 +79,41 @@ def test_get_molecule_indices(array, as_stack, as_bonds):
     assert seen_atoms == array.array_length()
 
 
+@pytest.mark.parametrize(
+    "as_stack, as_bonds",
+    [
+        (False, False),
+        (True,  False),
+        (False, True )
+    ]
+)
+def test_get_molecule_ids(array, as_stack, as_bonds):
+    """
+    Test whether the IDs returned by :func:`get_molecule_ids()` map
+    one-to-one to the residue IDs, as each residue in the
+    :class:`AtomArray` is a separate molecule, and whether they
+    point to the same atoms as the indices returned by
+    :func:`find_connected()`.
+    """
+    if as_stack:
+        array = struc.stack([array])
+
+    if as_bonds:
+        test_ids = struc.get_molecule_ids(array.bonds)
+    else:
+        test_ids = struc.get_molecule_ids(array)
+
+    assert test_ids.shape == (array.array_length(),)
+    # IDs are ordered by the first atom of each molecule
+    _, first_occurrence = np.unique(test_ids, return_index=True)
+    assert np.all(np.diff(first_occurrence) > 0)
+    assert len(first_occurrence) == len(np.unique(array.res_id))
+    for i, first_atom in enumerate(first_occurrence):
+        ref_indices = struc.find_connected(array.bonds, first_atom)
+        assert np.where(test_ids == i)[0].tolist() == ref_indices.tolist()
+        assert (array.res_id[test_ids == i] == array.res_id[first_atom]).all()
+
+
 @pytest.mark.parametrize(
     "as_stack, as_bonds",
     [
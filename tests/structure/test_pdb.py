@@ -370,6 +370,105 @@ def test_get_b_factor(model):
     assert (test_b_factor == ref_b_factor).all()
 
 
+@pytest.mark.parametrize(
+    "path, altloc", itertools.product(
+        glob.glob(join(data_dir("structure"), "*.pdb")),
+        ["first", "all"]
+    )
+)
+def test_read_iter_structure(path, altloc):
+    """
+    Check if the models from :meth:`PDBFile.read_iter_structure()` are
+    equal to the models of the :class:`AtomArrayStack` from
+    :meth:`PDBFile.get_structure()` and share their annotation arrays.
+    """
+    pdb_file = pdb.PDBFile.read(path)
+    try:
+        ref_stack = pdb_file.get_structure(
+            altloc=altloc, extra_fields=["atom_id", "b_factor"]
+        )
+    except biotite.InvalidFileError:
+        # The models contain different numbers of atoms
+        with pytest.raises(biotite.InvalidFileError):
+            list(pdb.PDBFile.read_iter_structure(path, altloc=altloc))
+        return
+
+    test_models = list(pdb.PDBFile.read_iter_structure(
+        path, altloc=altloc, extra_fields=["atom_id", "b_factor"]
+    ))
+
+    assert len(test_models) == ref_stack.stack_depth()
+    for ref_model, test_model in zip(ref_stack, test_models):
+        assert test_model == ref_model
+        for category in ref_stack.get_annotation_categories():
+            assert test_model.get_annotation(category) \
+                is test_models[0].get_annotation(category)
+
+
+def test_read_iter_structure_copy_on_write():
+    """
+    Check if the annotation arrays shared between the models from
+    :meth:`PDBFile.read_iter_structure()` are read-only and copied on
+    write, and if each model has its own box.
+    """
+    path = join(data_dir("structure"), "1l2y.pdb")
+    models = list(pdb.PDBFile.read_iter_structure(path))
+    ref_res_name = models[0].res_name.copy()
+
+    for model in models:
+        assert not model.res_name.flags.writeable
+        with pytest.raises(ValueError):
+            model.res_name[0] = "XXX"
+    models[0].res_name = np.full(models[0].array_length(), "XXX")
+    assert (models[0].res_name == "XXX").all()
+    for model in models[1:]:
+        assert (model.res_name == ref_res_name).all()
+
+    models[0].box[0, 0] = 42
+    for model in models[1:]:
+        assert model.box[0, 0] != 42
+
+    # The residue starts are cached for all models
+    struc.get_residue_starts(models[1])
+    assert "residue_starts" in models[-1]._cache
+
+
+@pytest.mark.parametrize(
+    "chunk_size, include_bonds", itertools.product([1, 7], [False, True])
+)
+def test_write_iter(chunk_size, include_bonds):
+    """
+    Test whether :meth:`PDBFile.write_iter()` writes the same file as
+    :meth:`PDBFile.set_structure()`, if the models are given one by one
+    or in chunks.
+    """
+    path = join(data_dir("structure"), "1l2y.pdb")
+    stack = pdb.PDBFile.read(path).get_structure(include_bonds=include_bonds)
+    # Put atom coordinates into an unusual range
+    stack.coord *= 10
+    stack.box = np.repeat(np.identity(3)[np.newaxis] * 100, len(stack), axis=0)
+
+    ref_file = pdb.PDBFile()
+    ref_file.set_structure(stack)
+    temp = TemporaryFile("w+")
+    ref_file.write(temp)
+    temp.seek(0)
+    ref_text = temp.read()
+    temp.close()
+
+    coord_chunks = [
+        stack.coord[i : i + chunk_size]
+        for i in range(0, len(stack), chunk_size)
+    ]
+    temp = TemporaryFile("w+")
+    pdb.PDBFile.write_iter(temp, stack[0], iter(coord_chunks))
+    temp.seek(0)
+    test_text = temp.read()
+    temp.close()
+
+    assert test_text == ref_text
+
+
 
 np.random.seed(0)
 N = 200
@@ -401,6 +500,40 @@ def test_max_hybrid36_number():
     assert hybrid36.max_hybrid36_number(5) == 87440031
 
 
+@pytest.mark.parametrize("length", LENGTHS)
+def test_hybrid36_array_decoding(length):
+    """
+    Test whether the vectorized hybrid-36 decoding of a character
+    matrix gives the same numbers as decoding each string separately.
+    Negative numbers are tested as well, as they may appear in the
+    residue ID column.
+    """
+    np.random.seed(0)
+    numbers = np.concatenate([
+        np.random.randint(0, hybrid36.max_hybrid36_number(length), N),
+        -np.random.randint(1, 10**(length-1), N)
+    ])
+    strings = [
+        hybrid36.encode_hybrid36(number, length) if number >= 0
+        else str(number)
+        for number in numbers
+    ]
+    # Right-justified as in a PDB file
+    chars = np.frombuffer(
+        "".join([string.rjust(length) for string in strings]).encode(),
+        dtype=np.uint8
+    ).reshape(-1, length)
+
+    test_numbers = hybrid36._decode_hybrid36_array(chars)
+    ref_numbers = [hybrid36.decode_hybrid36(string) for string in strings]
+    assert test_numbers.tolist() == ref_numbers
+
+    with pytest.raises(ValueError):
+        hybrid36._decode_hybrid36_array(
+            np.full((1, length), ord(" "), dtype=np.uint8)
+        )
+
+
 
 @pytest.mark.parametrize("hybrid36", [False, True])
 def test_bond_records(hybrid36):
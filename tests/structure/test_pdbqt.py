@@ -58,3 +58,33 @@ def test_array_conversion(path):
         except AssertionError:
             print(f"Inequality in '{category}' category")
             raise
+
+
+def test_read_iter_structure():
+    """
+    Check if the models from :meth:`PDBQTFile.read_iter_structure()`
+    are equal to the models of the :class:`AtomArrayStack` from
+    :meth:`PDBQTFile.get_structure()`, for a file with multiple poses.
+    """
+    pdbx_file = pdbx.BinaryCIFFile.read(join(data_dir("structure"), "1l2y.bcif"))
+    models = pdbx.get_structure(pdbx_file, include_bonds=True)[:3]
+
+    lines = []
+    for i, model in enumerate(models):
+        pdbqt_file = pdbqt.PDBQTFile()
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            pdbqt.set_structure(pdbqt_file, model)
+        lines += [f"MODEL {i+1}"] + pdbqt_file.lines + ["ENDMDL"]
+    temp = TemporaryFile("w+")
+    temp.write("\n".join(lines) + "\n")
+
+    temp.seek(0)
+    ref_stack = pdbqt.PDBQTFile.read(temp).get_structure()
+    temp.seek(0)
+    test_models = list(pdbqt.PDBQTFile.read_iter_structure(temp))
+    temp.close()
+
+    assert len(test_models) == ref_stack.stack_depth() == 3
+    for ref_model, test_model in zip(ref_stack, test_models):
+        assert test_model == ref_model
@@ -3,8 +3,10 @@
 # information.
 
 import warnings
+import gc
 import glob
 import itertools
+import weakref
 from os.path import join, splitext
 import numpy as np
 import pytest
@@ -59,6 +61,49 @@ def test_escape(string, looped):
     assert test_value == ref_value
 
 
+def test_looped_tokenization():
+    """
+    Test whether values of a looped category are correctly split
+    according to the CIF quoting rules, using manually written text
+    with expected values.
+    """
+    text = (
+        "loop_\n"
+        "_test_cat.first\n"
+        "_test_cat.second\n"
+        "_test_cat.third\n"
+        "plain 'quoted value' \"it's\"\n"
+        "# A comment line\n"
+        "O5' 'a'b' ''\n"
+        ";multi\n"
+        "line\n"
+        ";\n"
+        "split_row\n"
+        ".\n"
+    )
+    category = pdbx.CIFCategory.deserialize(text)
+
+    assert category.row_count == 3
+    assert category["first"].as_array().tolist() \
+        == ["plain", "O5'", "multi\nline"]
+    assert category["second"].as_array().tolist() \
+        == ["quoted value", "a'b", "split_row"]
+    assert category["third"].as_array().tolist() == ["it's", "", "."]
+    assert category["third"].mask.array.tolist() == [
+        pdbx.MaskValue.PRESENT,
+        pdbx.MaskValue.PRESENT,
+        pdbx.MaskValue.INAPPLICABLE
+    ]
+    assert category["second"].mask is None
+
+    # The former 'expect_whitespace' parameter is still accepted
+    with pytest.warns(DeprecationWarning):
+        deprecated_category = pdbx.CIFCategory.deserialize(
+            text, expect_whitespace=False
+        )
+    assert deprecated_category == category
+
+
 @pytest.mark.parametrize(
     "format, path, model",
     itertools.product(
@@ -281,6 +326,66 @@ def test_any_bonds(tmpdir, format):
     assert test_bonds == ref_bonds
 
 
+@pytest.mark.parametrize(
+    "format, pdb_id, altloc", itertools.product(
+        ["cif", "bcif"], ["1l2y", "1gya"], ["first", "all"]
+    )
+)
+def test_get_structure_iter(format, pdb_id, altloc):
+    """
+    Check if the models from :func:`get_structure_iter()` are equal to
+    the models of the :class:`AtomArrayStack` from
+    :func:`get_structure()` and share their annotation arrays.
+    """
+    path = join(data_dir("structure"), f"{pdb_id}.{format}")
+    if format == "cif":
+        pdbx_file = pdbx.CIFFile.read(path)
+    else:
+        pdbx_file = pdbx.BinaryCIFFile.read(path)
+    ref_stack = pdbx.get_structure(
+        pdbx_file, altloc=altloc, extra_fields=["b_factor"],
+        include_bonds=True
+    )
+
+    test_models = list(pdbx.get_structure_iter(
+        pdbx_file, altloc=altloc, extra_fields=["b_factor"],
+        include_bonds=True
+    ))
+
+    assert len(test_models) == ref_stack.stack_depth()
+    for ref_model, test_model in zip(ref_stack, test_models):
+        assert test_model == ref_model
+        assert test_model.bonds == ref_model.bonds
+        for category in ref_stack.get_annotation_categories():
+            assert test_model.get_annotation(category) \
+                is test_models[0].get_annotation(category)
+
+
+def test_get_structure_iter_copy_on_write():
+    """
+    Check if the annotation arrays and bonds shared between the models
+    from :func:`get_structure_iter()` are copied on write.
+    """
+    path = join(data_dir("structure"), "1l2y.bcif")
+    pdbx_file = pdbx.BinaryCIFFile.read(path)
+    models = list(pdbx.get_structure_iter(pdbx_file, include_bonds=True))
+    ref_res_id = models[0].res_id.copy()
+    ref_bond_count = models[1].bonds.get_bond_count()
+
+    for model in models:
+        assert not model.res_id.flags.writeable
+        with pytest.raises(ValueError):
+            model.res_id += 1
+    models[0].res_id = models[0].res_id + 1
+    assert (models[0].res_id == ref_res_id + 1).all()
+    for model in models[1:]:
+        assert (model.res_id == ref_res_id).all()
+
+    models[0].bonds.remove_bond(0, 1)
+    for model in models[1:]:
+        assert model.bonds.get_bond_count() == ref_bond_count
+
+
 @pytest.mark.parametrize(
     "format", ["cif", "bcif"]
 )
@@ -655,3 +760,93 @@ def _clear_encoding(category):
             mask = None
         columns[key] = pdbx.BinaryCIFColumn(data, mask)
     return pdbx.BinaryCIFCategory(columns)
+
+
+@pytest.mark.parametrize("format", ["cif", "bcif"])
+def test_filter_category(format):
+    """
+    Check if filtering a category gives the same values as filtering
+    the arrays of each column.
+    For *CIF* files the columns of the filtered category are lazily
+    deserialized, so each column is deserialized only after filtering.
+    """
+    path = join(data_dir("structure"), f"1l2y.{format}")
+    File = pdbx.CIFFile if format == "cif" else pdbx.BinaryCIFFile
+
+    ref_category = File.read(path).block["atom_site"]
+    models = ref_category["pdbx_PDB_model_num"].as_array(int)
+    # Apply filters consecutively to check combination of row indices
+    first_index = models <= 2
+    second_index = slice(10, None, 3)
+
+    test_category = File.read(path).block["atom_site"]
+    test_category = test_category.filter(first_index).filter(second_index)
+
+    assert test_category.row_count == len(
+        np.arange(ref_category.row_count)[first_index][second_index]
+    )
+    assert list(test_category.keys()) == list(ref_category.keys())
+    for key in ref_category.keys():
+        assert test_category[key].as_array().tolist() \
+            == ref_category[key].as_array()[first_index][second_index].tolist()
+
+
+def test_bcif_memory_map():
+    """
+    Check if reading a *BinaryCIF* file from a path, where the file is
+    memory mapped, gives the same content as reading it from a file
+    object.
+    """
+    path = join(data_dir("structure"), "1l2y.bcif")
+    with open(path, "rb") as file:
+        ref_file = pdbx.BinaryCIFFile.read(file)
+
+    # Data that was not decoded yet should be serialized as is
+    test_content = pdbx.BinaryCIFFile.read(path).serialize()
+    with open(path, "rb") as file:
+        ref_content = pdbx.BinaryCIFFile.read(file).serialize()
+    for test_block, ref_block in zip(
+        test_content["dataBlocks"], ref_content["dataBlocks"]
+    ):
+        for test_category, ref_category in zip(
+            test_block["categories"], ref_block["categories"]
+        ):
+            for test_column, ref_column in zip(
+                test_category["columns"], ref_category["columns"]
+            ):
+                assert bytes(test_column["data"]["data"]) \
+                    == bytes(ref_column["data"]["data"])
+
+    mapped_file = pdbx.BinaryCIFFile.read(path)
+    for category_name, ref_category in ref_file.block.items():
+        test_category = mapped_file.block[category_name]
+        for column_name, ref_column in ref_category.items():
+            assert test_category[column_name].as_array().tolist() \
+                == ref_column.as_array().tolist()
+
+
+def test_bcif_memory_map_release():
+    """
+    Check if a memory mapped *BinaryCIF* file object is released as
+    soon as it is not referenced anymore, so that the memory map is
+    closed, while data that outlives the file object is still
+    accessible.
+    """
+    path = join(data_dir("structure"), "1l2y.bcif")
+    ref_coord = pdbx.get_structure(
+        pdbx.BinaryCIFFile.read(path), model=1
+    ).coord
+
+    bcif_file = pdbx.BinaryCIFFile.read(path)
+    block = bcif_file.block
+    file_ref = weakref.ref(bcif_file)
+    gc.disable()
+    try:
+        del bcif_file
+        # No reference cycle keeps the file object alive
+        assert file_ref() is None
+    finally:
+        gc.enable()
+
+    test_coord = pdbx.get_structure(block, model=1).coord
+    assert np.array_equal(test_coord, ref_coord)
@@ -3,7 +3,7 @@ from os.path import join
 import numpy as np
 import pytest
 from biotite.structure.io import load_structure
-from biotite.structure.rdf import rdf
+from biotite.structure.rdf import rdf, RDFAccumulator
 from biotite.structure.box import vectors_from_unitcell
 from ..util import data_dir, cannot_import
 
@@ -182,3 +182,31 @@ def test_rdf_normalized():
                     bins=n_bins, periodic=True)
     assert np.allclose(g_r[-10:], np.ones(10), atol=0.1)
 
+
+
+@pytest.mark.parametrize("periodic, chunk_size", itertools.product(
+    [False, True], [1, 3]
+))
+def test_rdf_accumulator(periodic, chunk_size):
+    """
+    Check if accumulating the RDF over chunks of frames gives the same
+    result as computing it for all frames at once.
+    """
+    stack = load_structure(TEST_FILE)
+    oxygen = stack[:, stack.atom_name == 'OW']
+    interval = (0.2, 10)
+    n_bins = 49
+    ref_bins, ref_g_r = rdf(
+        oxygen[:, :5], oxygen, interval=interval, bins=n_bins,
+        periodic=periodic
+    )
+
+    accumulator = RDFAccumulator(interval, n_bins, periodic=periodic)
+    for start in range(0, oxygen.stack_depth(), chunk_size):
+        chunk = oxygen[start : start + chunk_size]
+        # Pass the coordinates only, as obtained from 'read_iter()'
+        accumulator.add(chunk[:, :5].coord, chunk.coord, box=chunk.box)
+    test_bins, test_g_r = accumulator.result()
+
+    assert np.array_equal(test_bins, ref_bins)
+    assert np.allclose(test_g_r, ref_g_r)
@@ -2,6 +2,8 @@
 # under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
 # information.
 
+import itertools
+import warnings
 import biotite.structure as struc
 import biotite.structure.io as strucio
 import numpy as np
@@ -20,6 +22,44 @@ def test_apply_residue_wise(array):
     assert data.tolist() == [len(array[array.res_id == i])
                              for i in range(1, 21)]
 
+
+@pytest.mark.parametrize(
+    "function, dtype, axis",
+    list(itertools.product(
+        [
+            np.sum, np.nansum, np.mean, np.nanmean,
+            np.min, np.max, np.nanmin, np.nanmax,
+            np.count_nonzero, np.any, np.all
+        ],
+        [np.float32, np.float64, np.int16, bool],
+        [None, 0]
+    ))
+)
+def test_apply_residue_wise_reduction(array, function, dtype, axis):
+    """
+    Check if the single-pass evaluation of common reductions gives the
+    same result as calling the function for each residue.
+    """
+    np.random.seed(0)
+    data = (np.random.rand(array.array_length(), 3) * 10).astype(dtype)
+    if dtype == np.float64:
+        data[np.random.rand(*data.shape) < 0.1] = np.nan
+
+    with warnings.catch_warnings():
+        # Ignore warnings for residues with only NaN values
+        warnings.simplefilter("ignore", RuntimeWarning)
+        # The lambda function prevents the dispatch to the reduction
+        ref_data = struc.apply_residue_wise(
+            array, data, lambda *args, **kwargs: function(*args, **kwargs),
+            axis
+        )
+        test_data = struc.apply_residue_wise(array, data, function, axis)
+
+    assert test_data.dtype == ref_data.dtype
+    assert test_data.shape == ref_data.shape
+    assert np.allclose(test_data, ref_data, rtol=1e-5, equal_nan=True)
+
+
 def test_spread_residue_wise(array):
     input_data = np.arange(1,21)
     output_data = struc.spread_residue_wise(array, input_data)
@@ -63,4 +103,109 @@ def test_residue_iter(array):
     ref_centroid = struc.apply_residue_wise(
         array, array.coord, np.average, axis=0
     )
-    assert centroid == ref_centroid.tolist()
\ No newline at end of file
+    assert centroid == ref_centroid.tolist()
+
+
+def test_residue_starts_cache():
+    """
+    Check if the residue and chain starts cached for the arrays obtained
+    from a frozen :class:`AtomArrayStack` are reused and are invalidated
+    when the annotations change.
+    """
+    stack = strucio.load_structure(join(data_dir("structure"), "1l2y.bcif"))
+    stack.freeze_annotations()
+    ref_starts = struc.get_residue_starts(stack)
+    ref_chain_starts = struc.get_chain_starts(stack)
+
+    models = list(stack)
+    for model in models:
+        assert struc.get_residue_starts(model).tolist() == ref_starts.tolist()
+        assert struc.get_chain_starts(model).tolist() \
+            == ref_chain_starts.tolist()
+    # The cache is shared between the models
+    assert "residue_starts" in models[0]._cache
+    assert models[0]._cache is models[-1]._cache
+    # Modifying the returned starts must not affect the cache
+    struc.get_residue_starts(models[0])[:] = 0
+    assert struc.get_residue_starts(models[0]).tolist() \
+        == ref_starts.tolist()
+
+    # Replacing an annotation in a model (copy-on-write)
+    model = models[0]
+    model.res_id = np.zeros(model.array_length(), dtype=int)
+    test_starts = struc.get_residue_starts(model)
+    assert len(test_starts) < len(ref_starts)
+    assert test_starts.tolist() \
+        == struc.get_residue_starts(model.copy()).tolist()
+    assert struc.get_residue_starts(models[1]).tolist() \
+        == ref_starts.tolist()
+
+    # Replacing an annotation of the stack
+    stack.res_id = np.ones(stack.array_length(), dtype=int)
+    for model in stack:
+        assert struc.get_residue_starts(model).tolist() \
+            == test_starts.tolist()
+
+    # Changing the array length
+    model = models[1]
+    model = model[model.atom_name == "CA"]
+    assert struc.get_residue_starts(model).tolist() \
+        == struc.get_residue_starts(model.copy()).tolist()
+
+
+def test_residue_starts_cache_writable_stack():
+    """
+    Check if the residue starts are not cached for the arrays obtained
+    from an :class:`AtomArrayStack` with writable annotations, as the
+    annotations of the stack may be modified in-place.
+    """
+    stack = strucio.load_structure(join(data_dir("structure"), "1l2y.bcif"))
+    res_id = stack.res_id
+    model = stack[0]
+    assert len(struc.get_residue_starts(model)) == 20
+
+    res_id[5:] = 99
+    assert struc.get_residue_starts(model).tolist() \
+        == struc.get_residue_starts(model.copy()).tolist()
+    assert len(struc.get_residue_starts(model)) == 17
+
+
+def test_residue_starts_cache_frozen():
+    """
+    Check if the residue starts are cached for an :class:`AtomArray`
+    after :meth:`freeze_annotations()` and are invalidated when the
+    annotations change.
+    """
+    array = strucio.load_structure(
+        join(data_dir("structure"), "1l2y.bcif"), model=1
+    )
+    ref_starts = struc.get_residue_starts(array)
+    # Ordinary atom arrays have writable annotations, that are not cached
+    assert "residue_starts" not in array._cache
+
+    array.freeze_annotations()
+    assert struc.get_residue_starts(array).tolist() == ref_starts.tolist()
+    assert "residue_starts" in array._cache
+    with pytest.raises(ValueError):
+        array.res_id[0] = 42
+    # Accessing an unrelated writable annotation keeps the cache
+    array.add_annotation("foo", dtype=int)
+    array.foo[:] = 1
+    assert "residue_starts" in array._cache
+    # The copy has writable annotations again
+    assert array.copy().res_id.flags.writeable
+
+    # Setting an atom is copy-on-write
+    atom = array[0]
+    atom.res_id = 42
+    array[1] = atom
+    assert array.res_id.flags.writeable
+    test_starts = struc.get_residue_starts(array)
+    assert test_starts.tolist() == [0, 1, 2] + ref_starts[1:].tolist()
+
+    # Replacing an annotation
+    array.freeze_annotations()
+    array.res_id = np.ones(array.array_length(), dtype=int)
+    assert struc.get_residue_starts(array).tolist() \
+        == struc.get_residue_starts(array.copy()).tolist()
+
@@ -2,6 +2,7 @@
 # under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
 # information.
 
+from concurrent.futures import ThreadPoolExecutor
 from os.path import join
 import pytest
 import numpy as np
@@ -73,4 +74,67 @@ def test_coarse_grained(pdb_id):
     # have less than 40% SASA difference
     assert np.count_nonzero(
         np.isclose(sasa, sasa_exp, rtol=4e-1, atol=1)
-    ) / len(sasa) > 0.98
\ No newline at end of file
+    ) / len(sasa) > 0.98
+
+
+@pytest.mark.parametrize("residue_wise", [False, True])
+def test_stack(residue_wise):
+    """
+    Test whether the SASA calculated for an :class:`AtomArrayStack` is
+    equal to the SASA calculated for each model separately.
+    """
+    file = pdbx.BinaryCIFFile.read(join(data_dir("structure"), "1l2y.bcif"))
+    stack = pdbx.get_structure(file)
+
+    test_sasa = struc.sasa(
+        stack, vdw_radii="Single", point_number=100,
+        residue_wise=residue_wise
+    )
+    ref_sasa = np.stack([
+        struc.sasa(
+            model, vdw_radii="Single", point_number=100,
+            residue_wise=residue_wise
+        )
+        for model in stack
+    ])
+
+    assert test_sasa.shape == ref_sasa.shape
+    assert np.array_equal(test_sasa, ref_sasa, equal_nan=True)
+
+
+@pytest.mark.parametrize("pdb_id", ["1l2y", "1gya"])
+def test_residue_wise(pdb_id):
+    """
+    Test whether the residue-wise SASA is equal to the sum of the
+    atom-wise SASA for each residue.
+    """
+    file = pdbx.BinaryCIFFile.read(join(data_dir("structure"), pdb_id+".bcif"))
+    array = pdbx.get_structure(file, model=1)
+
+    test_sasa = struc.sasa(array, vdw_radii="Single", residue_wise=True)
+    ref_sasa = struc.apply_residue_wise(
+        array, struc.sasa(array, vdw_radii="Single"), np.nansum
+    )
+
+    assert test_sasa == pytest.approx(ref_sasa, rel=1e-5)
+
+
+@pytest.mark.parametrize("as_stack", [False, True])
+def test_executor(as_stack):
+    """
+    Test whether distributing the SASA calculation to an executor
+    gives the same result as the serial calculation.
+    """
+    file = pdbx.BinaryCIFFile.read(join(data_dir("structure"), "1l2y.bcif"))
+    atoms = pdbx.get_structure(file)
+    if not as_stack:
+        atoms = atoms[0]
+
+    ref_sasa = struc.sasa(atoms, vdw_radii="Single", point_number=100)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        test_sasa = struc.sasa(
+            atoms, vdw_radii="Single", point_number=100,
+            executor=executor, max_pending=3
+        )
+
+    assert np.array_equal(test_sasa, ref_sasa, equal_nan=True)
@@ -233,6 +233,98 @@ def test_input_shapes(single_model, single_atom):
     assert fitted.coord.shape == mobile.coord.shape
 
 
+@pytest.mark.parametrize("seed", range(10))
+def test_superimposition_without_outliers(seed):
+    """
+    Take a structure, displace some random atoms in each model of a
+    randomly transformed copy and expect that
+    :func:`superimpose_without_outliers()` uses exactly the undisplaced
+    atoms as anchors, leading to a perfect match of these atoms.
+    """
+    N_MODELS = 3
+    N_OUTLIERS = 4
+
+    path = join(data_dir("structure"), "1l2y.bcif")
+    fixed = strucio.load_structure(path, model=1)
+    fixed = fixed[fixed.atom_name == "CA"]
+
+    np.random.seed(seed)
+    mobile_coord = np.stack([fixed.coord] * N_MODELS)
+    outlier_mask = np.zeros((N_MODELS, fixed.array_length()), dtype=bool)
+    for i in range(N_MODELS):
+        outlier_mask[i, np.random.choice(
+            fixed.array_length(), N_OUTLIERS, replace=False
+        )] = True
+    # Displace the outliers by 10 Å in random directions
+    displacement = np.random.normal(size=(N_MODELS * N_OUTLIERS, 3))
+    displacement *= 10 / np.linalg.norm(displacement, axis=-1, keepdims=True)
+    mobile_coord[outlier_mask] += displacement
+    mobile_coord = np.stack([
+        _transform_random_affine(model_coord) for model_coord in mobile_coord
+    ])
+
+    fitted, transformation, anchors = struc.superimpose_without_outliers(
+        fixed.coord, mobile_coord
+    )
+
+    assert (anchors == ~outlier_mask).all()
+    for i in range(N_MODELS):
+        assert struc.rmsd(fixed.coord[anchors[i]], fitted[i, anchors[i]]) \
+            == pytest.approx(0, abs=1e-4)
+    assert np.allclose(transformation.apply(mobile_coord), fitted)
+
+
+def test_superimposition_homologs():
+    """
+    Take a structure and create randomly transformed, truncated and
+    mutated variants of it.
+    Superimposing these variants onto the original structure should
+    match the corresponding CA atoms and lead to a perfect match of
+    them.
+    Superimposing all variants at once should give the same result as
+    superimposing them individually.
+    """
+    path = join(data_dir("structure"), "1l2y.bcif")
+    fixed = strucio.load_structure(path, model=1)
+
+    np.random.seed(0)
+    truncated = fixed[(fixed.res_id > 3) & (fixed.res_id < 17)]
+    mutated = fixed.copy()
+    mutated.res_name[np.isin(mutated.res_id, [5, 10])] = "ALA"
+    # Move the C-terminus away, so it is an outlier
+    displaced = fixed.copy()
+    displaced.coord[displaced.res_id > 17] += 10
+    mobiles = [
+        _transform_random_affine(atoms)
+        for atoms in (truncated, mutated, displaced)
+    ]
+    ref_res_ids = [
+        np.arange(4, 17),
+        np.arange(1, 21),
+        np.arange(1, 18),
+    ]
+
+    test_fitted, test_transform, test_fixed_anchors, test_mobile_anchors \
+        = struc.superimpose_homologs(fixed, mobiles)
+
+    assert test_transform.rotation.shape == (len(mobiles), 3, 3)
+    for i, mobile in enumerate(mobiles):
+        fitted, _, fixed_anchors, mobile_anchors \
+            = struc.superimpose_homologs(fixed, mobile)
+        assert fitted == test_fitted[i]
+        assert np.array_equal(fixed_anchors, test_fixed_anchors[i])
+        assert np.array_equal(mobile_anchors, test_mobile_anchors[i])
+
+        assert (fixed.atom_name[fixed_anchors] == "CA").all()
+        assert (mobile.atom_name[mobile_anchors] == "CA").all()
+        assert fixed.res_id[fixed_anchors].tolist() == ref_res_ids[i].tolist()
+        assert mobile.res_id[mobile_anchors].tolist() \
+            == ref_res_ids[i].tolist()
+        assert struc.rmsd(
+            fixed.coord[fixed_anchors], fitted.coord[mobile_anchors]
+        ) == pytest.approx(0, abs=1e-4)
+
+
 def _transform_random_affine(coord):
     coord = struc.translate(coord, np.random.rand(3))
     coord = struc.rotate(coord, np.random.uniform(low=0, high=2*np.pi, size=3))
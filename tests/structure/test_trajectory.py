@@ -326,4 +326,169 @@ def test_write_iter(format, n_models, n_atoms, include_box, include_time):
     if include_box:
         assert np.allclose(test_box, ref_box, atol=1e-2)
     if include_time:
-        assert np.allclose(test_time, ref_time, atol=1e-2)
\ No newline at end of file
+        assert np.allclose(test_time, ref_time, atol=1e-2)
+
+
+@pytest.mark.skipif(
+    cannot_import("mdtraj"),
+    reason="MDTraj is not installed"
+)
+@pytest.mark.parametrize(
+    "format, chunk_size, use_template, use_executor",
+    itertools.product(
+        ["trr", "xtc", "dcd"],
+        [1, 3, 100],
+        [False, True],
+        [False, True]
+    )
+)
+def test_analyze(format, chunk_size, use_template, use_executor):
+    """
+    Test whether the chunk-wise analysis of a trajectory via
+    :meth:`TrajectoryFile.analyze()` gives the same result as the
+    analysis of the entire trajectory at once.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    template = strucio.load_structure(
+        join(data_dir("structure"), "1l2y.bcif")
+    )[0]
+    if format == "trr":
+        traj_file_cls = trr.TRRFile
+    if format == "xtc":
+        traj_file_cls = xtc.XTCFile
+    if format == "dcd":
+        traj_file_cls = dcd.DCDFile
+    file_name = join(data_dir("structure"), f"1l2y.{format}")
+    ref_stack = traj_file_cls.read(file_name).get_structure(template)
+
+    if use_template:
+        def function(chunk):
+            return struc.rmsd(template, chunk)
+    else:
+        def function(coord, box, time):
+            return struc.rmsd(template, coord)
+    ref_rmsd = struc.rmsd(template, ref_stack)
+
+    if use_executor:
+        with ThreadPoolExecutor(2) as executor:
+            test_rmsd = traj_file_cls.analyze(
+                file_name, function,
+                template=template if use_template else None,
+                chunk_size=chunk_size, executor=executor, max_pending=2
+            )
+    else:
+        test_rmsd = traj_file_cls.analyze(
+            file_name, function,
+            template=template if use_template else None,
+            chunk_size=chunk_size
+        )
+
+    assert test_rmsd.tolist() == pytest.approx(ref_rmsd.tolist())
+
+
+def test_concatenation_reducer():
+    """
+    Test the :class:`ConcatenationReducer` for single arrays and
+    tuples of arrays.
+    """
+    np.random.seed(0)
+    values = np.random.rand(10, 3)
+    reducer = strucio.ConcatenationReducer()
+    tuple_reducer = strucio.ConcatenationReducer()
+    for chunk in np.array_split(values, 4):
+        reducer.add(chunk)
+        tuple_reducer.add((chunk, 2 * chunk))
+
+    assert np.array_equal(reducer.result(), values)
+    test_values, test_double_values = tuple_reducer.result()
+    assert np.array_equal(test_values, values)
+    assert np.array_equal(test_double_values, 2 * values)
+
+
+@pytest.mark.parametrize("nan_policy", ["propagate", "omit"])
+def test_mean_reducer(nan_policy):
+    """
+    Test whether the :class:`MeanReducer` gives the same result as
+    :func:`numpy.mean()` or :func:`numpy.nanmean()`.
+    """
+    np.random.seed(0)
+    values = np.random.rand(20, 5, 3)
+    values[np.random.rand(*values.shape) < 0.1] = np.nan
+    reducer = strucio.MeanReducer(nan_policy)
+    for chunk in np.array_split(values, 3):
+        reducer.add(chunk)
+
+    if nan_policy == "omit":
+        ref_mean = np.nanmean(values, axis=0)
+    else:
+        ref_mean = np.mean(values, axis=0)
+    assert np.allclose(reducer.result(), ref_mean, equal_nan=True)
+
+
+@pytest.mark.parametrize("density", [False, True])
+def test_histogram_reducer(density):
+    """
+    Test whether the :class:`HistogramReducer` gives the same result as
+    :func:`numpy.histogram()`.
+    """
+    np.random.seed(0)
+    values = np.random.normal(size=(100, 10))
+    bins = np.linspace(-3, 3, 20)
+    reducer = strucio.HistogramReducer(bins, density)
+    for chunk in np.array_split(values, 7):
+        reducer.add(chunk)
+
+    ref_hist, _ = np.histogram(values, bins, density=density)
+    assert np.allclose(reducer.result(), ref_hist)
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+def test_frequency_reducer(sparse):
+    """
+    Test whether the :class:`FrequencyReducer` gives the same result as
+    the frequency computed from a mask for all frames.
+    """
+    N_ITEMS = 10
+
+    np.random.seed(0)
+    all_items = np.random.randint(100, size=(N_ITEMS, 3))
+    mask = np.random.rand(30, N_ITEMS) < 0.3
+    reducer = strucio.FrequencyReducer()
+    for chunk_mask in np.array_split(mask, 4):
+        # Each chunk only contains items present in the chunk
+        # in random order
+        present = np.where(chunk_mask.any(axis=0))[0]
+        np.random.shuffle(present)
+        if sparse:
+            indices = np.stack(np.where(chunk_mask[:, present]), axis=-1)
+            reducer.add((all_items[present], indices, len(chunk_mask)))
+        else:
+            reducer.add((all_items[present], chunk_mask[:, present]))
+
+    items, frequency = reducer.result()
+    ref_frequency = np.count_nonzero(mask, axis=0) / len(mask)
+    assert len(items) == np.count_nonzero(ref_frequency)
+    for item, freq in zip(items, frequency):
+        item_i = np.where((all_items == item).all(axis=-1))[0][0]
+        assert freq == pytest.approx(ref_frequency[item_i])
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+def test_frequency_reducer_empty(sparse):
+    """
+    Test whether the items returned by :class:`FrequencyReducer` keep
+    the shape and dtype of the added items, if no item is present in
+    any frame.
+    """
+    items = np.zeros((0, 3), dtype=np.int64)
+    reducer = strucio.FrequencyReducer()
+    if sparse:
+        reducer.add((items, np.zeros((0, 2), dtype=int), 5))
+    else:
+        reducer.add((items, np.zeros((5, 0), dtype=bool)))
+
+    test_items, frequency = reducer.result()
+    assert test_items.shape == (0, 3)
+    assert test_items.dtype == np.int64
+    assert frequency.shape == (0,)
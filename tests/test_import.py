@@ -0,0 +1,116 @@
+# This source code is part of the Biotite package and is distributed
+# under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
+# information.
+
+import importlib
+import inspect
+import pkgutil
+import subprocess
+import sys
+import pytest
+
+
+LAZY_PACKAGES = [
+    "biotite.structure",
+    "biotite.sequence",
+    "biotite.structure.io",
+    "biotite.database",
+]
+
+
+@pytest.mark.parametrize("package_name", LAZY_PACKAGES)
+def test_lazy_attributes(package_name):
+    """
+    Check if all attributes listed in the ``__all__`` of a package are
+    accessible and are not shadowed by a module with the same name.
+    Furthermore, check if a module, whose attributes are partially
+    available in the package, provides all of its attributes via the
+    package.
+    """
+    package = importlib.import_module(package_name)
+    for attr in package.__all__:
+        assert not inspect.ismodule(getattr(package, attr))
+        assert attr in dir(package)
+
+    for module_info in pkgutil.iter_modules(package.__path__):
+        if module_info.ispkg:
+            continue
+        module = importlib.import_module(f"{package_name}.{module_info.name}")
+        exported = [
+            attr in package.__all__
+            and getattr(package, attr) is getattr(module, attr)
+            for attr in module.__all__
+        ]
+        if any(exported):
+            assert all(exported)
+
+
+@pytest.mark.parametrize("package_name", LAZY_PACKAGES)
+def test_lazy_module_attributes(package_name):
+    """
+    Check if the attribute names given for each lazily imported module
+    of a package are equal to the ``__all__`` of the module.
+    """
+    package = importlib.import_module(package_name)
+    for module_name, attributes in package._lazy_modules.items():
+        module = importlib.import_module(f"{package_name}.{module_name}")
+        assert sorted(attributes) == sorted(module.__all__)
+
+
+@pytest.mark.parametrize(
+    "package_name, unexpected_module_names",
+    [
+        (
+            "biotite.structure",
+            [
+                "networkx",
+                "biotite.structure.basepairs",
+                "biotite.structure.dotbracket",
+                "biotite.structure.io",
+                "biotite.structure.graphics",
+            ]
+        ),
+        (
+            "biotite.sequence",
+            [
+                "networkx",
+                "biotite.sequence.align",
+                "biotite.sequence.phylo",
+                "biotite.sequence.io",
+                "biotite.sequence.graphics",
+            ]
+        ),
+        (
+            "biotite.structure.io",
+            [
+                "networkx",
+                "biotite.structure.io.pdbx",
+                "biotite.structure.io.general",
+            ]
+        ),
+        (
+            "biotite.database",
+            [
+                "requests",
+                "biotite.database.rcsb",
+            ]
+        ),
+    ]
+)
+def test_import_is_lazy(package_name, unexpected_module_names):
+    """
+    Guard against regressions of the import time of the package, by
+    checking that expensive or rarely required modules are not imported
+    together with the package.
+    A new interpreter is required, as the modules might have already
+    been imported by other tests.
+    """
+    imported_module_names = subprocess.run(
+        [
+            sys.executable, "-c",
+            f"import sys; import {package_name}; print(*sys.modules)"
+        ],
+        capture_output=True, text=True, check=True
+    ).stdout.split()
+    for module_name in unexpected_module_names:
+        assert module_name not in imported_module_names